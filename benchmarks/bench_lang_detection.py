@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк определения языка проекта: однопроходный сканер против glob.
+
+Создаёт синтетические деревья файлов заданного размера и сравнивает время
+подсчёта файлов по языкам прежним способом (отдельный рекурсивный glob на
+каждый шаблон) и однопроходным сканером на os.scandir.
+
+Пример запуска:
+    python benchmarks/bench_lang_detection.py --sizes 10000,100000,1000000
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langs.file_scanner import count_language_files
+from langs.plugins import get_classifier, get_language_patterns
+
+# Расширения синтетических файлов (включая файлы, не относящиеся ни к одному языку)
+EXTENSIONS = [".py", ".py", ".js", ".ts", ".go", ".java", ".rb", ".md", ".txt", ".json"]
+FILES_PER_DIR = 50
+DIRS_PER_LEVEL = 10
+
+
+def glob_language_scores(project_path: str) -> Dict[str, int]:
+    """Прежняя реализация: один рекурсивный glob на каждый шаблон"""
+    language_patterns = get_language_patterns()
+    language_scores = {lang: 0 for lang in language_patterns}
+    for lang, patterns in language_patterns.items():
+        for pattern in patterns:
+            matching_files = glob.glob(os.path.join(project_path, "**", pattern), recursive=True)
+            language_scores[lang] += len(matching_files)
+    return language_scores
+
+
+def create_tree(root: str, total_files: int) -> None:
+    """
+    Создаёт синтетическое дерево из указанного количества пустых файлов.
+
+    Args:
+        root (str): Корневая директория
+        total_files (int): Количество файлов
+    """
+    created = 0
+    dir_index = 0
+    while created < total_files:
+        # Раскладываем директории по уровням вложенности: a/b/c
+        parts = []
+        n = dir_index
+        while True:
+            parts.append(f"d{n % DIRS_PER_LEVEL}")
+            n //= DIRS_PER_LEVEL
+            if n == 0:
+                break
+        directory = os.path.join(root, *parts)
+        os.makedirs(directory, exist_ok=True)
+        for i in range(min(FILES_PER_DIR, total_files - created)):
+            ext = EXTENSIONS[(created + i) % len(EXTENSIONS)]
+            open(os.path.join(directory, f"f{i}{ext}"), "w").close()
+        created += min(FILES_PER_DIR, total_files - created)
+        dir_index += 1
+    # Манифесты в корне
+    for manifest in ("pyproject.toml", "package.json", "go.mod"):
+        open(os.path.join(root, manifest), "w").close()
+
+
+def measure(func, *args) -> float:
+    """Возвращает время выполнения функции в секундах"""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Бенчмарк определения языка проекта")
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="Размеры синтетических деревьев (через запятую)")
+    args = parser.parse_args()
+
+    classifier = get_classifier()
+
+    print(f"{'файлов':>10} {'glob, с':>10} {'scandir, с':>12} {'ускорение':>10}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        root = tempfile.mkdtemp(prefix="testgen-bench-")
+        try:
+            create_tree(root, size)
+            glob_scores = glob_language_scores(root)
+            scan_scores = count_language_files(root, classifier)
+            if glob_scores != scan_scores:
+                raise SystemExit(f"Результаты различаются: {glob_scores} != {scan_scores}")
+
+            glob_time = measure(glob_language_scores, root)
+            scan_time = measure(count_language_files, root, classifier)
+            print(f"{size:>10} {glob_time:>10.3f} {scan_time:>12.3f} {glob_time / scan_time:>9.1f}x")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк параллельной генерации тестов (testgen gen --jobs N).
+
+Генерирует тесты для синтетического Python-проекта при разном количестве
+процессов без кэша разбора (чтобы измерять разбор и формирование тестов,
+а не чтение кэша) и проверяет, что набор и содержимое файлов тестов не
+зависят от количества процессов.
+
+Пример запуска:
+    python benchmarks/bench_parallel_generation.py --modules 20000 --jobs 1,4,16
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_python_generator import create_project
+from langs.lang_detector import generate_tests_for_language
+
+
+def output_digest(output_dir: str) -> str:
+    """Хэш имён и содержимого всех файлов тестов"""
+    digest = hashlib.blake2b(digest_size=16)
+    for name in sorted(os.listdir(output_dir)):
+        digest.update(name.encode())
+        with open(os.path.join(output_dir, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def main() -> None:
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Бенчмарк параллельной генерации тестов")
+    parser.add_argument("--modules", type=int, default=20000, help="Количество модулей")
+    parser.add_argument("--jobs", default="1,4,16", help="Количество процессов (через запятую)")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="testgen-bench-")
+    try:
+        create_project(root, args.modules)
+        baseline_time = None
+        baseline_digest = None
+        print(f"модулей: {args.modules}, ядер: {os.cpu_count()}")
+        print(f"{'процессов':>10} {'время, с':>10} {'ускорение':>10}")
+        for jobs in (int(j) for j in args.jobs.split(",")):
+            output_dir = os.path.join(root, f"tests-{jobs}")
+            start = time.perf_counter()
+            generate_tests_for_language(root, "python", "pytest", output_dir, use_cache=False, jobs=jobs)
+            elapsed = time.perf_counter() - start
+            digest = output_digest(output_dir)
+            if baseline_time is None:
+                baseline_time, baseline_digest = elapsed, digest
+            elif digest != baseline_digest:
+                raise SystemExit(f"Результат при {jobs} процессах отличается от последовательного")
+            print(f"{jobs:>10} {elapsed:>10.2f} {baseline_time / elapsed:>9.1f}x")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
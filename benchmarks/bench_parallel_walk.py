@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк параллельного обхода директорий при задержке файловой системы.
+
+На сетевых файловых системах (NFS) время обхода определяется задержкой
+каждого листинга директории. Бенчмарк имитирует её, добавляя задержку к
+каждому вызову os.scandir, и сравнивает последовательный обход с
+параллельным при разном количестве потоков. Заодно проверяется, что порядок
+вывода не зависит от количества потоков.
+
+Пример запуска:
+    python benchmarks/bench_parallel_walk.py --dirs 2000 --latency-ms 2 --workers 1,4,16,32
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langs import file_scanner
+
+FILES_PER_DIR = 10
+DIRS_PER_LEVEL = 8
+
+
+def create_tree(root: str, total_dirs: int) -> None:
+    """
+    Создаёт дерево из указанного количества директорий с файлами.
+
+    Args:
+        root (str): Корневая директория
+        total_dirs (int): Количество директорий
+    """
+    for index in range(total_dirs):
+        parts = []
+        n = index
+        while True:
+            parts.append(f"d{n % DIRS_PER_LEVEL}")
+            n //= DIRS_PER_LEVEL
+            if n == 0:
+                break
+        directory = os.path.join(root, *parts)
+        os.makedirs(directory, exist_ok=True)
+        for i in range(FILES_PER_DIR):
+            open(os.path.join(directory, f"m{i}.py"), "w").close()
+
+
+def with_latency(latency: float):
+    """Оборачивает os.scandir, добавляя задержку к каждому вызову"""
+    original = os.scandir
+
+    def slow_scandir(*args, **kwargs):
+        time.sleep(latency)
+        return original(*args, **kwargs)
+
+    return original, slow_scandir
+
+
+def main() -> None:
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Бенчмарк параллельного обхода директорий")
+    parser.add_argument("--dirs", type=int, default=2000, help="Количество директорий в дереве")
+    parser.add_argument("--latency-ms", type=float, default=2.0,
+                        help="Имитируемая задержка одного листинга директории, мс")
+    parser.add_argument("--workers", default="1,4,16,32", help="Количество потоков (через запятую)")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="testgen-bench-")
+    original, slow_scandir = with_latency(args.latency_ms / 1000.0)
+    try:
+        create_tree(root, args.dirs)
+        os.scandir = slow_scandir
+
+        baseline_order = None
+        baseline_time = None
+        print(f"директорий: {args.dirs}, задержка: {args.latency_ms} мс")
+        print(f"{'потоков':>8} {'время, с':>10} {'ускорение':>10}")
+        for workers in (int(w) for w in args.workers.split(",")):
+            start = time.perf_counter()
+            order = list(file_scanner.iter_files(root, workers=workers))
+            elapsed = time.perf_counter() - start
+            if baseline_order is None:
+                baseline_order, baseline_time = order, elapsed
+            elif order != baseline_order:
+                raise SystemExit(f"Порядок вывода при {workers} потоках отличается от последовательного")
+            print(f"{workers:>8} {elapsed:>10.3f} {baseline_time / elapsed:>9.1f}x")
+    finally:
+        os.scandir = original
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
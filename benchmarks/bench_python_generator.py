@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк повторной генерации тестов для Python с кэшем разбора.
+
+Создаёт синтетический проект из N модулей и измеряет три прогона генерации:
+холодный (кэша нет), повторный после изменения одного модуля с кэшем в
+новом процессе (кэш читается с диска) и тот же прогон без кэша.
+
+Пример запуска:
+    python benchmarks/bench_python_generator.py --modules 20000
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langs import parse_cache
+from langs.python_generator import generate_tests
+
+MODULES_PER_PACKAGE = 100
+
+MODULE_TEMPLATE = '''"""Модуль {index}"""
+import os
+
+
+def load_{index}(path, *, encoding="utf-8"):
+    with open(path, encoding=encoding) as f:
+        return f.read()
+
+
+def save_{index}(path, data):
+    with open(path, "w") as f:
+        f.write(data)
+
+
+class Service{index}:
+    def __init__(self, name):
+        self.name = name
+
+    def run(self, *args, **kwargs):
+        return [os.path.join(self.name, str(arg)) for arg in args]
+
+    def stop(self):
+        return None
+'''
+
+
+def create_project(root: str, modules: int) -> list:
+    """Создаёт пакеты с модулями и возвращает пути к модулям"""
+    paths = []
+    for index in range(modules):
+        package = os.path.join(root, f"pkg{index // MODULES_PER_PACKAGE}")
+        os.makedirs(package, exist_ok=True)
+        path = os.path.join(package, f"module{index}.py")
+        with open(path, "w") as f:
+            f.write(MODULE_TEMPLATE.format(index=index))
+        paths.append(path)
+    return paths
+
+
+def generate_all(root: str, paths: list, output_dir: str, use_cache: bool) -> float:
+    """Генерирует тесты для всех модулей, имитируя новый процесс"""
+    parse_cache._CACHES.clear()
+    start = time.perf_counter()
+    for path in paths:
+        generate_tests(path, "pytest", output_dir, root, use_cache)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Бенчмарк генерации тестов для Python с кэшем разбора")
+    parser.add_argument("--modules", type=int, default=20000, help="Количество модулей")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="testgen-bench-")
+    try:
+        paths = create_project(root, args.modules)
+        output_dir = os.path.join(root, "tests")
+
+        cold = generate_all(root, paths, output_dir, use_cache=True)
+        with open(paths[0], "a") as f:
+            f.write("\n\ndef added():\n    return 1\n")
+        warm = generate_all(root, paths, output_dir, use_cache=True)
+        uncached = generate_all(root, paths, output_dir, use_cache=False)
+
+        print(f"модулей: {args.modules}")
+        print(f"{'прогон':>28} {'время, с':>10}")
+        print(f"{'холодный (без кэша на диске)':>28} {cold:>10.2f}")
+        print(f"{'после изменения, с кэшем':>28} {warm:>10.2f}")
+        print(f"{'после изменения, --no-cache':>28} {uncached:>10.2f}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
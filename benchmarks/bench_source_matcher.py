@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Микро-бенчмарк отбора исходных файлов по шаблонам имён.
+
+Сравнивает прежнюю проверку (fnmatch по каждому шаблону включения и
+сравнение префиксов/суффиксов для шаблонов тестов) со скомпилированным
+сопоставителем на синтетическом списке имён. Результат - наносекунды на
+одно имя.
+
+Пример запуска:
+    python benchmarks/bench_source_matcher.py --paths 1000000
+"""
+
+import argparse
+import fnmatch
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langs.glob_matcher import compile_name_matcher
+from langs.plugins import get_plugin
+
+# Имена синтетического дерева: исходники, тесты и посторонние файлы
+NAME_TEMPLATES = [
+    "module_{}.py", "test_module_{}.py", "module_{}_test.py", "component_{}.tsx",
+    "component_{}.test.js", "handler_{}.go", "handler_{}_test.go", "README_{}.md",
+    "Service{}.java", "Service{}Test.java", "data_{}.json", "script_{}.sh",
+]
+
+
+def legacy_is_source(name: str, patterns: List[str], exclude_list: List[str]) -> bool:
+    """Прежняя проверка из get_source_files"""
+    if not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+        return False
+    is_test_file = any(
+        name.lower().endswith(p[1:].lower()) or name.lower().startswith(p[:-1].lower())
+        for p in exclude_list if "*" in p
+    )
+    return not is_test_file
+
+
+def main() -> None:
+    """Точка входа бенчмарка"""
+    parser = argparse.ArgumentParser(description="Бенчмарк отбора исходных файлов по шаблонам")
+    parser.add_argument("--paths", type=int, default=1000000, help="Количество имён файлов")
+    parser.add_argument("--lang", default="python", help="Язык, шаблоны которого проверяются")
+    args = parser.parse_args()
+
+    names = [NAME_TEMPLATES[i % len(NAME_TEMPLATES)].format(i) for i in range(args.paths)]
+    plugin = get_plugin(args.lang)
+    if plugin is None:
+        parser.error(f"неизвестный язык: {args.lang}")
+    patterns = plugin.source_patterns
+    exclude_list = plugin.test_patterns
+
+    start = time.perf_counter()
+    legacy = [name for name in names if legacy_is_source(name, patterns, exclude_list)]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matches_source = compile_name_matcher(patterns, exclude_list)
+    compiled = [name for name in names if matches_source(name)]
+    compiled_time = time.perf_counter() - start
+
+    print(f"имён: {args.paths}, язык: {args.lang}")
+    print(f"{'вариант':>12} {'нс/имя':>10} {'отобрано':>10}")
+    print(f"{'прежний':>12} {legacy_time / args.paths * 1e9:>10.0f} {len(legacy):>10}")
+    print(f"{'компилир.':>12} {compiled_time / args.paths * 1e9:>10.0f} {len(compiled):>10}")
+    print(f"ускорение: {legacy_time / compiled_time:.1f}x")
+    if len(legacy) != len(compiled):
+        # Прежняя проверка не исключала часть тестов (например, test_*.py)
+        print(f"прежняя проверка пропускала тестовых файлов: {len(legacy) - len(compiled)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,31 @@
 import typer
 from rich.console import Console
 from rich.panel import Panel
+from rich.table import Table
 from rich import print as rprint
 import pyfiglet
 import os
 import sys
+import time
+from typing import Optional, Tuple
 
 # Добавляем корневую директорию проекта в PYTHONPATH
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from langs import lang_detector
+from langs.file_scanner import set_walk_workers
+from langs.gen_plan import plan_generation
+from langs.output_layout import parse_layout
+from langs.plugins import UNIT_TESTS, get_plugin
+from langs.project_map import find_project_root
+from langs.sampled_detection import parse_detect_budget
+from langs.watcher import SourceWatcher
+from langs.symbol_index import UNTESTED_LANGUAGES, update_symbol_index
 from testengines import runner
 from testengines import custom_runner
+from testengines.duration_history import DurationHistory
+from testengines.sharding import parse_shard, partition, plan_shards
+from testengines.suite_executor import Suite, default_jobs, merge_results, run_suites
 from ui import tui
 from cmd.testgen.ci_gen import generate_ci_config
 
@@ -25,10 +39,408 @@ def show_header():
     console.print(Panel.fit(header, border_style="bright_blue"))
     console.print("Утилита для генерации и запуска тестов", style="italic")
 
+@app.callback()
+def common_options(
+    walk_workers: int = typer.Option(None, "--walk-workers", min=1, envvar="TESTGEN_WALK_WORKERS",
+                                     help="Количество потоков обхода директорий (ускоряет обход на сетевых ФС, например NFS; по умолчанию 1)"),
+):
+    """Общие параметры всех команд"""
+    if walk_workers:
+        set_walk_workers(walk_workers)
+
+def detect_language(path: str, no_cache: bool, detect_budget: Optional[str]) -> Optional[str]:
+    """Определение языка проекта: полный подсчёт или выборка с бюджетом --detect-budget"""
+    if not detect_budget:
+        return lang_detector.detect_project_language(path, use_cache=not no_cache)
+
+    try:
+        max_files, max_seconds = parse_detect_budget(detect_budget)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--detect-budget")
+
+    result = lang_detector.detect_project_language_sampled(path, max_files, max_seconds)
+    if result.language:
+        console.print(
+            f"Выборочное определение: просмотрено файлов {result.files_scanned}, "
+            f"уверенность {result.confidence:.1%}"
+        )
+    return result.language
+
+def show_project_map(projects) -> None:
+    """Отображение найденных проектов полиглотного репозитория"""
+    table = Table(title="Проекты в репозитории")
+    table.add_column("Корень", style="cyan")
+    table.add_column("Язык", style="green")
+    table.add_column("Фреймворк", style="green")
+    table.add_column("Файлов", justify="right")
+    for project in projects.values():
+        table.add_row(project.path, project.language, project.framework or "-", str(project.file_count))
+    console.print(table)
+
+def show_generation_report(report) -> None:
+    """Отображение итогов генерации: записанные, неизменённые и удалённые тесты"""
+    console.print(f"[green]Сгенерировано тестов: {len(report.generated)}[/green]")
+    for test_path in report.written:
+        console.print(f"  - {test_path}")
+    # Неизменённые: содержимое совпало при перегенерации или файл пропущен по манифесту
+    unchanged = len(report.unchanged) + len(report.up_to_date)
+    console.print(f"Записано: {len(report.written)}, без изменений: {unchanged}, удалено: {len(report.removed)}")
+    for test_path in report.removed:
+        console.print(f"  - удалён {test_path}")
+    if report.orphans:
+        console.print(f"[yellow]Изменённые тесты удалённых исходных файлов (оставлены): {len(report.orphans)}[/yellow]")
+        for test_path in report.orphans:
+            console.print(f"  - {test_path}")
+    if report.collisions:
+        console.print(f"[yellow]Исходные файлы, тест которых совпал по пути с другим тестом (пропущены): "
+                      f"{len(report.collisions)}[/yellow]")
+        for test_path, file_path in report.collisions:
+            console.print(f"  - {file_path} -> {test_path}")
+
+def format_size(size: int) -> str:
+    """Размер в байтах в читаемом виде"""
+    for unit in ("Б", "КБ", "МБ"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "Б" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} ГБ"
+
+def format_duration(seconds: float) -> str:
+    """Длительность в читаемом виде"""
+    if seconds < 60:
+        return f"{seconds:.1f} с"
+    minutes, seconds = divmod(int(seconds), 60)
+    if minutes < 60:
+        return f"{minutes} мин {seconds} с"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} ч {minutes} мин"
+
+def show_generation_plans(plans, jobs: int) -> None:
+    """Отображение плана генерации (--plan): файлы, объём, актуальные тесты и оценка времени"""
+    table = Table(title="План генерации")
+    table.add_column("Корень", style="cyan")
+    table.add_column("Язык/фреймворк", style="green")
+    table.add_column("Файлов", justify="right")
+    table.add_column("Объём", justify="right")
+    table.add_column("Актуальны", justify="right")
+    table.add_column("К генерации", justify="right")
+    table.add_column("Оценка времени", justify="right")
+    total_seconds = 0.0
+    for plan in plans:
+        if plan.supported:
+            seconds = plan.estimated_seconds(jobs)
+            total_seconds += seconds
+            # Оценка без записанной скорости отмечается звёздочкой
+            estimate = format_duration(seconds) + ("" if plan.measured else "*")
+        else:
+            estimate = "[yellow]не поддерживается[/yellow]"
+        table.add_row(
+            plan.directory, f"{plan.language}/{plan.framework}", str(plan.files), format_size(plan.bytes),
+            str(plan.up_to_date), f"{plan.pending} ({format_size(plan.pending_bytes)})", estimate
+        )
+    console.print(table)
+    console.print(f"Оценка общего времени ({jobs} проц.): {format_duration(total_seconds)}")
+    if any(plan.supported and not plan.measured for plan in plans):
+        console.print("* скорость генерации ещё не измерялась, использована оценка по умолчанию")
+    console.print("Тесты не генерировались и не записывались")
+
+def plan_for_projects(projects, path: str, test_framework: Optional[str], output_dir: Optional[str],
+                      no_cache: bool, jobs: int, force: bool, layout=None) -> None:
+    """План генерации (--plan) для каждого проекта полиглотного репозитория"""
+    plans = []
+    for project in projects.values():
+        frameworks = lang_detector.get_available_test_frameworks(project.language)
+        framework = test_framework if test_framework in frameworks else project.framework
+        if not framework:
+            continue
+        if output_dir:
+            project_output = os.path.join(output_dir, os.path.relpath(project.path, path))
+        else:
+            project_output = os.path.join(project.path, "tests")
+        plans.append(plan_generation(project.path, project.language, framework, project_output,
+                                     use_cache=not no_cache, exclude_dirs=project.nested, force=force,
+                                     layout=layout))
+    show_generation_plans(plans, jobs)
+
+def generate_for_projects(projects, path: str, test_framework: Optional[str], output_dir: Optional[str],
+                          no_cache: bool, jobs: int, force: bool, layout=None) -> None:
+    """Генерация тестов отдельно для каждого проекта полиглотного репозитория"""
+    show_project_map(projects)
+    total = 0
+    for project in projects.values():
+        # Явно указанный фреймворк применяется только к проектам, где он поддерживается
+        frameworks = lang_detector.get_available_test_frameworks(project.language)
+        framework = test_framework if test_framework in frameworks else project.framework
+        if output_dir:
+            project_output = os.path.join(output_dir, os.path.relpath(project.path, path))
+        else:
+            project_output = os.path.join(project.path, "tests")
+
+        try:
+            report = lang_detector.generate_tests_incremental(
+                directory=project.path,
+                language=project.language,
+                framework=framework,
+                output_dir=project_output,
+                use_cache=not no_cache,
+                exclude_dirs=project.nested,
+                jobs=jobs,
+                force=force,
+                layout=layout
+            )
+        except Exception as e:
+            console.print(f"[red]{project.path}: ошибка при генерации тестов: {str(e)}[/red]")
+            continue
+
+        total += len(report.generated)
+        console.print(f"[bold]{project.path}[/bold] ({project.language}/{framework})")
+        show_generation_report(report)
+
+    console.print(f"[green]Всего сгенерировано тестов: {total}[/green]")
+
+def show_output_logs(result) -> None:
+    """Сообщает, где сохранён полный вывод тестов (вывод уже напечатан по мере выполнения)"""
+    if result.log is None:
+        # Тесты не запускались: причина только в сообщении об ошибке
+        if result.errors:
+            console.print(f"Ошибки:\n{result.errors}")
+        return
+    if not result.log.log_paths:
+        return
+    console.print("Вывод не поместился в память, полностью сохранён в журналах:")
+    for log_path in result.log.log_paths:
+        console.print(f"  - {log_path}")
+
+# Сколько упавших тестов перечисляется в итогах запуска
+MAX_LISTED_FAILURES = 20
+
+def show_test_summary(summary) -> None:
+    """Итоги по отдельным тестам: количество и упавшие тесты (если вывод фреймворка разбирался)"""
+    if summary is None or not summary.finished:
+        return
+    console.print(f"Тестов: [green]{summary.passed} пройдено[/green], [red]{summary.failed} упало[/red], "
+                  f"[yellow]{summary.skipped} пропущено[/yellow]")
+    if not summary.failures:
+        return
+    console.print("[red]Упавшие тесты:[/red]")
+    for test_id in summary.failures[:MAX_LISTED_FAILURES]:
+        console.print(f"  - {test_id}", highlight=False)
+    if len(summary.failures) > MAX_LISTED_FAILURES:
+        console.print(f"  ... и ещё {len(summary.failures) - MAX_LISTED_FAILURES}")
+
+def record_durations(project_path: str, framework: str, results) -> DurationHistory:
+    """Запоминает длительности тестов запусков (для --shard, --workers, порядка запуска и --durations)"""
+    history = DurationHistory(project_path)
+    history.load()
+    # Один запуск - один замер каждого теста, даже если тесты выполнялись в нескольких процессах
+    durations = {}
+    for result in results:
+        if result.summary is not None:
+            durations.update(result.summary.durations)
+    history.record(framework, durations)
+    history.save()
+    return history
+
+def slowest_rows(history: DurationHistory, framework: str, durations, prefix: str = "") -> list:
+    """Строки отчёта --durations: (тест, длительность в запуске, статистика по истории)"""
+    return [(prefix + test_id, duration, history.stats(framework, test_id))
+            for test_id, duration in durations.items()]
+
+def show_slowest(rows: list, count: int) -> None:
+    """--durations N: самые долгие тесты запуска со скользящим средним и процентилями по истории"""
+    if not count or not rows:
+        return
+    rows = sorted(rows, key=lambda row: -row[1])[:count]
+    table = Table(title=f"Самые долгие тесты ({len(rows)})")
+    table.add_column("Тест", style="cyan")
+    table.add_column("Время", justify="right")
+    table.add_column("Среднее", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p90", justify="right")
+    table.add_column("Замеров", justify="right")
+    for test_id, duration, stats in rows:
+        if stats is None:
+            table.add_row(test_id, f"{duration:.2f} с", "", "", "", "")
+            continue
+        table.add_row(test_id, f"{duration:.2f} с", f"{stats.mean:.2f} с", f"{stats.percentile(50):.2f} с",
+                      f"{stats.percentile(90):.2f} с", str(stats.runs))
+    console.print(table)
+
+def project_location(path: str, language: str) -> Tuple[str, str]:
+    """Корень проекта (директория запуска тестов и истории длительности) и путь к тестам относительно него"""
+    root = find_project_root(path, language)
+    return root, os.path.relpath(path, root)
+
+def run_sharded(language: str, framework: str, path: str, verbose: bool, quiet: bool,
+                shard: Optional[str], workers: Optional[int], durations: int = 0) -> None:
+    """Запуск части тестов (--shard i/N) и/или в нескольких процессах (--workers N) с делением по истории длительности"""
+    plugin = get_plugin(language)
+    root, path = project_location(path, language)
+    history = DurationHistory(root)
+    history.load()
+    # Без подробного вывода тесты известны только по номерам в файле, а файл может быть
+    # поделён между частями: для истории нужны идентификаторы тестов
+    verbose = verbose or plugin.shard_unit(framework) == UNIT_TESTS
+    if shard:
+        index, count = parse_shard(shard)
+        selected = plan_shards(plugin, framework, path, count, history.durations(framework), root)[index - 1]
+        if not selected.units:
+            console.print(f"[yellow]В шарде {index}/{count} нет тестов[/yellow]")
+            return
+        console.print(f"Шард {index}/{count}: {len(selected.units)} ед., оценка {selected.weight:.1f}")
+        # Шард делится между процессами без повторного дробления файлов на тесты
+        parts = partition(selected.weights, workers) if workers else [selected]
+    else:
+        parts = plan_shards(plugin, framework, path, workers, history.durations(framework), root)
+    parts = [part for part in parts if part.units]
+    if not parts:
+        console.print("[yellow]Тесты не найдены[/yellow]")
+        return
+    if len(parts) == 1:
+        result = runner.run_tests(language, framework, path, verbose, cwd=root, echo=not quiet, units=parts[0].units)
+        results = [result]
+    else:
+        # Части и единицы в частях упорядочены по убыванию оценки: самые долгие тесты запускаются первыми
+        suites = [Suite(f"{number}/{len(parts)}", language, framework, path, cwd=root, units=part.units,
+                        estimate=part.weight)
+                  for number, part in enumerate(parts, 1)]
+        for suite, part in zip(suites, parts):
+            console.print(f"Процесс {suite.name}: {len(part.units)} ед., оценка {part.weight:.1f}")
+        results = run_suites(suites, len(suites), verbose, echo=not quiet)
+        result = runner.TestResult(all(item.success for item in results), "", "",
+                                   max(item.duration for item in results))
+        result.summary = merge_results(suites, results)
+    history = record_durations(root, framework, results)
+
+    status_color = "green" if result.success else "red"
+    status_text = "УСПЕШНО" if result.success else "ОШИБКА"
+    console.print(f"\nСтатус: [{status_color}]{status_text}[/{status_color}]")
+    show_test_summary(result.summary)
+    show_slowest([row for item in results if item.summary is not None
+                  for row in slowest_rows(history, framework, item.summary.durations)], durations)
+    for item in results:
+        show_output_logs(item)
+
+def run_for_projects(projects, verbose: bool, quiet: bool = False, jobs: Optional[int] = None,
+                     durations: int = 0) -> None:
+    """Одновременный запуск тестов каждого проекта полиглотного репозитория"""
+    show_project_map(projects)
+    suites = []
+    for project in projects.values():
+        if not project.framework:
+            continue
+        # История - в корне проекта, из которого запускаются его тесты (как в project_location);
+        # оценка по ней: самые долгие проекты запускаются первыми
+        history = DurationHistory(project.path)
+        estimate = sum(history.durations(project.framework).values()) if history.load() else None
+        # Команда запускается из корня проекта, чтобы go.mod, package.json и т.п. были найдены;
+        # тесты вложенных проектов запускаются их собственными наборами
+        exclude = [os.path.relpath(nested, project.path).replace(os.sep, "/") for nested in project.nested]
+        suites.append(Suite(project.path, project.language, project.framework, ".", cwd=project.path,
+                            estimate=estimate, exclude=exclude))
+    jobs = jobs or default_jobs(len(suites))
+    console.print(f"\nОдновременно запускается наборов: {min(jobs, len(suites))} из {len(suites)}")
+    started = time.perf_counter()
+    results = dict(zip((suite.name for suite in suites), run_suites(suites, jobs, verbose, echo=not quiet)))
+    elapsed = time.perf_counter() - started
+
+    summary = Table(title="Итоги по проектам")
+    summary.add_column("Корень", style="cyan")
+    summary.add_column("Язык/фреймворк")
+    summary.add_column("Статус")
+    summary.add_column("Тесты", justify="right")
+    summary.add_column("Время", justify="right")
+    for project in projects.values():
+        result = results.get(project.path)
+        if result is None:
+            summary.add_row(project.path, project.language, "[yellow]нет фреймворка[/yellow]", "", "")
+            continue
+        status = "[green]УСПЕШНО[/green]" if result.success else "[red]ОШИБКА[/red]"
+        tests = (f"[green]{result.summary.passed}[/green] ✓ [red]{result.summary.failed}[/red] ✗"
+                 if result.summary is not None else "")
+        summary.add_row(project.path, f"{project.language}/{project.framework}", status, tests,
+                        f"{result.duration:.1f} с")
+    console.print(summary)
+    total = sum(result.duration for result in results.values())
+    console.print(f"Общее время: {elapsed:.1f} с (сумма по проектам: {total:.1f} с)")
+
+    show_test_summary(merge_results(suites, list(results.values())))
+    rows = []
+    for suite in suites:
+        result = results[suite.name]
+        history = record_durations(suite.cwd, suite.framework, [result])
+        if result.summary is not None:
+            rows.extend(slowest_rows(history, suite.framework, result.summary.durations, f"{suite.name}: "))
+    show_slowest(rows, durations)
+    for suite in suites:
+        result = results[suite.name]
+        if result.log is None or result.log.log_paths:
+            console.print(f"[bold]{suite.name}[/bold]:")
+            show_output_logs(result)
+
+def watch_and_generate(path: str, language: str, test_framework: str, output_dir: str, no_cache: bool,
+                       layout=None) -> None:
+    """Режим --watch: перегенерация тестов только для изменённых исходных файлов"""
+    if lang_detector.get_test_renderer(language, test_framework, output_dir, path, not no_cache) is None:
+        console.print(f"[yellow]Генерация тестов для языка {language} не поддерживается[/yellow]")
+        return
+
+    bundled = layout is not None and layout.bundled
+
+    def generate_batch(batch) -> None:
+        # Пакет изменений обрабатывается через манифест, как gen: тесты изменённых файлов
+        # перезаписываются, тесты удалённых исходных файлов удаляются. Объединённые файлы
+        # тестов зависят от нескольких исходных файлов: группы пересобираются по всему дереву
+        report = lang_detector.generate_tests_incremental(
+            path, language, test_framework, output_dir, not no_cache, layout=layout,
+            changed=None if bundled else batch.changed, removed=None if bundled else batch.removed
+        )
+        for test_path in report.written:
+            console.print(f"[green]Обновлён тест[/green]: {test_path}")
+        for test_path in report.removed:
+            console.print(f"[yellow]Удалён тест[/yellow]: {test_path}")
+        for test_path in report.orphans:
+            console.print(f"[yellow]Тест удалённого исходного файла изменён вручную (оставлен)[/yellow]: {test_path}")
+        for test_path, file_path in report.collisions:
+            console.print(f"[yellow]{file_path}: путь к тесту занят[/yellow]: {test_path}")
+
+    with SourceWatcher(path, language) as watcher:
+        console.print(
+            f"[cyan]Отслеживание изменений ({watcher.backend}), файлов: {len(watcher.files())}. "
+            f"Ctrl+C для выхода[/cyan]"
+        )
+        try:
+            while True:
+                batch = watcher.next_batch()
+                for file_path in batch.removed:
+                    console.print(f"[yellow]Удалён исходный файл[/yellow]: {file_path}")
+                try:
+                    generate_batch(batch)
+                except Exception as e:
+                    console.print(f"[red]Ошибка при генерации тестов: {str(e)}[/red]")
+        except KeyboardInterrupt:
+            console.print("Отслеживание остановлено")
+
+def show_untested_functions(path: str, prefix: str, no_cache: bool) -> None:
+    """Отображение публичных функций без тестов по индексу символов .testgen/symbols.db"""
+    with update_symbol_index(path, use_cache=not no_cache) as index:
+        rows = index.functions_without_tests("" if prefix == "." else prefix)
+    console.print(f"Покрытие определяется для языков: {', '.join(UNTESTED_LANGUAGES)}")
+    table = Table(title=f"Функции без тестов: {prefix}")
+    table.add_column("Файл", style="cyan")
+    table.add_column("Строки", justify="right")
+    table.add_column("Функция", style="green")
+    for file_path, _, _, signature, start, end in rows:
+        table.add_row(file_path, f"{start}-{end}", signature)
+    console.print(table)
+    console.print(f"Всего функций без тестов: {len(rows)}")
+
 @app.command()
 def init(
     language: str = typer.Option(None, "--lang", "-l", help="Язык программирования проекта"),
     test_framework: str = typer.Option(None, "--framework", "-f", help="Тестовый фреймворк"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Не использовать индекс файлов из .testgen/cache"),
+    detect_budget: str = typer.Option(None, "--detect-budget", help="Бюджет выборочного определения языка: файлы, секунды или оба (5000, 2s, 5000,2s)"),
 ):
     """Инициализация тестового окружения в проекте"""
     show_header()
@@ -36,7 +448,7 @@ def init(
     
     # Если язык не указан, пытаемся определить его автоматически
     if not language:
-        detected_lang = lang_detector.detect_project_language()
+        detected_lang = detect_language(".", no_cache, detect_budget)
         if detected_lang:
             console.print(f"Обнаружен язык программирования: [bold]{detected_lang}[/bold]")
             language = detected_lang
@@ -54,15 +466,42 @@ def gen(
     language: str = typer.Option(None, "--lang", "-l", help="Язык программирования"),
     test_framework: str = typer.Option(None, "--framework", "-f", help="Тестовый фреймворк"),
     output_dir: str = typer.Option(None, "--output", "-o", help="Директория для сохранения тестов"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Не использовать индекс файлов из .testgen/cache"),
+    detect_budget: str = typer.Option(None, "--detect-budget", help="Бюджет выборочного определения языка: файлы, секунды или оба (5000, 2s, 5000,2s)"),
+    watch: bool = typer.Option(False, "--watch", "-w", help="Отслеживать изменения и перегенерировать тесты для изменённых файлов"),
+    jobs: int = typer.Option(1, "--jobs", "-j", min=1, help="Количество процессов для генерации тестов"),
+    force: bool = typer.Option(False, "--force", help="Перегенерировать все тесты, не сверяясь с .testgen/gen-manifest"),
+    plan: bool = typer.Option(False, "--plan", help="Показать план генерации и оценку времени, ничего не генерируя"),
+    layout: str = typer.Option(None, "--layout", help="Раскладка тестов: file (файл на исходный файл), package (файл на пакет) или shards:N (файлы примерно по N тестов)"),
 ):
     """Генерация тестов для указанных файлов"""
     show_header()
     console.print(f"[bold green]Генерация тестов для[/bold green]: {path}")
     
+    # Ошибка в параметре - ошибка использования, а не генерации
+    if detect_budget:
+        try:
+            parse_detect_budget(detect_budget)
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--detect-budget")
+    
     try:
+        output_layout = parse_layout(layout)
+        # В полиглотном репозитории тесты генерируются для каждого проекта отдельно
+        # (режим --watch отслеживает один язык во всём дереве)
+        if not language and not detect_budget and not watch:
+            projects = lang_detector.detect_project_map(path, use_cache=not no_cache)
+            if len(projects) > 1:
+                if plan:
+                    plan_for_projects(projects, path, test_framework, output_dir, no_cache, jobs, force, output_layout)
+                else:
+                    generate_for_projects(projects, path, test_framework, output_dir, no_cache, jobs, force,
+                                          output_layout)
+                return
+
         # Если язык не указан, определяем его автоматически
         if not language:
-            detected_lang = lang_detector.detect_project_language(path)
+            detected_lang = detect_language(path, no_cache, detect_budget)
             if detected_lang:
                 console.print(f"Обнаружен язык программирования: [bold]{detected_lang}[/bold]")
                 language = detected_lang
@@ -91,20 +530,31 @@ def gen(
             output_dir = os.path.join(path, "tests")
             console.print(f"Тесты будут сохранены в: [bold]{output_dir}[/bold]")
         
+        if plan:
+            show_generation_plans([plan_generation(path, language, test_framework, output_dir,
+                                                   use_cache=not no_cache, force=force,
+                                                   layout=output_layout)], jobs)
+            return
+        
         # Генерируем тесты
-        generated_tests = lang_detector.generate_tests_for_language(
+        report = lang_detector.generate_tests_incremental(
             directory=path,
             language=language,
             framework=test_framework,
-            output_dir=output_dir
+            output_dir=output_dir,
+            use_cache=not no_cache,
+            jobs=jobs,
+            force=force,
+            layout=output_layout
         )
         
-        if generated_tests:
-            console.print(f"[green]Сгенерировано тестов: {len(generated_tests)}[/green]")
-            for test_path in generated_tests:
-                console.print(f"  - {test_path}")
+        if report.generated or report.up_to_date or report.removed:
+            show_generation_report(report)
         else:
             console.print("[yellow]Не удалось сгенерировать тесты[/yellow]")
+        
+        if watch:
+            watch_and_generate(path, language, test_framework, output_dir, no_cache, output_layout)
     
     except Exception as e:
         console.print(f"[red]Ошибка при генерации тестов: {str(e)}[/red]")
@@ -117,6 +567,13 @@ def run(
     use_custom_runner: bool = typer.Option(False, "--custom", "-c", help="Использовать собственный тестраннер"),
     include: str = typer.Option(None, "--include", "-i", help="Шаблоны для включения тестов (через запятую)"),
     exclude: str = typer.Option(None, "--exclude", "-e", help="Шаблоны для исключения тестов (через запятую)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Не использовать индекс файлов из .testgen/cache"),
+    detect_budget: str = typer.Option(None, "--detect-budget", help="Бюджет выборочного определения языка: файлы, секунды или оба (5000, 2s, 5000,2s)"),
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Не печатать вывод тестов: только прогресс и упавшие тесты"),
+    jobs: int = typer.Option(None, "--jobs", "-j", min=1, help="Количество одновременно запускаемых проектов в полиглотном репозитории (по умолчанию - по числу процессоров)"),
+    shard: str = typer.Option(None, "--shard", help="Запустить только часть тестов i из N (например, 2/4); части выравниваются по истории длительности"),
+    workers: int = typer.Option(None, "--workers", min=1, help="Разделить тесты на N частей по истории длительности и запустить их одновременно"),
+    durations: int = typer.Option(0, "--durations", min=0, help="Показать N самых долгих тестов запуска со средним и процентилями по истории"),
 ):
     """Запуск тестов"""
     show_header()
@@ -126,17 +583,34 @@ def run(
     include_patterns = include.split(",") if include else None
     exclude_patterns = exclude.split(",") if exclude else None
     
+    if shard:
+        try:
+            parse_shard(shard)
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--shard")
+    
     # Выбор тестраннера
     if use_custom_runner:
         console.print("[cyan]Используется собственный тестраннер[/cyan]")
         verbosity = 2 if verbose else 1
-        result = custom_runner.run_tests(path, verbosity, include_patterns, exclude_patterns)
+        history = DurationHistory(find_project_root(path, "python"))
+        history.load()
+        result = custom_runner.run_tests(path, verbosity, include_patterns, exclude_patterns, history)
         
         # Вывод результатов уже осуществляется внутри custom_runner
+        show_slowest(slowest_rows(history, custom_runner.CUSTOM_FRAMEWORK, result.durations), durations)
     else:
+        # В полиглотном репозитории каждый проект запускается своим фреймворком
+        # Шарды делятся в пределах одного проекта
+        if not detect_budget and not shard and not workers:
+            projects = lang_detector.detect_project_map(path, use_cache=not no_cache)
+            if len(projects) > 1:
+                run_for_projects(projects, verbose, quiet, jobs, durations)
+                return
+
         console.print("[cyan]Используется стандартный тестраннер (pytest)[/cyan]")
         # Определяем язык программирования
-        language = lang_detector.detect_project_language(path)
+        language = detect_language(path, no_cache, detect_budget)
         
         if not language:
             console.print("[red]Не удалось определить язык программирования[/red]")
@@ -152,18 +626,24 @@ def run(
             
         console.print(f"Используется фреймворк: [bold]{framework}[/bold]")
         
-        # Запуск тестов
-        result = runner.run_tests(language, framework, path, verbose)
+        if shard or workers:
+            run_sharded(language, framework, path, verbose, quiet, shard, workers, durations)
+            return
+        
+        # Запуск тестов из корня проекта: история длительности хранится там же
+        root, test_path = project_location(path, language)
+        result = runner.run_tests(language, framework, test_path, verbose, cwd=root, echo=not quiet)
+        history = record_durations(root, framework, [result])
         
         # Вывод результатов
         status_color = "green" if result.success else "red"
         status_text = "УСПЕШНО" if result.success else "ОШИБКА"
         
         console.print(f"\nСтатус: [{status_color}]{status_text}[/{status_color}]")
-        console.print(f"Вывод:\n{result.output}")
-        
-        if result.errors:
-            console.print(f"Ошибки:\n{result.errors}")
+        show_test_summary(result.summary)
+        if result.summary is not None:
+            show_slowest(slowest_rows(history, framework, result.summary.durations), durations)
+        show_output_logs(result)
 
 
 @app.command()
@@ -179,9 +659,15 @@ def config():
 def report(
     format: str = typer.Option("html", help="Формат отчета (html, markdown, text)"),
     output: str = typer.Option("report", help="Путь для сохранения отчета"),
+    untested: str = typer.Option(None, "--untested", help="Показать публичные функции без тестов в директории (например, pkg/x или .; Python, Go, JavaScript)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Не использовать индекс файлов из .testgen/cache"),
 ):
     """Генерация отчета о тестировании"""
     show_header()
+    if untested:
+        show_untested_functions(".", untested, no_cache)
+        return
+    
     console.print(f"[bold green]Генерация отчета в формате[/bold green]: {format}")
     
     # TODO: Добавить логику генерации отчетов
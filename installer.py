@@ -48,13 +48,17 @@ def create_executable():
     spec_content = """
 # -*- mode: python ; coding: utf-8 -*-
 
+from PyInstaller.utils.hooks import collect_submodules
+
 block_cipher = None
 
 a = Analysis(['testgen.py'],
              pathex=[],
              binaries=[],
-             datas=[],
-             hiddenimports=['cmd', 'cmd.testgen', 'cmd.testgen.main', 'langs', 'testengines', 'ui', 'rich.live', 'rich.syntax'],
+             datas=[('langs/templates', 'langs/templates')],
+             # Генераторы и встроенные плагины импортируются по имени (langs.plugins), анализ их не находит
+             hiddenimports=['cmd', 'cmd.testgen', 'cmd.testgen.main', 'testengines', 'ui', 'rich.live', 'rich.syntax']
+                           + collect_submodules('langs') + collect_submodules('testengines'),
              hookspath=[],
              hooksconfig={},
              runtime_hooks=[],
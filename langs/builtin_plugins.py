@@ -0,0 +1,134 @@
+"""
+Встроенные языковые плагины TestGen.
+
+Модуль содержит только описания: генераторы тестов импортируются реестром
+(langs.plugins) при первом использовании языка.
+"""
+
+import re
+from typing import List, Sequence
+
+from langs.plugins import UNIT_PACKAGES, UNIT_TESTS, LanguagePlugin
+
+
+def _go_packages(test_path: str) -> List[str]:
+    return ["go", "test", "./..." if test_path == "." else f"./{test_path}/..."]
+
+
+def _pytest_ignore(paths: Sequence[str]) -> List[str]:
+    return [f"--ignore={path}" for path in paths]
+
+
+def _jest_ignore(paths: Sequence[str]) -> List[str]:
+    # Шаблоны из командной строки заменяют шаблоны по умолчанию, поэтому node_modules указывается явно
+    return ["--testPathIgnorePatterns=/node_modules/"] + [
+        f"--testPathIgnorePatterns=<rootDir>/{re.escape(path)}/" for path in paths]
+
+
+def _mocha_ignore(paths: Sequence[str]) -> List[str]:
+    return [f"--ignore={path}/**" for path in paths]
+
+
+PLUGINS = [
+    LanguagePlugin(
+        "python",
+        patterns=["*.py", "requirements.txt", "setup.py", "pyproject.toml"],
+        source_patterns=["*.py"],
+        test_patterns=["test_*.py", "*_test.py"],
+        frameworks=["pytest", "unittest"],
+        generator="langs.python_generator",
+        commands={
+            "pytest": ["pytest", "{test_path}", "--color=yes"],
+            "unittest": ["python", "-m", "unittest", "discover", "{test_path}"],
+        },
+        verbose_flags={"pytest": ["-v"], "unittest": ["-v"]},
+        subset_commands={"pytest": ["pytest", "{tests}", "--color=yes"]},
+        shard_units={"pytest": UNIT_TESTS},
+        collect_commands={"pytest": ["pytest", "--collect-only", "-q", "{tests}"]},
+        exclude_args={"pytest": _pytest_ignore},
+    ),
+    LanguagePlugin(
+        "javascript",
+        patterns=["*.js", "package.json", "*.jsx", "*.ts", "*.tsx"],
+        source_patterns=["*.js", "*.jsx", "*.ts", "*.tsx"],
+        test_patterns=["*.test.js", "*.spec.js", "*-test.js", "*.test.ts", "*.spec.ts", "*.test.tsx", "*.spec.tsx"],
+        frameworks=["jest", "mocha"],
+        generator="langs.javascript_generator",
+        commands={
+            "jest": ["npx", "jest", "{test_path}"],
+            "mocha": ["npx", "mocha", "{test_path}"],
+        },
+        verbose_flags={"jest": ["--verbose"], "mocha": ["--reporter=spec"]},
+        # Без --runTestsByPath jest считает аргументы регулярными выражениями путей
+        subset_commands={
+            "jest": ["npx", "jest", "--runTestsByPath", "{tests}"],
+            "mocha": ["npx", "mocha", "{tests}"],
+        },
+        exclude_args={"jest": _jest_ignore, "mocha": _mocha_ignore},
+    ),
+    LanguagePlugin(
+        "go",
+        patterns=["*.go", "go.mod", "go.sum"],
+        source_patterns=["*.go"],
+        test_patterns=["*_test.go"],
+        frameworks=["testing"],
+        generator="langs.go_generator",
+        # go test ./... сам пропускает вложенные модули (директории с go.mod): exclude_args не нужны
+        commands={"testing": _go_packages},
+        verbose_flags={"testing": ["-v"]},
+        subset_commands={"testing": ["go", "test", "{tests}"]},
+        shard_units={"testing": UNIT_PACKAGES},
+    ),
+    LanguagePlugin(
+        "java",
+        patterns=["*.java", "pom.xml", "build.gradle"],
+        source_patterns=["*.java"],
+        test_patterns=["*Test.java"],
+        frameworks=["junit", "testng"],
+        commands={
+            "junit": ["./gradlew", "test"],
+            "testng": ["./gradlew", "test"],
+        },
+    ),
+    LanguagePlugin(
+        "ruby",
+        patterns=["*.rb", "Gemfile"],
+        source_patterns=["*.rb"],
+        test_patterns=["*_spec.rb", "*_test.rb"],
+        frameworks=["rspec", "minitest"],
+        commands={
+            "rspec": ["bundle", "exec", "rspec", "{test_path}"],
+            "minitest": ["ruby", "-Ilib:test", "{test_path}"],
+        },
+        verbose_flags={"rspec": ["--format=documentation"]},
+        subset_commands={"rspec": ["bundle", "exec", "rspec", "{tests}"]},
+    ),
+    LanguagePlugin(
+        "rust",
+        patterns=["*.rs", "Cargo.toml"],
+        source_patterns=["*.rs"],
+        test_patterns=["*_test.rs"],
+        frameworks=["cargo-test"],
+        commands={"cargo-test": ["cargo", "test"]},
+    ),
+    LanguagePlugin(
+        "php",
+        patterns=["*.php", "composer.json"],
+        source_patterns=["*.php"],
+        test_patterns=["*Test.php"],
+        frameworks=["phpunit"],
+        commands={"phpunit": ["./vendor/bin/phpunit", "{test_path}"]},
+    ),
+    LanguagePlugin(
+        "csharp",
+        patterns=["*.cs", "*.csproj", "*.sln"],
+        source_patterns=["*.cs"],
+        test_patterns=["*Test.cs", "*Tests.cs"],
+        frameworks=["nunit", "xunit", "mstest"],
+        commands={
+            "nunit": ["dotnet", "test", "--filter", "TestCategory=NUnit"],
+            "xunit": ["dotnet", "test", "--filter", "TestCategory=XUnit"],
+            "mstest": ["dotnet", "test", "--filter", "TestCategory=MSTest"],
+        },
+    ),
+]
@@ -0,0 +1,43 @@
+"""
+Расположение локальных кэшей TestGen внутри проекта.
+"""
+
+import os
+
+# Служебная директория TestGen в корне проекта
+TESTGEN_DIR_NAME = ".testgen"
+CACHE_DIR_NAME = "cache"
+
+
+def get_testgen_dir(project_path: str = ".", create: bool = False) -> str:
+    """
+    Возвращает путь к служебной директории .testgen проекта.
+
+    Args:
+        project_path (str): Путь к корневой директории проекта
+        create (bool): Создать директорию, если она не существует
+
+    Returns:
+        str: Путь к директории .testgen
+    """
+    path = os.path.join(project_path, TESTGEN_DIR_NAME)
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_cache_dir(project_path: str = ".", create: bool = False) -> str:
+    """
+    Возвращает путь к директории кэшей проекта (.testgen/cache).
+
+    Args:
+        project_path (str): Путь к корневой директории проекта
+        create (bool): Создать директорию, если она не существует
+
+    Returns:
+        str: Путь к директории кэшей
+    """
+    path = os.path.join(get_testgen_dir(project_path), CACHE_DIR_NAME)
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,212 @@
+"""
+Постоянный индекс файлов проекта с инкрементальным пересканированием.
+
+Индекс хранится в .testgen/cache и для каждой директории запоминает её
+mtime, отфильтрованный список поддиректорий и файлы, разложенные по языкам.
+При повторном запуске перечитываются только директории, mtime которых
+изменился (добавление, удаление или переименование записей меняет mtime
+родительской директории), а для остальных используется сохранённый список.
+"""
+
+import os
+import marshal
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from langs.cache import get_cache_dir
+from langs.file_scanner import LanguageClassifier, extend_chain, scan_directory
+from langs.ignore_rules import IgnoreChain, ignore_signature
+
+INDEX_FILENAME = "file-index.bin"
+INDEX_VERSION = 2
+
+# Директории, изменённые незадолго до сканирования, не считаются актуальными:
+# на файловых системах с грубым разрешением mtime их изменение может быть
+# не замечено при следующем запуске
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class FileIndex:
+    """Индекс файлов проекта, разложенных по директориям и языкам"""
+
+    def __init__(self, root: str, classifier: LanguageClassifier):
+        """
+        Args:
+            root (str): Корневая директория проекта
+            classifier (LanguageClassifier): Классификатор файлов по языкам
+        """
+        self.root = root
+        self.classifier = classifier
+        self.path = os.path.join(get_cache_dir(root), INDEX_FILENAME)
+        # Относительный путь директории -> [mtime_ns, подпись правил, {язык: имена}, поддиректории,
+        # {язык: совпадения шаблонов}]; списки имён хранятся одной строкой через "\0", что в разы
+        # ускоряет загрузку индекса. Имя записывается в язык один раз, а совпадения считаются
+        # по каждому шаблону, как при подсчёте файлов glob (setup.py - дважды для python)
+        self.dirs: Dict[str, list] = {}
+        self.rescanned = 0
+        self._dirty = False
+
+    def _header(self) -> dict:
+        return {
+            "version": INDEX_VERSION,
+            "root": os.path.abspath(self.root),
+            "patterns": self.classifier.signature,
+        }
+
+    def load(self) -> bool:
+        """
+        Загружает индекс с диска.
+
+        Returns:
+            bool: True, если индекс загружен и подходит для текущего проекта
+        """
+        try:
+            with open(self.path, "rb") as f:
+                header, dirs = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return False
+        if header != self._header() or not isinstance(dirs, dict):
+            return False
+        self.dirs = dirs
+        return True
+
+    def save(self) -> None:
+        """Атомарно сохраняет индекс на диск, если он изменился"""
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                marshal.dump((self._header(), self.dirs), f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError:
+            # Кэш необязателен: например, проект может лежать на диске только для чтения
+            pass
+
+    def refresh(self) -> None:
+        """Приводит индекс в соответствие с файловой системой, перечитывая только изменённые директории"""
+        old_dirs = self.dirs
+        new_dirs: Dict[str, list] = {}
+        classify = self.classifier.classify
+        racy_threshold = time.time_ns() - RACY_WINDOW_NS
+        self.rescanned = 0
+
+        empty_chain: IgnoreChain = ()
+        # (относительный путь, цепочка правил, принудительное перечитывание)
+        stack: List[Tuple[str, IgnoreChain, bool]] = [("", empty_chain, False)]
+        while stack:
+            rel_dir, chain, force = stack.pop()
+            directory = os.path.join(self.root, *rel_dir.split("/")) if rel_dir else self.root
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+
+            entry = old_dirs.get(rel_dir)
+            signature = None
+            # Если файлов исключений не было, их появление изменит mtime директории
+            if entry is not None and entry[1] is not None:
+                signature = ignore_signature(directory)
+                if tuple(signature) != tuple(entry[1]):
+                    # Изменились правила исключения: перечитываем всё поддерево
+                    force = True
+
+            if entry is not None and not force and entry[0] == mtime:
+                if signature is not None:
+                    chain = extend_chain(directory, rel_dir, chain)
+                subdirs = entry[3].split("\0") if entry[3] else []
+                new_dirs[rel_dir] = entry
+            else:
+                listing = scan_directory(directory, rel_dir, chain)
+                if listing is None:
+                    continue
+                names, subdirs, new_chain = listing
+                signature = ignore_signature(directory) if len(new_chain) > len(chain) else None
+                chain = new_chain
+                if entry is not None and signature != (tuple(entry[1]) if entry[1] is not None else None):
+                    # Файлы исключений появились, изменились или удалены: поддерево перечитывается
+                    force = True
+
+                by_language: Dict[str, List[str]] = {}
+                matches: Dict[str, int] = {}
+                for name in names:
+                    langs = classify(name)
+                    for lang in langs:
+                        matches[lang] = matches.get(lang, 0) + 1
+                    for lang in dict.fromkeys(langs):
+                        by_language.setdefault(lang, []).append(name)
+                stored_mtime = mtime if mtime < racy_threshold else -1
+                new_dirs[rel_dir] = [
+                    stored_mtime,
+                    signature,
+                    {lang: "\0".join(lang_names) for lang, lang_names in by_language.items()},
+                    "\0".join(subdirs),
+                    matches,
+                ]
+                self.rescanned += 1
+
+            prefix = rel_dir + "/" if rel_dir else ""
+            stack.extend((prefix + name, chain, force) for name in reversed(subdirs))
+
+        if self.rescanned or len(new_dirs) != len(old_dirs):
+            self._dirty = True
+        self.dirs = new_dirs
+
+    def iter_files(self, language: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Возвращает файлы из индекса.
+
+        Args:
+            language (Optional[str]): Язык (если None, возвращаются файлы всех языков)
+
+        Yields:
+            Tuple[str, str]: Пара (путь к директории, имя файла)
+        """
+        for rel_dir, entry in self.dirs.items():
+            by_language = entry[2]
+            if language is None:
+                names = [name for lang_names in by_language.values() for name in lang_names.split("\0")]
+            else:
+                lang_names = by_language.get(language)
+                if not lang_names:
+                    continue
+                names = lang_names.split("\0")
+            directory = os.path.join(self.root, *rel_dir.split("/")) if rel_dir else self.root
+            for name in names:
+                yield directory, name
+
+    def language_counts(self) -> Dict[str, int]:
+        """
+        Подсчитывает количество файлов каждого языка по индексу.
+
+        Файл, подходящий под несколько шаблонов языка, учитывается по разу
+        на шаблон, как при подсчёте с glob.
+
+        Returns:
+            Dict[str, int]: Количество файлов для каждого языка
+        """
+        counts = {lang: 0 for lang in self.classifier.languages}
+        for entry in self.dirs.values():
+            for lang, count in entry[4].items():
+                counts[lang] = counts.get(lang, 0) + count
+        return counts
+
+
+def load_file_index(root: str, classifier: LanguageClassifier) -> FileIndex:
+    """
+    Загружает индекс проекта, инкрементально обновляет его и сохраняет изменения.
+
+    Args:
+        root (str): Корневая директория проекта
+        classifier (LanguageClassifier): Классификатор файлов по языкам
+
+    Returns:
+        FileIndex: Актуальный индекс файлов проекта
+    """
+    index = FileIndex(root, classifier)
+    index.load()
+    index.refresh()
+    index.save()
+    return index
@@ -0,0 +1,274 @@
+"""
+Однопроходный сканер файловой системы для определения языков проекта.
+
+Вместо отдельного рекурсивного glob на каждый шаблон дерево обходится
+один раз через os.scandir, а каждый файл относится к языкам по заранее
+построенным таблицам расширений и имён файлов.
+"""
+
+import os
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from langs.ignore_rules import DEFAULT_IGNORED_DIRS, IGNORE_FILENAMES, IgnoreChain, IgnoreRules, is_ignored
+
+# Количество потоков обхода по умолчанию (переменная TESTGEN_WALK_WORKERS или
+# параметр `testgen --walk-workers N`). На локальных дисках последовательный
+# обход быстрее; на сетевых файловых системах (NFS) задержка каждого листинга
+# директории доминирует, и параллельное чтение заметно ускоряет обход
+DEFAULT_WALK_WORKERS = max(1, int(os.environ.get("TESTGEN_WALK_WORKERS", "1") or 1))
+# Сколько листингов директорий на поток параллельного обхода читается заранее
+WALK_PREFETCH_PER_WORKER = 4
+
+
+class LanguageClassifier:
+    """Классификатор файлов по языкам на основе таблиц поиска"""
+
+    def __init__(self, language_patterns: Dict[str, List[str]]):
+        """
+        Строит таблицы поиска по шаблонам языков.
+
+        Args:
+            language_patterns (Dict[str, List[str]]): Шаблоны файлов для каждого языка
+        """
+        self.languages = list(language_patterns)
+        # Подпись шаблонов: позволяет отличить кэши, построенные по другим таблицам
+        self.signature = repr(sorted((lang, list(patterns)) for lang, patterns in language_patterns.items()))
+        # Расширение (".py") -> языки
+        self.extensions: Dict[str, List[str]] = {}
+        # Точное имя файла ("go.mod") -> языки
+        self.filenames: Dict[str, List[str]] = {}
+        # Шаблоны, которые не сводятся к расширению или имени файла
+        self.wildcards: List[Tuple[str, str]] = []
+
+        for lang, patterns in language_patterns.items():
+            for pattern in patterns:
+                pattern = os.path.normcase(pattern)
+                suffix = pattern[1:]
+                if pattern.startswith("*.") and not any(c in suffix for c in "*?[") and suffix.count(".") == 1:
+                    self.extensions.setdefault(suffix, []).append(lang)
+                elif not any(c in pattern for c in "*?["):
+                    self.filenames.setdefault(pattern, []).append(lang)
+                else:
+                    self.wildcards.append((pattern, lang))
+
+    def classify(self, name: str) -> List[str]:
+        """
+        Возвращает языки, к которым относится файл с указанным именем.
+
+        Args:
+            name (str): Имя файла (без директории)
+
+        Returns:
+            List[str]: Список языков (пустой, если файл не относится ни к одному)
+        """
+        name = os.path.normcase(name)
+        by_ext = self.extensions.get(os.path.splitext(name)[1], [])
+        by_name = self.filenames.get(name)
+        if by_name is None and not self.wildcards:
+            # Быстрый путь: файл определяется только расширением
+            return by_ext
+        langs = (by_name or []) + by_ext
+        if self.wildcards:
+            langs = langs + [lang for pattern, lang in self.wildcards if fnmatch.fnmatchcase(name, pattern)]
+        return langs
+
+
+def extend_chain(directory: str, rel_dir: str, chain: IgnoreChain) -> IgnoreChain:
+    """
+    Добавляет в цепочку правила из файлов исключений директории.
+
+    Args:
+        directory (str): Путь к директории
+        rel_dir (str): Путь директории относительно корня (через '/')
+        chain (IgnoreChain): Цепочка правил родительских директорий
+
+    Returns:
+        IgnoreChain: Цепочка правил для содержимого директории
+    """
+    rules = IgnoreRules.from_directory(directory)
+    if rules is None:
+        return chain
+    return chain + ((rel_dir, rules),)
+
+
+def scan_directory(directory: str, rel_dir: str, chain: IgnoreChain,
+                   use_ignore: bool = True) -> Optional[Tuple[List[str], List[str], IgnoreChain]]:
+    """
+    Читает одну директорию и применяет к её содержимому правила исключения.
+
+    Args:
+        directory (str): Путь к директории
+        rel_dir (str): Путь директории относительно корня (через '/')
+        chain (IgnoreChain): Цепочка правил родительских директорий
+        use_ignore (bool): Учитывать правила исключения
+
+    Returns:
+        Optional[Tuple[List[str], List[str], IgnoreChain]]: Имена файлов, имена
+            поддиректорий и цепочка правил для спуска, либо None, если директорию
+            не удалось прочитать
+    """
+    files, subdirs = [], []
+    has_ignore_file = False
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith("."):
+                    if name in IGNORE_FILENAMES:
+                        has_ignore_file = True
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not (use_ignore and name in DEFAULT_IGNORED_DIRS):
+                            subdirs.append(name)
+                    elif entry.is_file():
+                        files.append(name)
+                except OSError:
+                    continue
+    except OSError:
+        return None
+
+    # Порядок листинга зависит от файловой системы; сортировка делает обход воспроизводимым
+    files.sort()
+    subdirs.sort()
+
+    if use_ignore and has_ignore_file:
+        chain = extend_chain(directory, rel_dir, chain)
+
+    if chain:
+        prefix = rel_dir + "/" if rel_dir else ""
+        files = [name for name in files if not is_ignored(chain, prefix + name, False)]
+        subdirs = [name for name in subdirs if not is_ignored(chain, prefix + name, True)]
+    return files, subdirs, chain
+
+
+def set_walk_workers(workers: int) -> None:
+    """
+    Задаёт количество потоков обхода по умолчанию для всех обходов дерева.
+
+    Args:
+        workers (int): Количество потоков (1 - последовательный обход)
+    """
+    global DEFAULT_WALK_WORKERS
+    DEFAULT_WALK_WORKERS = max(1, workers)
+
+
+def iter_files(root: str, use_ignore: bool = True, workers: Optional[int] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Обходит дерево директорий один раз и возвращает найденные файлы.
+
+    Скрытые файлы и директории (начинающиеся с точки) пропускаются, как и
+    при рекурсивном glob. Символические ссылки на директории не
+    раскрываются, чтобы избежать циклов. Директории из встроенного списка
+    исключений и пути, исключённые правилами .gitignore/.testgenignore,
+    отсекаются до спуска в них; правила каждого уровня компилируются один раз.
+
+    Args:
+        root (str): Корневая директория обхода
+        use_ignore (bool): Учитывать правила исключения
+        workers (Optional[int]): Количество потоков для чтения директорий
+            (по умолчанию DEFAULT_WALK_WORKERS; 1 - последовательный обход)
+
+    Yields:
+        Tuple[str, str]: Пара (путь к директории, имя файла)
+    """
+    if workers is None:
+        workers = DEFAULT_WALK_WORKERS
+    if workers > 1:
+        yield from _iter_files_parallel(root, use_ignore, workers)
+        return
+
+    empty_chain: IgnoreChain = ()
+    # (путь к директории, путь относительно корня через '/', цепочка правил)
+    stack = [(root, "", empty_chain)]
+    while stack:
+        directory, rel_dir, chain = stack.pop()
+        listing = scan_directory(directory, rel_dir, chain, use_ignore)
+        if listing is None:
+            continue
+        files, subdirs, chain = listing
+
+        for name in files:
+            yield directory, name
+
+        prefix = rel_dir + "/" if rel_dir else ""
+        # Обратный порядок сохраняет обход директорий в порядке листинга
+        stack.extend(
+            (os.path.join(directory, name), prefix + name, chain) for name in reversed(subdirs)
+        )
+
+
+def _iter_files_parallel(root: str, use_ignore: bool, workers: int) -> Iterator[Tuple[str, str]]:
+    """
+    Параллельный вариант iter_files для файловых систем с высокой задержкой (NFS).
+
+    Директории читаются на ограниченном пуле потоков. Потребитель обходит
+    стек директорий в том же порядке обхода в глубину, что и
+    последовательный вариант, и заранее ставит в очередь чтение ближайших к
+    вершине стека директорий - не больше WALK_PREFETCH_PER_WORKER на поток,
+    поэтому память не растёт с размером дерева, а порядок вывода не зависит
+    от количества потоков.
+    """
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="testgen-walk")
+    limit = workers * WALK_PREFETCH_PER_WORKER
+
+    empty_chain: IgnoreChain = ()
+    # [путь к директории, путь относительно корня через '/', цепочка правил, задача чтения или None]
+    stack = [[root, "", empty_chain, None]]
+    in_flight = 0
+    try:
+        while stack:
+            # Чтение ставится в очередь от вершины стека: эти директории понадобятся первыми
+            for entry in reversed(stack):
+                if in_flight >= limit:
+                    break
+                if entry[3] is None:
+                    entry[3] = pool.submit(scan_directory, entry[0], entry[1], entry[2], use_ignore)
+                    in_flight += 1
+            directory, rel_dir, chain, future = stack.pop()
+            if future is None:
+                # Все места заняты директориями глубже в стеке: эта читается сразу
+                listing = scan_directory(directory, rel_dir, chain, use_ignore)
+            else:
+                in_flight -= 1
+                listing = future.result()
+            if listing is None:
+                continue
+            files, subdirs, chain = listing
+
+            for name in files:
+                yield directory, name
+
+            prefix = rel_dir + "/" if rel_dir else ""
+            stack.extend(
+                [os.path.join(directory, name), prefix + name, chain, None] for name in reversed(subdirs)
+            )
+    finally:
+        # При досрочном завершении генератора незапущенные задачи отменяются
+        # (cancel_futures у shutdown появился только в Python 3.9)
+        for entry in stack:
+            if entry[3] is not None:
+                entry[3].cancel()
+        pool.shutdown(wait=False)
+
+
+def count_language_files(root: str, classifier: LanguageClassifier, use_ignore: bool = True) -> Dict[str, int]:
+    """
+    Подсчитывает количество файлов каждого языка за один обход дерева.
+
+    Args:
+        root (str): Корневая директория проекта
+        classifier (LanguageClassifier): Классификатор файлов по языкам
+        use_ignore (bool): Учитывать правила исключения
+
+    Returns:
+        Dict[str, int]: Количество найденных файлов для каждого языка
+    """
+    scores = {lang: 0 for lang in classifier.languages}
+    classify = classifier.classify
+    for _, name in iter_files(root, use_ignore):
+        for lang in classify(name):
+            scores[lang] += 1
+    return scores
@@ -0,0 +1,317 @@
+"""
+Манифест генерации тестов (.testgen/gen-manifest).
+
+Для каждого исходного файла манифест хранит хэш содержимого, версию
+генератора и хэш шаблона, с которыми был получен тест, и путь к этому
+тесту вместе с хэшем записанного содержимого. При следующем запуске файлы с теми же входными данными пропускаются,
+а тесты удалённых исходных файлов возвращаются как «осиротевшие». Осиротевшим
+становится и прежний тест файла, тест которого записан по другому пути в той же
+директории (например, после смены раскладки тестов) или больше не создаётся, если
+на него больше никто не ссылается.
+
+Чтобы не читать каждый файл, в манифесте также хранятся mtime и размер:
+если они не изменились, содержимое считается прежним без вычисления хэша.
+
+Кроме того, для каждого языка запоминается скорость генерации (байты
+исходных файлов в секунду на процесс), по которой `gen --plan` оценивает
+время генерации.
+"""
+
+import json
+import os
+import posixpath
+import time
+from typing import Dict, List, Optional, Tuple
+
+from langs.cache import get_testgen_dir
+from langs.parse_cache import content_digest
+
+MANIFEST_FILENAME = "gen-manifest"
+MANIFEST_VERSION = 2
+
+# Файлы, изменённые незадолго до записи манифеста, всегда проверяются по хэшу:
+# на файловых системах с грубым разрешением mtime изменение может быть не замечено
+RACY_WINDOW_NS = 2_000_000_000
+# Запуски, обработавшие меньше байтов, не учитываются в скорости генерации: в них преобладают накладные расходы
+MIN_THROUGHPUT_BYTES = 256 * 1024
+
+# Поля записи: [хэш содержимого, версия генератора, хэш шаблона, путь к тесту, mtime_ns, размер,
+#               хэш содержимого теста]
+_DIGEST, _GENERATOR, _TEMPLATE, _TEST, _MTIME, _SIZE, _TEST_DIGEST = range(7)
+
+
+class GenManifest:
+    """Манифест генерации: исходный файл -> входные данные генерации и тест"""
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root (str): Корневая директория проекта
+        """
+        self.root = root
+        self.path = os.path.join(get_testgen_dir(root), MANIFEST_FILENAME)
+        # Путь исходного файла относительно корня (через '/') -> запись
+        self.entries: Dict[str, list] = {}
+        # Язык -> [байты, секунды работы процессов] с затуханием по запускам
+        self.throughput: Dict[str, List[float]] = {}
+        # Прежние тесты файлов, тест которых теперь записан по другому пути или не создан: (путь к тесту, хэш теста)
+        self._replaced: List[Tuple[str, Optional[str]]] = []
+        self._dirty = False
+
+    def _rel(self, path: str) -> str:
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def _abs(self, rel_path: str) -> str:
+        return os.path.normpath(os.path.join(self.root, *rel_path.split("/")))
+
+    def load(self) -> bool:
+        """
+        Загружает манифест с диска.
+
+        Returns:
+            bool: True, если манифест загружен
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return False
+        self.entries = data.get("entries", {})
+        self.throughput = data.get("throughput", {})
+        return True
+
+    def save(self) -> None:
+        """Атомарно сохраняет манифест, если он изменился"""
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                # Одна запись на строку и сортировка ключей: манифест удобно сравнивать
+                f.write('{"version": %d, "throughput": %s, "entries": {\n'
+                        % (MANIFEST_VERSION, json.dumps(self.throughput, sort_keys=True)))
+                f.write(",\n".join(
+                    f"{json.dumps(rel_path, ensure_ascii=False)}: {json.dumps(entry, ensure_ascii=False)}"
+                    for rel_path, entry in sorted(self.entries.items())
+                ))
+                f.write("\n}}\n")
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError:
+            # Манифест необязателен: без него все файлы просто генерируются заново
+            pass
+
+    def check(self, file_path: str, generator_version: str,
+              template_hash: str) -> Tuple[bool, Optional[Tuple[str, int, int]]]:
+        """
+        Проверяет, актуален ли тест исходного файла.
+
+        Args:
+            file_path (str): Путь к исходному файлу
+            generator_version (str): Версия генератора
+            template_hash (str): Хэш шаблона и настроек вывода
+
+        Returns:
+            Tuple[bool, Optional[Tuple[str, int, int]]]: Признак актуальности и
+                состояние файла (хэш, mtime_ns, размер) для последующей записи
+                через record; состояние None, если файл не удалось прочитать
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return False, None
+        entry = self.entries.get(self._rel(file_path))
+        same_inputs = self._same_inputs(entry, generator_version, template_hash)
+        if same_inputs and entry[_MTIME] == st.st_mtime_ns and entry[_SIZE] == st.st_size:
+            # Быстрый путь: файл не менялся, содержимое не читаем
+            return True, (entry[_DIGEST], st.st_mtime_ns, st.st_size)
+
+        try:
+            with open(file_path, "rb") as f:
+                digest = content_digest(f.read()).hex()
+        except OSError:
+            return False, None
+        state = (digest, st.st_mtime_ns, st.st_size)
+        if same_inputs and entry[_DIGEST] == digest:
+            # Содержимое прежнее (например, после git checkout): обновляем mtime
+            self._store(file_path, state, generator_version, template_hash, entry[_TEST], entry[_TEST_DIGEST])
+            return True, state
+        return False, state
+
+    def _same_inputs(self, entry: Optional[list], generator_version: str, template_hash: str) -> bool:
+        return (entry is not None and entry[_GENERATOR] == generator_version
+                and entry[_TEMPLATE] == template_hash
+                and (entry[_TEST] is None or os.path.exists(self._abs(entry[_TEST]))))
+
+    def peek(self, file_path: str, st: os.stat_result, generator_version: str, template_hash: str) -> bool:
+        """
+        Проверяет актуальность теста только по mtime и размеру, не читая файл и не меняя манифест.
+
+        Args:
+            file_path (str): Путь к исходному файлу
+            st (os.stat_result): Результат os.stat для файла
+            generator_version (str): Версия генератора
+            template_hash (str): Хэш шаблона и настроек вывода
+
+        Returns:
+            bool: True, если тест заведомо актуален (файл с изменённым mtime считается изменённым)
+        """
+        entry = self.entries.get(self._rel(file_path))
+        return (self._same_inputs(entry, generator_version, template_hash)
+                and entry[_MTIME] == st.st_mtime_ns and entry[_SIZE] == st.st_size)
+
+    def record_throughput(self, language: str, size: int, seconds: float) -> None:
+        """
+        Учитывает скорость генерации очередного запуска.
+
+        Предыдущие запуски учитываются с весом 1/2, поэтому оценка следует за
+        изменениями скорости, но не скачет от одного запуска.
+
+        Args:
+            language (str): Язык программирования
+            size (int): Размер обработанных исходных файлов в байтах
+            seconds (float): Затраченное время работы процессов (время на число процессов)
+        """
+        if size < MIN_THROUGHPUT_BYTES or seconds <= 0:
+            return
+        old_size, old_seconds = self.throughput.get(language, (0, 0.0))
+        self.throughput[language] = [old_size // 2 + size, round(old_seconds / 2 + seconds, 6)]
+        self._dirty = True
+
+    def get_throughput(self, language: str) -> Optional[float]:
+        """
+        Возвращает записанную скорость генерации.
+
+        Args:
+            language (str): Язык программирования
+
+        Returns:
+            Optional[float]: Байты исходных файлов в секунду на процесс или None, если данных нет
+        """
+        size, seconds = self.throughput.get(language, (0, 0.0))
+        return size / seconds if size and seconds > 0 else None
+
+    def record(self, file_path: str, state: Tuple[str, int, int], generator_version: str,
+               template_hash: str, test_path: Optional[str], test_digest: Optional[str] = None) -> None:
+        """
+        Запоминает результат генерации для исходного файла.
+
+        Args:
+            file_path (str): Путь к исходному файлу
+            state (Tuple[str, int, int]): Состояние файла, полученное из check
+            generator_version (str): Версия генератора
+            template_hash (str): Хэш шаблона и настроек вывода
+            test_path (Optional[str]): Путь к тесту (None, если тест не создан)
+            test_digest (Optional[str]): Хэш содержимого теста (hex)
+        """
+        self._store(file_path, state, generator_version, template_hash,
+                    self._rel(test_path) if test_path else None, test_digest)
+
+    def _store(self, file_path: str, state: Tuple[str, int, int], generator_version: str,
+               template_hash: str, rel_test: Optional[str], test_digest: Optional[str]) -> None:
+        digest, mtime, size = state
+        if mtime > time.time_ns() - RACY_WINDOW_NS:
+            mtime = -1
+        entry = [digest, generator_version, template_hash, rel_test, mtime, size, test_digest]
+        rel_path = self._rel(file_path)
+        previous = self.entries.get(rel_path)
+        if previous != entry:
+            if previous is not None and self._replaced_test(previous[_TEST], rel_test):
+                self._replaced.append((previous[_TEST], previous[_TEST_DIGEST]))
+            self.entries[rel_path] = entry
+            self._dirty = True
+
+    @staticmethod
+    def _replaced_test(previous: Optional[str], rel_test: Optional[str]) -> bool:
+        # Тесты в прежней директории тестов (после смены --output) не трогаем
+        if previous is None or previous == rel_test:
+            return False
+        return rel_test is None or posixpath.dirname(previous) == posixpath.dirname(rel_test)
+
+    def test_path(self, file_path: str) -> Optional[str]:
+        """
+        Возвращает путь к тесту исходного файла по манифесту.
+
+        Args:
+            file_path (str): Путь к исходному файлу
+
+        Returns:
+            Optional[str]: Путь к тесту или None
+        """
+        entry = self.entries.get(self._rel(file_path))
+        if entry is None or entry[_TEST] is None:
+            return None
+        return self._abs(entry[_TEST])
+
+    def test_references(self) -> Dict[str, int]:
+        """
+        Подсчитывает, сколько исходных файлов ссылаются на каждый тест.
+
+        Returns:
+            Dict[str, int]: Путь к тесту -> количество записей манифеста с этим тестом
+        """
+        references: Dict[str, int] = {}
+        for entry in self.entries.values():
+            if entry[_TEST] is not None:
+                test_path = self._abs(entry[_TEST])
+                references[test_path] = references.get(test_path, 0) + 1
+        return references
+
+    def collect_orphans(self) -> List[Tuple[str, Optional[str]]]:
+        """
+        Находит тесты, исходные файлы которых удалены, и убирает их из манифеста.
+
+        Тест, на который ссылается запись другого исходного файла (одинаковый
+        путь к тесту), осиротевшим не считается. Прежние тесты файлов, записанных
+        с тех пор по другому пути, проверяются так же.
+
+        Returns:
+            List[Tuple[str, Optional[str]]]: Пути к осиротевшим тестам и хэши
+                содержимого, с которым они были записаны (hex)
+        """
+        removed = []
+        for rel_path in sorted(self.entries):
+            # Файл, не попавший в обход (например, вложенный проект), не считается удалённым
+            if os.path.exists(self._abs(rel_path)):
+                continue
+            removed.append(self.entries.pop(rel_path))
+            self._dirty = True
+        return self._orphans(removed)
+
+    def forget(self, file_paths: List[str]) -> List[Tuple[str, Optional[str]]]:
+        """
+        Убирает из манифеста записи указанных удалённых исходных файлов.
+
+        В отличие от collect_orphans, не проверяет остальные записи, поэтому
+        подходит для обработки отдельных изменений (режим --watch).
+
+        Args:
+            file_paths (List[str]): Пути к удалённым исходным файлам
+
+        Returns:
+            List[Tuple[str, Optional[str]]]: Пути к осиротевшим тестам и хэши
+                содержимого, с которым они были записаны (hex)
+        """
+        removed = []
+        for file_path in file_paths:
+            rel_path = self._rel(file_path)
+            if rel_path in self.entries and not os.path.exists(file_path):
+                removed.append(self.entries.pop(rel_path))
+                self._dirty = True
+        return self._orphans(removed)
+
+    def _orphans(self, removed: List[list]) -> List[Tuple[str, Optional[str]]]:
+        """Отбирает тесты удалённых записей и заменённые тесты, на которые больше никто не ссылается"""
+        candidates = [(entry[_TEST], entry[_TEST_DIGEST]) for entry in removed] + self._replaced
+        self._replaced = []
+        referenced = {entry[_TEST] for entry in self.entries.values()}
+        orphans = []
+        for rel_test, test_digest in candidates:
+            if rel_test is not None and rel_test not in referenced and os.path.exists(self._abs(rel_test)):
+                # Несколько удалённых исходных файлов могли давать один тест
+                referenced.add(rel_test)
+                orphans.append((self._abs(rel_test), test_digest))
+        return orphans
@@ -0,0 +1,127 @@
+"""
+План генерации тестов без генерации (`testgen gen --plan`).
+
+План строится по индексу файлов и манифесту генерации: для каждого
+исходного файла выполняется только os.stat, актуальность теста
+проверяется по mtime и размеру из манифеста (файлы не читаются и не
+хэшируются). Время генерации оценивается по скорости, записанной в
+манифесте прошлыми запусками `gen`, а без неё - по скорости по умолчанию.
+Тесты и манифест при этом не записываются.
+"""
+
+import os
+from typing import List, Optional
+
+from langs import lang_detector
+from langs.gen_manifest import GenManifest
+from langs.output_layout import OutputLayout
+
+# Скорость генерации (байты исходных файлов в секунду на процесс), если запусков ещё не было
+DEFAULT_THROUGHPUT = 1_000_000
+
+
+class GenerationPlan:
+    """План генерации тестов для одного языка"""
+
+    def __init__(self, directory: str, language: str, framework: str, output_dir: str):
+        """
+        Args:
+            directory (str): Корневая директория проекта
+            language (str): Язык программирования
+            framework (str): Тестовый фреймворк
+            output_dir (str): Директория тестов
+        """
+        self.directory = directory
+        self.language = language
+        self.framework = framework
+        self.output_dir = output_dir
+        # Найденные исходные файлы и их общий размер
+        self.files = 0
+        self.bytes = 0
+        # Файлы, тесты которых актуальны по манифесту
+        self.up_to_date = 0
+        self.up_to_date_bytes = 0
+        # Байты исходных файлов в секунду на процесс и признак того, что скорость записана прошлыми запусками
+        self.throughput: float = DEFAULT_THROUGHPUT
+        self.measured = False
+        # Генератор тестов для языка реализован
+        self.supported = True
+
+    @property
+    def pending(self) -> int:
+        """Количество файлов, для которых тесты будут сгенерированы"""
+        return self.files - self.up_to_date
+
+    @property
+    def pending_bytes(self) -> int:
+        """Размер файлов, для которых тесты будут сгенерированы"""
+        return self.bytes - self.up_to_date_bytes
+
+    def estimated_seconds(self, jobs: int = 1) -> float:
+        """
+        Оценивает время генерации.
+
+        Args:
+            jobs (int): Количество процессов генерации
+
+        Returns:
+            float: Оценка в секундах
+        """
+        if not self.supported:
+            return 0.0
+        return self.pending_bytes / (self.throughput * max(jobs, 1))
+
+
+def plan_generation(directory: str, language: str, framework: Optional[str] = None,
+                    output_dir: Optional[str] = None, use_cache: bool = True,
+                    exclude_dirs: Optional[List[str]] = None, force: bool = False,
+                    layout: Optional[OutputLayout] = None) -> GenerationPlan:
+    """
+    Составляет план генерации тестов, ничего не генерируя и не записывая.
+
+    Args:
+        directory (str): Директория для поиска исходных файлов
+        language (str): Язык программирования
+        framework (Optional[str]): Тестовый фреймворк (если None, выбирается первый доступный)
+        output_dir (Optional[str]): Директория тестов (если None, <directory>/tests)
+        use_cache (bool): Использовать постоянный индекс файлов из .testgen/cache
+        exclude_dirs (Optional[List[str]]): Поддеревья (например, вложенные проекты), которые пропускаются
+        force (bool): Учитывать все файлы как требующие генерации, не сверяясь с манифестом
+        layout (Optional[OutputLayout]): Раскладка тестов по файлам (None - файл на исходный файл)
+
+    Returns:
+        GenerationPlan: План генерации
+    """
+    if not framework:
+        frameworks = lang_detector.get_available_test_frameworks(language)
+        if not frameworks:
+            raise ValueError(f"Для языка {language} не найдены доступные тестовые фреймворки")
+        framework = frameworks[0]
+    if output_dir is None:
+        output_dir = os.path.join(directory, "tests")
+
+    plan = GenerationPlan(directory, language, framework, output_dir)
+    manifest = GenManifest(directory)
+    manifest.load()
+    throughput = manifest.get_throughput(language)
+    if throughput:
+        plan.throughput = throughput
+        plan.measured = True
+
+    signature = lang_detector.get_generator_signature(language, framework, directory)
+    plan.supported = signature is not None
+    inputs = None
+    if signature is not None and not force:
+        inputs = lang_detector.get_manifest_inputs(language, framework, directory, output_dir, layout)
+
+    for file_path in lang_detector.iter_source_files(directory, language, use_cache, exclude_dirs):
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            continue
+        plan.files += 1
+        plan.bytes += st.st_size
+        if inputs is not None and manifest.peek(file_path, st, *inputs):
+            plan.up_to_date += 1
+            plan.up_to_date_bytes += st.st_size
+    return plan
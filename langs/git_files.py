@@ -0,0 +1,177 @@
+"""
+Получение списка файлов проекта из индекса git.
+
+Внутри рабочей копии git список отслеживаемых и неотслеживаемых (но не
+исключённых) файлов берётся одной командой `git ls-files`, которая
+использует индекс и кэш неотслеживаемых файлов git вместо обхода
+файловой системы, а правила .gitignore применяет сам git.
+"""
+
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from langs.file_scanner import LanguageClassifier
+from langs.ignore_rules import DEFAULT_IGNORED_DIRS, IgnoreChain, IgnoreRules, is_ignored
+
+# Файл исключений TestGen, который git не знает и который применяется отдельно
+TESTGENIGNORE_FILENAME = ".testgenignore"
+
+
+def list_git_files(root: str) -> Optional[List[str]]:
+    """
+    Возвращает файлы рабочей копии git относительно указанной директории.
+
+    Args:
+        root (str): Директория внутри рабочей копии git
+
+    Returns:
+        Optional[List[str]]: Относительные пути (через '/') отслеживаемых и
+            неисключённых неотслеживаемых файлов, либо None, если директория не
+            находится в рабочей копии или git недоступен
+    """
+    try:
+        import git
+    except ImportError:
+        # GitPython не установлен или не нашёл исполняемый файл git
+        return None
+
+    try:
+        # -t помечает удалённые из рабочей копии файлы тегом "R", чтобы их отбросить
+        output = git.Git(root).ls_files(
+            "-z", "-t", "--cached", "--deleted", "--others", "--exclude-standard"
+        )
+    except (git.exc.GitError, OSError):
+        return None
+
+    deleted = set()
+    paths = []
+    for record in output.split("\0"):
+        if not record:
+            continue
+        tag, _, path = record.partition(" ")
+        if tag == "R":
+            deleted.add(path)
+        else:
+            paths.append(path)
+    if deleted:
+        paths = [path for path in paths if path not in deleted]
+    # Файлы с конфликтами слияния перечисляются по одному разу на стадию
+    return list(dict.fromkeys(paths))
+
+
+class GitFileList:
+    """Список файлов проекта из git, разложенный по директориям и языкам"""
+
+    def __init__(self, root: str, classifier: LanguageClassifier, paths: List[str]):
+        """
+        Args:
+            root (str): Корневая директория проекта
+            classifier (LanguageClassifier): Классификатор файлов по языкам
+            paths (List[str]): Относительные пути файлов из git
+        """
+        self.root = root
+        self.classifier = classifier
+        # Относительный путь директории -> {язык: [имена файлов]}
+        self.dirs: Dict[str, Dict[str, List[str]]] = {}
+        # Совпадения шаблонов по языкам: файл, подходящий под несколько шаблонов языка,
+        # учитывается по разу на шаблон, как при подсчёте с glob
+        self.matches: Dict[str, int] = {lang: 0 for lang in classifier.languages}
+
+        rules_by_dir = self._load_testgenignore(paths)
+        classify = classifier.classify
+        for path in paths:
+            rel_dir, _, name = path.rpartition("/")
+            langs = classify(name)
+            if not langs or self._is_excluded(path, rules_by_dir):
+                continue
+            by_language = self.dirs.setdefault(rel_dir, {})
+            for lang in langs:
+                self.matches[lang] = self.matches.get(lang, 0) + 1
+            for lang in dict.fromkeys(langs):
+                by_language.setdefault(lang, []).append(name)
+
+    def _load_testgenignore(self, paths: List[str]) -> Dict[str, IgnoreRules]:
+        """Компилирует найденные в списке файлы .testgenignore"""
+        rules_by_dir = {}
+        for path in paths:
+            rel_dir, _, name = path.rpartition("/")
+            if name == TESTGENIGNORE_FILENAME:
+                directory = os.path.join(self.root, *rel_dir.split("/")) if rel_dir else self.root
+                rules = IgnoreRules.from_directory(directory, (TESTGENIGNORE_FILENAME,))
+                if rules is not None:
+                    rules_by_dir[rel_dir] = rules
+        return rules_by_dir
+
+    @staticmethod
+    def _is_excluded(path: str, rules_by_dir: Dict[str, IgnoreRules]) -> bool:
+        """Применяет к пути встроенный список исключений, скрытые имена и правила .testgenignore"""
+        parts = path.split("/")
+        if parts[-1].startswith("."):
+            return True
+        for part in parts[:-1]:
+            if part.startswith(".") or part in DEFAULT_IGNORED_DIRS:
+                return True
+        if not rules_by_dir:
+            return False
+
+        chain: IgnoreChain = ()
+        for depth in range(len(parts)):
+            rel_dir = "/".join(parts[:depth])
+            rules = rules_by_dir.get(rel_dir)
+            if rules is not None:
+                chain = chain + ((rel_dir, rules),)
+            if chain:
+                is_dir = depth < len(parts) - 1
+                if is_ignored(chain, "/".join(parts[:depth + 1]), is_dir):
+                    return True
+        return False
+
+    def iter_files(self, language: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Возвращает файлы из списка git.
+
+        Args:
+            language (Optional[str]): Язык (если None, возвращаются файлы всех языков)
+
+        Yields:
+            Tuple[str, str]: Пара (путь к директории, имя файла)
+        """
+        for rel_dir, by_language in self.dirs.items():
+            if language is None:
+                names = [name for lang_names in by_language.values() for name in lang_names]
+            else:
+                names = by_language.get(language)
+                if not names:
+                    continue
+            directory = os.path.join(self.root, *rel_dir.split("/")) if rel_dir else self.root
+            for name in names:
+                yield directory, name
+
+    def language_counts(self) -> Dict[str, int]:
+        """
+        Подсчитывает количество файлов каждого языка.
+
+        Файл, подходящий под несколько шаблонов языка, учитывается по разу
+        на шаблон, как при подсчёте с glob.
+
+        Returns:
+            Dict[str, int]: Количество файлов для каждого языка
+        """
+        return dict(self.matches)
+
+
+def load_git_file_list(root: str, classifier: LanguageClassifier) -> Optional[GitFileList]:
+    """
+    Строит список файлов проекта по индексу git.
+
+    Args:
+        root (str): Корневая директория проекта
+        classifier (LanguageClassifier): Классификатор файлов по языкам
+
+    Returns:
+        Optional[GitFileList]: Список файлов или None, если проект не в рабочей копии git
+    """
+    paths = list_git_files(root)
+    if paths is None:
+        return None
+    return GitFileList(root, classifier, paths)
@@ -0,0 +1,51 @@
+"""
+Скомпилированные сопоставители имён файлов с glob-шаблонами.
+
+Все шаблоны включения и исключения одного языка компилируются один раз в
+одно регулярное выражение, поэтому проверка имени файла - это один вызов
+re.match вместо перебора шаблонов для каждого файла.
+"""
+
+import fnmatch
+import os
+import re
+from typing import Callable, List, Optional
+
+# На Windows имена файлов сравниваются без учёта регистра, как в fnmatch
+_CASE_INSENSITIVE_FS = os.path.normcase("A") == "a"
+
+
+def _alternation(patterns: List[str]) -> str:
+    """Объединяет glob-шаблоны в одну альтернативу регулярного выражения"""
+    return "|".join(fnmatch.translate(pattern) for pattern in patterns)
+
+
+def compile_name_matcher(include: List[str], exclude: Optional[List[str]] = None) -> Callable[[str], object]:
+    """
+    Компилирует шаблоны включения и исключения в одну функцию проверки имени.
+
+    Имя подходит, если оно совпадает хотя бы с одним шаблоном включения и не
+    совпадает ни с одним шаблоном исключения. Шаблоны исключения (файлы
+    тестов) сравниваются без учёта регистра.
+
+    Args:
+        include (List[str]): Glob-шаблоны включения (например, "*.py")
+        exclude (List[str]): Glob-шаблоны исключения (например, "test_*.py")
+
+    Returns:
+        Callable[[str], object]: Функция проверки имени файла (без директории):
+            возвращает истинное значение (объект совпадения), если имя подходит
+    """
+    if not include:
+        return lambda name: None
+
+    include_regex = _alternation(include)
+    if _CASE_INSENSITIVE_FS:
+        include_regex = f"(?i:{include_regex})"
+    regex = f"(?:{include_regex})"
+    if exclude:
+        # Отрицательная опережающая проверка отсекает исключения тем же вызовом match
+        regex = f"(?!(?i:{_alternation(exclude)})){regex}"
+
+    # Связанный метод match вызывается без дополнительной обёртки
+    return re.compile(regex).match
@@ -0,0 +1,514 @@
+"""
+Генератор тестов для Go.
+
+Экспортируемые функции, методы и типы пакета ищутся потоковым сканером в
+отображении файла в память (см. langs.mapped_source): регулярное
+выражение пропускает комментарии, строки, "сырые" строки и руны,
+отслеживает глубину фигурных скобок и разбирает только объявления
+верхнего уровня (func, type, package) по короткому фрагменту файла.
+
+Тесты создаются во внешнем тестовом пакете testgen_test в директории
+тестов: пакет исходного файла импортируется по пути модуля из ближайшего
+go.mod. Результат сканирования кэшируется по хэшу содержимого файла
+(см. langs.parse_cache).
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from langs.mapped_source import Buffer, LineCounter, open_mapped, window
+from langs.output_layout import flat_name
+from langs.parse_cache import content_digest, get_parse_cache
+from langs.template_engine import load_template
+from langs.test_writer import write_if_changed
+
+# Версия генератора: меняется при изменении формата разбора или вида тестов
+GENERATOR_VERSION = "1"
+PARSE_CACHE_NAME = "go-parse.bin"
+GO_MOD_FILENAME = "go.mod"
+
+# Символ: (вид, имя, тип-получатель метода ("*T", "T" или ""), сигнатура, первая строка,
+# последняя строка, обобщённый); вид - "function", "method" или "type"
+GoSymbol = Tuple[str, str, str, str, int, int, bool]
+# Файл: (имя пакета, экспортируемые символы)
+FileInfo = Tuple[str, Tuple[GoSymbol, ...]]
+
+# Токен после пропуска байтов, которые не могут его начинать (пропуск выполняется внутри
+# движка регулярных выражений). Объявления верхнего уровня в Go начинаются с начала строки.
+_TOKEN_RE = re.compile(
+    rb"(?:(?!^(?:func|type|package)\b)[^\n\"'`/{}]+|\n(?!(?:func|type|package)\b))*(?:"
+    rb"//[^\n]*"
+    rb"|/\*(?:[^*]|\*(?!/))*(?:\*/)?"
+    rb'|"(?:[^"\\\n]|\\.)*"?'
+    rb"|`[^`]*`?"
+    rb"|'(?:[^'\\\n]|\\.)*'?"
+    rb"|(?P<open>\{)"
+    rb"|(?P<close>\})"
+    rb"|(?:^|\n)(?P<keyword>func|type|package)\b"
+    rb"|[/\n]"
+    rb"|\Z)",
+    re.S,
+)
+
+_IDENT = rb"[^\W\d]\w*"
+_TYPE_PARAMS = rb"\[(?:[^\[\]]|\[[^\]]*\])*\]"
+_FUNC_RE = re.compile(
+    rb"func\s*(?:\(\s*(?:" + _IDENT + rb"\s+)?(\*?)\s*(" + _IDENT + rb")\s*(" + _TYPE_PARAMS + rb")?\s*\)\s*)?"
+    rb"(" + _IDENT + rb")\s*(" + _TYPE_PARAMS + rb")?\s*\(([^()]*(?:\([^()]*\)[^()]*)*)\)")
+_TYPE_RE = re.compile(
+    rb"type\s+(" + _IDENT + rb")\s*(" + _TYPE_PARAMS + rb")?\s*(?:=\s*)?(struct\s*\{|interface\s*\{)?")
+_PACKAGE_RE = re.compile(rb"package\s+(" + _IDENT + rb")")
+_MODULE_RE = re.compile(r"^\s*module\s+\"?([^\s\"]+)", re.M)
+
+# Путь модуля по директории: директория -> (директория go.mod, путь модуля) или None
+_MODULES: Dict[str, Optional[Tuple[str, str]]] = {}
+
+
+def _is_exported(name: str) -> bool:
+    return name[:1].isupper()
+
+
+def _signature(name: str, type_params: Optional[bytes], params: bytes) -> str:
+    text = " ".join(params.decode("utf-8", "replace").split())
+    if len(text) > 200:
+        text = text[:197] + "..."
+    generic = type_params.decode("utf-8", "replace") if type_params else ""
+    return f"{name}{generic}({text})"
+
+
+def scan_file(buf: Buffer) -> FileInfo:
+    """
+    Находит имя пакета и экспортируемые функции, методы и типы файла.
+
+    Args:
+        buf (Buffer): Содержимое файла (байты или отображение в память)
+
+    Returns:
+        FileInfo: Имя пакета и символы в порядке строк
+    """
+    lines = LineCounter(buf)
+    package = ""
+    symbols: List[list] = []
+    # Объявление верхнего уровня, конец тела которого ещё не найден
+    pending = None
+    depth = 0
+    next_token = _TOKEN_RE.match
+    size = len(buf)
+    position = 0
+    while position < size:
+        match = next_token(buf, position)
+        position = match.end()
+        token = match.lastgroup
+        if token is None:
+            # Комментарий, строка, руна или конец файла
+            continue
+
+        if token == "open":
+            depth += 1
+        elif token == "close":
+            depth = max(depth - 1, 0)
+            if depth == 0 and pending is not None:
+                pending[5] = lines.line_at(match.start(token))
+                pending = None
+        elif depth == 0:
+            pending = None
+            start = match.start(token)
+            head = window(buf, start)
+            keyword = match.group("keyword")
+            if keyword == b"package":
+                clause = _PACKAGE_RE.match(head)
+                if clause is not None:
+                    package = clause.group(1).decode()
+                continue
+
+            if keyword == b"func":
+                decl = _FUNC_RE.match(head)
+                if decl is None:
+                    continue
+                name = decl.group(4).decode()
+                receiver = decl.group(2).decode() if decl.group(2) else ""
+                if not _is_exported(name) or (receiver and not _is_exported(receiver)):
+                    continue
+                kind = "method" if receiver else "function"
+                generic = bool(decl.group(3) or decl.group(5))
+                signature = _signature(name, decl.group(5), decl.group(6))
+                if receiver and decl.group(1):
+                    receiver = "*" + receiver
+                has_body = True
+            else:
+                decl = _TYPE_RE.match(head)
+                # Группы объявлений type ( ... ) не разбираются
+                if decl is None or not _is_exported(decl.group(1).decode()):
+                    continue
+                kind, name, receiver = "type", decl.group(1).decode(), ""
+                generic = decl.group(2) is not None
+                signature = name
+                has_body = decl.group(3) is not None
+            line = lines.line_at(start)
+            symbol = [kind, name, receiver, signature, line, line, generic]
+            symbols.append(symbol)
+            pending = symbol if has_body else None
+            # Сканирование продолжается с конца имени, до скобок тела
+            position = start + decl.end(4 if kind != "type" else 1)
+
+    return package, tuple(tuple(symbol) for symbol in symbols)
+
+
+def analyze_source(source: Buffer, file_path: str, project_path: str = ".",
+                   use_cache: bool = True) -> FileInfo:
+    """
+    Сканирует содержимое файла, используя кэш по хэшу содержимого.
+
+    Args:
+        source (Buffer): Содержимое файла (байты или отображение в память)
+        file_path (str): Путь к исходному файлу
+        project_path (str): Корневая директория проекта (для расположения кэша)
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        FileInfo: Результат сканирования
+    """
+    if not use_cache:
+        return scan_file(source)
+
+    cache = get_parse_cache(project_path, PARSE_CACHE_NAME, GENERATOR_VERSION)
+    digest = content_digest(source)
+    found, info = cache.get(digest)
+    if not found:
+        info = scan_file(source)
+    cache.put(file_path, digest, info)
+    return info
+
+
+def analyze_file(file_path: str, project_path: str = ".", use_cache: bool = True) -> FileInfo:
+    """
+    Сканирует файл, отображённый в память, используя кэш по хэшу содержимого.
+
+    Args:
+        file_path (str): Путь к исходному файлу
+        project_path (str): Корневая директория проекта (для расположения кэша)
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        FileInfo: Результат сканирования
+    """
+    with open_mapped(file_path) as buf:
+        return analyze_source(buf, file_path, project_path, use_cache)
+
+
+def extract_symbols(source: Buffer, file_path: str, project_path: str = ".",
+                    use_cache: bool = True) -> List[Tuple[str, str, str, str, int, int]]:
+    """
+    Возвращает экспортируемые символы файла для индекса символов.
+
+    Args:
+        source (Buffer): Содержимое файла
+        file_path (str): Путь к исходному файлу
+        project_path (str): Корневая директория проекта
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        List[Tuple[str, str, str, str, int, int]]: Символы (вид, имя, полное имя,
+            сигнатура, первая строка, последняя строка); вид - "function", "method" или "type"
+    """
+    _, symbols = analyze_source(source, file_path, project_path, use_cache)
+    result = []
+    for kind, name, receiver, signature, start, end, _ in symbols:
+        qualname = f"{receiver.lstrip('*')}.{name}" if receiver else name
+        result.append((kind, name, qualname, signature, start, end))
+    return result
+
+
+def find_module(directory: str) -> Optional[Tuple[str, str]]:
+    """
+    Находит модуль Go, которому принадлежит директория.
+
+    Args:
+        directory (str): Директория исходного файла
+
+    Returns:
+        Optional[Tuple[str, str]]: Директория go.mod и путь модуля или None, если go.mod не найден
+    """
+    directory = os.path.abspath(directory)
+    if directory in _MODULES:
+        return _MODULES[directory]
+    module = None
+    try:
+        with open(os.path.join(directory, GO_MOD_FILENAME), encoding="utf-8") as f:
+            found = _MODULE_RE.search(f.read())
+        if found is not None:
+            module = (directory, found.group(1))
+    except OSError:
+        parent = os.path.dirname(directory)
+        if parent != directory:
+            module = find_module(parent)
+    _MODULES[directory] = module
+    return module
+
+
+def import_path(file_path: str) -> Optional[str]:
+    """
+    Возвращает путь импорта пакета, содержащего файл.
+
+    Args:
+        file_path (str): Путь к исходному файлу
+
+    Returns:
+        Optional[str]: Путь импорта или None, если файл не входит в модуль Go
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    module = find_module(directory)
+    if module is None:
+        return None
+    module_dir, module_path = module
+    rel_dir = os.path.relpath(directory, module_dir)
+    return module_path if rel_dir == os.curdir else module_path + "/" + rel_dir.replace(os.sep, "/")
+
+
+def file_module(file_path: str, project_path: str = ".") -> str:
+    """
+    Возвращает путь файла относительно проекта без расширения.
+
+    Args:
+        file_path (str): Путь к исходному файлу
+        project_path (str): Корневая директория проекта
+
+    Returns:
+        str: Путь через '/' (например, "pkg/util/strings")
+    """
+    rel_path = os.path.relpath(file_path, project_path)
+    if rel_path.startswith(os.pardir + os.sep) or os.path.isabs(rel_path):
+        rel_path = os.path.basename(file_path)
+    return os.path.splitext(rel_path)[0].replace(os.sep, "/")
+
+
+def output_file_name(module: str) -> str:
+    """
+    Возвращает имя файла теста для исходного файла.
+
+    Args:
+        module (str): Путь файла через '/' без расширения
+
+    Returns:
+        str: Имя файла (например, "pkg_util_strings_test.go"; для "pkg/str_util" - "pkg_str__util_test.go")
+    """
+    return flat_name(module.split("/")) + "_test.go"
+
+
+def _camel(name: str) -> str:
+    return "".join(part[:1].upper() + part[1:] for part in re.split(r"[^0-9A-Za-z]+", name) if part)
+
+
+def _load_template(framework: str, project_path: str, use_cache: bool):
+    template = load_template("go", framework, project_path, use_cache)
+    if template is None:
+        raise ValueError(f"Не найден шаблон тестов go/{framework}")
+    return template
+
+
+def _file_cases(info: FileInfo, module: str, package: str) -> List[Tuple[str, str, Optional[str]]]:
+    """Тесты файла (имя теста, описание, проверка или None); package - имя, под которым импортирован пакет"""
+    prefix = "Test" + _camel(module)
+    cases = []
+    for kind, name, receiver, _, _, _, generic in info[1]:
+        type_name = receiver.lstrip("*")
+        if generic:
+            # Обобщённый символ нельзя использовать без параметров типа
+            check = None
+        elif kind == "type":
+            check = f"var _ {package}.{name}"
+        elif kind == "method":
+            target = f"(*{package}.{type_name})" if receiver.startswith("*") else f"{package}.{type_name}"
+            check = f"_ = {target}.{name}"
+        else:
+            check = f"_ = {package}.{name}"
+        description = f"{type_name}.{name}" if kind == "method" else name
+        cases.append((prefix + type_name + name, description, check))
+    return cases
+
+
+def render_tests(info: FileInfo, module: str, package_path: str, framework: str = "testing",
+                 project_path: str = ".", use_cache: bool = True) -> str:
+    """
+    Формирует исходный код заготовок тестов для файла.
+
+    Args:
+        info (FileInfo): Результат сканирования файла
+        module (str): Путь файла через '/' без расширения
+        package_path (str): Путь импорта пакета
+        framework (str): Тестовый фреймворк ("testing")
+        project_path (str): Корневая директория проекта (шаблоны из .testgen/templates)
+        use_cache (bool): Использовать кэш скомпилированных шаблонов из .testgen/cache
+
+    Returns:
+        str: Исходный код файла тестов
+    """
+    package = info[0]
+    cases = _file_cases(info, module, package)
+    uses_package = any(check is not None for _, _, check in cases)
+    template = _load_template(framework, project_path, use_cache)
+    return template.render({
+        "module": module,
+        "subject": f"{module}.go",
+        "imports": [(package, package_path)] if uses_package else [],
+        "package": package,
+        "import_path": package_path,
+        "uses_package": uses_package,
+        "cases": cases,
+    })
+
+
+def render_bundle(files: List[Tuple[str, FileInfo, str]], label: str, framework: str = "testing",
+                  project_path: str = ".", use_cache: bool = True) -> str:
+    """
+    Формирует исходный код заготовок тестов для нескольких файлов в одном файле.
+
+    Каждый пакет импортируется один раз; пакеты с одинаковыми именами получают
+    разные псевдонимы, а имена тестов уже различаются путём файла.
+
+    Args:
+        files (List[Tuple[str, FileInfo, str]]): Пути файлов, результаты сканирования и пути импорта пакетов
+        label (str): Метка файла тестов (см. langs.output_layout)
+        framework (str): Тестовый фреймворк ("testing")
+        project_path (str): Корневая директория проекта (шаблоны из .testgen/templates)
+        use_cache (bool): Использовать кэш скомпилированных шаблонов из .testgen/cache
+
+    Returns:
+        str: Исходный код файла тестов
+    """
+    aliases: Dict[str, str] = {}
+    used = {"testing"}
+    imported = set()
+    cases = []
+    for module, info, package_path in files:
+        alias = aliases.get(package_path)
+        if alias is None:
+            alias = base = info[0]
+            suffix = 1
+            while alias in used:
+                suffix += 1
+                alias = f"{base}{suffix}"
+            used.add(alias)
+            aliases[package_path] = alias
+        file_cases = _file_cases(info, module, alias)
+        if any(check is not None for _, _, check in file_cases):
+            imported.add(package_path)
+        cases.extend(file_cases)
+    imports = [(alias, package_path) for package_path, alias in aliases.items() if package_path in imported]
+    template = _load_template(framework, project_path, use_cache)
+    return template.render({
+        "module": label,
+        "subject": ("файла " if len(files) == 1 else "файлов ") + ", ".join(f"{module}.go" for module, _, _ in files),
+        "imports": imports,
+        "package": None,
+        "import_path": None,
+        "uses_package": bool(imports),
+        "cases": cases,
+    })
+
+
+def generator_signature(framework: str = "testing", project_path: str = ".") -> Tuple[str, str]:
+    """
+    Возвращает версию генератора и хэш шаблона для манифеста генерации.
+
+    Args:
+        framework (str): Тестовый фреймворк
+        project_path (str): Корневая директория проекта (шаблоны из .testgen/templates)
+
+    Returns:
+        Tuple[str, str]: Версия генератора и хэш шаблона
+    """
+    return GENERATOR_VERSION, _load_template(framework, project_path, True).hash
+
+
+def render_test_file(file_path: str, framework: str = "testing", output_dir: Optional[str] = None,
+                     project_path: str = ".", use_cache: bool = True) -> Optional[Tuple[str, str]]:
+    """
+    Формирует файл тестов для исходного файла Go, не записывая его.
+
+    Args:
+        file_path (str): Путь к исходному файлу
+        framework (str): Тестовый фреймворк ("testing")
+        output_dir (Optional[str]): Директория тестов (если None, возвращается только имя файла)
+        project_path (str): Корневая директория проекта
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        Optional[Tuple[str, str]]: Путь к файлу теста и его код; None, если в файле нет
+            экспортируемых символов, это пакет main или файл не входит в модуль Go
+    """
+    info = analyze_file(file_path, project_path, use_cache)
+    package, symbols = info
+    if not symbols or package in ("", "main"):
+        return None
+    package_path = import_path(file_path)
+    if package_path is None:
+        return None
+    module = file_module(file_path, project_path)
+    name = output_file_name(module)
+    test_path = os.path.join(output_dir, name) if output_dir is not None else name
+    return test_path, render_tests(info, module, package_path, framework, project_path, use_cache)
+
+
+def render_test_bundle(file_paths: List[str], label: str, framework: str = "testing",
+                       output_dir: Optional[str] = None, project_path: str = ".",
+                       use_cache: bool = True) -> Optional[Tuple[str, str]]:
+    """
+    Формирует один файл тестов для нескольких исходных файлов Go, не записывая его.
+
+    Args:
+        file_paths (List[str]): Пути к исходным файлам
+        label (str): Метка файла тестов (см. langs.output_layout)
+        framework (str): Тестовый фреймворк ("testing")
+        output_dir (Optional[str]): Директория тестов (если None, возвращается только имя файла)
+        project_path (str): Корневая директория проекта
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        Optional[Tuple[str, str]]: Путь к файлу теста и его код; None, если тесты
+            не создаются ни для одного файла
+    """
+    files = []
+    for file_path in file_paths:
+        info = analyze_file(file_path, project_path, use_cache)
+        if not info[1] or info[0] in ("", "main"):
+            continue
+        package_path = import_path(file_path)
+        if package_path is not None:
+            files.append((file_module(file_path, project_path), info, package_path))
+    if not files:
+        return None
+    name = output_file_name(label)
+    test_path = os.path.join(output_dir, name) if output_dir is not None else name
+    return test_path, render_bundle(files, label, framework, project_path, use_cache)
+
+
+def generate_tests(file_path: str, framework: str = "testing", output_dir: Optional[str] = None,
+                   project_path: str = ".", use_cache: bool = True) -> Optional[str]:
+    """
+    Генерирует заготовки тестов для исходного файла Go.
+
+    Существующий файл теста перезаписывается, только если его содержимое изменилось.
+
+    Args:
+        file_path (str): Путь к исходному файлу
+        framework (str): Тестовый фреймворк ("testing")
+        output_dir (Optional[str]): Директория для сохранения тестов (если None, возвращается код теста)
+        project_path (str): Корневая директория проекта (для путей файлов и кэша разбора)
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        Optional[str]: Путь к файлу теста (или код теста без output_dir); None, если тесты
+            для файла не создаются
+    """
+    rendered = render_test_file(file_path, framework, output_dir, project_path, use_cache)
+    if rendered is None:
+        return None
+    test_path, code = rendered
+    if output_dir is None:
+        return code
+
+    os.makedirs(os.path.dirname(test_path), exist_ok=True)
+    write_if_changed(test_path, code.encode("utf-8"))
+    return test_path
@@ -0,0 +1,218 @@
+"""
+Правила исключения файлов при обходе проекта.
+
+Поддерживает синтаксис .gitignore (и .testgenignore с тем же синтаксисом)
+и встроенный список директорий, которые никогда не содержат исходного кода
+проекта: зависимости, виртуальные окружения, артефакты сборки и кэши.
+"""
+
+import os
+import re
+from typing import List, Optional, Tuple
+
+# Директории, которые отсекаются до спуска в них
+DEFAULT_IGNORED_DIRS = frozenset({
+    ".git",
+    ".hg",
+    ".svn",
+    ".testgen",
+    ".tox",
+    ".nox",
+    ".venv",
+    ".mypy_cache",
+    ".pytest_cache",
+    "__pycache__",
+    "node_modules",
+    "bower_components",
+    "venv",
+    "env",
+    "site-packages",
+    "vendor",
+    "target",
+    "dist",
+    "build",
+})
+
+# Файлы с правилами исключения, которые читаются в каждой директории
+IGNORE_FILENAMES = (".gitignore", ".testgenignore")
+
+
+def _translate_pattern(pattern: str) -> str:
+    """
+    Переводит шаблон gitignore (без префикса '!' и завершающего '/') в регулярное выражение.
+
+    Args:
+        pattern (str): Шаблон gitignore
+
+    Returns:
+        str: Регулярное выражение для пути относительно директории с правилами
+    """
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    result = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern[i:i + 2] == "**":
+                at_start = i == 0 or pattern[i - 1] == "/"
+                at_end = i + 2 == n or pattern[i + 2] == "/"
+                if at_start and at_end:
+                    if i + 2 == n:
+                        result.append(".*")
+                    else:
+                        # "**/" совпадает с любым количеством директорий, включая ноль
+                        result.append("(?:.*/)?")
+                        i += 1
+                    i += 2
+                    continue
+            result.append("[^/]*")
+        elif c == "?":
+            result.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                result.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                result.append(f"[{body}]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            result.append(re.escape(pattern[i]))
+        else:
+            result.append(re.escape(c))
+        i += 1
+
+    regex = "".join(result)
+    if not anchored:
+        # Шаблон без '/' совпадает с именем на любой глубине
+        regex = "(?:.*/)?" + regex
+    return regex
+
+
+class IgnoreRules:
+    """Скомпилированные правила одного файла исключений"""
+
+    def __init__(self, lines: List[str]):
+        """
+        Компилирует правила из строк файла исключений.
+
+        Args:
+            lines (List[str]): Строки файла .gitignore/.testgenignore
+        """
+        # (регулярное выражение, отрицание, только для директорий)
+        self.rules: List[Tuple["re.Pattern[str]", bool, bool]] = []
+        any_parts, dir_parts = [], []
+        for raw in lines:
+            line = raw.rstrip("\r\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            elif line.startswith("\\"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            regex = _translate_pattern(line)
+            self.rules.append((re.compile(regex + r"\Z", re.DOTALL), negate, dir_only))
+            (dir_parts if dir_only else any_parts).append(regex)
+
+        self.has_negation = any(negate for _, negate, _ in self.rules)
+        # Без отрицаний все правила объединяются в одно выражение на уровень
+        self._any_regex = re.compile(r"(?:%s)\Z" % "|".join(any_parts), re.DOTALL) if any_parts else None
+        self._dir_regex = re.compile(r"(?:%s)\Z" % "|".join(dir_parts), re.DOTALL) if dir_parts else None
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Проверяет путь по правилам.
+
+        Args:
+            rel_path (str): Путь относительно директории с правилами (через '/')
+            is_dir (bool): Является ли путь директорией
+
+        Returns:
+            Optional[bool]: True - исключить, False - явно включить, None - правила не применимы
+        """
+        if not self.has_negation:
+            if self._any_regex is not None and self._any_regex.match(rel_path):
+                return True
+            if is_dir and self._dir_regex is not None and self._dir_regex.match(rel_path):
+                return True
+            return None
+
+        # С отрицаниями решает последнее совпавшее правило
+        for regex, negate, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                return not negate
+        return None
+
+    @classmethod
+    def from_directory(cls, directory: str, filenames=IGNORE_FILENAMES) -> Optional["IgnoreRules"]:
+        """
+        Читает файлы исключений из директории.
+
+        Args:
+            directory (str): Директория
+            filenames: Имена файлов исключений
+
+        Returns:
+            Optional[IgnoreRules]: Правила или None, если файлов нет или они пусты
+        """
+        lines: List[str] = []
+        for filename in filenames:
+            try:
+                with open(os.path.join(directory, filename), encoding="utf-8", errors="replace") as f:
+                    lines.extend(f.readlines())
+            except OSError:
+                continue
+        rules = cls(lines)
+        return rules if rules else None
+
+
+# Цепочка правил от корня к текущей директории: (относительный путь базы, правила)
+IgnoreChain = Tuple[Tuple[str, IgnoreRules], ...]
+
+
+def is_ignored(chain: IgnoreChain, rel_path: str, is_dir: bool) -> bool:
+    """
+    Проверяет путь по цепочке правил; более глубокие файлы правил имеют приоритет.
+
+    Args:
+        chain (IgnoreChain): Цепочка правил от корня проекта
+        rel_path (str): Путь относительно корня проекта (через '/')
+        is_dir (bool): Является ли путь директорией
+
+    Returns:
+        bool: True, если путь исключён
+    """
+    for base, rules in reversed(chain):
+        sub_path = rel_path[len(base) + 1:] if base else rel_path
+        decision = rules.match(sub_path, is_dir)
+        if decision is not None:
+            return decision
+    return False
+
+
+def ignore_signature(directory: str) -> Tuple[int, ...]:
+    """Возвращает mtime файлов исключений директории (-1 для отсутствующих)"""
+    signature = []
+    for filename in IGNORE_FILENAMES:
+        try:
+            signature.append(os.stat(os.path.join(directory, filename)).st_mtime_ns)
+        except OSError:
+            signature.append(-1)
+    return tuple(signature)
@@ -0,0 +1,761 @@
+"""
+Генератор тестов для JavaScript и TypeScript.
+
+Экспортируемые функции и классы ищутся потоковым сканером прямо в
+отображении файла в память (см. langs.mapped_source): регулярное
+выражение перескакивает от токена к токену, пропуская комментарии,
+строки, шаблонные строки (с вложенными `${...}`) и литералы регулярных
+выражений, и отслеживает глубину скобок. Объявления разбираются только на
+верхнем уровне по короткому фрагменту файла, поэтому даже собранные
+бандлы на десятки мегабайт не загружаются в память целиком.
+
+Поддерживаются ES-модули (export function/class/const, export { ... },
+export default) и CommonJS (module.exports, exports.name). Результат
+сканирования кэшируется по хэшу содержимого файла (см. langs.parse_cache).
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from langs.mapped_source import Buffer, LineCounter, open_mapped, window
+from langs.output_layout import flat_name
+from langs.parse_cache import content_digest, get_parse_cache
+from langs.template_engine import load_template
+from langs.test_writer import write_if_changed
+
+# Версия генератора: меняется при изменении формата разбора или вида тестов
+GENERATOR_VERSION = "1"
+PARSE_CACHE_NAME = "javascript-parse.bin"
+
+# Экспорт: (вид, локальное имя, экспортируемое имя, сигнатура, первая строка, последняя строка);
+# вид - "function" или "class", экспортируемое имя "default" - экспорт по умолчанию
+ExportInfo = Tuple[str, str, str, str, int, int]
+# Модуль: (ES-модуль, экспорты в порядке строк)
+ModuleInfo = Tuple[bool, Tuple[ExportInfo, ...]]
+
+_KEYWORDS = rb"export|function|class|const|let|var|module\.exports|exports"
+# Токен после пропуска байтов и идентификаторов, которые не могут его начинать: пропуск
+# выполняется внутри движка регулярных выражений, а цикл Python видит только значимые токены.
+# Учитываются только фигурные скобки: объявления верхнего уровня не бывают внутри круглых.
+_TOKEN_RE = re.compile(
+    rb"(?:[^\w$/'\"`{}]+|(?!(?:" + _KEYWORDS + rb")(?![\w$]))[\w$]+)*(?:"
+    rb"//[^\n]*"
+    rb"|/\*(?:[^*]|\*(?!/))*(?:\*/)?"
+    rb"|'(?:[^'\\\n]|\\.)*'?"
+    rb'|"(?:[^"\\\n]|\\.)*"?'
+    rb"|(?P<template>`)"
+    rb"|(?P<slash>/)"
+    rb"|(?P<open>\{)"
+    rb"|(?P<close>\})"
+    rb"|(?<![\w$.])(?P<keyword>" + _KEYWORDS + rb")(?![\w$])"
+    rb"|[\w$]+"
+    rb"|\Z)",
+    re.S,
+)
+# Тело шаблонной строки до конца или до подстановки ${
+_TEMPLATE_BODY_RE = re.compile(rb"(?:[^`\\$]|\\.|\$(?!\{))*(`|\$\{)?", re.S)
+_REGEX_LITERAL_RE = re.compile(rb"/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*")
+# Символы и ключевые слова, после которых '/' начинает регулярное выражение, а не деление
+_BEFORE_REGEX = frozenset(b"(,=:[!&|?{};+-*%<>~^")
+_KEYWORDS_BEFORE_EXPRESSION = frozenset(
+    [b"return", b"typeof", b"case", b"do", b"else", b"in", b"of", b"void", b"yield", b"await",
+     b"delete", b"new", b"throw", b"instanceof"])
+
+_IDENT = rb"[A-Za-z_$][\w$]*"
+_PARAMS = rb"\s*(?:<[^<>]{0,200}>)?\s*\(([^()]*(?:\([^()]*\)[^()]*)*)\)"
+_END = rb"\s*(?:;|\n|$)"
+_EXPORT_DECL_RE = re.compile(
+    rb"export\s+(default\s+)?(?:abstract\s+)?(?:async\s+)?(function\s*\*?|class)\s*(" + _IDENT + rb")?")
+_DECL_RE = re.compile(rb"(function\s*\*?|class)\s*(" + _IDENT + rb")")
+_VARIABLE_RE = re.compile(rb"(export\s+)?(?:const|let|var)\s+(" + _IDENT + rb")\s*(?::[^=;]{0,200})?=")
+_EXPORT_LIST_RE = re.compile(rb"export\s*(?:type\s*)?\{([^{}]*)\}(\s*from\b)?")
+_EXPORT_DEFAULT_RE = re.compile(rb"export\s+default\s+")
+_COMMONJS_RE = re.compile(rb"(?:module\.exports|exports)(?:\.(" + _IDENT + rb"))?\s*=\s*")
+_NAME_RE = re.compile(rb"(" + _IDENT + rb")" + _END)
+_PARAMS_RE = re.compile(_PARAMS)
+_CLASS_VALUE_RE = re.compile(rb"\s*class\b")
+_FUNCTION_VALUE_RE = re.compile(rb"\s*(?:async\s+)?function\s*\*?\s*(?:" + _IDENT + rb")?" + _PARAMS)
+_ARROW_VALUE_RE = re.compile(
+    rb"\s*(?:async\s*)?(?:\(([^()]*(?:\([^()]*\)[^()]*)*)\)|(" + _IDENT + rb"))\s*(?::[^=]{0,200})?=>\s*({)?")
+# Вложенные скобки внутри литерала объекта, заменяемые на \x01 перед разбором его ключей
+_NESTED_RE = re.compile(rb"\{[^{}]*\}|\([^()]*\)|\[[^\[\]]*\]")
+_ENTRY_RE = re.compile(
+    rb"\s*(?:(" + _IDENT + rb")\s*(?::\s*(" + _IDENT + rb")\s*)?$"
+    rb"|(?:async\s+|get\s+|set\s+|\*\s*)?(" + _IDENT + rb")\s*\x01\s*\x01\s*$"
+    rb"|(" + _IDENT + rb")\s*:\s*(async\s+|function\b|class\b|\x01\s*=>|" + _IDENT + rb"\s*=>))")
+_IDENT_RE = re.compile(_IDENT.decode() + r"\Z")
+
+_EXTENSIONS_WITHOUT_IMPORT_SUFFIX = (".ts", ".tsx")
+# Относительный импорт модуля: import ... from, import "...", import(...), require(...)
+_RELATIVE_IMPORT_RE = re.compile(
+    rb"(?<![\w$.])(?:from|import|require)\s*\(?\s*(['\"])(\.\.?/[^'\"\n]*)\1")
+_MODULE_EXTENSIONS = (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs")
+
+# Значение-функция или класс: (вид, параметры или None, есть ли тело в фигурных скобках,
+# конец заголовка во фрагменте - до открывающей скобки тела)
+_ValueInfo = Tuple[str, Optional[bytes], bool, int]
+
+
+def _regex_allowed(buf: Buffer, position: int) -> bool:
+    """Определяет по предыдущему токену, начинает ли '/' литерал регулярного выражения"""
+    before = bytes(buf[max(0, position - 32):position]).rstrip()
+    if not before:
+        return True
+    if before[-1] in _BEFORE_REGEX:
+        return True
+    word = re.search(rb"[\w$]+$", before)
+    return word is not None and word.group() in _KEYWORDS_BEFORE_EXPRESSION
+
+
+def _value_info(head: bytes, position: int) -> Optional[_ValueInfo]:
+    """Определяет, является ли выражение с позиции position функцией или классом"""
+    value = _CLASS_VALUE_RE.match(head, position)
+    if value is not None:
+        return "class", None, True, value.end()
+    function = _FUNCTION_VALUE_RE.match(head, position)
+    if function is not None:
+        return "function", function.group(1), True, function.end()
+    arrow = _ARROW_VALUE_RE.match(head, position)
+    if arrow is not None:
+        params = arrow.group(1) if arrow.group(1) is not None else arrow.group(2)
+        has_body = arrow.group(3) is not None
+        return "function", params, has_body, arrow.start(3) if has_body else arrow.end()
+    return None
+
+
+def _signature(name: str, params: Optional[bytes]) -> str:
+    if params is None:
+        return name
+    text = " ".join(params.decode("utf-8", "replace").split())
+    if len(text) > 200:
+        text = text[:197] + "..."
+    return f"{name}({text})"
+
+
+def _export_list(text: bytes) -> List[Tuple[str, str]]:
+    """Разбирает список `a, b as c` в пары (локальное имя, экспортируемое имя)"""
+    names = []
+    for part in text.decode("utf-8", "replace").split(","):
+        local, _, exported = part.strip().partition(" as ")
+        local = local.strip()
+        exported = exported.strip() or local
+        if _IDENT_RE.match(local) and _IDENT_RE.match(exported):
+            names.append((local, exported))
+    return names
+
+
+def _object_entries(head: bytes, position: int) -> List[Tuple[str, Optional[str]]]:
+    """
+    Разбирает ключи литерала объекта, открывающегося в позиции position.
+
+    Returns:
+        List[Tuple[str, Optional[str]]]: Пары (ключ, локальное имя); локальное имя None,
+            если значение - функция или класс, объявленные прямо в объекте
+    """
+    text = head[position + 1:]
+    previous = None
+    while previous != text:
+        previous = text
+        text = _NESTED_RE.sub(b"\x01", text)
+    end = text.find(b"}")
+    if end < 0:
+        # Объект не уместился во фрагмент
+        return []
+    entries = []
+    for part in text[:end].split(b","):
+        entry = _ENTRY_RE.match(part)
+        if entry is None:
+            continue
+        if entry.group(1) is not None:
+            name = entry.group(1).decode()
+            entries.append((name, (entry.group(2) or entry.group(1)).decode()))
+        else:
+            entries.append(((entry.group(3) or entry.group(4)).decode(), None))
+    return entries
+
+
+def scan_module(buf: Buffer) -> ModuleInfo:
+    """
+    Находит экспортируемые функции и классы модуля.
+
+    Args:
+        buf (Buffer): Содержимое файла (байты или отображение в память)
+
+    Returns:
+        ModuleInfo: Признак ES-модуля и экспорты
+    """
+    return _Scanner(buf).scan()
+
+
+class _Scanner:
+    """Потоковый сканер объявлений верхнего уровня"""
+
+    def __init__(self, buf: Buffer):
+        self.buf = buf
+        self.lines = LineCounter(buf)
+        # Записи: [вид, локальное имя, экспортируемое имя или None, сигнатура, первая строка, последняя строка]
+        self.records: List[list] = []
+        self.local: Dict[str, list] = {}
+        # Экспорт ранее объявленных имён: (локальное имя, экспортируемое имя)
+        self.linked: List[Tuple[str, str]] = []
+        self.esm = False
+        # Объявление верхнего уровня, конец тела которого ещё не найден
+        self.pending: Optional[list] = None
+
+    def scan(self) -> ModuleInfo:
+        buf = self.buf
+        next_token = _TOKEN_RE.match
+        size = len(buf)
+        depth = 0
+        # Глубина скобок, на которой продолжается шаблонная строка после ${...}
+        templates: List[int] = []
+        position = 0
+        while position < size:
+            match = next_token(buf, position)
+            position = match.end()
+            token = match.lastgroup
+            if token is None:
+                # Комментарий, строка, идентификатор или конец файла
+                continue
+
+            start = match.start(token)
+            if token == "open":
+                depth += 1
+            elif token == "close":
+                depth = max(depth - 1, 0)
+                if templates and depth == templates[-1]:
+                    templates.pop()
+                    position, depth = _continue_template(buf, position, templates, depth)
+                elif depth == 0 and self.pending is not None:
+                    self.pending[5] = self.lines.line_at(start)
+                    self.pending = None
+            elif token == "template":
+                position, depth = _continue_template(buf, position, templates, depth)
+            elif token == "slash":
+                if _regex_allowed(buf, start):
+                    literal = _REGEX_LITERAL_RE.match(buf, start)
+                    if literal is not None:
+                        position = literal.end()
+            elif depth == 0:
+                # Новое объявление верхнего уровня: у предыдущего не было тела (например, перегрузка TypeScript)
+                self.pending = None
+                # Сканирование продолжается с конца разобранного заголовка, но до скобок тела
+                position = start + self.declaration(window(buf, start), start, position - start)
+
+        return self.esm, self.exports()
+
+    def exports(self) -> Tuple[ExportInfo, ...]:
+        records = self.records
+        for name, exported in self.linked:
+            record = self.local.get(name)
+            if record is None:
+                continue
+            if record[2] is None:
+                record[2] = exported
+            elif record[2] != exported:
+                records.append(record[:2] + [exported] + record[3:])
+        records.sort(key=lambda record: record[4])
+        return tuple(tuple(record) for record in records if record[2] is not None)
+
+    def declare(self, kind: str, name: str, exported: Optional[str], params: Optional[bytes], start: int,
+                has_body: bool) -> None:
+        line = self.lines.line_at(start)
+        record = [kind, name, exported, _signature(name, params), line, line]
+        previous = self.local.get(name)
+        if previous is not None and previous[:3] == record[:3] and previous[4] == previous[5]:
+            # Повторное объявление после сигнатуры без тела (перегрузка TypeScript)
+            previous[3:] = record[3:]
+            record = previous
+        else:
+            self.records.append(record)
+            self.local.setdefault(name, record)
+        self.pending = record if has_body else None
+
+    def declare_value(self, name: str, exported: Optional[str], value: _ValueInfo, start: int) -> None:
+        kind, params, has_body, _ = value
+        self.declare(kind, name, exported, params, start, has_body)
+
+    def declaration(self, head: bytes, start: int, skip: int) -> int:
+        """Разбирает объявление верхнего уровня; возвращает смещение, с которого продолжается сканирование"""
+        if head.startswith(b"module") or head.startswith(b"exports"):
+            return self.commonjs(head, start, skip)
+        if head.startswith(b"export"):
+            self.esm = True
+            return self.export(head, start, skip)
+        if head.startswith(b"function") or head.startswith(b"class"):
+            decl = _DECL_RE.match(head)
+            if decl is None:
+                return skip
+            kind = "class" if decl.group(1) == b"class" else "function"
+            params = _PARAMS_RE.match(head, decl.end()) if kind == "function" else None
+            self.declare(kind, decl.group(2).decode(), None, params.group(1) if params else None, start, True)
+            return decl.end()
+
+        variable = _VARIABLE_RE.match(head)
+        if variable is not None:
+            value = _value_info(head, variable.end())
+            if value is None:
+                return variable.end()
+            self.declare_value(variable.group(2).decode(), None, value, start)
+            return value[3]
+        return skip
+
+    def export(self, head: bytes, start: int, skip: int) -> int:
+        decl = _EXPORT_DECL_RE.match(head)
+        if decl is not None:
+            kind = "class" if decl.group(2) == b"class" else "function"
+            name = decl.group(3).decode() if decl.group(3) else None
+            exported = "default" if decl.group(1) else name
+            if exported is None:
+                return decl.end()
+            params = _PARAMS_RE.match(head, decl.end()) if kind == "function" else None
+            self.declare(kind, name or "default", exported, params.group(1) if params else None, start, True)
+            return decl.end()
+
+        variable = _VARIABLE_RE.match(head)
+        if variable is not None:
+            name = variable.group(2).decode()
+            value = _value_info(head, variable.end())
+            if value is None:
+                return variable.end()
+            self.declare_value(name, name, value, start)
+            return value[3]
+
+        export_list = _EXPORT_LIST_RE.match(head)
+        if export_list is not None:
+            if export_list.group(2) is None:
+                # Реэкспорт из другого модуля (export { a } from "./a") тестируется в том модуле
+                self.linked.extend(_export_list(export_list.group(1)))
+            return export_list.end()
+
+        default = _EXPORT_DEFAULT_RE.match(head)
+        if default is not None:
+            value = _value_info(head, default.end())
+            if value is not None:
+                self.declare_value("default", "default", value, start)
+                return value[3]
+            name = _NAME_RE.match(head, default.end())
+            if name is not None:
+                self.linked.append((name.group(1).decode(), "default"))
+                return name.end(1)
+        return skip
+
+    def commonjs(self, head: bytes, start: int, skip: int) -> int:
+        assignment = _COMMONJS_RE.match(head)
+        if assignment is None:
+            return skip
+        position = assignment.end()
+        if assignment.group(1) is not None:
+            exported = assignment.group(1).decode()
+        elif head.startswith(b"module"):
+            exported = "default"
+        else:
+            # Присваивание самой переменной exports не меняет экспорт модуля
+            return position
+
+        value = _value_info(head, position)
+        if value is not None:
+            name = exported
+            decl = _DECL_RE.match(head, position)
+            if decl is not None and exported == "default":
+                # module.exports = function name() {...}: тест обращается к экспорту по этому имени
+                name = decl.group(2).decode()
+            self.declare_value(name, exported, value, start)
+            return value[3]
+
+        if exported == "default" and head[position:position + 1] == b"{":
+            line = self.lines.line_at(start)
+            for key, local in _object_entries(head, position):
+                if local is None:
+                    self.records.append(["function", key, key, key, line, line])
+                else:
+                    self.linked.append((local, key))
+            # Литерал объекта целиком разобран: его скобки не участвуют в подсчёте глубины
+            return position + 1 + _closing_brace(head, position)
+
+        name = _NAME_RE.match(head, position)
+        if name is not None:
+            self.linked.append((name.group(1).decode(), exported))
+            return name.end(1)
+        return skip
+
+
+def _closing_brace(head: bytes, position: int) -> int:
+    """Длина литерала объекта с позиции position без открывающей скобки (в пределах фрагмента)"""
+    depth = 0
+    for offset, byte in enumerate(head[position:]):
+        if byte == 0x7B:
+            depth += 1
+        elif byte == 0x7D:
+            depth -= 1
+            if depth == 0:
+                return offset
+    return 0
+
+
+def _continue_template(buf: Buffer, position: int, templates: List[int], depth: int) -> Tuple[int, int]:
+    """Пропускает тело шаблонной строки до её конца или до подстановки ${"""
+    body = _TEMPLATE_BODY_RE.match(buf, position)
+    if body.group(1) == b"${":
+        templates.append(depth)
+        depth += 1
+    return body.end(), depth
+
+
+def analyze_source(source: Buffer, file_path: str, project_path: str = ".",
+                   use_cache: bool = True) -> ModuleInfo:
+    """
+    Сканирует содержимое файла, используя кэш по хэшу содержимого.
+
+    Args:
+        source (Buffer): Содержимое файла (байты или отображение в память)
+        file_path (str): Путь к исходному файлу
+        project_path (str): Корневая директория проекта (для расположения кэша)
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        ModuleInfo: Результат сканирования
+    """
+    if not use_cache:
+        return scan_module(source)
+
+    cache = get_parse_cache(project_path, PARSE_CACHE_NAME, GENERATOR_VERSION)
+    digest = content_digest(source)
+    found, info = cache.get(digest)
+    if not found:
+        info = scan_module(source)
+    cache.put(file_path, digest, info)
+    return info
+
+
+def analyze_file(file_path: str, project_path: str = ".", use_cache: bool = True) -> ModuleInfo:
+    """
+    Сканирует файл, отображённый в память, используя кэш по хэшу содержимого.
+
+    Args:
+        file_path (str): Путь к исходному файлу
+        project_path (str): Корневая директория проекта (для расположения кэша)
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        ModuleInfo: Результат сканирования
+    """
+    with open_mapped(file_path) as buf:
+        return analyze_source(buf, file_path, project_path, use_cache)
+
+
+def extract_symbols(source: Buffer, file_path: str, project_path: str = ".",
+                    use_cache: bool = True) -> List[Tuple[str, str, str, str, int, int]]:
+    """
+    Возвращает экспортируемые символы модуля для индекса символов.
+
+    Args:
+        source (Buffer): Содержимое файла
+        file_path (str): Путь к исходному файлу
+        project_path (str): Корневая директория проекта
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        List[Tuple[str, str, str, str, int, int]]: Символы (вид, имя, экспортируемое имя,
+            сигнатура, первая строка, последняя строка)
+    """
+    _, exports = analyze_source(source, file_path, project_path, use_cache)
+    return [tuple(export) for export in exports]
+
+
+def extract_imports(source: Buffer, file_path: str, project_path: str = ".") -> List[str]:
+    """
+    Возвращает модули проекта, которые файл импортирует относительным путём.
+
+    Используется индексом символов: функция модуля считается покрытой, если
+    модуль импортирует какой-либо файл тестов.
+
+    Args:
+        source (Buffer): Содержимое файла
+        file_path (str): Путь к файлу
+        project_path (str): Корневая директория проекта
+
+    Returns:
+        List[str]: Пути модулей через '/' без расширения (как module_path), без повторов
+    """
+    modules = set()
+    directory = os.path.dirname(os.path.abspath(file_path))
+    for match in _RELATIVE_IMPORT_RE.finditer(source):
+        target = os.path.normpath(os.path.join(directory, match.group(2).decode("utf-8", "replace")))
+        root, extension = os.path.splitext(target)
+        if extension in _MODULE_EXTENSIONS:
+            target = root
+        modules.add(os.path.relpath(target, os.path.abspath(project_path)).replace(os.sep, "/"))
+    return sorted(modules)
+
+
+def module_path(file_path: str, project_path: str = ".") -> str:
+    """
+    Возвращает путь модуля относительно проекта без расширения.
+
+    Args:
+        file_path (str): Путь к исходному файлу
+        project_path (str): Корневая директория проекта
+
+    Returns:
+        str: Путь через '/' (например, "src/utils/math")
+    """
+    rel_path = os.path.relpath(file_path, project_path)
+    if rel_path.startswith(os.pardir + os.sep) or os.path.isabs(rel_path):
+        rel_path = os.path.basename(file_path)
+    return os.path.splitext(rel_path)[0].replace(os.sep, "/")
+
+
+def output_file_name(module: str, extension: str) -> str:
+    """
+    Возвращает имя файла теста для модуля.
+
+    Args:
+        module (str): Путь модуля через '/'
+        extension (str): Расширение исходного файла
+
+    Returns:
+        str: Имя файла (например, "src_utils_math.test.js"; для "src/my_utils" - "src_my__utils.test.js")
+    """
+    test_extension = ".ts" if extension in (".ts", ".tsx") else ".js"
+    return flat_name(module.split("/")) + ".test" + test_extension
+
+
+def _import_path(file_path: str, test_path: str) -> str:
+    root, extension = os.path.splitext(file_path)
+    target = root if extension in _EXTENSIONS_WITHOUT_IMPORT_SUFFIX else file_path
+    rel_path = os.path.relpath(os.path.abspath(target), os.path.dirname(os.path.abspath(test_path)))
+    rel_path = rel_path.replace(os.sep, "/")
+    return rel_path if rel_path.startswith(".") else "./" + rel_path
+
+
+def _camel(name: str) -> str:
+    parts = re.split(r"[^0-9A-Za-z]+", name)
+    result = parts[0][:1].lower() + parts[0][1:] + "".join(part[:1].upper() + part[1:] for part in parts[1:])
+    return result if result and not result[0].isdigit() else "module" + result
+
+
+def _load_template(framework: str, project_path: str, use_cache: bool):
+    template = load_template("javascript", framework, project_path, use_cache)
+    if template is None:
+        raise ValueError(f"Не найден шаблон тестов javascript/{framework}")
+    return template
+
+
+# Модуль в файле тестов: (путь модуля, ES-модуль, путь импорта, экспорт по умолчанию,
+# именованные экспорты, псевдоним, тесты (описание, проверяемое выражение))
+_ModuleTests = Tuple[str, bool, str, Optional[str], List[str], Optional[str], List[Tuple[str, str]]]
+
+
+def _module_tests(info: ModuleInfo, module: str, import_path: str, alias: Optional[str] = None) -> _ModuleTests:
+    """Тесты модуля; при псевдониме модуль импортируется целиком, и выражения обращаются к нему"""
+    esm, exports = info
+    default_name = None
+    names: List[str] = []
+    cases: List[Tuple[str, str]] = []
+    prefix = f"{alias}." if alias else ""
+    for kind, name, exported, _, _, _ in exports:
+        if exported == "default":
+            if default_name is None:
+                default_name = name if name != "default" else _camel(os.path.basename(module))
+            continue
+        if exported not in names:
+            names.append(exported)
+            cases.append((exported, prefix + exported))
+    if default_name is not None:
+        if default_name in names:
+            default_name += "Default"
+        # module.exports = ... в CommonJS - сам объект модуля
+        expr = default_name if not alias else (f"{alias}.default" if esm else alias)
+        cases.insert(0, (f"{default_name} (default)", expr))
+    return module, esm, import_path, default_name, names, alias, cases
+
+
+def render_tests(info: ModuleInfo, module: str, import_path: str, framework: str = "jest",
+                 project_path: str = ".", use_cache: bool = True) -> str:
+    """
+    Формирует исходный код заготовок тестов для модуля.
+
+    Args:
+        info (ModuleInfo): Результат сканирования модуля
+        module (str): Путь модуля
+        import_path (str): Путь импорта модуля из файла теста
+        framework (str): Тестовый фреймворк ("jest" или "mocha")
+        project_path (str): Корневая директория проекта (шаблоны из .testgen/templates)
+        use_cache (bool): Использовать кэш скомпилированных шаблонов из .testgen/cache
+
+    Returns:
+        str: Исходный код файла тестов
+    """
+    tests = _module_tests(info, module, import_path)
+    template = _load_template(framework, project_path, use_cache)
+    return template.render({
+        "subject": f"модуля {module}",
+        "modules": [tests],
+        "module": module,
+        "esm": tests[1],
+        "import_path": import_path,
+        "default_name": tests[3],
+        "names": tests[4],
+        "cases": tests[6],
+    })
+
+
+def render_bundle(modules: List[Tuple[str, ModuleInfo, str]], label: str, framework: str = "jest",
+                  project_path: str = ".", use_cache: bool = True) -> str:
+    """
+    Формирует исходный код заготовок тестов для нескольких модулей в одном файле.
+
+    Каждый модуль импортируется целиком под псевдонимом из его пути и тестируется
+    в своём блоке describe, поэтому одинаковые имена в разных модулях не конфликтуют.
+
+    Args:
+        modules (List[Tuple[str, ModuleInfo, str]]): Пути модулей, результаты сканирования и пути импорта
+        label (str): Метка файла тестов (см. langs.output_layout)
+        framework (str): Тестовый фреймворк ("jest" или "mocha")
+        project_path (str): Корневая директория проекта (шаблоны из .testgen/templates)
+        use_cache (bool): Использовать кэш скомпилированных шаблонов из .testgen/cache
+
+    Returns:
+        str: Исходный код файла тестов
+    """
+    # Псевдоним не должен закрывать глобальные имена фреймворков
+    aliases = {"assert", "describe", "test", "it", "expect", "require", "module", "exports"}
+    tests = []
+    for module, info, import_path in modules:
+        alias = base = _camel(module)
+        suffix = 1
+        while alias in aliases:
+            suffix += 1
+            alias = f"{base}{suffix}"
+        aliases.add(alias)
+        tests.append(_module_tests(info, module, import_path, alias))
+    template = _load_template(framework, project_path, use_cache)
+    return template.render({
+        "subject": ("модуля " if len(modules) == 1 else "модулей ") + ", ".join(module for module, _, _ in modules),
+        "modules": tests,
+        "module": label,
+        "esm": any(module_tests[1] for module_tests in tests),
+        "import_path": None,
+        "default_name": None,
+        "names": [],
+        "cases": [],
+    })
+
+
+def generator_signature(framework: str = "jest", project_path: str = ".") -> Tuple[str, str]:
+    """
+    Возвращает версию генератора и хэш шаблона для манифеста генерации.
+
+    Args:
+        framework (str): Тестовый фреймворк
+        project_path (str): Корневая директория проекта (шаблоны из .testgen/templates)
+
+    Returns:
+        Tuple[str, str]: Версия генератора и хэш шаблона
+    """
+    return GENERATOR_VERSION, _load_template(framework, project_path, True).hash
+
+
+def render_test_file(file_path: str, framework: str = "jest", output_dir: Optional[str] = None,
+                     project_path: str = ".", use_cache: bool = True) -> Optional[Tuple[str, str]]:
+    """
+    Формирует файл тестов для модуля, не записывая его.
+
+    Args:
+        file_path (str): Путь к исходному файлу
+        framework (str): Тестовый фреймворк ("jest" или "mocha")
+        output_dir (Optional[str]): Директория тестов (если None, пути импорта строятся от директории проекта)
+        project_path (str): Корневая директория проекта
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        Optional[Tuple[str, str]]: Путь к файлу теста и его код; None, если модуль
+            ничего не экспортирует
+    """
+    info = analyze_file(file_path, project_path, use_cache)
+    if not info[1]:
+        return None
+    module = module_path(file_path, project_path)
+    name = output_file_name(module, os.path.splitext(file_path)[1])
+    test_path = os.path.join(output_dir if output_dir is not None else project_path, name)
+    code = render_tests(info, module, _import_path(file_path, test_path), framework, project_path, use_cache)
+    return (test_path if output_dir is not None else name), code
+
+
+def bundle_file_name(label: str, extensions: List[str]) -> str:
+    """
+    Возвращает имя файла тестов, объединяющего несколько модулей.
+
+    Args:
+        label (str): Метка файла тестов (например, "src/utils" или "shard0001")
+        extensions (List[str]): Расширения исходных файлов (с TypeScript тест пишется на TypeScript)
+
+    Returns:
+        str: Имя файла (например, "src_utils.test.js")
+    """
+    extension = ".ts" if any(ext in (".ts", ".tsx") for ext in extensions) else ".js"
+    return output_file_name(label, extension)
+
+
+def render_test_bundle(file_paths: List[str], label: str, framework: str = "jest",
+                       output_dir: Optional[str] = None, project_path: str = ".",
+                       use_cache: bool = True) -> Optional[Tuple[str, str]]:
+    """
+    Формирует один файл тестов для нескольких модулей, не записывая его.
+
+    Args:
+        file_paths (List[str]): Пути к исходным файлам
+        label (str): Метка файла тестов (см. langs.output_layout)
+        framework (str): Тестовый фреймворк ("jest" или "mocha")
+        output_dir (Optional[str]): Директория тестов (если None, пути импорта строятся от директории проекта)
+        project_path (str): Корневая директория проекта
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        Optional[Tuple[str, str]]: Путь к файлу теста и его код; None, если ни один
+            модуль ничего не экспортирует
+    """
+    analyzed = [(file_path, analyze_file(file_path, project_path, use_cache)) for file_path in file_paths]
+    analyzed = [(file_path, info) for file_path, info in analyzed if info[1]]
+    if not analyzed:
+        return None
+    name = bundle_file_name(label, [os.path.splitext(file_path)[1] for file_path, _ in analyzed])
+    test_path = os.path.join(output_dir if output_dir is not None else project_path, name)
+    modules = [
+        (module_path(file_path, project_path), info, _import_path(file_path, test_path))
+        for file_path, info in analyzed
+    ]
+    code = render_bundle(modules, label, framework, project_path, use_cache)
+    return (test_path if output_dir is not None else name), code
+
+
+def generate_tests(file_path: str, framework: str = "jest", output_dir: Optional[str] = None,
+                   project_path: str = ".", use_cache: bool = True) -> Optional[str]:
+    """
+    Генерирует заготовки тестов для модуля JavaScript или TypeScript.
+
+    Существующий файл теста перезаписывается, только если его содержимое изменилось.
+
+    Args:
+        file_path (str): Путь к исходному файлу
+        framework (str): Тестовый фреймворк ("jest" или "mocha")
+        output_dir (Optional[str]): Директория для сохранения тестов (если None, возвращается код теста)
+        project_path (str): Корневая директория проекта (для путей модулей и кэша разбора)
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        Optional[str]: Путь к файлу теста (или код теста без output_dir); None, если
+            модуль ничего не экспортирует
+    """
+    rendered = render_test_file(file_path, framework, output_dir, project_path, use_cache)
+    if rendered is None:
+        return None
+    test_path, code = rendered
+    if output_dir is None:
+        return code
+
+    os.makedirs(os.path.dirname(test_path), exist_ok=True)
+    write_if_changed(test_path, code.encode("utf-8"))
+    return test_path
@@ -1,35 +1,131 @@
 import os
-import glob
-from typing import Optional, Dict, List
-
-LANGUAGE_PATTERNS = {
-    "python": ["*.py", "requirements.txt", "setup.py", "pyproject.toml"],
-    "javascript": ["*.js", "package.json", "*.jsx", "*.ts", "*.tsx"],
-    "go": ["*.go", "go.mod", "go.sum"],
-    "java": ["*.java", "pom.xml", "build.gradle"],
-    "ruby": ["*.rb", "Gemfile"],
-    "rust": ["*.rs", "Cargo.toml"],
-    "php": ["*.php", "composer.json"],
-    "csharp": ["*.cs", "*.csproj", "*.sln"],
-}
-
-def detect_project_language(project_path: str = ".") -> Optional[str]:
+import time
+from typing import Callable, Optional, Dict, Iterator, List, Tuple
+
+from langs.file_scanner import count_language_files, iter_files
+from langs.file_index import load_file_index
+from langs.git_files import load_git_file_list
+from langs.sampled_detection import DetectionResult, detect_language_sampled
+from langs.project_map import ProjectInfo, build_project_map
+from langs.plugins import get_classifier, get_plugin
+from langs.parallel_generation import generate_parallel
+from langs.gen_manifest import GenManifest
+from langs.mapped_source import open_mapped
+from langs.output_layout import LAYOUT_SHARDS, Bundle, OutputLayout
+from langs.parse_cache import content_digest
+from langs.test_writer import OutputWriter
+
+
+def get_source_matcher(language: str) -> Optional[Callable[[str], object]]:
+    """
+    Возвращает скомпилированный сопоставитель исходных (не тестовых) файлов языка.
+
+    Args:
+        language (str): Язык программирования в нижнем регистре
+
+    Returns:
+        Optional[Callable[[str], object]]: Функция проверки имени файла или None для неизвестного языка
+    """
+    plugin = get_plugin(language)
+    if plugin is None or not plugin.source_patterns:
+        return None
+    return plugin.source_matcher()
+
+
+def get_test_matcher(language: str) -> Optional[Callable[[str], object]]:
+    """
+    Возвращает скомпилированный сопоставитель файлов тестов языка.
+
+    Args:
+        language (str): Язык программирования в нижнем регистре
+
+    Returns:
+        Optional[Callable[[str], object]]: Функция проверки имени файла или None для неизвестного языка
+    """
+    plugin = get_plugin(language)
+    return plugin.test_matcher() if plugin is not None else None
+
+
+def _load_file_source(directory: str, use_cache: bool):
+    """
+    Выбирает источник списка файлов проекта.
+
+    Внутри рабочей копии git список берётся из индекса git, вне её - из
+    постоянного индекса файлов. Если оба недоступны, возвращается None,
+    и вызывающий код обходит файловую систему напрямую.
+
+    Args:
+        directory (str): Корневая директория проекта
+        use_cache (bool): Использовать постоянный индекс файлов из .testgen/cache
+
+    Returns:
+        Optional[GitFileList | FileIndex]: Источник с методами iter_files и language_counts
+    """
+    git_files = load_git_file_list(directory, get_classifier())
+    if git_files is not None:
+        return git_files
+    if use_cache:
+        return load_file_index(directory, get_classifier())
+    return None
+
+
+def _iter_project_files(directory: str, language: Optional[str], use_cache: bool,
+                        exclude_dirs: Optional[List[str]] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Возвращает файлы проекта, относящиеся к указанному языку.
+
+    Args:
+        directory (str): Корневая директория проекта
+        language (Optional[str]): Язык программирования (если None, файлы всех языков)
+        use_cache (bool): Использовать постоянный индекс файлов из .testgen/cache
+        exclude_dirs (Optional[List[str]]): Поддеревья, файлы которых пропускаются
+
+    Yields:
+        Tuple[str, str]: Пара (путь к директории, имя файла)
+    """
+    source = _load_file_source(directory, use_cache)
+    if source is not None:
+        files = source.iter_files(language)
+    else:
+        files = (
+            (dir_path, name) for dir_path, name in iter_files(directory)
+            if language is None or language in get_classifier().classify(name)
+        )
+
+    if not exclude_dirs:
+        yield from files
+        return
+
+    # Проверка вложенности выполняется один раз на директорию
+    excluded = tuple(os.path.join(os.path.normpath(path), "") for path in exclude_dirs)
+    last_dir, skip = None, False
+    for dir_path, name in files:
+        if dir_path != last_dir:
+            last_dir = dir_path
+            skip = os.path.join(os.path.normpath(dir_path), "").startswith(excluded)
+        if not skip:
+            yield dir_path, name
+
+
+def detect_project_language(project_path: str = ".", use_cache: bool = True) -> Optional[str]:
     """
     Определяет основной язык программирования проекта на основе файлов в директории.
     
     Args:
         project_path (str): Путь к корневой директории проекта
+        use_cache (bool): Использовать постоянный индекс файлов из .testgen/cache
         
     Returns:
         Optional[str]: Определенный язык программирования или None, если не удалось определить
     """
-    language_scores = {lang: 0 for lang in LANGUAGE_PATTERNS}
-    
-    for lang, patterns in LANGUAGE_PATTERNS.items():
-        for pattern in patterns:
-            matching_files = glob.glob(os.path.join(project_path, "**", pattern), recursive=True)
-            language_scores[lang] += len(matching_files)
-    
+    source = _load_file_source(project_path, use_cache)
+    if source is not None:
+        # Список из git или индекс, в котором перечитаны только изменившиеся директории
+        language_scores = source.language_counts()
+    else:
+        # Один обход дерева вместо отдельного glob на каждый шаблон
+        language_scores = count_language_files(project_path, get_classifier())
+
     # Сортируем языки по количеству найденных файлов
     sorted_langs = sorted(language_scores.items(), key=lambda x: x[1], reverse=True)
     
@@ -40,6 +136,37 @@ def detect_project_language(project_path: str = ".") -> Optional[str]:
     return None
 
 
+def detect_project_language_sampled(project_path: str = ".", max_files: Optional[int] = None,
+                                    max_seconds: Optional[float] = None) -> DetectionResult:
+    """
+    Определяет основной язык проекта по выборке файлов с ограниченным бюджетом.
+
+    Args:
+        project_path (str): Путь к корневой директории проекта
+        max_files (Optional[int]): Максимальное количество просмотренных файлов
+        max_seconds (Optional[float]): Максимальное время обхода в секундах
+
+    Returns:
+        DetectionResult: Определённый язык и достигнутая уверенность
+    """
+    return detect_language_sampled(project_path, get_classifier(), max_files, max_seconds)
+
+
+def detect_project_map(project_path: str = ".", use_cache: bool = True) -> Dict[str, ProjectInfo]:
+    """
+    Находит проекты в полиглотном репозитории и определяет язык и фреймворк каждого.
+
+    Args:
+        project_path (str): Путь к корневой директории репозитория
+        use_cache (bool): Использовать постоянный индекс файлов из .testgen/cache
+
+    Returns:
+        Dict[str, ProjectInfo]: Путь к корню проекта -> язык, фреймворк и вложенные проекты
+    """
+    files = _iter_project_files(project_path, None, use_cache)
+    return build_project_map(project_path, files, get_classifier(), get_available_test_frameworks)
+
+
 def get_available_test_frameworks(language: str) -> List[str]:
     """
     Возвращает список доступных тестовых фреймворков для указанного языка.
@@ -50,92 +177,284 @@ def get_available_test_frameworks(language: str) -> List[str]:
     Returns:
         List[str]: Список доступных тестовых фреймворков
     """
-    frameworks = {
-        "python": ["pytest", "unittest"],
-        "javascript": ["jest", "mocha"],
-        "go": ["testing"],
-        "java": ["junit", "testng"],
-        "ruby": ["rspec", "minitest"],
-        "rust": ["cargo-test"],
-        "php": ["phpunit"],
-        "csharp": ["nunit", "xunit", "mstest"],
-    }
+    plugin = get_plugin(language)
+    return list(plugin.frameworks) if plugin is not None else []
+
+
+def iter_source_files(directory: str, language: str, use_cache: bool = True,
+                      exclude_dirs: Optional[List[str]] = None) -> Iterator[str]:
+    """
+    Лениво перечисляет исходные файлы указанного языка в директории.
+
+    Пути выдаются по мере обхода, поэтому обработка первых файлов начинается
+    до завершения обхода, а память не растёт с размером дерева.
+    
+    Args:
+        directory (str): Директория для поиска
+        language (str): Язык программирования
+        use_cache (bool): Использовать постоянный индекс файлов из .testgen/cache
+        exclude_dirs (Optional[List[str]]): Поддеревья (например, вложенные проекты), которые пропускаются
+        
+    Yields:
+        str: Путь к исходному файлу
+    """
+    matches_source = get_source_matcher(language.lower())
+    if matches_source is None:
+        return
     
-    return frameworks.get(language.lower(), [])
+    # Обход (или индекс) отсекает node_modules, venv и пути из .gitignore до спуска в них
+    for dir_path, name in _iter_project_files(directory, language.lower(), use_cache, exclude_dirs):
+        # Один вызов скомпилированного выражения: шаблоны исходников минус шаблоны тестов
+        if matches_source(name):
+            yield os.path.join(dir_path, name)
 
 
-def get_source_files(directory: str, language: str) -> List[str]:
+def iter_language_files(directory: str, language: str, use_cache: bool = True,
+                        exclude_dirs: Optional[List[str]] = None) -> Iterator[Tuple[str, bool]]:
+    """
+    Лениво перечисляет за один обход исходные файлы и файлы тестов языка.
+    
+    Args:
+        directory (str): Директория для поиска
+        language (str): Язык программирования
+        use_cache (bool): Использовать постоянный индекс файлов из .testgen/cache
+        exclude_dirs (Optional[List[str]]): Поддеревья (например, вложенные проекты), которые пропускаются
+        
+    Yields:
+        Tuple[str, bool]: Путь к файлу и признак файла тестов
+    """
+    matches_source = get_source_matcher(language.lower())
+    matches_test = get_test_matcher(language.lower()) or (lambda name: None)
+    if matches_source is None:
+        return
+    
+    for dir_path, name in _iter_project_files(directory, language.lower(), use_cache, exclude_dirs):
+        if matches_source(name):
+            yield os.path.join(dir_path, name), False
+        elif matches_test(name):
+            yield os.path.join(dir_path, name), True
+
+
+def get_source_files(directory: str, language: str, use_cache: bool = True,
+                     exclude_dirs: Optional[List[str]] = None) -> List[str]:
     """
     Находит все исходные файлы указанного языка в директории.
     
     Args:
         directory (str): Директория для поиска
         language (str): Язык программирования
+        use_cache (bool): Использовать постоянный индекс файлов из .testgen/cache
+        exclude_dirs (Optional[List[str]]): Поддеревья (например, вложенные проекты), которые пропускаются
         
     Returns:
         List[str]: Список путей к найденным файлам
     """
-    file_patterns = {
-        "python": ["*.py"],
-        "javascript": ["*.js", "*.jsx", "*.ts", "*.tsx"],
-        "go": ["*.go"],
-        "java": ["*.java"],
-        "ruby": ["*.rb"],
-        "rust": ["*.rs"],
-        "php": ["*.php"],
-        "csharp": ["*.cs"],
-    }
-    
-    # Исключаем файлы тестов
-    exclude_patterns = {
-        "python": ["test_*.py", "*_test.py"],
-        "javascript": ["*.test.js", "*.spec.js", "*-test.js"],
-        "go": ["*_test.go"],
-        "java": ["*Test.java"],
-        "ruby": ["*_spec.rb", "*_test.rb"],
-        "rust": ["*_test.rs"],
-        "php": ["*Test.php"],
-        "csharp": ["*Test.cs", "*Tests.cs"],
-    }
-    
-    patterns = file_patterns.get(language.lower(), [])
-    if not patterns:
-        return []
-    
-    exclude_list = exclude_patterns.get(language.lower(), [])
-    
-    source_files = []
-    for pattern in patterns:
-        for file_path in glob.glob(os.path.join(directory, "**", pattern), recursive=True):
-            # Проверяем, что это не тестовый файл
-            is_test_file = any(
-                os.path.basename(file_path).lower().endswith(exclude_pattern[1:].lower())
-                or os.path.basename(file_path).lower().startswith(exclude_pattern[:-1].lower())
-                for exclude_pattern in exclude_list if "*" in exclude_pattern
-            )
-            
-            if not is_test_file:
-                source_files.append(file_path)
-    
-    return source_files
-
-
-def generate_tests_for_language(directory: str, language: str, framework: Optional[str] = None, output_dir: Optional[str] = None) -> List[str]:
+    return list(iter_source_files(directory, language, use_cache, exclude_dirs))
+
+
+def _generator_module(language: str):
+    """Модуль генератора тестов языка (импортируется при первом использовании) или None"""
+    plugin = get_plugin(language)
+    return plugin.generator_module() if plugin is not None else None
+
+
+def get_test_renderer(language: str, framework: str, output_dir: Optional[str] = None, project_path: str = ".",
+                      use_cache: bool = True) -> Optional[Callable[[str], Optional[Tuple[str, str]]]]:
     """
-    Генерирует тесты для всех исходных файлов указанного языка в директории.
+    Возвращает функцию, формирующую файл тестов для одного исходного файла без записи на диск.
+    
+    Args:
+        language (str): Язык программирования
+        framework (str): Тестовый фреймворк
+        output_dir (Optional[str]): Директория тестов
+        project_path (str): Корневая директория проекта (имена модулей и кэш разбора)
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+        
+    Returns:
+        Optional[Callable[[str], Optional[Tuple[str, str]]]]: Функция (путь к исходному файлу ->
+            путь к тесту и код) или None, если генератор для языка не реализован
+    """
+    module = _generator_module(language)
+    if module is None:
+        return None
+    return lambda file_path: module.render_test_file(file_path, framework, output_dir, project_path, use_cache)
+
+
+def get_bundle_renderer(language: str, framework: str, output_dir: Optional[str] = None, project_path: str = ".",
+                        use_cache: bool = True) -> Optional[Callable[[Bundle], Optional[Tuple[str, str]]]]:
+    """
+    Возвращает функцию, формирующую объединённый файл тестов для группы исходных файлов без записи на диск.
+    
+    Args:
+        language (str): Язык программирования
+        framework (str): Тестовый фреймворк
+        output_dir (Optional[str]): Директория тестов
+        project_path (str): Корневая директория проекта (имена модулей и кэш разбора)
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+        
+    Returns:
+        Optional[Callable[[Bundle], Optional[Tuple[str, str]]]]: Функция ((метка, исходные файлы) ->
+            путь к тесту и код) или None, если генератор языка не объединяет тесты
+    """
+    module = _generator_module(language)
+    render_bundle = getattr(module, "render_test_bundle", None)
+    if render_bundle is None:
+        return None
+    return lambda bundle: render_bundle(bundle[1], bundle[0], framework, output_dir, project_path, use_cache)
+
+
+def _test_counter(language: str, project_path: str, use_cache: bool) -> Callable[[str], int]:
+    """Функция оценки количества тестов исходного файла по его символам (для раскладки shards)"""
+    extract = get_symbol_extractor(language)
+    if extract is None:
+        return lambda file_path: 1
+    
+    def count_tests(file_path: str) -> int:
+        try:
+            with open_mapped(file_path) as source:
+                return len(extract(source, file_path, project_path, use_cache))
+        except OSError:
+            return 0
+    return count_tests
+
+
+def get_symbol_extractor(language: str) -> Optional[Callable[..., List[Tuple[str, str, str, str, int, int]]]]:
+    """
+    Возвращает функцию извлечения символов языка для индекса символов.
+    
+    Args:
+        language (str): Язык программирования
+        
+    Returns:
+        Optional[Callable]: Функция (содержимое, путь, корень проекта, использовать кэш) -> символы
+            или None, если извлечение символов для языка не реализовано
+    """
+    module = _generator_module(language)
+    return getattr(module, "extract_symbols", None)
+
+
+def get_import_extractor(language: str) -> Optional[Callable[..., List[str]]]:
+    """
+    Возвращает функцию извлечения импортируемых модулей проекта для индекса символов.
+    
+    Args:
+        language (str): Язык программирования
+        
+    Returns:
+        Optional[Callable]: Функция (содержимое, путь, корень проекта) -> пути модулей
+            или None, если покрытие языка определяется без импортов
+    """
+    module = _generator_module(language)
+    return getattr(module, "extract_imports", None)
+
+
+def get_generator_signature(language: str, framework: str, project_path: str = ".") -> Optional[Tuple[str, str]]:
+    """
+    Возвращает версию генератора и хэш шаблона языка для манифеста генерации.
+    
+    Args:
+        language (str): Язык программирования
+        framework (str): Тестовый фреймворк
+        project_path (str): Корневая директория проекта (переопределённые шаблоны)
+        
+    Returns:
+        Optional[Tuple[str, str]]: Версия генератора и хэш шаблона или None для неизвестного языка
+    """
+    module = _generator_module(language)
+    if module is None:
+        return None
+    return module.generator_signature(framework, project_path)
+
+
+def get_manifest_inputs(language: str, framework: str, directory: str, output_dir: str,
+                        layout: Optional[OutputLayout] = None) -> Tuple[str, str]:
+    """
+    Возвращает входные данные генерации, общие для всех файлов, для манифеста .testgen/gen-manifest.
+    
+    Args:
+        language (str): Язык программирования
+        framework (str): Тестовый фреймворк
+        directory (str): Корневая директория проекта
+        output_dir (str): Директория тестов
+        layout (Optional[OutputLayout]): Раскладка тестов по файлам (None - файл на исходный файл)
+        
+    Returns:
+        Tuple[str, str]: Версия генератора и хэш шаблона вместе с директорией тестов и раскладкой
+    """
+    generator_version, template = get_generator_signature(language, framework, directory)
+    # Тест зависит и от шаблона, и от того, куда он записывается
+    inputs = f"{template}\0{os.path.abspath(output_dir)}"
+    if layout is not None and layout.bundled:
+        inputs += f"\0{layout.spec}"
+    template_hash = content_digest(inputs.encode()).hex()
+    return generator_version, template_hash
+
+
+class GenerationReport:
+    """Итоги генерации тестов"""
+    
+    def __init__(self):
+        # Созданные и перегенерированные тесты
+        self.generated: List[str] = []
+        # Тесты, пропущенные как актуальные по манифесту
+        self.up_to_date: List[str] = []
+        # Записанные тесты (новые или с изменённым содержимым)
+        self.written: List[str] = []
+        # Перегенерированные тесты, содержимое которых не изменилось (файл не перезаписан)
+        self.unchanged: List[str] = []
+        # Удалённые тесты исходных файлов, которых больше нет
+        self.removed: List[str] = []
+        # Тесты удалённых исходных файлов, изменённые вручную и поэтому оставленные
+        self.orphans: List[str] = []
+        # Пропущенные исходные файлы, тест которых совпал по пути с тестом другого файла:
+        # (путь к тесту, исходный файл)
+        self.collisions: List[Tuple[str, str]] = []
+        # Количество найденных исходных файлов
+        self.sources = 0
+
+
+def generate_tests_incremental(directory: str, language: str, framework: Optional[str] = None,
+                               output_dir: Optional[str] = None, use_cache: bool = True,
+                               exclude_dirs: Optional[List[str]] = None, jobs: int = 1,
+                               force: bool = False, layout: Optional[OutputLayout] = None,
+                               changed: Optional[List[str]] = None, removed: Optional[List[str]] = None) -> GenerationReport:
+    """
+    Генерирует тесты, пропуская исходные файлы, входные данные которых не изменились.
+    
+    Входные данные файла - хэш содержимого, версия генератора и хэш шаблона -
+    запоминаются в манифесте .testgen/gen-manifest (только при заданной output_dir).
+    Тесты записываются, только если их содержимое изменилось; тесты удалённых
+    исходных файлов удаляются, если не были изменены вручную. Если тест
+    исходного файла совпадает по пути с тестом, уже полученным для другого
+    файла, он не записывается и сообщается в GenerationReport.collisions.
+    
+    При раскладке package или shards (см. langs.output_layout) файл тестов
+    формируется заново целиком, если изменился любой исходный файл группы или
+    состав группы.
+    
+    Если задан changed, директория не обходится: обрабатываются только
+    указанные исходные файлы, а тесты удаляются только для файлов из removed
+    (режим --watch, только для раскладки файл на исходный файл).
     
     Args:
         directory (str): Директория для поиска исходных файлов
         language (str): Язык программирования
         framework (Optional[str]): Тестовый фреймворк (если None, выбирается первый доступный)
         output_dir (Optional[str]): Директория для сохранения тестов (если None, возвращает тесты как строки)
+        use_cache (bool): Использовать постоянный индекс файлов и кэш разбора из .testgen/cache
+        exclude_dirs (Optional[List[str]]): Поддеревья (например, вложенные проекты), которые пропускаются
+        jobs (int): Количество процессов для генерации (1 - в текущем процессе)
+        force (bool): Перегенерировать все тесты, не сверяясь с манифестом
+        layout (Optional[OutputLayout]): Раскладка тестов по файлам (None - файл на исходный файл)
+        changed (Optional[List[str]]): Изменённые исходные файлы (None - все файлы директории)
+        removed (Optional[List[str]]): Удалённые исходные файлы (вместе с changed)
         
     Returns:
-        List[str]: Список путей к сгенерированным тестам
+        GenerationReport: Созданные, записанные, актуальные и удалённые тесты
     """
     # Определяем язык и фреймворк
     if not language:
-        language = detect_project_language(directory)
+        language = detect_project_language(directory, use_cache)
         if not language:
             raise ValueError("Не удалось определить язык программирования")
     
@@ -146,36 +465,165 @@ def generate_tests_for_language(directory: str, language: str, framework: Option
             raise ValueError(f"Для языка {language} не найдены доступные тестовые фреймворки")
         framework = frameworks[0]
     
-    # Находим исходные файлы
-    source_files = get_source_files(directory, language)
-    if not source_files:
-        raise ValueError(f"Не найдены исходные файлы языка {language} в директории {directory}")
-    
-    # Генерируем тесты для каждого файла
-    generated_tests = []
+    report = GenerationReport()
+    bundled = layout is not None and layout.bundled
+    if changed is not None and bundled:
+        raise ValueError(f"Раскладка тестов {layout.spec} пересобирается только по всем исходным файлам")
+    render = get_test_renderer(language, framework, output_dir, directory, use_cache)
+    if changed is not None:
+        # Файл мог быть удалён после того, как изменение было замечено
+        source_files = (file_path for file_path in changed if os.path.isfile(file_path))
+    else:
+        source_files = iter_source_files(directory, language, use_cache, exclude_dirs)
+    if render is None:
+        if next(source_files, None) is None:
+            raise ValueError(f"Не найдены исходные файлы языка {language} в директории {directory}")
+        return report
+    render_bundle = get_bundle_renderer(language, framework, output_dir, directory, use_cache) if bundled else None
+    if bundled and render_bundle is None:
+        raise ValueError(f"Раскладка тестов {layout.spec} не поддерживается для языка {language}")
     
-    # Импортируем соответствующий генератор для каждого языка
-    if language.lower() == "python":
-        from langs.python_generator import generate_tests as py_gen
-        for file_path in source_files:
-            test_path = py_gen(file_path, framework, output_dir)
+    manifest = None
+    if output_dir is not None:
+        manifest = GenManifest(directory)
+        manifest.load()
+        generator_version, template_hash = get_manifest_inputs(language, framework, directory, output_dir, layout)
+    # Состояние файлов, отправленных на генерацию (хэш, mtime, размер)
+    states: Dict[str, Optional[Tuple[str, int, int]]] = {}
+    # Занятые пути к тестам: актуальные по манифесту и записанные в этом запуске
+    claimed = set()
+    if changed is not None and manifest is not None:
+        # Остальные файлы не обходятся: их тесты заняты по манифесту
+        references = manifest.test_references()
+        for file_path in changed:
+            test_path = manifest.test_path(file_path)
             if test_path:
-                generated_tests.append(test_path)
+                references[test_path] -= 1
+        claimed.update(test_path for test_path, count in references.items() if count > 0)
     
-    elif language.lower() == "javascript":
-        from langs.javascript_generator import generate_tests as js_gen
+    def pending_sources() -> Iterator[str]:
         for file_path in source_files:
-            test_path = js_gen(file_path, output_dir)
-            if test_path:
-                generated_tests.append(test_path)
+            report.sources += 1
+            if manifest is not None:
+                up_to_date, state = manifest.check(file_path, generator_version, template_hash)
+                if up_to_date and not force:
+                    test_path = manifest.test_path(file_path)
+                    if test_path:
+                        report.up_to_date.append(test_path)
+                        claimed.add(test_path)
+                    continue
+                states[file_path] = state
+            yield file_path
     
-    elif language.lower() == "go":
-        from langs.go_generator import generate_tests as go_gen
-        for file_path in source_files:
-            test_path = go_gen(file_path, output_dir)
-            if test_path:
-                generated_tests.append(test_path)
+    def pending_bundles() -> Iterator[Bundle]:
+        # Группы зависят от всех файлов сразу, поэтому обход выполняется целиком
+        sources = list(source_files)
+        report.sources = len(sources)
+        count_tests = _test_counter(language, directory, use_cache) if layout.kind == LAYOUT_SHARDS else None
+        references = manifest.test_references() if manifest is not None else {}
+        for label, members in layout.group(sources, directory, count_tests):
+            if manifest is not None:
+                checks = [manifest.check(file_path, generator_version, template_hash) for file_path in members]
+                test_paths = {manifest.test_path(file_path) for file_path in members}
+                if not force and len(test_paths) == 1 and all(up_to_date for up_to_date, _ in checks):
+                    # Группа актуальна, если на её тест ссылаются ровно её файлы
+                    test_path = test_paths.pop()
+                    if test_path is None or references.get(test_path) == len(members):
+                        if test_path:
+                            report.up_to_date.append(test_path)
+                            claimed.add(test_path)
+                        continue
+                for file_path, (_, state) in zip(members, checks):
+                    states[file_path] = state
+            yield label, members
+    
+    # Формируем тесты по мере обнаружения файлов, не дожидаясь конца обхода
+    options = (language, framework, output_dir, directory, use_cache)
+    if bundled:
+        if jobs > 1:
+            results = generate_parallel(pending_bundles(), options, jobs, 1, bundled=True)
+        else:
+            results = ((bundle, render_bundle(bundle)) for bundle in pending_bundles())
+        results = ((members, rendered) for (_, members), rendered in results)
+    elif jobs > 1:
+        results = (([file_path], rendered) for file_path, rendered in generate_parallel(pending_sources(), options, jobs))
+    else:
+        results = (([file_path], render(file_path)) for file_path in pending_sources())
     
-    # TODO: Добавить поддержку других языков
+    # Файлы записываются в порядке обнаружения исходных файлов: если несколько
+    # исходных файлов дают один путь к тесту, остаётся тест первого из них
+    # независимо от числа процессов
+    writer = OutputWriter()
+    # Размер обработанных исходных файлов для оценки скорости генерации (gen --plan)
+    processed_bytes = 0
+    started = time.perf_counter()
+    for members, rendered in results:
+        test_path = test_digest = None
+        if rendered is not None:
+            rendered_path, code = rendered
+            if output_dir is None:
+                report.generated.append(code)
+            else:
+                test_path = rendered_path
+                if test_path in claimed:
+                    # Файл не попадает в манифест: коллизия сообщается при каждом запуске
+                    for file_path in members:
+                        states.pop(file_path, None)
+                        report.collisions.append((test_path, file_path))
+                    continue
+                claimed.add(test_path)
+                data = code.encode("utf-8")
+                digest = content_digest(data)
+                writer.write(test_path, data, digest)
+                test_digest = digest.hex()
+                report.generated.append(test_path)
+        if manifest is not None:
+            for file_path in members:
+                state = states.pop(file_path)
+                if state is not None:
+                    processed_bytes += state[2]
+                    manifest.record(file_path, state, generator_version, template_hash, test_path, test_digest)
     
-    return generated_tests 
\ No newline at end of file
+    if not report.sources and changed is None:
+        raise ValueError(f"Не найдены исходные файлы языка {language} в директории {directory}")
+    
+    if manifest is not None:
+        manifest.record_throughput(language, processed_bytes, (time.perf_counter() - started) * jobs)
+        if changed is None:
+            orphans = manifest.collect_orphans()
+        else:
+            orphans = manifest.forget(removed or [])
+        for test_path, test_digest in orphans:
+            expected = bytes.fromhex(test_digest) if test_digest else None
+            # Без хэша (или после ручной правки) тест не удаляется, а только сообщается
+            if expected is None or not writer.remove(test_path, expected):
+                report.orphans.append(test_path)
+        manifest.save()
+    report.written = writer.written
+    report.unchanged = writer.unchanged
+    report.removed = writer.removed
+    return report
+
+
+def generate_tests_for_language(directory: str, language: str, framework: Optional[str] = None, output_dir: Optional[str] = None,
+                                use_cache: bool = True, exclude_dirs: Optional[List[str]] = None,
+                                jobs: int = 1, layout: Optional[OutputLayout] = None) -> List[str]:
+    """
+    Генерирует тесты для всех исходных файлов указанного языка в директории.
+    
+    Args:
+        directory (str): Директория для поиска исходных файлов
+        language (str): Язык программирования
+        framework (Optional[str]): Тестовый фреймворк (если None, выбирается первый доступный)
+        output_dir (Optional[str]): Директория для сохранения тестов (если None, возвращает тесты как строки)
+        use_cache (bool): Использовать постоянный индекс файлов из .testgen/cache
+        exclude_dirs (Optional[List[str]]): Поддеревья (например, вложенные проекты), которые пропускаются
+        jobs (int): Количество процессов для генерации (1 - в текущем процессе)
+        layout (Optional[OutputLayout]): Раскладка тестов по файлам (None - файл на исходный файл)
+        
+    Returns:
+        List[str]: Список путей к сгенерированным тестам (актуальные по манифесту тесты пропускаются)
+    """
+    report = generate_tests_incremental(directory, language, framework, output_dir, use_cache, exclude_dirs, jobs,
+                                        layout=layout)
+    return report.generated
@@ -0,0 +1,91 @@
+"""
+Чтение исходных файлов через отображение в память (mmap).
+
+Сканеры исходного кода (langs.javascript_generator, langs.go_generator)
+ищут токены регулярными выражениями прямо в отображении файла и копируют
+в память только короткие фрагменты вокруг найденных объявлений. Поэтому
+пиковое потребление памяти не зависит от размера файла, даже если это
+собранный бандл на десятки мегабайт.
+"""
+
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+# Максимальная длина фрагмента, копируемого из файла для разбора заголовка объявления
+HEADER_WINDOW = 1024
+# Размер блока при подсчёте строк
+LINE_COUNT_CHUNK = 1 << 20
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+@contextmanager
+def open_mapped(file_path: str) -> Iterator[Buffer]:
+    """
+    Отображает файл в память только для чтения.
+
+    Args:
+        file_path (str): Путь к файлу
+
+    Yields:
+        Buffer: Отображение файла (для пустого файла - пустая строка байтов)
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Пустой файл нельзя отобразить в память
+            yield b""
+            return
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+def window(buf: Buffer, start: int, size: int = HEADER_WINDOW) -> bytes:
+    """
+    Копирует ограниченный фрагмент буфера.
+
+    Args:
+        buf (Buffer): Содержимое файла
+        start (int): Начало фрагмента
+        size (int): Максимальная длина фрагмента
+
+    Returns:
+        bytes: Фрагмент длиной не более size
+    """
+    return bytes(buf[start:start + size])
+
+
+class LineCounter:
+    """Номера строк для возрастающих позиций в буфере"""
+
+    def __init__(self, buf: Buffer):
+        """
+        Args:
+            buf (Buffer): Содержимое файла
+        """
+        self.buf = buf
+        self.position = 0
+        self.line = 1
+
+    def line_at(self, position: int) -> int:
+        """
+        Возвращает номер строки (с 1) для позиции.
+
+        Позиции запрашиваются в порядке возрастания; строки между ними
+        подсчитываются блоками фиксированного размера.
+
+        Args:
+            position (int): Позиция в буфере (не меньше предыдущей)
+
+        Returns:
+            int: Номер строки
+        """
+        while self.position < position:
+            end = min(position, self.position + LINE_COUNT_CHUNK)
+            self.line += self.buf[self.position:end].count(b"\n")
+            self.position = end
+        return self.line
@@ -0,0 +1,146 @@
+"""
+Раскладка сгенерированных тестов по файлам.
+
+По умолчанию каждому исходному файлу соответствует свой файл тестов. На
+больших проектах тестраннеры тратят основное время на сбор десятков
+тысяч маленьких файлов, поэтому тесты можно объединять:
+
+    file        - один файл тестов на исходный файл (по умолчанию)
+    package     - один файл тестов на директорию (пакет) исходных файлов
+    shards[:N]  - файлы примерно по N тестов: исходные файлы в порядке путей
+                  набираются в очередной файл, пока в нём не наберётся N тестов
+
+Объединённые файлы формирует генератор языка (render_test_bundle), так
+что имена тестов и импорты разных модулей не конфликтуют. Имена файлов
+тестов строятся из путей функцией flat_name, поэтому разные пути не дают
+одного имени.
+"""
+
+import os
+from typing import Callable, List, Optional, Sequence, Tuple
+
+LAYOUT_FILE = "file"
+LAYOUT_PACKAGE = "package"
+LAYOUT_SHARDS = "shards"
+LAYOUTS = (LAYOUT_FILE, LAYOUT_PACKAGE, LAYOUT_SHARDS)
+# Размер файла тестов по умолчанию для раскладки shards
+DEFAULT_SHARD_SIZE = 200
+# Метка файла тестов для исходных файлов в корне проекта (раскладка package)
+ROOT_LABEL = "root"
+
+# Группа: (метка файла тестов, исходные файлы)
+Bundle = Tuple[str, List[str]]
+
+
+class OutputLayout:
+    """Способ раскладки тестов по файлам"""
+
+    def __init__(self, kind: str = LAYOUT_FILE, shard_size: int = DEFAULT_SHARD_SIZE):
+        """
+        Args:
+            kind (str): Вид раскладки: "file", "package" или "shards"
+            shard_size (int): Примерное количество тестов в файле для раскладки shards
+        """
+        if kind not in LAYOUTS:
+            raise ValueError(f"Неизвестная раскладка тестов: {kind} (доступны: {', '.join(LAYOUTS)})")
+        if shard_size < 1:
+            raise ValueError("Размер файла тестов должен быть положительным")
+        self.kind = kind
+        self.shard_size = shard_size
+
+    @property
+    def bundled(self) -> bool:
+        """Объединяются ли тесты нескольких исходных файлов"""
+        return self.kind != LAYOUT_FILE
+
+    @property
+    def spec(self) -> str:
+        """Запись раскладки в виде параметра --layout"""
+        return f"{LAYOUT_SHARDS}:{self.shard_size}" if self.kind == LAYOUT_SHARDS else self.kind
+
+    def group(self, sources: Sequence[str], directory: str,
+              count_tests: Optional[Callable[[str], int]] = None) -> List[Bundle]:
+        """
+        Раскладывает исходные файлы по файлам тестов.
+
+        Args:
+            sources (Sequence[str]): Исходные файлы
+            directory (str): Корневая директория проекта
+            count_tests (Optional[Callable[[str], int]]): Количество тестов для исходного файла
+                (нужно для раскладки shards)
+
+        Returns:
+            List[Bundle]: Группы в порядке меток; файлы внутри группы в порядке путей
+        """
+        ordered = sorted(sources)
+        if self.kind == LAYOUT_FILE:
+            return [(path, [path]) for path in ordered]
+
+        if self.kind == LAYOUT_PACKAGE:
+            packages = {}
+            for path in ordered:
+                rel_dir = os.path.relpath(os.path.dirname(path), directory)
+                label = ROOT_LABEL if rel_dir == os.curdir else rel_dir.replace(os.sep, "/")
+                packages.setdefault(label, []).append(path)
+            return sorted(packages.items())
+
+        if count_tests is None:
+            raise ValueError("Для раскладки shards нужен подсчёт тестов")
+        shards: List[Bundle] = []
+        members: List[str] = []
+        size = 0
+        for path in ordered:
+            # Файлы без тестов тоже входят в группу: манифест запоминает, что тест для них не создан
+            members.append(path)
+            size += count_tests(path)
+            if size >= self.shard_size:
+                shards.append((f"shard{len(shards) + 1:04d}", members))
+                members, size = [], 0
+        if members:
+            shards.append((f"shard{len(shards) + 1:04d}", members))
+        return shards
+
+
+def flat_name(parts: Sequence[str]) -> str:
+    """
+    Склеивает части пути (директории и имя модуля) в одно имя файла тестов.
+
+    Подчёркивания внутри частей удваиваются, а части соединяются одним
+    подчёркиванием: "pkg/a_b" и "pkg_a/b" дают разные имена "pkg_a__b" и
+    "pkg__a_b". Совпасть могут только части, начинающиеся или
+    заканчивающиеся подчёркиванием; такие совпадения обнаруживает
+    generate_tests_incremental.
+
+    Args:
+        parts (Sequence[str]): Части пути
+
+    Returns:
+        str: Имя без префикса и расширения файла тестов
+    """
+    return "_".join(part.replace("_", "__") for part in parts)
+
+
+def parse_layout(text: Optional[str]) -> OutputLayout:
+    """
+    Разбирает параметр --layout.
+
+    Args:
+        text (Optional[str]): "file", "package", "shards" или "shards:N" (None - раскладка по умолчанию)
+
+    Returns:
+        OutputLayout: Раскладка
+
+    Raises:
+        ValueError: Неизвестная раскладка или неверный размер
+    """
+    if not text:
+        return OutputLayout()
+    kind, _, size = text.strip().lower().partition(":")
+    if not size:
+        return OutputLayout(kind)
+    if kind != LAYOUT_SHARDS:
+        raise ValueError(f"Размер указывается только для раскладки {LAYOUT_SHARDS}: {text}")
+    try:
+        return OutputLayout(kind, int(size))
+    except ValueError:
+        raise ValueError(f"Неверный размер файла тестов: {text}") from None
@@ -0,0 +1,82 @@
+"""
+Параллельная генерация тестов в пуле процессов.
+
+Исходные файлы поступают из ленивого обхода и отправляются в пул пачками,
+поэтому накладные расходы на передачу задач между процессами малы, а в
+очереди одновременно находится ограниченное число пачек. Процессы только
+формируют код тестов, а записывает их вызывающий процесс: результаты
+возвращаются строго в порядке обнаружения файлов, так что вывод не зависит
+от количества процессов. Так же формируются и объединённые файлы тестов
+(см. langs.output_layout): вместо исходного файла задачей служит группа.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+# Размер пачки файлов, отправляемой в один процесс
+DEFAULT_CHUNK_SIZE = 32
+# Сколько пачек на процесс может ждать в очереди
+PENDING_CHUNKS_PER_JOB = 4
+
+# Параметры генератора: (язык, фреймворк, директория тестов, корень проекта, использовать кэш)
+GeneratorOptions = Tuple[str, str, Optional[str], str, bool]
+# Результат для файла: (путь к тесту, код) или None
+RenderedTest = Optional[Tuple[str, str]]
+# Задача: исходный файл или группа (метка файла тестов, исходные файлы)
+Item = TypeVar("Item")
+
+# Функции формирования тестов, созданные в процессе пула (по одной на набор параметров)
+_WORKER_RENDERERS: Dict[Tuple[bool, GeneratorOptions], object] = {}
+
+
+def _generate_chunk(options: GeneratorOptions, paths: List[Item], bundled: bool = False) -> List[RenderedTest]:
+    """Формирует тесты для пачки файлов (или групп файлов) внутри процесса пула"""
+    render = _WORKER_RENDERERS.get((bundled, options))
+    if render is None:
+        # Импорт внутри функции: модуль загружается в процессе пула при первой задаче
+        from langs.lang_detector import get_bundle_renderer, get_test_renderer
+        render = (get_bundle_renderer if bundled else get_test_renderer)(*options)
+        _WORKER_RENDERERS[(bundled, options)] = render
+    return [render(path) for path in paths]
+
+
+def _chunks(paths: Iterable[Item], size: int) -> Iterator[List[Item]]:
+    chunk: List[Item] = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def generate_parallel(paths: Iterable[Item], options: GeneratorOptions, jobs: int,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE, bundled: bool = False) -> Iterator[Tuple[Item, RenderedTest]]:
+    """
+    Формирует тесты в пуле процессов, сохраняя порядок исходных файлов.
+
+    Args:
+        paths (Iterable[Item]): Исходные файлы (например, из iter_source_files) или группы файлов
+        options (GeneratorOptions): Параметры для get_test_renderer (get_bundle_renderer для групп)
+        jobs (int): Количество процессов
+        chunk_size (int): Количество файлов (групп) в одной задаче
+        bundled (bool): Задачи - группы (метка файла тестов, исходные файлы)
+
+    Yields:
+        Tuple[Item, RenderedTest]: Пара (исходный файл или группа, путь к тесту и код) в порядке paths
+    """
+    # Пул процессов нужен только при jobs > 1: модуль не замедляет запуск CLI
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        max_pending = jobs * PENDING_CHUNKS_PER_JOB
+        for chunk in _chunks(paths, chunk_size):
+            pending.append((chunk, pool.submit(_generate_chunk, options, chunk, bundled)))
+            # Ограничиваем очередь: обход не убегает далеко вперёд, память не растёт
+            if len(pending) >= max_pending:
+                chunk, future = pending.popleft()
+                yield from zip(chunk, future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            yield from zip(chunk, future.result())
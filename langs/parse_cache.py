@@ -0,0 +1,203 @@
+"""
+Кэш результатов разбора исходных файлов, общий для всех запусков.
+
+Ключ записи - хэш содержимого файла, поэтому неизменённые файлы не
+разбираются повторно, даже если их mtime изменился (например, после
+`git checkout`). Кэш хранится в .testgen/cache: снимок всех записей одним
+объектом marshal, за которым следуют дописанные в конец файла новые записи.
+При загрузке дописанные записи сливаются в новый снимок, потому что один
+большой объект marshal читается на порядки быстрее тысяч мелких. Журнал
+с повреждённой записью (например, оборванной при аварийном завершении)
+сразу перезаписывается прочитанными до неё записями: иначе все записи,
+дописанные после повреждённой, оставались бы невидимыми.
+"""
+
+import hashlib
+import io
+import marshal
+import os
+from typing import Any, Dict, Tuple
+
+from langs.cache import get_cache_dir
+
+PARSE_CACHE_VERSION = 1
+_HEADER_TAG = "testgen-parse-cache"
+
+# Количество дописанных записей, после которого журнал сливается в снимок
+COMPACT_MIN_RECORDS = 64
+
+_MISSING = object()
+
+
+def content_digest(data: bytes) -> bytes:
+    """
+    Возвращает компактный хэш содержимого файла.
+
+    Args:
+        data (bytes): Содержимое файла
+
+    Returns:
+        bytes: 16-байтовый хэш BLAKE2b
+    """
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class ParseCache:
+    """Журнал результатов разбора: относительный путь, хэш содержимого и результат"""
+
+    def __init__(self, root: str, name: str, version: str):
+        """
+        Args:
+            root (str): Корневая директория проекта
+            name (str): Имя файла кэша (например, "python-parse.bin")
+            version (str): Версия формата результата; при её смене кэш сбрасывается
+        """
+        self.root = root
+        self.path = os.path.join(get_cache_dir(root), name)
+        self.version = version
+        # Хэш содержимого -> результат разбора
+        self.by_digest: Dict[bytes, Any] = {}
+        # Относительный путь -> последний хэш содержимого
+        self.by_path: Dict[str, bytes] = {}
+        # Записи, дописанные после снимка
+        self.appended = 0
+        self._header = (_HEADER_TAG, PARSE_CACHE_VERSION, version)
+
+    def load(self) -> None:
+        """Загружает журнал и при необходимости сжимает его"""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return
+
+        stream = io.BytesIO(data)
+        try:
+            header = marshal.load(stream)
+        except (EOFError, ValueError, TypeError):
+            header = None
+        if header != self._header:
+            # Другая версия формата: журнал будет перезаписан при первой записи
+            self._remove()
+            return
+
+        corrupted = False
+        while stream.tell() < len(data):
+            try:
+                record = marshal.load(stream)
+            except (EOFError, ValueError, TypeError):
+                # Оборванная при аварийном завершении или повреждённая запись
+                corrupted = True
+                break
+            if record == self._header:
+                # Заголовок, записанный параллельным процессом
+                continue
+            if isinstance(record, list):
+                records = record
+            else:
+                records = [record]
+                self.appended += 1
+            try:
+                for rel_path, digest, value in records:
+                    self.by_path[rel_path] = digest
+                    self.by_digest[digest] = value
+            except (ValueError, TypeError):
+                corrupted = True
+                break
+
+        if corrupted or self.appended > COMPACT_MIN_RECORDS:
+            self.compact()
+
+    def get(self, digest: bytes) -> Tuple[bool, Any]:
+        """
+        Ищет результат разбора по хэшу содержимого.
+
+        Args:
+            digest (bytes): Хэш содержимого файла
+
+        Returns:
+            Tuple[bool, Any]: Признак наличия записи и результат разбора
+        """
+        value = self.by_digest.get(digest, _MISSING)
+        if value is _MISSING:
+            return False, None
+        return True, value
+
+    def put(self, file_path: str, digest: bytes, value: Any) -> None:
+        """
+        Запоминает результат разбора и дописывает его в журнал.
+
+        Args:
+            file_path (str): Путь к исходному файлу
+            digest (bytes): Хэш содержимого файла
+            value (Any): Результат разбора (значение, сериализуемое marshal)
+        """
+        rel_path = os.path.relpath(file_path, self.root).replace(os.sep, "/")
+        self.by_digest[digest] = value
+        if self.by_path.get(rel_path) == digest:
+            return
+        self.by_path[rel_path] = digest
+        record = marshal.dumps((rel_path, digest, value))
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            is_new = not os.path.exists(self.path)
+            # Одна запись O_APPEND на запись журнала: параллельные процессы не перемешивают данные
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                if is_new:
+                    os.write(fd, marshal.dumps(self._header))
+                os.write(fd, record)
+            finally:
+                os.close(fd)
+            self.appended += 1
+        except OSError:
+            # Кэш необязателен: например, проект может лежать на диске только для чтения
+            pass
+
+    def compact(self) -> None:
+        """Перезаписывает журнал одним снимком с последней записью для каждого существующего файла"""
+        live = {
+            rel_path: digest for rel_path, digest in self.by_path.items()
+            if os.path.exists(os.path.join(self.root, *rel_path.split("/")))
+        }
+        try:
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                marshal.dump(self._header, f)
+                marshal.dump([(rel_path, digest, self.by_digest[digest]) for rel_path, digest in live.items()], f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            return
+        self.by_path = live
+        self.by_digest = {digest: self.by_digest[digest] for digest in live.values()}
+        self.appended = 0
+
+    def _remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+_CACHES: Dict[Tuple[str, str], ParseCache] = {}
+
+
+def get_parse_cache(root: str, name: str, version: str) -> ParseCache:
+    """
+    Возвращает загруженный кэш разбора проекта (один экземпляр на процесс).
+
+    Args:
+        root (str): Корневая директория проекта
+        name (str): Имя файла кэша
+        version (str): Версия формата результата
+
+    Returns:
+        ParseCache: Кэш разбора
+    """
+    key = (os.path.abspath(root), name)
+    cache = _CACHES.get(key)
+    if cache is None or cache.version != version:
+        cache = ParseCache(root, name, version)
+        cache.load()
+        _CACHES[key] = cache
+    return cache
@@ -0,0 +1,311 @@
+"""
+Реестр языковых плагинов.
+
+Плагин описывает язык: шаблоны файлов для определения языка, исходных
+файлов и файлов тестов, тестовые фреймворки, модуль генератора тестов и
+команды запуска тестов. Описание плагина - лёгкий объект без импортов:
+модуль генератора загружается только при первом обращении к нему, то есть
+когда язык действительно используется.
+
+Встроенные плагины объявлены в langs.builtin_plugins. Сторонние пакеты
+регистрируют плагины через точку входа группы "testgen.languages"; её
+значение - LanguagePlugin, список плагинов или функция, возвращающая их.
+Точки входа читаются один раз, при первом обращении к списку всех языков
+или к языку, которого нет среди встроенных.
+
+Модуль генератора реализует функции:
+    generate_tests(file_path, framework, output_dir, project_path, use_cache)
+    render_test_file(file_path, framework, output_dir, project_path, use_cache)
+    extract_symbols(source, file_path, project_path, use_cache)
+    generator_signature(framework, project_path)
+и может реализовать render_test_bundle(file_paths, label, framework, output_dir,
+project_path, use_cache) - один файл тестов для группы исходных файлов
+(раскладки package и shards, см. langs.output_layout).
+"""
+
+import importlib
+import warnings
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from langs.file_scanner import LanguageClassifier
+from langs.glob_matcher import compile_name_matcher
+
+ENTRY_POINT_GROUP = "testgen.languages"
+
+# Команда запуска тестов: список аргументов (подстановка {test_path}) или функция (путь к тестам -> аргументы)
+RunCommand = Union[Sequence[str], Callable[[str], List[str]]]
+# Аргументы, исключающие поддеревья из запуска: директории относительно корня запуска -> аргументы
+ExcludeArgs = Callable[[Sequence[str]], List[str]]
+
+# Единицы, на которые делятся тесты при запуске части тестов (см. testengines.sharding)
+UNIT_FILES = "files"
+# Файлы; слишком долгие файлы делятся на отдельные тесты (их идентификаторы передаются фреймворку)
+UNIT_TESTS = "tests"
+UNIT_PACKAGES = "packages"
+# Аргумент команды запуска части тестов, вместо которого подставляются выбранные файлы, тесты или пакеты
+SUBSET_PLACEHOLDER = "{tests}"
+
+
+class LanguagePlugin:
+    """Описание поддержки языка"""
+
+    def __init__(self, name: str, patterns: Sequence[str], source_patterns: Sequence[str],
+                 test_patterns: Sequence[str] = (), frameworks: Sequence[str] = (),
+                 generator: Optional[str] = None, commands: Optional[Dict[str, RunCommand]] = None,
+                 verbose_flags: Optional[Dict[str, Sequence[str]]] = None,
+                 subset_commands: Optional[Dict[str, Sequence[str]]] = None,
+                 shard_units: Optional[Dict[str, str]] = None,
+                 collect_commands: Optional[Dict[str, Sequence[str]]] = None,
+                 exclude_args: Optional[Dict[str, ExcludeArgs]] = None):
+        """
+        Args:
+            name (str): Имя языка (например, "python")
+            patterns (Sequence[str]): Шаблоны файлов для определения языка проекта
+            source_patterns (Sequence[str]): Шаблоны исходных файлов для генерации тестов
+            test_patterns (Sequence[str]): Шаблоны файлов тестов (исключаются из исходных)
+            frameworks (Sequence[str]): Тестовые фреймворки; первый используется по умолчанию
+            generator (Optional[str]): Имя модуля генератора тестов (импортируется при первом использовании)
+            commands (Optional[Dict[str, RunCommand]]): Команды запуска тестов по фреймворкам
+            verbose_flags (Optional[Dict[str, Sequence[str]]]): Аргументы подробного вывода по фреймворкам
+            subset_commands (Optional[Dict[str, Sequence[str]]]): Команды запуска части тестов по фреймворкам
+                (аргумент "{tests}" заменяется выбранными файлами, тестами или пакетами)
+            shard_units (Optional[Dict[str, str]]): Единицы деления тестов по фреймворкам
+                (UNIT_FILES по умолчанию, UNIT_TESTS или UNIT_PACKAGES)
+            collect_commands (Optional[Dict[str, Sequence[str]]]): Команды, печатающие идентификаторы тестов
+                файлов "{tests}" по одному на строку (для UNIT_TESTS)
+            exclude_args (Optional[Dict[str, ExcludeArgs]]): Аргументы, исключающие директории
+                (например, вложенные проекты) из запуска всех тестов, по фреймворкам
+        """
+        self.name = name
+        self.patterns = list(patterns)
+        self.source_patterns = list(source_patterns)
+        self.test_patterns = list(test_patterns)
+        self.frameworks = list(frameworks)
+        self.generator = generator
+        self.commands = dict(commands or {})
+        self.verbose_flags = dict(verbose_flags or {})
+        self.subset_commands = dict(subset_commands or {})
+        self.shard_units = dict(shard_units or {})
+        self.collect_commands = dict(collect_commands or {})
+        self.exclude_args = dict(exclude_args or {})
+        self._generator_module = None
+        self._source_matcher = None
+        self._test_matcher = None
+
+    def generator_module(self):
+        """
+        Возвращает модуль генератора тестов, импортируя его при первом обращении.
+
+        Returns:
+            Optional[ModuleType]: Модуль генератора или None, если генератор не объявлен
+
+        Raises:
+            ImportError: Модуль генератора не найден
+        """
+        if self.generator is None:
+            return None
+        if self._generator_module is None:
+            self._generator_module = importlib.import_module(self.generator)
+        return self._generator_module
+
+    def source_matcher(self) -> Callable[[str], object]:
+        """Возвращает скомпилированный сопоставитель исходных (не тестовых) файлов"""
+        if self._source_matcher is None:
+            self._source_matcher = compile_name_matcher(self.source_patterns, self.test_patterns)
+        return self._source_matcher
+
+    def test_matcher(self) -> Optional[Callable[[str], object]]:
+        """Возвращает скомпилированный сопоставитель файлов тестов (None, если шаблонов нет)"""
+        if self._test_matcher is None and self.test_patterns:
+            self._test_matcher = compile_name_matcher(self.test_patterns)
+        return self._test_matcher
+
+    def run_command(self, framework: str, test_path: str, verbose: bool = False,
+                    exclude: Sequence[str] = ()) -> Optional[List[str]]:
+        """
+        Формирует команду запуска тестов.
+
+        Args:
+            framework (str): Тестовый фреймворк
+            test_path (str): Путь к директории с тестами
+            verbose (bool): Добавить аргументы подробного вывода
+            exclude (Sequence[str]): Директории (относительно корня запуска), тесты которых не запускаются;
+                фреймворки без exclude_args их не исключают
+
+        Returns:
+            Optional[List[str]]: Аргументы команды или None, если фреймворк не поддерживается
+        """
+        framework = framework.lower()
+        command = self.commands.get(framework)
+        if command is None:
+            return None
+        if callable(command):
+            args = list(command(test_path))
+        else:
+            args = [arg.format(test_path=test_path) for arg in command]
+        if verbose:
+            args.extend(self.verbose_flags.get(framework, ()))
+        if exclude and framework in self.exclude_args:
+            args.extend(self.exclude_args[framework](exclude))
+        return args
+
+    @staticmethod
+    def _expand(command: Sequence[str], tests: Sequence[str]) -> List[str]:
+        args = []
+        for arg in command:
+            if arg == SUBSET_PLACEHOLDER:
+                args.extend(tests)
+            else:
+                args.append(arg)
+        return args
+
+    def subset_command(self, framework: str, tests: Sequence[str], verbose: bool = False) -> Optional[List[str]]:
+        """
+        Формирует команду запуска части тестов (шард или процесс --workers).
+
+        Args:
+            framework (str): Тестовый фреймворк
+            tests (Sequence[str]): Файлы, идентификаторы тестов или пакеты (см. shard_unit)
+            verbose (bool): Добавить аргументы подробного вывода
+
+        Returns:
+            Optional[List[str]]: Аргументы команды или None, если фреймворк не умеет запускать часть тестов
+        """
+        framework = framework.lower()
+        command = self.subset_commands.get(framework)
+        if command is None:
+            return None
+        args = self._expand(command, tests)
+        if verbose:
+            args.extend(self.verbose_flags.get(framework, ()))
+        return args
+
+    def shard_unit(self, framework: str) -> str:
+        """Возвращает единицу деления тестов фреймворка (UNIT_FILES, UNIT_TESTS или UNIT_PACKAGES)"""
+        return self.shard_units.get(framework.lower(), UNIT_FILES)
+
+    def collect_command(self, framework: str, files: Sequence[str]) -> Optional[List[str]]:
+        """
+        Формирует команду, печатающую идентификаторы тестов файлов.
+
+        Args:
+            framework (str): Тестовый фреймворк
+            files (Sequence[str]): Файлы тестов
+
+        Returns:
+            Optional[List[str]]: Аргументы команды или None, если фреймворк не сообщает идентификаторы тестов
+        """
+        command = self.collect_commands.get(framework.lower())
+        return self._expand(command, files) if command is not None else None
+
+
+# Зарегистрированные плагины по имени языка
+_PLUGINS: Dict[str, LanguagePlugin] = {}
+_BUILTINS_LOADED = False
+_ENTRY_POINTS_LOADED = False
+# Классификатор по шаблонам всех плагинов (сбрасывается при регистрации)
+_CLASSIFIER: Optional[LanguageClassifier] = None
+
+
+def register_plugin(plugin: LanguagePlugin) -> None:
+    """
+    Регистрирует плагин языка (заменяя плагин с тем же именем).
+
+    Args:
+        plugin (LanguagePlugin): Плагин
+    """
+    global _CLASSIFIER
+    _load_builtins()
+    _PLUGINS[plugin.name.lower()] = plugin
+    _CLASSIFIER = None
+
+
+def _load_builtins() -> None:
+    global _BUILTINS_LOADED
+    if not _BUILTINS_LOADED:
+        _BUILTINS_LOADED = True
+        from langs.builtin_plugins import PLUGINS
+        for plugin in PLUGINS:
+            _PLUGINS.setdefault(plugin.name, plugin)
+
+
+def _iter_entry_points():
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        # Python 3.7: точки входа без importlib.metadata не поддерживаются
+        return []
+    points = entry_points()
+    if hasattr(points, "select"):
+        return points.select(group=ENTRY_POINT_GROUP)
+    return points.get(ENTRY_POINT_GROUP, [])
+
+
+def _load_entry_points() -> None:
+    global _ENTRY_POINTS_LOADED
+    if _ENTRY_POINTS_LOADED:
+        return
+    _ENTRY_POINTS_LOADED = True
+    _load_builtins()
+    for point in _iter_entry_points():
+        try:
+            loaded = point.load()
+            if callable(loaded) and not isinstance(loaded, LanguagePlugin):
+                loaded = loaded()
+            for plugin in ([loaded] if isinstance(loaded, LanguagePlugin) else loaded):
+                register_plugin(plugin)
+        except Exception as e:
+            # Ошибка в стороннем плагине не должна ломать работу с остальными языками
+            warnings.warn(f"Не удалось загрузить плагин {point.name}: {e}")
+
+
+def get_plugin(language: str) -> Optional[LanguagePlugin]:
+    """
+    Возвращает плагин языка.
+
+    Args:
+        language (str): Имя языка
+
+    Returns:
+        Optional[LanguagePlugin]: Плагин или None, если язык не поддерживается
+    """
+    _load_builtins()
+    plugin = _PLUGINS.get(language.lower())
+    if plugin is None and not _ENTRY_POINTS_LOADED:
+        _load_entry_points()
+        plugin = _PLUGINS.get(language.lower())
+    return plugin
+
+
+def get_plugins() -> List[LanguagePlugin]:
+    """
+    Возвращает все зарегистрированные плагины, включая сторонние.
+
+    Returns:
+        List[LanguagePlugin]: Плагины в порядке регистрации
+    """
+    _load_entry_points()
+    return list(_PLUGINS.values())
+
+
+def get_language_patterns() -> Dict[str, List[str]]:
+    """
+    Возвращает шаблоны определения языка проекта для всех плагинов.
+
+    Returns:
+        Dict[str, List[str]]: Язык -> шаблоны файлов
+    """
+    return {plugin.name: plugin.patterns for plugin in get_plugins()}
+
+
+def get_classifier() -> LanguageClassifier:
+    """
+    Возвращает классификатор файлов по шаблонам всех плагинов.
+
+    Returns:
+        LanguageClassifier: Классификатор (строится один раз)
+    """
+    global _CLASSIFIER
+    if _CLASSIFIER is None:
+        _CLASSIFIER = LanguageClassifier(get_language_patterns())
+    return _CLASSIFIER
@@ -0,0 +1,212 @@
+"""
+Карта проектов в полиглотном монорепозитории.
+
+За один проход по списку файлов находит корни проектов по манифестам
+(pyproject.toml, go.mod, package.json, ...), относит каждый файл к
+ближайшему корню и определяет для каждого корня язык и тестовый фреймворк
+по умолчанию.
+"""
+
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from langs.file_scanner import LanguageClassifier
+from langs.sampled_detection import MANIFEST_WEIGHTS
+
+# Манифест -> язык проекта
+MANIFEST_LANGUAGES = {name: lang for name, (lang, _) in MANIFEST_WEIGHTS.items()}
+# Манифесты, определяемые по расширению
+MANIFEST_EXTENSIONS = {".csproj": "csharp"}
+
+# Сколько байт манифеста читать при поиске упоминаний фреймворков
+MANIFEST_READ_LIMIT = 1024 * 1024
+
+
+class ProjectInfo:
+    """Проект внутри репозитория: корень, язык и тестовый фреймворк"""
+
+    def __init__(self, path: str, language: str, framework: Optional[str], file_count: int,
+                 manifests: List[str]):
+        self.path = path
+        self.language = language
+        self.framework = framework
+        # Количество исходных файлов языка проекта, не считая вложенные проекты
+        self.file_count = file_count
+        self.manifests = manifests
+        # Корни вложенных проектов, которые нужно исключать при обходе этого проекта
+        self.nested: List[str] = []
+
+
+def manifest_language(name: str) -> Optional[str]:
+    """
+    Возвращает язык, на который указывает манифест.
+
+    Args:
+        name (str): Имя файла
+
+    Returns:
+        Optional[str]: Язык или None, если файл не является манифестом
+    """
+    lang = MANIFEST_LANGUAGES.get(name)
+    if lang is None:
+        lang = MANIFEST_EXTENSIONS.get(os.path.splitext(name)[1])
+    return lang
+
+
+def _parent_rel(rel_dir: str) -> Optional[str]:
+    if not rel_dir:
+        return None
+    return rel_dir.rpartition("/")[0]
+
+
+def _detect_framework(directory: str, manifests: List[str], frameworks: List[str]) -> Optional[str]:
+    """
+    Выбирает фреймворк по упоминаниям в манифестах проекта.
+
+    Args:
+        directory (str): Корень проекта
+        manifests (List[str]): Имена манифестов в корне
+        frameworks (List[str]): Доступные фреймворки языка в порядке предпочтения
+
+    Returns:
+        Optional[str]: Упомянутый в манифестах фреймворк или первый доступный
+    """
+    if not frameworks:
+        return None
+    contents = []
+    for name in manifests:
+        try:
+            with open(os.path.join(directory, name), encoding="utf-8", errors="replace") as f:
+                contents.append(f.read(MANIFEST_READ_LIMIT).lower())
+        except OSError:
+            continue
+    text = "\n".join(contents)
+    for framework in frameworks:
+        if framework.lower() in text:
+            return framework
+    return frameworks[0]
+
+
+def build_project_map(root: str, files: Iterable[Tuple[str, str]], classifier: LanguageClassifier,
+                      frameworks_for: Callable[[str], List[str]]) -> Dict[str, ProjectInfo]:
+    """
+    Строит карту проектов по списку файлов.
+
+    Args:
+        root (str): Корневая директория репозитория
+        files (Iterable[Tuple[str, str]]): Пары (путь к директории, имя файла)
+        classifier (LanguageClassifier): Классификатор файлов по языкам
+        frameworks_for (Callable[[str], List[str]]): Доступные фреймворки для языка
+
+    Returns:
+        Dict[str, ProjectInfo]: Путь к корню проекта -> сведения о проекте,
+            от внешних проектов к вложенным
+    """
+    # Единственный проход по файлам: количества по директориям и манифесты
+    counts: Dict[str, Dict[str, int]] = {}
+    manifests: Dict[str, List[str]] = {}
+    rel_dirs: Dict[str, str] = {}
+    classify = classifier.classify
+    for dir_path, name in files:
+        rel_dir = rel_dirs.get(dir_path)
+        if rel_dir is None:
+            rel_dir = os.path.relpath(dir_path, root).replace(os.sep, "/")
+            rel_dir = "" if rel_dir == "." else rel_dir
+            rel_dirs[dir_path] = rel_dir
+        if manifest_language(name) is not None:
+            manifests.setdefault(rel_dir, []).append(name)
+            continue
+        langs = classify(name)
+        if langs:
+            dir_counts = counts.setdefault(rel_dir, {})
+            for lang in langs:
+                dir_counts[lang] = dir_counts.get(lang, 0) + 1
+
+    # Кандидаты в корни: директории с манифестами и корень репозитория
+    candidates = set(manifests) | {""}
+
+    def nearest_candidate(rel_dir: Optional[str]) -> str:
+        while rel_dir is not None and rel_dir not in candidates:
+            rel_dir = _parent_rel(rel_dir)
+        return rel_dir if rel_dir is not None else ""
+
+    totals: Dict[str, Dict[str, int]] = {candidate: {} for candidate in candidates}
+    for rel_dir, dir_counts in counts.items():
+        target = totals[nearest_candidate(rel_dir)]
+        for lang, count in dir_counts.items():
+            target[lang] = target.get(lang, 0) + count
+
+    # От вложенных к внешним: кандидат без исходных файлов своего языка
+    # (например, package.json только для инструментов) отдаёт файлы родителю
+    chosen: Dict[str, str] = {}
+    for candidate in sorted(candidates, key=lambda rel: rel.count("/") + bool(rel), reverse=True):
+        own = totals[candidate]
+        languages = [manifest_language(name) for name in manifests.get(candidate, [])]
+        languages = [lang for lang in dict.fromkeys(languages) if own.get(lang, 0) > 0]
+        if not languages and candidate == "":
+            # Корень репозитория без подходящего манифеста: язык по количеству файлов
+            languages = [lang for lang, count in own.items() if count > 0]
+        if languages:
+            chosen[candidate] = max(languages, key=lambda lang: own.get(lang, 0))
+        elif candidate:
+            parent = totals[nearest_candidate(_parent_rel(candidate))]
+            for lang, count in own.items():
+                parent[lang] = parent.get(lang, 0) + count
+
+    project_map: Dict[str, ProjectInfo] = {}
+    for rel_dir in sorted(chosen, key=lambda rel: (rel.count("/") + bool(rel), rel)):
+        language = chosen[rel_dir]
+        path = os.path.join(root, *rel_dir.split("/")) if rel_dir else root
+        project_manifests = manifests.get(rel_dir, [])
+        framework = _detect_framework(path, project_manifests, frameworks_for(language))
+        project_map[path] = ProjectInfo(path, language, framework, totals[rel_dir].get(language, 0),
+                                        project_manifests)
+
+    # Вложенные проекты исключаются из обхода внешних
+    rel_by_path = {path: os.path.relpath(path, root).replace(os.sep, "/") for path in project_map}
+    for path, info in project_map.items():
+        rel = rel_by_path[path]
+        prefix = "" if rel == "." else rel + "/"
+        info.nested = [
+            other for other, other_rel in rel_by_path.items()
+            if other != path and other_rel != "." and other_rel.startswith(prefix)
+        ]
+    return project_map
+
+def find_project_root(path: str, language: str) -> str:
+    """
+    Находит корень проекта языка, которому принадлежит путь к тестам.
+
+    Корень - ближайшая директория (начиная с самого пути) с манифестом языка
+    (go.mod, package.json, pyproject.toml, ...); внутри текущей директории
+    поиск не поднимается выше неё. Из корня запускаются тесты проекта, и в
+    нём хранится история их длительности - так же, как для проектов
+    полиглотного репозитория, найденных build_project_map.
+
+    Args:
+        path (str): Путь к тестам (файл или директория)
+        language (str): Язык проекта
+
+    Returns:
+        str: Корень проекта; если манифест не найден - текущая директория (".")
+            или, для пути вне её, директория пути
+    """
+    directory = os.path.abspath(path if os.path.isdir(path) else os.path.dirname(path) or ".")
+    cwd = os.getcwd()
+    try:
+        inside = os.path.commonpath([directory, cwd]) == cwd
+    except ValueError:
+        # Разные диски в Windows
+        inside = False
+    current = directory
+    while True:
+        try:
+            names = os.listdir(current)
+        except OSError:
+            names = []
+        if any(manifest_language(name) == language for name in names):
+            return os.path.relpath(current) if inside else current
+        parent = os.path.dirname(current)
+        if (inside and current == cwd) or parent == current:
+            return "." if inside else directory
+        current = parent
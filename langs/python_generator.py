@@ -0,0 +1,419 @@
+"""
+Генератор тестов для Python на основе модуля ast.
+
+Из исходного файла извлекаются публичные функции, классы и их методы, по
+которым по шаблонам langs/templates/python/<фреймворк>.tmpl (см.
+langs.template_engine) строятся заготовки тестов для pytest или unittest.
+Результат разбора кэшируется по хэшу содержимого файла (см. langs.parse_cache), так
+что при повторной генерации неизменённые модули не разбираются заново.
+Тесты нескольких модулей можно объединить в один файл (render_test_bundle).
+"""
+
+import ast
+import os
+from typing import List, Optional, Tuple
+
+from langs.output_layout import flat_name
+from langs.parse_cache import content_digest, get_parse_cache
+from langs.template_engine import load_template
+from langs.test_writer import write_if_changed
+
+# Версия генератора: меняется при изменении формата разбора или вида тестов
+GENERATOR_VERSION = "1"
+PARSE_CACHE_NAME = "python-parse.bin"
+
+# Функция: (имя, аргументы, асинхронная, первая строка, последняя строка)
+FunctionInfo = Tuple[str, Tuple[str, ...], bool, int, int]
+# Класс: (имя, методы, первая строка, последняя строка)
+ClassInfo = Tuple[str, Tuple[FunctionInfo, ...], int, int]
+# Модуль: (функции, классы)
+ModuleInfo = Tuple[Tuple[FunctionInfo, ...], Tuple[ClassInfo, ...]]
+
+
+def _is_public(name: str) -> bool:
+    return not name.startswith("_")
+
+
+def _function_info(node) -> FunctionInfo:
+    args = node.args
+    # posonlyargs появились в ast только в Python 3.8
+    names = [arg.arg for arg in getattr(args, "posonlyargs", []) + args.args]
+    if args.vararg:
+        names.append("*" + args.vararg.arg)
+    names.extend(arg.arg for arg in args.kwonlyargs)
+    if args.kwarg:
+        names.append("**" + args.kwarg.arg)
+    return (
+        node.name,
+        tuple(names),
+        isinstance(node, ast.AsyncFunctionDef),
+        node.lineno,
+        getattr(node, "end_lineno", node.lineno),
+    )
+
+
+def parse_module(source: bytes) -> Optional[ModuleInfo]:
+    """
+    Извлекает публичные функции, классы и методы модуля.
+
+    Args:
+        source (bytes): Исходный код модуля
+
+    Returns:
+        Optional[ModuleInfo]: Функции и классы верхнего уровня или None при синтаксической ошибке
+    """
+    if not isinstance(source, (bytes, str)):
+        # ast разбирает только строки: отображение файла в память копируется
+        source = bytes(source)
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+
+    functions: List[FunctionInfo] = []
+    classes: List[ClassInfo] = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and _is_public(node.name):
+            functions.append(_function_info(node))
+        elif isinstance(node, ast.ClassDef) and _is_public(node.name):
+            methods = tuple(
+                _function_info(item) for item in node.body
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and _is_public(item.name)
+            )
+            classes.append((node.name, methods, node.lineno, getattr(node, "end_lineno", node.lineno)))
+    return tuple(functions), tuple(classes)
+
+
+def analyze_source(source: bytes, file_path: str, project_path: str = ".",
+                   use_cache: bool = True) -> Optional[ModuleInfo]:
+    """
+    Разбирает уже прочитанное содержимое файла, используя кэш по хэшу содержимого.
+
+    Args:
+        source (bytes): Содержимое файла
+        file_path (str): Путь к исходному файлу
+        project_path (str): Корневая директория проекта (для расположения кэша)
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        Optional[ModuleInfo]: Результат разбора или None при синтаксической ошибке
+    """
+    if not use_cache:
+        return parse_module(source)
+
+    cache = get_parse_cache(project_path, PARSE_CACHE_NAME, GENERATOR_VERSION)
+    digest = content_digest(source)
+    found, info = cache.get(digest)
+    if not found:
+        info = parse_module(source)
+    # Содержимое могло разбираться под другим путём: запись привязывается и к этому пути
+    cache.put(file_path, digest, info)
+    return info
+
+
+def analyze_file(file_path: str, project_path: str = ".", use_cache: bool = True) -> Optional[ModuleInfo]:
+    """
+    Разбирает файл, используя кэш по хэшу содержимого.
+
+    Args:
+        file_path (str): Путь к исходному файлу
+        project_path (str): Корневая директория проекта (для расположения кэша)
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        Optional[ModuleInfo]: Результат разбора или None при синтаксической ошибке
+    """
+    with open(file_path, "rb") as f:
+        source = f.read()
+    return analyze_source(source, file_path, project_path, use_cache)
+
+
+def extract_symbols(source: bytes, file_path: str, project_path: str = ".",
+                    use_cache: bool = True) -> List[Tuple[str, str, str, str, int, int]]:
+    """
+    Возвращает публичные символы модуля для индекса символов.
+
+    Args:
+        source (bytes): Содержимое файла
+        file_path (str): Путь к исходному файлу
+        project_path (str): Корневая директория проекта
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        List[Tuple[str, str, str, str, int, int]]: Символы (вид, имя, полное имя,
+            сигнатура, первая строка, последняя строка); вид - "function", "class" или "method"
+    """
+    info = analyze_source(source, file_path, project_path, use_cache)
+    if info is None:
+        return []
+    symbols = []
+    for function in info[0]:
+        symbols.append(("function", function[0], function[0], _signature(function), function[3], function[4]))
+    for name, methods, start, end in info[1]:
+        symbols.append(("class", name, name, name, start, end))
+        for method in methods:
+            symbols.append(("method", method[0], f"{name}.{method[0]}", _signature(method), method[3], method[4]))
+    return symbols
+
+
+def module_name(file_path: str, project_path: str = ".") -> str:
+    """
+    Возвращает имя модуля для импорта в тесте.
+
+    Args:
+        file_path (str): Путь к исходному файлу
+        project_path (str): Корневая директория проекта
+
+    Returns:
+        str: Имя модуля через точку (например, "pkg.utils")
+    """
+    rel_path = os.path.relpath(file_path, project_path)
+    if rel_path.startswith(os.pardir + os.sep) or os.path.isabs(rel_path):
+        rel_path = os.path.basename(file_path)
+    parts = os.path.splitext(rel_path)[0].split(os.sep)
+    if parts[-1] == "__init__" and len(parts) > 1:
+        parts = parts[:-1]
+    return ".".join(parts)
+
+
+def output_file_name(module: str) -> str:
+    """
+    Возвращает имя файла теста для модуля.
+
+    Args:
+        module (str): Имя модуля через точку
+
+    Returns:
+        str: Имя файла (например, "test_pkg_utils.py"; для "pkg.my_utils" - "test_pkg_my__utils.py")
+    """
+    return "test_" + flat_name(module.split(".")) + ".py"
+
+
+def _signature(function: FunctionInfo) -> str:
+    return f"{function[0]}({', '.join(function[1])})"
+
+
+def _camel(name: str) -> str:
+    return "".join(part[:1].upper() + part[1:] for part in name.split("_") if part)
+
+
+# Тест: (имя теста, описание, проверяемое выражение, асинхронный объект)
+_TestCase = Tuple[str, str, str, bool]
+
+
+def _test_groups(info: ModuleInfo, module: str, alias: Optional[str] = None) -> List[Tuple[str, bool, List[_TestCase]]]:
+    """
+    Раскладывает тесты по группам (имя класса тестов, функции модуля, тесты): функции модуля, затем каждый класс.
+
+    В объединённом файле (alias - псевдоним импортированного модуля) функции модуля
+    тоже собираются в класс, а имена классов тестов и выражения получают префикс модуля.
+    """
+    functions, classes = info
+    prefix = f"{alias}." if alias else ""
+    owner = _camel(alias) if alias else ""
+    groups = []
+    if functions:
+        groups.append((f"Test{_camel(alias or module.rpartition('.')[2])}Functions", alias is None, [
+            (f"test_{function[0]}", f"Тест для функции {_signature(function)}", prefix + function[0], function[2])
+            for function in functions
+        ]))
+    for name, methods, _, _ in classes:
+        cases = [
+            (f"test_{method[0]}", f"Тест для метода {name}.{_signature(method)}",
+             f"{prefix}{name}.{method[0]}", method[2])
+            for method in methods
+        ]
+        if not cases:
+            cases.append(("test_create", f"Тест для класса {name}", prefix + name, False))
+        groups.append((f"Test{owner}{name}", False, cases))
+    return groups
+
+
+def _load_template(framework: str, project_path: str, use_cache: bool):
+    template = load_template("python", framework, project_path, use_cache)
+    if template is None:
+        raise ValueError(f"Не найден шаблон тестов python/{framework}")
+    return template
+
+
+def _imported_names(info: ModuleInfo) -> List[str]:
+    return [function[0] for function in info[0]] + [cls[0] for cls in info[1]]
+
+
+def render_tests(info: ModuleInfo, module: str, framework: str = "pytest", project_path: str = ".",
+                 use_cache: bool = True) -> str:
+    """
+    Формирует исходный код заготовок тестов для модуля.
+
+    Args:
+        info (ModuleInfo): Результат разбора модуля
+        module (str): Имя модуля для импорта
+        framework (str): Тестовый фреймворк ("pytest" или "unittest")
+        project_path (str): Корневая директория проекта (шаблоны из .testgen/templates)
+        use_cache (bool): Использовать кэш скомпилированных шаблонов из .testgen/cache
+
+    Returns:
+        str: Исходный код файла тестов
+    """
+    template = _load_template(framework, project_path, use_cache)
+    imported = _imported_names(info)
+    return template.render({
+        "module": module,
+        "subject": f"модуля {module}",
+        "imports": [(module, None, imported)],
+        "imported": imported,
+        "groups": _test_groups(info, module),
+    })
+
+
+def render_bundle(modules: List[Tuple[str, ModuleInfo]], label: str, framework: str = "pytest",
+                  project_path: str = ".", use_cache: bool = True) -> str:
+    """
+    Формирует исходный код заготовок тестов для нескольких модулей в одном файле.
+
+    Каждый модуль импортируется целиком под псевдонимом из его имени, поэтому
+    одинаковые имена в разных модулях не конфликтуют.
+
+    Args:
+        modules (List[Tuple[str, ModuleInfo]]): Имена модулей и результаты их разбора
+        label (str): Метка файла тестов (см. langs.output_layout)
+        framework (str): Тестовый фреймворк ("pytest" или "unittest")
+        project_path (str): Корневая директория проекта (шаблоны из .testgen/templates)
+        use_cache (bool): Использовать кэш скомпилированных шаблонов из .testgen/cache
+
+    Returns:
+        str: Исходный код файла тестов
+    """
+    template = _load_template(framework, project_path, use_cache)
+    # Псевдоним не должен закрывать модуль тестового фреймворка
+    aliases = {"pytest", "unittest"}
+    imports = []
+    groups = []
+    for module, info in modules:
+        alias = base = module.replace(".", "_")
+        suffix = 1
+        while alias in aliases:
+            suffix += 1
+            alias = f"{base}_{suffix}"
+        aliases.add(alias)
+        imports.append((module, alias, _imported_names(info)))
+        groups.extend(_test_groups(info, module, alias))
+    return template.render({
+        "module": label.replace("/", "."),
+        "subject": ("модуля " if len(modules) == 1 else "модулей ") + ", ".join(module for module, _ in modules),
+        "imports": imports,
+        "imported": [],
+        "groups": groups,
+    })
+
+
+def generator_signature(framework: str = "pytest", project_path: str = ".") -> Tuple[str, str]:
+    """
+    Возвращает версию генератора и хэш шаблона для манифеста генерации.
+
+    Args:
+        framework (str): Тестовый фреймворк
+        project_path (str): Корневая директория проекта (шаблоны из .testgen/templates)
+
+    Returns:
+        Tuple[str, str]: Версия генератора и хэш шаблона
+    """
+    return GENERATOR_VERSION, _load_template(framework, project_path, True).hash
+
+
+def render_test_file(file_path: str, framework: str = "pytest", output_dir: Optional[str] = None,
+                     project_path: str = ".", use_cache: bool = True) -> Optional[Tuple[str, str]]:
+    """
+    Формирует файл тестов для Python-модуля, не записывая его.
+
+    Args:
+        file_path (str): Путь к исходному файлу
+        framework (str): Тестовый фреймворк ("pytest" или "unittest")
+        output_dir (Optional[str]): Директория тестов (если None, возвращается только имя файла)
+        project_path (str): Корневая директория проекта (для имён модулей и кэша разбора)
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        Optional[Tuple[str, str]]: Путь к файлу теста и его код; None, если в модуле
+            нет публичных функций и классов или он не разбирается
+    """
+    info = analyze_file(file_path, project_path, use_cache)
+    if not info or not (info[0] or info[1]):
+        return None
+    module = module_name(file_path, project_path)
+    name = output_file_name(module)
+    test_path = os.path.join(output_dir, name) if output_dir is not None else name
+    return test_path, render_tests(info, module, framework, project_path, use_cache)
+
+
+def bundle_file_name(label: str) -> str:
+    """
+    Возвращает имя файла тестов, объединяющего несколько модулей.
+
+    Args:
+        label (str): Метка файла тестов (например, "pkg/utils" или "shard0001")
+
+    Returns:
+        str: Имя файла (например, "test_pkg_utils.py")
+    """
+    return output_file_name(label.replace("/", "."))
+
+
+def render_test_bundle(file_paths: List[str], label: str, framework: str = "pytest",
+                       output_dir: Optional[str] = None, project_path: str = ".",
+                       use_cache: bool = True) -> Optional[Tuple[str, str]]:
+    """
+    Формирует один файл тестов для нескольких Python-модулей, не записывая его.
+
+    Args:
+        file_paths (List[str]): Пути к исходным файлам
+        label (str): Метка файла тестов (см. langs.output_layout)
+        framework (str): Тестовый фреймворк ("pytest" или "unittest")
+        output_dir (Optional[str]): Директория тестов (если None, возвращается только имя файла)
+        project_path (str): Корневая директория проекта (для имён модулей и кэша разбора)
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        Optional[Tuple[str, str]]: Путь к файлу теста и его код; None, если ни в одном
+            модуле нет публичных функций и классов
+    """
+    modules = []
+    for file_path in file_paths:
+        info = analyze_file(file_path, project_path, use_cache)
+        if info and (info[0] or info[1]):
+            modules.append((module_name(file_path, project_path), info))
+    if not modules:
+        return None
+    name = bundle_file_name(label)
+    test_path = os.path.join(output_dir, name) if output_dir is not None else name
+    return test_path, render_bundle(modules, label, framework, project_path, use_cache)
+
+
+def generate_tests(file_path: str, framework: str = "pytest", output_dir: Optional[str] = None,
+                   project_path: str = ".", use_cache: bool = True) -> Optional[str]:
+    """
+    Генерирует заготовки тестов для Python-модуля.
+
+    Существующий файл теста перезаписывается, только если его содержимое изменилось.
+
+    Args:
+        file_path (str): Путь к исходному файлу
+        framework (str): Тестовый фреймворк ("pytest" или "unittest")
+        output_dir (Optional[str]): Директория для сохранения тестов (если None, возвращается код теста)
+        project_path (str): Корневая директория проекта (для имён модулей и кэша разбора)
+        use_cache (bool): Использовать кэш разбора из .testgen/cache
+
+    Returns:
+        Optional[str]: Путь к файлу теста (или код теста без output_dir); None, если в
+            модуле нет публичных функций и классов или он не разбирается
+    """
+    rendered = render_test_file(file_path, framework, output_dir, project_path, use_cache)
+    if rendered is None:
+        return None
+    test_path, code = rendered
+    if output_dir is None:
+        return code
+
+    os.makedirs(os.path.dirname(test_path), exist_ok=True)
+    write_if_changed(test_path, code.encode("utf-8"))
+    return test_path
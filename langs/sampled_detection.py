@@ -0,0 +1,189 @@
+"""
+Выборочное определение языка проекта с ранней остановкой.
+
+Для выбора основного языка точные количества файлов не нужны: дерево
+обходится в ширину, манифесты проектов получают большой вес при выборе
+лидера, а обход прекращается, как только отрыв лидера от ближайшего
+конкурента по количеству файлов становится статистически значимым или
+исчерпан бюджет по файлам или времени (он проверяется после каждого файла).
+"""
+
+import math
+import os
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from langs.file_scanner import LanguageClassifier, scan_directory
+from langs.ignore_rules import IgnoreChain
+
+# Манифесты проектов: имя файла -> (язык, вес в «файлах»)
+MANIFEST_WEIGHTS = {
+    "pyproject.toml": ("python", 25),
+    "setup.py": ("python", 25),
+    "go.mod": ("go", 25),
+    "Cargo.toml": ("rust", 25),
+    "package.json": ("javascript", 25),
+    "pom.xml": ("java", 25),
+    "build.gradle": ("java", 25),
+    "Gemfile": ("ruby", 25),
+    "composer.json": ("php", 25),
+}
+
+# Требуемая уверенность в лидере и минимальный объём выборки до проверки
+DEFAULT_MIN_CONFIDENCE = 0.99
+MIN_SAMPLE_FILES = 30
+
+
+class DetectionResult:
+    """Результат выборочного определения языка"""
+
+    def __init__(self, language: Optional[str], confidence: float, files_scanned: int,
+                 duration: float, complete: bool):
+        self.language = language
+        self.confidence = confidence
+        self.files_scanned = files_scanned
+        self.duration = duration
+        # True, если дерево просмотрено полностью и бюджет не ограничил обход
+        self.complete = complete
+
+
+def leader_confidence(scores: Dict[str, float],
+                      counts: Optional[Dict[str, int]] = None) -> Tuple[Optional[str], float]:
+    """
+    Оценивает уверенность в том, что лидер опережает ближайшего конкурента.
+
+    Лидер и конкурент выбираются по взвешенным количествам. Каждый
+    просмотренный файл лидера или конкурента рассматривается как испытание
+    Бернулли; уверенность - односторонняя вероятность того, что доля лидера
+    больше 1/2 (нормальное приближение). Испытаниями считаются только файлы:
+    вес манифеста не увеличивает объём выборки.
+
+    Args:
+        scores (Dict[str, float]): Взвешенные количества файлов по языкам
+        counts (Optional[Dict[str, int]]): Количества файлов без весов манифестов (None - совпадают со scores)
+
+    Returns:
+        Tuple[Optional[str], float]: Лидер и уверенность от 0.0 до 1.0
+            (None и 0.0, если файлов нет)
+    """
+    ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+    if not ranked or ranked[0][1] <= 0:
+        return None, 0.0
+    if counts is None:
+        counts = scores
+    leader = ranked[0][0]
+    first = counts.get(leader, 0)
+    second = counts.get(ranked[1][0], 0) if len(ranked) > 1 else 0
+    if first + second <= 0:
+        # Лидер известен только по манифестам: выборка ничего не говорит об отрыве
+        return leader, 0.5
+    z = (first - second) / math.sqrt(first + second)
+    return leader, 0.5 * (1.0 + math.erf(z / math.sqrt(2.0)))
+
+
+def detect_language_sampled(root: str, classifier: LanguageClassifier,
+                            max_files: Optional[int] = None,
+                            max_seconds: Optional[float] = None,
+                            min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> DetectionResult:
+    """
+    Определяет основной язык проекта обходом в ширину с ранней остановкой.
+
+    Args:
+        root (str): Корневая директория проекта
+        classifier (LanguageClassifier): Классификатор файлов по языкам
+        max_files (Optional[int]): Максимальное количество просмотренных файлов
+        max_seconds (Optional[float]): Максимальное время обхода в секундах
+        min_confidence (float): Уверенность, при которой обход прекращается
+
+    Returns:
+        DetectionResult: Определённый язык и достигнутая уверенность
+    """
+    start = time.perf_counter()
+    deadline = start + max_seconds if max_seconds is not None else None
+    # Взвешенные количества (выбор лидера) и количества файлов (объём выборки)
+    scores: Dict[str, float] = {lang: 0.0 for lang in classifier.languages}
+    counts: Dict[str, int] = {lang: 0 for lang in classifier.languages}
+    classify = classifier.classify
+    files_scanned = 0
+    budget_exhausted = False
+
+    empty_chain: IgnoreChain = ()
+    queue = deque([(root, "", empty_chain)])
+    while queue and not budget_exhausted:
+        directory, rel_dir, chain = queue.popleft()
+        listing = scan_directory(directory, rel_dir, chain)
+        if listing is None:
+            continue
+        names, subdirs, chain = listing
+
+        for name in names:
+            # Бюджет проверяется после каждого файла: одна большая директория его не превышает
+            if (max_files is not None and files_scanned >= max_files) or \
+                    (deadline is not None and time.perf_counter() >= deadline):
+                budget_exhausted = True
+                break
+            files_scanned += 1
+            manifest = MANIFEST_WEIGHTS.get(name)
+            if manifest is not None:
+                scores[manifest[0]] += manifest[1]
+                continue
+            for lang in classify(name):
+                scores[lang] += 1
+                counts[lang] += 1
+        if budget_exhausted:
+            break
+
+        prefix = rel_dir + "/" if rel_dir else ""
+        queue.extend((os.path.join(directory, name), prefix + name, chain) for name in subdirs)
+
+        # Уверенность проверяется после каждой директории
+        if files_scanned >= MIN_SAMPLE_FILES and leader_confidence(scores, counts)[1] >= min_confidence:
+            break
+        if queue and ((max_files is not None and files_scanned >= max_files) or
+                      (deadline is not None and time.perf_counter() >= deadline)):
+            budget_exhausted = True
+
+    complete = not queue and not budget_exhausted
+    language, confidence = leader_confidence(scores, counts)
+    if complete and language is not None:
+        # Всё дерево просмотрено: ответ точный для взвешенных количеств
+        confidence = 1.0
+    return DetectionResult(language, confidence, files_scanned, time.perf_counter() - start, complete)
+
+
+def parse_detect_budget(value: str) -> Tuple[Optional[int], Optional[float]]:
+    """
+    Разбирает бюджет определения языка из командной строки.
+
+    Поддерживаемые форматы: "5000" (файлы), "2s" или "1.5s" (секунды),
+    "5000,2s" (оба ограничения).
+
+    Args:
+        value (str): Строка бюджета
+
+    Returns:
+        Tuple[Optional[int], Optional[float]]: Ограничение по файлам и по времени
+
+    Raises:
+        ValueError: Если строка не соответствует формату
+    """
+    max_files: Optional[int] = None
+    max_seconds: Optional[float] = None
+    for part in (p.strip() for p in value.split(",")):
+        if not part:
+            continue
+        try:
+            if part.endswith("s"):
+                max_seconds = float(part[:-1])
+                limit: float = max_seconds
+            else:
+                max_files = int(part)
+                limit = max_files
+        except ValueError:
+            raise ValueError(f"Некорректный бюджет определения языка: {part!r}") from None
+        if limit <= 0:
+            raise ValueError(f"Бюджет определения языка должен быть положительным: {part!r}")
+    if max_files is None and max_seconds is None:
+        raise ValueError(f"Пустой бюджет определения языка: {value!r}")
+    return max_files, max_seconds
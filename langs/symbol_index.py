@@ -0,0 +1,299 @@
+"""
+Общий индекс символов проекта в SQLite (.testgen/symbols.db).
+
+Индекс хранит для каждого исходного файла и файла тестов его публичные
+символы: функции, классы и методы с сигнатурами и диапазонами строк.
+Обновление инкрементальное: файлы перечисляются через индекс файлов
+(git или .testgen/cache), неизменённые по mtime и размеру пропускаются,
+а символы извлекаются заново только при изменении хэша содержимого.
+Генераторы, команда `report` и анализ влияния изменений могут выполнять
+запросы к индексу вместо повторного разбора файлов.
+
+Для файлов тестов языков, где тест связан с модулем импортом (JavaScript),
+хранятся также импортируемые модули проекта.
+"""
+
+import os
+import posixpath
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from langs import lang_detector
+from langs.cache import get_testgen_dir
+from langs.mapped_source import open_mapped
+from langs.parse_cache import content_digest
+from langs.plugins import get_plugins
+
+SYMBOL_DB_FILENAME = "symbols.db"
+# Версия схемы хранится в PRAGMA user_version; при её смене индекс строится заново
+SCHEMA_VERSION = 2
+
+# Файлы, изменённые незадолго до обновления индекса, в следующий раз проверяются по хэшу
+RACY_WINDOW_NS = 2_000_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    language TEXT NOT NULL,
+    is_test INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    qualname TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    start_line INTEGER NOT NULL,
+    end_line INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS imports (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    module TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS symbols_file ON symbols(file_id);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols(name);
+CREATE INDEX IF NOT EXISTS imports_file ON imports(file_id);
+"""
+
+# Правила покрытия функций тестами по языкам: (виды символов, условие на символ теста t)
+# Условие None - функция покрыта, если файл тестов импортирует её модуль
+_COVERAGE_RULES: Dict[str, Tuple[Tuple[str, ...], Optional[str]]] = {
+    # test_<имя>
+    "python": (("function",), "t.name = 'test_' || s.name"),
+    # Test<Имя> или Test<Тип><Имя> для методов, в том числе с суффиксом случая (TestAdd_Negative)
+    "go": (("function", "method"),
+           "(t.name = 'Test' || replace(s.qualname, '.', '') "
+           "OR t.name GLOB 'Test' || replace(s.qualname, '.', '') || '_*')"),
+    "javascript": (("function",), None),
+}
+# Языки, для которых определяется покрытие функций тестами
+UNTESTED_LANGUAGES = tuple(_COVERAGE_RULES)
+
+# Символ: (путь, вид, полное имя, сигнатура, первая строка, последняя строка)
+SymbolRow = Tuple[str, str, str, str, int, int]
+
+
+def _prefix_range(prefix: str) -> Tuple[str, str]:
+    """Границы путей под директорией для поиска по индексу: [prefix/, prefix0)"""
+    prefix = prefix.strip("/")
+    if not prefix:
+        return "", "\U0010ffff"
+    # '0' следует за '/' в порядке кодов символов
+    return prefix + "/", prefix + "0"
+
+
+class SymbolIndex:
+    """Индекс символов проекта в SQLite"""
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root (str): Корневая директория проекта
+        """
+        self.root = root
+        self.path = os.path.join(get_testgen_dir(root), SYMBOL_DB_FILENAME)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        # WAL: чтение индекса (например, командой report) не блокируется обновлением
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self.connection.executescript("DROP TABLE IF EXISTS symbols; DROP TABLE IF EXISTS files;")
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.connection.executescript(_SCHEMA)
+        # Количество файлов, символы которых извлечены заново при последнем обновлении
+        self.updated = 0
+        self.removed = 0
+
+    def close(self) -> None:
+        """Закрывает соединение с базой"""
+        self.connection.close()
+
+    def __enter__(self) -> "SymbolIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _rel(self, path: str) -> str:
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def update(self, language: str, files: Iterable[Tuple[str, bool]], extract,
+               use_cache: bool = True, extract_imports=None) -> None:
+        """
+        Инкрементально обновляет символы файлов одного языка.
+
+        Файлы языка, которых нет в files, удаляются из индекса.
+
+        Args:
+            language (str): Язык программирования
+            files (Iterable[Tuple[str, bool]]): Пары (путь к файлу, признак файла тестов)
+            extract: Функция (содержимое, путь, корень проекта, использовать кэш) -> символы
+            use_cache (bool): Передаётся в функцию извлечения (кэш разбора)
+            extract_imports: Функция (содержимое, путь, корень проекта) -> модули, импортируемые
+                файлом тестов (None - импорты не хранятся)
+        """
+        db = self.connection
+        known = {
+            path: (file_id, digest, mtime, size)
+            for file_id, path, digest, mtime, size in db.execute(
+                "SELECT id, path, digest, mtime_ns, size FROM files WHERE language = ?", (language,))
+        }
+        racy_threshold = time.time_ns() - RACY_WINDOW_NS
+        seen = set()
+        self.updated = 0
+        with db:
+            for file_path, is_test in files:
+                rel_path = self._rel(file_path)
+                seen.add(rel_path)
+                try:
+                    st = os.stat(file_path)
+                except OSError:
+                    continue
+                row = known.get(rel_path)
+                if row is not None and row[2] == st.st_mtime_ns and row[3] == st.st_size:
+                    continue
+
+                mtime = st.st_mtime_ns if st.st_mtime_ns < racy_threshold else -1
+                try:
+                    # Файл отображается в память: хэш и сканеры не копируют его содержимое целиком
+                    with open_mapped(file_path) as source:
+                        digest = content_digest(source)
+                        if row is not None and row[1] == digest:
+                            db.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?",
+                                       (mtime, st.st_size, row[0]))
+                            continue
+                        symbols = extract(source, file_path, self.root, use_cache)
+                        imports = extract_imports(source, file_path, self.root) if is_test and extract_imports else []
+                except OSError:
+                    continue
+
+                if row is not None:
+                    file_id = row[0]
+                    db.execute("DELETE FROM symbols WHERE file_id = ?", (file_id,))
+                    db.execute("DELETE FROM imports WHERE file_id = ?", (file_id,))
+                    db.execute("UPDATE files SET is_test = ?, digest = ?, mtime_ns = ?, size = ? WHERE id = ?",
+                               (int(is_test), digest, mtime, st.st_size, file_id))
+                else:
+                    file_id = db.execute(
+                        "INSERT INTO files (path, language, is_test, digest, mtime_ns, size) VALUES (?, ?, ?, ?, ?, ?)",
+                        (rel_path, language, int(is_test), digest, mtime, st.st_size)).lastrowid
+                db.executemany(
+                    "INSERT INTO symbols (file_id, kind, name, qualname, signature, start_line, end_line) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(file_id,) + tuple(symbol) for symbol in symbols])
+                db.executemany("INSERT INTO imports (file_id, module) VALUES (?, ?)",
+                               [(file_id, module) for module in imports])
+                self.updated += 1
+
+            removed = [(row[0],) for path, row in known.items() if path not in seen]
+            db.executemany("DELETE FROM files WHERE id = ?", removed)
+            self.removed = len(removed)
+
+    def file_symbols(self, file_path: str) -> List[SymbolRow]:
+        """
+        Возвращает символы файла.
+
+        Args:
+            file_path (str): Путь к файлу
+
+        Returns:
+            List[SymbolRow]: Символы в порядке строк
+        """
+        return self.connection.execute(
+            "SELECT f.path, s.kind, s.qualname, s.signature, s.start_line, s.end_line "
+            "FROM symbols s JOIN files f ON f.id = s.file_id WHERE f.path = ? ORDER BY s.start_line",
+            (self._rel(file_path),)).fetchall()
+
+    def functions_without_tests(self, prefix: str = "", language: Optional[str] = None) -> List[SymbolRow]:
+        """
+        Находит публичные функции под директорией, для которых нет тестов.
+
+        Покрытие определяется по правилам языка (см. UNTESTED_LANGUAGES):
+
+            python      - в файле тестов есть функция или метод test_<имя>
+            go          - в файле тестов есть функция Test<Имя> или, для метода,
+                          Test<Тип><Имя> (возможно, с суффиксом "_...")
+            javascript  - модуль функции импортирует какой-либо файл тестов
+
+        Функции других языков не проверяются.
+
+        Args:
+            prefix (str): Директория относительно корня проекта (например, "pkg/x")
+            language (Optional[str]): Язык (если None, все языки с правилами покрытия)
+
+        Returns:
+            List[SymbolRow]: Функции без тестов, упорядоченные по пути и строке
+        """
+        low, high = _prefix_range(prefix)
+        rows: List[SymbolRow] = []
+        for name in [language] if language is not None else UNTESTED_LANGUAGES:
+            if name in _COVERAGE_RULES:
+                rows.extend(self._untested(name, low, high))
+        rows.sort(key=lambda row: (row[0], row[4]))
+        return rows
+
+    def _untested(self, language: str, low: str, high: str) -> List[SymbolRow]:
+        kinds, condition = _COVERAGE_RULES[language]
+        query = (
+            "SELECT f.path, s.kind, s.qualname, s.signature, s.start_line, s.end_line "
+            "FROM symbols s JOIN files f ON f.id = s.file_id "
+            "WHERE f.path >= ? AND f.path < ? AND f.is_test = 0 AND f.language = ? "
+            f"AND s.kind IN ({', '.join('?' * len(kinds))})"
+        )
+        params: list = [low, high, language, *kinds]
+        if condition is not None:
+            query += (" AND NOT EXISTS (SELECT 1 FROM symbols t JOIN files tf ON tf.id = t.file_id "
+                      f"WHERE tf.is_test = 1 AND tf.language = f.language AND {condition})")
+            return self.connection.execute(query, params).fetchall()
+
+        imported = {module for module, in self.connection.execute(
+            "SELECT DISTINCT i.module FROM imports i JOIN files tf ON tf.id = i.file_id WHERE tf.language = ?",
+            (language,))}
+        rows = []
+        for row in self.connection.execute(query, params):
+            module = posixpath.splitext(row[0])[0]
+            # Импорт директории загружает её index
+            if module in imported or (posixpath.basename(module) == "index"
+                                      and (posixpath.dirname(module) or ".") in imported):
+                continue
+            rows.append(row)
+        return rows
+
+
+def update_symbol_index(project_path: str = ".", languages: Optional[List[str]] = None,
+                        use_cache: bool = True) -> SymbolIndex:
+    """
+    Открывает индекс символов проекта и инкрементально обновляет его.
+
+    Args:
+        project_path (str): Корневая директория проекта
+        languages (Optional[List[str]]): Языки (если None, все языки с извлечением символов)
+        use_cache (bool): Использовать индекс файлов и кэш разбора из .testgen/cache
+
+    Returns:
+        SymbolIndex: Актуальный индекс (закрывается вызывающим)
+    """
+    index = SymbolIndex(project_path)
+    updated = removed = 0
+    for language in languages or [plugin.name for plugin in get_plugins()]:
+        try:
+            extract = lang_detector.get_symbol_extractor(language)
+            extract_imports = lang_detector.get_import_extractor(language)
+        except ImportError:
+            extract = None
+        if extract is None:
+            continue
+        files = lang_detector.iter_language_files(project_path, language, use_cache)
+        index.update(language, files, extract, use_cache, extract_imports)
+        updated += index.updated
+        removed += index.removed
+    index.updated, index.removed = updated, removed
+    return index
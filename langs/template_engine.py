@@ -0,0 +1,322 @@
+"""
+Шаблоны генерируемых тестов, компилируемые в функции Python.
+
+Шаблон - текстовый файл с подстановками `{{ выражение }}`, блоками
+`{% for ... %}`/`{% endfor %}`, `{% if ... %}`/`{% elif ... %}`/`{% else %}`/
+`{% endif %}` и комментариями `{# ... #}`. Выражения - обычные выражения
+Python над переменными контекста. Строка, содержащая только блок или
+комментарий, не попадает в результат целиком, включая перевод строки.
+
+Шаблон компилируется один раз в функцию render(context) -> str: разбор
+текста при генерации каждого файла не выполняется. Код функции
+кэшируется в .testgen/cache/templates по хэшу шаблона, поэтому процессы
+пула и повторные запуски не компилируют шаблон заново.
+
+Встроенные шаблоны лежат в langs/templates/<язык>/<фреймворк>.tmpl; файл
+с тем же путём в .testgen/templates/ проекта переопределяет встроенный.
+"""
+
+import ast
+import builtins
+import importlib.util
+import marshal
+import os
+import re
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from langs.cache import get_cache_dir, get_testgen_dir
+from langs.parse_cache import content_digest
+
+# Версия компилятора шаблонов: при её смене кэш скомпилированных шаблонов не используется
+ENGINE_VERSION = "1"
+TEMPLATE_SUFFIX = ".tmpl"
+TEMPLATES_DIR_NAME = "templates"
+# Как часто (в секундах) проверять, не изменились ли файлы загруженных шаблонов
+TEMPLATE_CHECK_INTERVAL = 1.0
+# Встроенные шаблоны
+BUILTIN_TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), TEMPLATES_DIR_NAME)
+
+# Тело тега до закрывающей последовательности (без захвата следующих тегов)
+_BLOCK = r"((?:(?!%\}).)*)"
+_TOKEN_RE = re.compile(
+    # Блок или комментарий, занимающий всю строку: строка удаляется целиком
+    r"^[ \t]*\{%" + _BLOCK + r"%\}[ \t]*(?:\n|\Z)"
+    r"|^[ \t]*\{#(?:(?!#\}).)*#\}[ \t]*(?:\n|\Z)"
+    r"|\{%" + _BLOCK + r"%\}"
+    r"|\{\{((?:(?!\}\}).)*)\}\}"
+    r"|\{#(?:(?!#\}).)*#\}",
+    re.MULTILINE | re.DOTALL,
+)
+
+_BUILTIN_NAMES = frozenset(dir(builtins))
+
+RenderFunction = Callable[[Dict[str, object]], str]
+
+
+class TemplateError(ValueError):
+    """Ошибка в тексте шаблона"""
+
+
+class Template:
+    """Скомпилированный шаблон"""
+
+    def __init__(self, name: str, digest: str, render: RenderFunction):
+        """
+        Args:
+            name (str): Имя шаблона (путь к файлу) для сообщений об ошибках
+            digest (str): Хэш текста шаблона (hex)
+            render (RenderFunction): Функция (контекст -> текст)
+        """
+        self.name = name
+        self.hash = digest
+        self.render = render
+
+
+def template_hash(text: str) -> str:
+    """
+    Возвращает хэш текста шаблона.
+
+    Args:
+        text (str): Текст шаблона
+
+    Returns:
+        str: Хэш (hex)
+    """
+    return content_digest(text.encode("utf-8")).hex()
+
+
+def _names(node: ast.AST, context_type) -> Set[str]:
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name) and isinstance(n.ctx, context_type)}
+
+
+def _free_names(node: ast.AST) -> Set[str]:
+    """Имена, читаемые выражением, без переменных его генераторов списков"""
+    return _names(node, ast.Load) - _names(node, ast.Store)
+
+
+def compile_source(text: str, name: str = "<template>") -> str:
+    """
+    Переводит шаблон в исходный код функции render(__ctx).
+
+    Args:
+        text (str): Текст шаблона
+        name (str): Имя шаблона для сообщений об ошибках
+
+    Returns:
+        str: Исходный код модуля с функцией render
+    """
+    body: List[str] = []
+    used: Set[str] = set()
+    bound: Set[str] = set()
+    # Открытые блоки: (тег, номер строки)
+    stack: List[Tuple[str, int]] = []
+
+    def emit(line: str) -> None:
+        body.append("    " * (len(stack) + 1) + line)
+
+    def parse(source: str, line: int, mode: str = "eval") -> ast.AST:
+        try:
+            return ast.parse(source.strip(), mode=mode)
+        except SyntaxError as e:
+            raise TemplateError(f"{name}:{line}: ошибка в выражении {source.strip()!r}: {e.msg}") from None
+
+    position = 0
+    for match in _TOKEN_RE.finditer(text):
+        if match.start() > position:
+            emit(f"_w({text[position:match.start()]!r})")
+        position = match.end()
+        line = text.count("\n", 0, match.start()) + 1
+        block = match.group(1) if match.group(1) is not None else match.group(2)
+        expression = match.group(3)
+
+        if expression is not None:
+            used |= _free_names(parse(expression, line))
+            emit(f"_w(_str({expression.strip()}))")
+            continue
+        if block is None:
+            # Комментарий
+            continue
+
+        keyword, _, argument = block.strip().partition(" ")
+        if keyword == "for":
+            loop = parse(f"for {argument}:\n pass", line, "exec").body[0]
+            bound |= _names(loop.target, ast.Store)
+            used |= _free_names(loop.iter)
+            emit(f"for {argument.strip()}:")
+            stack.append(("for", line))
+            emit("pass")
+        elif keyword == "if":
+            used |= _free_names(parse(argument, line))
+            emit(f"if {argument.strip()}:")
+            stack.append(("if", line))
+            emit("pass")
+        elif keyword in ("elif", "else"):
+            if not stack or stack[-1][0] != "if":
+                raise TemplateError(f"{name}:{line}: {keyword} вне блока if")
+            stack.pop()
+            if keyword == "elif":
+                used |= _free_names(parse(argument, line))
+                emit(f"elif {argument.strip()}:")
+            else:
+                emit("else:")
+            # После else новый elif недопустим
+            stack.append(("if" if keyword == "elif" else "else", line))
+            emit("pass")
+        elif keyword in ("endfor", "endif"):
+            expected = ("for",) if keyword == "endfor" else ("if", "else")
+            if not stack or stack[-1][0] not in expected:
+                raise TemplateError(f"{name}:{line}: {keyword} без открывающего блока")
+            stack.pop()
+        else:
+            raise TemplateError(f"{name}:{line}: неизвестный блок {keyword!r}")
+
+    if stack:
+        tag, line = stack[-1]
+        raise TemplateError(f"{name}:{line}: блок {tag} не закрыт")
+    if position < len(text):
+        emit(f"_w({text[position:]!r})")
+
+    # Переменные контекста связываются с локальными именами один раз за вызов
+    header = ["def render(__ctx):", "    _out = []", "    _w = _out.append", "    _str = str"]
+    header += [f"    {var} = __ctx[{var!r}]" for var in sorted(used - bound - _BUILTIN_NAMES)]
+    return "\n".join(header + body + ['    return "".join(_out)']) + "\n"
+
+
+# Скомпилированные функции по хэшу шаблона
+_COMPILED: Dict[str, RenderFunction] = {}
+# Загруженные шаблоны: путь -> (mtime_ns, размер, шаблон)
+_LOADED: Dict[str, Tuple[int, int, Template]] = {}
+# Последний найденный шаблон: (корень проекта, язык, фреймворк, кэш) -> (время проверки, шаблон)
+_RESOLVED: Dict[Tuple[str, str, str, bool], Tuple[float, Template]] = {}
+# Пути поиска шаблона: (корень проекта, язык, фреймворк) -> (переопределение, встроенный)
+_CANDIDATES: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
+
+
+def _cache_file(cache_dir: str, digest: str) -> str:
+    # Байт-код зависит от версии интерпретатора
+    magic = importlib.util.MAGIC_NUMBER.hex()
+    return os.path.join(cache_dir, f"{digest}-{ENGINE_VERSION}-{magic}.bin")
+
+
+def compile_template(text: str, name: str = "<template>", cache_dir: Optional[str] = None) -> Template:
+    """
+    Компилирует шаблон в функцию, используя кэш скомпилированного кода.
+
+    Args:
+        text (str): Текст шаблона
+        name (str): Имя шаблона для сообщений об ошибках
+        cache_dir (Optional[str]): Директория кэша скомпилированных шаблонов (если None, только в памяти)
+
+    Returns:
+        Template: Скомпилированный шаблон
+    """
+    digest = template_hash(text)
+    render = _COMPILED.get(digest)
+    if render is not None:
+        return Template(name, digest, render)
+
+    code = None
+    cache_path = _cache_file(cache_dir, digest) if cache_dir else None
+    if cache_path:
+        try:
+            with open(cache_path, "rb") as f:
+                code = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            code = None
+    if code is None:
+        code = compile(compile_source(text, name), name, "exec")
+        if cache_path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    marshal.dump(code, f)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                # Кэш необязателен: шаблон будет скомпилирован в следующий раз заново
+                pass
+
+    namespace: Dict[str, object] = {}
+    exec(code, namespace)
+    render = namespace["render"]
+    _COMPILED[digest] = render
+    return Template(name, digest, render)
+
+
+def _candidates(language: str, framework: str, project_path: str) -> Tuple[str, str]:
+    key = (project_path, language, framework)
+    paths = _CANDIDATES.get(key)
+    if paths is None:
+        relative = os.path.join(language.lower(), framework.lower() + TEMPLATE_SUFFIX)
+        paths = (os.path.join(get_testgen_dir(project_path), TEMPLATES_DIR_NAME, relative),
+                 os.path.join(BUILTIN_TEMPLATES_DIR, relative))
+        _CANDIDATES[key] = paths
+    return paths
+
+
+def _stat_template(language: str, framework: str, project_path: str) -> Optional[Tuple[str, os.stat_result]]:
+    for path in _candidates(language, framework, project_path):
+        try:
+            return path, os.stat(path)
+        except OSError:
+            continue
+    return None
+
+
+def find_template(language: str, framework: str, project_path: str = ".") -> Optional[str]:
+    """
+    Находит файл шаблона: сначала в .testgen/templates проекта, затем среди встроенных.
+
+    Args:
+        language (str): Язык программирования
+        framework (str): Тестовый фреймворк
+        project_path (str): Корневая директория проекта
+
+    Returns:
+        Optional[str]: Путь к файлу шаблона или None, если шаблона нет
+    """
+    found = _stat_template(language, framework, project_path)
+    return found[0] if found else None
+
+
+def load_template(language: str, framework: str, project_path: str = ".",
+                  use_cache: bool = True) -> Optional[Template]:
+    """
+    Загружает и компилирует шаблон языка и фреймворка.
+
+    Функцию можно вызывать для каждого файла: файлы шаблонов проверяются не
+    чаще раза в TEMPLATE_CHECK_INTERVAL секунд, а шаблон перечитывается, только
+    если его файл изменился или появилось переопределение.
+
+    Args:
+        language (str): Язык программирования
+        framework (str): Тестовый фреймворк
+        project_path (str): Корневая директория проекта (переопределения и кэш)
+        use_cache (bool): Использовать кэш скомпилированных шаблонов из .testgen/cache
+
+    Returns:
+        Optional[Template]: Шаблон или None, если шаблона нет
+    """
+    key = (project_path, language, framework, use_cache)
+    now = time.monotonic()
+    resolved = _RESOLVED.get(key)
+    if resolved is not None and now - resolved[0] < TEMPLATE_CHECK_INTERVAL:
+        return resolved[1]
+
+    found = _stat_template(language, framework, project_path)
+    if found is None:
+        _RESOLVED.pop(key, None)
+        return None
+    path, st = found
+    loaded = _LOADED.get(path)
+    if loaded is not None and loaded[0] == st.st_mtime_ns and loaded[1] == st.st_size:
+        template = loaded[2]
+    else:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        cache_dir = os.path.join(get_cache_dir(project_path), TEMPLATES_DIR_NAME) if use_cache else None
+        template = compile_template(text, path, cache_dir)
+        _LOADED[path] = (st.st_mtime_ns, st.st_size, template)
+    _RESOLVED[key] = (now, template)
+    return template
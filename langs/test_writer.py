@@ -0,0 +1,118 @@
+"""
+Запись сгенерированных тестов только при изменении содержимого.
+
+Файл теста перезаписывается, лишь если новое содержимое отличается от
+существующего: сначала сравниваются размеры, затем хэши содержимого.
+Неизменённые тесты сохраняют mtime, поэтому кэши pytest/jest и
+наблюдатели за файлами не срабатывают впустую. Запись атомарная (временный
+файл в той же директории и os.replace), а директории создаются один раз
+на пачку записей.
+"""
+
+import os
+from typing import List, Optional, Set
+
+from langs.parse_cache import content_digest
+
+
+def _same_content(path: str, data: bytes, digest: Optional[bytes]) -> bool:
+    """Проверяет, совпадает ли содержимое файла с data (по размеру, затем по хэшу)"""
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, "rb") as f:
+            existing = f.read()
+    except OSError:
+        return False
+    return content_digest(existing) == (digest if digest is not None else content_digest(data))
+
+
+def write_if_changed(path: str, data: bytes, digest: Optional[bytes] = None) -> bool:
+    """
+    Атомарно записывает файл, если его содержимое отличается от data.
+
+    Args:
+        path (str): Путь к файлу
+        data (bytes): Новое содержимое
+        digest (Optional[bytes]): Хэш data (content_digest), если уже вычислен
+
+    Returns:
+        bool: True, если файл записан; False, если содержимое не изменилось
+    """
+    if _same_content(path, data, digest):
+        return False
+    directory = os.path.dirname(path) or "."
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+class OutputWriter:
+    """Запись пачки тестов с учётом записанных, неизменённых и удалённых файлов"""
+
+    def __init__(self):
+        # Записанные файлы
+        self.written: List[str] = []
+        # Файлы, содержимое которых не изменилось
+        self.unchanged: List[str] = []
+        # Удалённые файлы
+        self.removed: List[str] = []
+        # Директории, существование которых уже проверено
+        self._directories: Set[str] = set()
+
+    def write(self, path: str, data: bytes, digest: Optional[bytes] = None) -> bool:
+        """
+        Записывает файл, если его содержимое изменилось.
+
+        Args:
+            path (str): Путь к файлу
+            data (bytes): Новое содержимое
+            digest (Optional[bytes]): Хэш data, если уже вычислен
+
+        Returns:
+            bool: True, если файл записан
+        """
+        directory = os.path.dirname(path)
+        if directory and directory not in self._directories:
+            os.makedirs(directory, exist_ok=True)
+            self._directories.add(directory)
+        if write_if_changed(path, data, digest):
+            self.written.append(path)
+            return True
+        self.unchanged.append(path)
+        return False
+
+    def remove(self, path: str, expected_digest: Optional[bytes] = None) -> bool:
+        """
+        Удаляет файл.
+
+        Args:
+            path (str): Путь к файлу
+            expected_digest (Optional[bytes]): Хэш содержимого, с которым файл был записан;
+                если файл с тех пор изменён, он не удаляется
+
+        Returns:
+            bool: True, если файл удалён
+        """
+        if expected_digest is not None:
+            try:
+                with open(path, "rb") as f:
+                    if content_digest(f.read()) != expected_digest:
+                        return False
+            except OSError:
+                return False
+        try:
+            os.remove(path)
+        except OSError:
+            return False
+        self.removed.append(path)
+        return True
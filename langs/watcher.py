@@ -0,0 +1,386 @@
+"""
+Отслеживание изменений исходных файлов для режима `testgen gen --watch`.
+
+Дерево проекта обходится один раз, после чего индекс исходных файлов
+(mtime и размер каждого файла) хранится в памяти. На Linux изменения
+приходят от inotify (через ctypes, без внешних зависимостей); если inotify
+недоступен, директории и файлы периодически проверяются по mtime. После
+изменённой директории перечитывается только она сама, а серия событий
+(например, `git checkout`) собирается в один пакет с задержкой (debounce).
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from langs.file_scanner import scan_directory
+from langs.ignore_rules import IgnoreChain, ignore_signature
+from langs.lang_detector import get_source_matcher
+
+# Флаги inotify из <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Интервал опроса без inotify и окно объединения событий, в секундах
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_DEBOUNCE = 0.2
+# Максимальная задержка пакета при непрерывном потоке изменений
+DEFAULT_MAX_DELAY = 2.0
+
+
+class WatchBatch:
+    """Пакет изменений исходных файлов"""
+
+    def __init__(self, changed: List[str], removed: List[str]):
+        # Новые и изменённые исходные файлы
+        self.changed = changed
+        # Удалённые исходные файлы
+        self.removed = removed
+
+
+class _DirState:
+    """Состояние директории в индексе наблюдателя"""
+
+    def __init__(self, rel_dir: str, parent_chain: IgnoreChain, chain: IgnoreChain, mtime: int,
+                 signature: Tuple[int, ...], files: Dict[str, Tuple[int, int]], subdirs: List[str]):
+        self.rel_dir = rel_dir
+        # Цепочка правил родителя (нужна для повторного чтения директории) и своя
+        self.parent_chain = parent_chain
+        self.chain = chain
+        self.mtime = mtime
+        self.signature = signature
+        # Имя исходного файла -> (mtime_ns, размер)
+        self.files = files
+        self.subdirs = subdirs
+
+
+class _Inotify:
+    """Минимальная обёртка над inotify через ctypes"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+
+    def add_watch(self, path: str) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch: {path}")
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        # Для удалённой директории ядро уже сняло наблюдение
+        self._rm_watch(self.fd, wd)
+
+    def read(self, timeout: float) -> List[Tuple[int, int]]:
+        """Ждёт события не дольше timeout секунд и возвращает пары (wd, маска)"""
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0.0))
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            events.append((wd, mask))
+            offset += _EVENT_HEADER.size + name_len
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class SourceWatcher:
+    """Наблюдатель за исходными файлами одного языка с индексом в памяти"""
+
+    def __init__(self, root: str, language: str, exclude_dirs: Optional[List[str]] = None,
+                 use_inotify: bool = True, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 debounce: float = DEFAULT_DEBOUNCE, max_delay: float = DEFAULT_MAX_DELAY):
+        """
+        Args:
+            root (str): Корневая директория проекта
+            language (str): Язык исходных файлов
+            exclude_dirs (Optional[List[str]]): Поддеревья, которые не отслеживаются
+            use_inotify (bool): Использовать inotify, если он доступен
+            poll_interval (float): Интервал опроса без inotify, в секундах
+            debounce (float): Пауза без событий, после которой пакет считается собранным
+            max_delay (float): Максимальная задержка пакета при непрерывных изменениях
+        """
+        self.root = root
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._matches: Callable[[str], object] = get_source_matcher(language.lower()) or (lambda name: None)
+        self._excluded = {os.path.abspath(path) for path in exclude_dirs or []}
+        self.dirs: Dict[str, _DirState] = {}
+
+        self._inotify: Optional[_Inotify] = None
+        self._wd_to_dir: Dict[int, str] = {}
+        self._dir_to_wd: Dict[str, int] = {}
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError):
+                # Не Linux или inotify отключён: остаётся опрос по mtime
+                self._inotify = None
+        self.backend = "inotify" if self._inotify is not None else "polling"
+        self._next_poll = time.monotonic() + poll_interval
+
+        changed: Set[str] = set()
+        removed: Set[str] = set()
+        self._rescan([(root, "", ())], changed, removed)
+
+    def files(self) -> List[str]:
+        """
+        Возвращает исходные файлы из индекса в памяти.
+
+        Returns:
+            List[str]: Пути к исходным файлам
+        """
+        return [os.path.join(directory, name) for directory, state in self.dirs.items() for name in state.files]
+
+    def close(self) -> None:
+        """Освобождает ресурсы inotify"""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def __enter__(self) -> "SourceWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _watch(self, directory: str) -> None:
+        if self._inotify is None or directory in self._dir_to_wd:
+            return
+        try:
+            wd = self._inotify.add_watch(directory)
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                # Исчерпан лимит fs.inotify.max_user_watches: переходим на опрос
+                self.close()
+                self.backend = "polling"
+                self._wd_to_dir.clear()
+                self._dir_to_wd.clear()
+            return
+        self._wd_to_dir[wd] = directory
+        self._dir_to_wd[directory] = wd
+
+    def _drop_tree(self, directory: str, changed: Set[str], removed: Set[str]) -> None:
+        """Удаляет поддерево из индекса, перенося его исходные файлы из changed в removed"""
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            state = self.dirs.pop(current, None)
+            if state is None:
+                continue
+            for name in state.files:
+                path = os.path.join(current, name)
+                removed.add(path)
+                changed.discard(path)
+            stack.extend(os.path.join(current, name) for name in state.subdirs)
+            wd = self._dir_to_wd.pop(current, None)
+            if wd is not None:
+                self._wd_to_dir.pop(wd, None)
+                if self._inotify is not None:
+                    self._inotify.rm_watch(wd)
+
+    def _rescan(self, pending: Iterable[Tuple[str, str, IgnoreChain]], changed: Set[str], removed: Set[str],
+                force: bool = False) -> None:
+        """
+        Перечитывает директории и обновляет индекс.
+
+        Новые поддиректории обходятся целиком; существующие перечитываются
+        только при изменении правил исключения выше по дереву.
+
+        Args:
+            pending: Директории для чтения: (путь, относительный путь, цепочка правил родителя)
+            changed (Set[str]): Сюда добавляются новые и изменённые исходные файлы
+            removed (Set[str]): Сюда добавляются удалённые исходные файлы
+            force (bool): Перечитать поддеревья целиком
+        """
+        stack = [(directory, rel_dir, chain, force) for directory, rel_dir, chain in pending]
+        while stack:
+            directory, rel_dir, parent_chain, force_subtree = stack.pop()
+            if os.path.abspath(directory) in self._excluded:
+                continue
+            old = self.dirs.get(directory)
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                mtime = None
+            listing = scan_directory(directory, rel_dir, parent_chain) if mtime is not None else None
+            if listing is None:
+                self._drop_tree(directory, changed, removed)
+                continue
+            names, subdirs, chain = listing
+
+            old_files = old.files if old is not None else {}
+            files: Dict[str, Tuple[int, int]] = {}
+            for name in names:
+                if not self._matches(name):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                signature = (st.st_mtime_ns, st.st_size)
+                files[name] = signature
+                if old_files.get(name) != signature:
+                    changed.add(path)
+                    removed.discard(path)
+            for name in old_files:
+                if name not in files:
+                    path = os.path.join(directory, name)
+                    removed.add(path)
+                    changed.discard(path)
+
+            rules = ignore_signature(directory)
+            # Изменились правила исключения (свои или родителя): поддерево перечитывается целиком
+            force_subtree = force_subtree or (old is not None and old.signature != rules)
+            old_subdirs = old.subdirs if old is not None else []
+            for name in old_subdirs:
+                if name not in subdirs:
+                    self._drop_tree(os.path.join(directory, name), changed, removed)
+
+            self.dirs[directory] = _DirState(rel_dir, parent_chain, chain, mtime, rules, files, subdirs)
+            self._watch(directory)
+
+            prefix = rel_dir + "/" if rel_dir else ""
+            for name in reversed(subdirs):
+                child = os.path.join(directory, name)
+                if force_subtree or child not in self.dirs:
+                    stack.append((child, prefix + name, chain, force_subtree))
+
+    def _poll_dirty(self) -> List[str]:
+        """Находит директории, mtime которых, правила исключения или исходные файлы изменились"""
+        dirty = []
+        for directory, state in self.dirs.items():
+            try:
+                if os.stat(directory).st_mtime_ns != state.mtime or ignore_signature(directory) != state.signature:
+                    dirty.append(directory)
+                    continue
+            except OSError:
+                dirty.append(directory)
+                continue
+            for name, signature in state.files.items():
+                try:
+                    st = os.stat(os.path.join(directory, name))
+                except OSError:
+                    dirty.append(directory)
+                    break
+                if (st.st_mtime_ns, st.st_size) != signature:
+                    dirty.append(directory)
+                    break
+        return dirty
+
+    def _wait_dirty(self, timeout: float) -> Optional[List[str]]:
+        """
+        Ждёт изменений не дольше timeout секунд.
+
+        Returns:
+            Optional[List[str]]: Изменённые директории (None, если событий не было)
+        """
+        if self._inotify is not None:
+            events = self._inotify.read(timeout)
+            if not events:
+                return None
+            if any(mask & IN_Q_OVERFLOW for _, mask in events):
+                # Очередь ядра переполнена: события потеряны, перечитываем всё
+                return list(self.dirs)
+            dirty = []
+            for wd, mask in events:
+                directory = self._wd_to_dir.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    # Наблюдение снято ядром: директория удалена или перемещена
+                    self._wd_to_dir.pop(wd, None)
+                    self._dir_to_wd.pop(directory, None)
+                dirty.append(directory)
+            return dirty or None
+
+        delay = self._next_poll - time.monotonic()
+        if delay > timeout:
+            time.sleep(max(timeout, 0.0))
+            return None
+        if delay > 0:
+            time.sleep(delay)
+        self._next_poll = time.monotonic() + self.poll_interval
+        return self._poll_dirty() or None
+
+    def _apply(self, dirty: Iterable[str], changed: Set[str], removed: Set[str]) -> None:
+        pending = []
+        for directory in dict.fromkeys(dirty):
+            state = self.dirs.get(directory)
+            if state is not None:
+                pending.append((directory, state.rel_dir, state.parent_chain))
+        self._rescan(pending, changed, removed)
+
+    def next_batch(self, timeout: Optional[float] = None) -> Optional[WatchBatch]:
+        """
+        Ждёт следующий пакет изменений исходных файлов.
+
+        События собираются, пока между ними не наступит пауза debounce (при
+        опросе - не меньше одного интервала опроса) или пока не истечёт
+        max_delay с первого события.
+
+        Args:
+            timeout (Optional[float]): Максимальное время ожидания первого изменения
+
+        Returns:
+            Optional[WatchBatch]: Пакет изменений или None, если за timeout изменений не было
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        changed: Set[str] = set()
+        removed: Set[str] = set()
+        while True:
+            wait = self.poll_interval if deadline is None else deadline - time.monotonic()
+            if wait <= 0 and deadline is not None:
+                return None
+            dirty = self._wait_dirty(wait)
+            if dirty is None:
+                continue
+            self._apply(dirty, changed, removed)
+
+            # Объединяем серию событий в один пакет
+            quiet = self.debounce if self._inotify is not None else max(self.debounce, self.poll_interval)
+            batch_deadline = time.monotonic() + self.max_delay
+            while time.monotonic() < batch_deadline:
+                dirty = self._wait_dirty(min(quiet, batch_deadline - time.monotonic()))
+                if dirty is None:
+                    break
+                self._apply(dirty, changed, removed)
+
+            if changed or removed:
+                return WatchBatch(sorted(changed), sorted(removed))
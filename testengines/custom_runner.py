@@ -15,8 +15,14 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
+from langs.file_scanner import iter_files
+from testengines.duration_history import DurationHistory
+
 console = Console()
 
+# Имя фреймворка собственного тестраннера в истории длительности тестов
+CUSTOM_FRAMEWORK = "custom"
+
 class TestCase:
     """Базовый класс для тест-кейса"""
     
@@ -38,6 +44,8 @@ class TestResult:
         self.failures = []
         self.errors = []
         self.skipped = []
+        # Длительность каждого теста (секунды), включая setUp и tearDown
+        self.durations: Dict[str, float] = {}
         self.start_time = 0.0
         self.end_time = 0.0
         
@@ -55,10 +63,15 @@ class TestResult:
 class TestRunner:
     """Собственный тестраннер для запуска и анализа тестов"""
     
-    def __init__(self, verbosity: int = 1, include_patterns: List[str] = None, exclude_patterns: List[str] = None):
+    def __init__(self, verbosity: int = 1, include_patterns: List[str] = None, exclude_patterns: List[str] = None,
+                 walk_workers: Optional[int] = None, history: Optional[DurationHistory] = None):
         self.verbosity = verbosity
         self.include_patterns = include_patterns or []
         self.exclude_patterns = exclude_patterns or []
+        # Количество потоков обхода директорий при поиске тестов (None - значение по умолчанию)
+        self.walk_workers = walk_workers
+        # История длительности: по ней самые долгие тесты запускаются первыми
+        self.history = history
         self.result = TestResult()
         
     def _should_run_test(self, test_name: str) -> bool:
@@ -97,34 +110,34 @@ class TestRunner:
         """
         test_files = {}
         
-        # Ищем все файлы Python, начинающиеся с 'test_'
-        for root, dirs, files in os.walk(start_dir):
-            for file in files:
-                if file.startswith('test_') and file.endswith('.py'):
-                    module_path = os.path.join(root, file)
-                    module_name = os.path.splitext(file)[0]
-                    
-                    # Загружаем модуль
-                    spec = importlib.util.spec_from_file_location(module_name, module_path)
-                    module = importlib.util.module_from_spec(spec)
-                    sys.modules[module_name] = module
-                    spec.loader.exec_module(module)
-                    
-                    # Находим все классы тестов и методы тестирования
-                    test_classes = {}
-                    for name, obj in inspect.getmembers(module):
-                        if inspect.isclass(obj) and issubclass(obj, TestCase) and obj != TestCase:
-                            test_methods = []
-                            for method_name, method in inspect.getmembers(obj):
-                                if method_name.startswith('test_') and inspect.isfunction(method):
-                                    if self._should_run_test(f"{module_name}.{name}.{method_name}"):
-                                        test_methods.append(method_name)
-                            
-                            if test_methods:
-                                test_classes[name] = test_methods
-                    
-                    if test_classes:
-                        test_files[module_path] = test_classes
+        # Ищем все файлы Python, начинающиеся с 'test_'; общий обходчик отсекает
+        # venv, node_modules и т.п. и может читать директории параллельно
+        for root, file in iter_files(start_dir, workers=self.walk_workers):
+            if file.startswith('test_') and file.endswith('.py'):
+                module_path = os.path.join(root, file)
+                module_name = os.path.splitext(file)[0]
+                
+                # Загружаем модуль
+                spec = importlib.util.spec_from_file_location(module_name, module_path)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                spec.loader.exec_module(module)
+                
+                # Находим все классы тестов и методы тестирования
+                test_classes = {}
+                for name, obj in inspect.getmembers(module):
+                    if inspect.isclass(obj) and issubclass(obj, TestCase) and obj != TestCase:
+                        test_methods = []
+                        for method_name, method in inspect.getmembers(obj):
+                            if method_name.startswith('test_') and inspect.isfunction(method):
+                                if self._should_run_test(f"{module_name}.{name}.{method_name}"):
+                                    test_methods.append(method_name)
+                        
+                        if test_methods:
+                            test_classes[name] = test_methods
+                
+                if test_classes:
+                    test_files[module_path] = test_classes
         
         return test_files
         
@@ -154,6 +167,26 @@ class TestRunner:
         total_tests = sum(len(methods) for file_tests in test_files.values() for methods in file_tests.values())
         console.print(f"Найдено тестов: {total_tests}")
         
+        # Загружаем модули и составляем список тестов: имя -> (модуль, класс, метод).
+        # Имя строится по пути модуля относительно test_dir: одноимённые файлы
+        # в разных директориях (a/test_util.py и b/test_util.py) не совпадают
+        tests = {}
+        for module_path, test_classes in test_files.items():
+            module_name = os.path.splitext(os.path.basename(module_path))[0]
+            test_prefix = os.path.splitext(os.path.relpath(module_path, test_dir))[0].replace(os.sep, ".")
+            spec = importlib.util.spec_from_file_location(module_name, module_path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+            for class_name, test_methods in test_classes.items():
+                for method_name in test_methods:
+                    tests[f"{test_prefix}.{class_name}.{method_name}"] = (module, class_name, method_name)
+        
+        # Самые долгие тесты первыми: при делении запуска между процессами хвост короче
+        order = list(tests)
+        if self.history is not None:
+            order = self.history.longest_first(CUSTOM_FRAMEWORK, order)
+        
         # Запускаем тесты
         with Progress(
             SpinnerColumn(),
@@ -162,52 +195,44 @@ class TestRunner:
         ) as progress:
             task = progress.add_task("Выполнение тестов...", total=total_tests)
             
-            for module_path, test_classes in test_files.items():
-                module_name = os.path.splitext(os.path.basename(module_path))[0]
+            for test_name in order:
+                module, class_name, method_name = tests[test_name]
+                test_class = getattr(module, class_name)
                 
-                # Загружаем модуль
-                spec = importlib.util.spec_from_file_location(module_name, module_path)
-                module = importlib.util.module_from_spec(spec)
-                sys.modules[module_name] = module
-                spec.loader.exec_module(module)
+                progress.update(task, description=f"Выполнение {test_name}")
+                self.result.total += 1
                 
-                # Запускаем тесты для каждого класса
-                for class_name, test_methods in test_classes.items():
-                    test_class = getattr(module, class_name)
-                    
-                    for method_name in test_methods:
-                        progress.update(task, description=f"Выполнение {module_name}.{class_name}.{method_name}")
-                        self.result.total += 1
-                        
-                        test_instance = test_class()
-                        try:
-                            test_instance.setUp()
-                            try:
-                                getattr(test_instance, method_name)()
-                                self.result.success += 1
-                                if self.verbosity > 1:
-                                    console.print(f"[green]✓[/green] {module_name}.{class_name}.{method_name}")
-                            except AssertionError as e:
-                                self.result.failures.append((f"{module_name}.{class_name}.{method_name}", str(e)))
-                                if self.verbosity > 0:
-                                    console.print(f"[red]✗[/red] {module_name}.{class_name}.{method_name} - {str(e)}")
-                            except Exception as e:
-                                self.result.errors.append((f"{module_name}.{class_name}.{method_name}", traceback.format_exc()))
-                                if self.verbosity > 0:
-                                    console.print(f"[red]![/red] {module_name}.{class_name}.{method_name} - {str(e)}")
-                        except Exception as e:
-                            self.result.errors.append((f"{module_name}.{class_name}.{method_name} (setUp)", traceback.format_exc()))
-                            if self.verbosity > 0:
-                                console.print(f"[red]![/red] {module_name}.{class_name}.{method_name} (setUp) - {str(e)}")
-                        finally:
-                            try:
-                                test_instance.tearDown()
-                            except Exception as e:
-                                self.result.errors.append((f"{module_name}.{class_name}.{method_name} (tearDown)", traceback.format_exc()))
-                                if self.verbosity > 0:
-                                    console.print(f"[red]![/red] {module_name}.{class_name}.{method_name} (tearDown) - {str(e)}")
-                        
-                        progress.update(task, advance=1)
+                test_instance = test_class()
+                started = time.perf_counter()
+                try:
+                    test_instance.setUp()
+                    try:
+                        getattr(test_instance, method_name)()
+                        self.result.success += 1
+                        if self.verbosity > 1:
+                            console.print(f"[green]✓[/green] {test_name}")
+                    except AssertionError as e:
+                        self.result.failures.append((test_name, str(e)))
+                        if self.verbosity > 0:
+                            console.print(f"[red]✗[/red] {test_name} - {str(e)}")
+                    except Exception as e:
+                        self.result.errors.append((test_name, traceback.format_exc()))
+                        if self.verbosity > 0:
+                            console.print(f"[red]![/red] {test_name} - {str(e)}")
+                except Exception as e:
+                    self.result.errors.append((f"{test_name} (setUp)", traceback.format_exc()))
+                    if self.verbosity > 0:
+                        console.print(f"[red]![/red] {test_name} (setUp) - {str(e)}")
+                finally:
+                    try:
+                        test_instance.tearDown()
+                    except Exception as e:
+                        self.result.errors.append((f"{test_name} (tearDown)", traceback.format_exc()))
+                        if self.verbosity > 0:
+                            console.print(f"[red]![/red] {test_name} (tearDown) - {str(e)}")
+                    self.result.durations[test_name] = time.perf_counter() - started
+                
+                progress.update(task, advance=1)
         
         self.result.end_time = time.time()
         self._print_result()
@@ -249,7 +274,8 @@ class TestRunner:
             console.print("\n[bold red]Тесты завершились с ошибками![/bold red]")
 
 
-def run_tests(test_dir: str, verbosity: int = 1, include_patterns: List[str] = None, exclude_patterns: List[str] = None) -> TestResult:
+def run_tests(test_dir: str, verbosity: int = 1, include_patterns: List[str] = None, exclude_patterns: List[str] = None,
+              history: Optional[DurationHistory] = None) -> TestResult:
     """
     Запускает тесты из указанной директории
     
@@ -258,9 +284,14 @@ def run_tests(test_dir: str, verbosity: int = 1, include_patterns: List[str] = N
         verbosity (int): Уровень детализации вывода (0 - минимальный, 2 - максимальный)
         include_patterns (List[str]): Шаблоны для включения тестов
         exclude_patterns (List[str]): Шаблоны для исключения тестов
+        history (Optional[DurationHistory]): История длительности: задаёт порядок тестов и дополняется замерами запуска
         
     Returns:
         TestResult: Результаты выполнения тестов
     """
-    runner = TestRunner(verbosity, include_patterns, exclude_patterns)
-    return runner.run(test_dir) 
\ No newline at end of file
+    runner = TestRunner(verbosity, include_patterns, exclude_patterns, history=history)
+    result = runner.run(test_dir)
+    if history is not None:
+        history.record(CUSTOM_FRAMEWORK, result.durations)
+        history.save()
+    return result
\ No newline at end of file
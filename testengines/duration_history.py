@@ -0,0 +1,201 @@
+"""
+История длительности тестов (.testgen/test-durations).
+
+После запуска тестов длительности отдельных тестов (см. TestSummary.durations
+и custom_runner.TestResult.durations) запоминаются по фреймворку и
+идентификатору теста: последние MAX_SAMPLES замеров в миллисекундах. По ним
+вычисляются скользящее среднее и процентили; среднее используется для
+деления тестов на шарды (testengines.sharding) и для запуска самых долгих
+тестов первыми. Тесты, не встречавшиеся STALE_RUNS записей подряд
+(удалённые или переименованные), забываются.
+"""
+
+import json
+import math
+import os
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from langs.cache import get_testgen_dir
+
+HISTORY_FILENAME = "test-durations"
+HISTORY_VERSION = 2
+# Сколько последних замеров хранится для каждого теста
+MAX_SAMPLES = 10
+# Через сколько записей фреймворка без замеров тест удаляется из истории
+STALE_RUNS = 100
+
+# Запись теста: [номер записи фреймворка с последним замером, замеры в мс...]
+_LAST_RUN = 0
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Вычисляет процентиль с линейной интерполяцией.
+
+    Args:
+        values (List[float]): Непустой список значений
+        q (float): Процентиль от 0 до 100
+
+    Returns:
+        float: Значение процентиля
+    """
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class DurationStats:
+    """Статистика длительности теста по последним замерам (секунды)"""
+
+    def __init__(self, samples: List[float]):
+        """
+        Args:
+            samples (List[float]): Замеры от старых к новым
+        """
+        self.samples = samples
+
+    @property
+    def runs(self) -> int:
+        """Количество замеров"""
+        return len(self.samples)
+
+    @property
+    def last(self) -> float:
+        """Последний замер"""
+        return self.samples[-1]
+
+    @property
+    def mean(self) -> float:
+        """Скользящее среднее"""
+        return sum(self.samples) / len(self.samples)
+
+    def percentile(self, q: float) -> float:
+        """Процентиль замеров (например, 50 или 90)"""
+        return percentile(self.samples, q)
+
+
+class DurationHistory:
+    """Длительности тестов: фреймворк -> идентификатор теста -> последние замеры"""
+
+    def __init__(self, project_path: str = "."):
+        """
+        Args:
+            project_path (str): Директория, из которой запускаются тесты
+        """
+        self.path = os.path.join(get_testgen_dir(project_path), HISTORY_FILENAME)
+        # Фреймворк -> {"runs": количество записей, "tests": идентификатор теста -> запись}
+        self.frameworks: Dict[str, dict] = {}
+        self._dirty = False
+
+    def load(self) -> bool:
+        """
+        Загружает историю с диска.
+
+        Returns:
+            bool: True, если история загружена
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(data, dict) or data.get("version") != HISTORY_VERSION:
+            return False
+        self.frameworks = data.get("frameworks", {})
+        return True
+
+    def save(self) -> None:
+        """Атомарно сохраняет историю, если она изменилась"""
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                # Замеры - целые миллисекунды без пробелов: история остаётся компактной
+                json.dump({"version": HISTORY_VERSION, "frameworks": self.frameworks}, f,
+                          ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError:
+            # История необязательна: без неё тесты делятся поровну по количеству
+            pass
+
+    def _tests(self, framework: str) -> Dict[str, list]:
+        return self.frameworks.get(framework.lower(), {}).get("tests", {})
+
+    def stats(self, framework: str, test_id: str) -> Optional[DurationStats]:
+        """
+        Возвращает статистику длительности теста.
+
+        Args:
+            framework (str): Тестовый фреймворк
+            test_id (str): Идентификатор теста
+
+        Returns:
+            Optional[DurationStats]: Статистика или None, если замеров нет
+        """
+        entry = self._tests(framework).get(test_id)
+        if not entry or len(entry) <= 1:
+            return None
+        return DurationStats([ms / 1000 for ms in entry[1:]])
+
+    def durations(self, framework: str) -> Dict[str, float]:
+        """
+        Возвращает скользящие средние длительности тестов фреймворка.
+
+        Args:
+            framework (str): Тестовый фреймворк
+
+        Returns:
+            Dict[str, float]: Идентификатор теста -> секунды
+        """
+        return {test_id: sum(entry[1:]) / (len(entry) - 1) / 1000
+                for test_id, entry in self._tests(framework).items() if len(entry) > 1}
+
+    def longest_first(self, framework: str, test_ids: Iterable[str]) -> List[str]:
+        """
+        Упорядочивает тесты по убыванию средней длительности.
+
+        Тестам без истории назначается среднее известных тестов; при равной
+        длительности сохраняется исходный порядок.
+
+        Args:
+            framework (str): Тестовый фреймворк
+            test_ids (Iterable[str]): Идентификаторы тестов
+
+        Returns:
+            List[str]: Тесты, самые долгие первыми
+        """
+        test_ids = list(test_ids)
+        means = self.durations(framework)
+        known = [means[test_id] for test_id in test_ids if test_id in means]
+        default = sum(known) / len(known) if known else 0.0
+        return sorted(test_ids, key=lambda test_id: -means.get(test_id, default))
+
+    def record(self, framework: str, durations: Mapping[str, float]) -> None:
+        """
+        Добавляет замеры запуска (записи остальных тестов сохраняются).
+
+        Args:
+            framework (str): Тестовый фреймворк
+            durations (Mapping[str, float]): Идентификатор теста -> секунды
+        """
+        if not durations:
+            return
+        data = self.frameworks.setdefault(framework.lower(), {"runs": 0, "tests": {}})
+        data["runs"] += 1
+        run = data["runs"]
+        tests = data["tests"]
+        for test_id, duration in durations.items():
+            entry = tests.get(test_id) or [run]
+            entry[_LAST_RUN] = run
+            entry.append(max(0, round(duration * 1000)))
+            # Первый элемент - номер записи, за ним последние MAX_SAMPLES замеров
+            del entry[1:-MAX_SAMPLES]
+            tests[test_id] = entry
+        for test_id in [test_id for test_id, entry in tests.items() if run - entry[_LAST_RUN] > STALE_RUNS]:
+            del tests[test_id]
+        self._dirty = True
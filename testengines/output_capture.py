@@ -0,0 +1,218 @@
+"""
+Потоковый захват вывода тестраннера.
+
+Вывод процесса читается построчно по мере появления (stdout и stderr
+параллельно; в потоках или в цикле asyncio), каждая строка сразу
+передаётся обработчику (например, для вывода в консоль). В памяти хранится только хвост каждого потока
+ограниченного размера; строки, вытесненные из хвоста, дописываются в
+сжатый журнал .testgen/logs/<запуск>-<поток>.log.gz, который создаётся
+только при переполнении. Полный вывод - журнал, за которым следует хвост.
+"""
+
+import asyncio
+import gzip
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Iterator, List, Optional
+
+from langs.cache import get_testgen_dir
+
+# Размер хвоста потока, хранимого в памяти
+DEFAULT_TAIL_BYTES = 1024 * 1024
+# Строка длиннее этого размера читается частями: память не растёт на выводе без переводов строк
+MAX_LINE_BYTES = 64 * 1024
+LOG_DIR_NAME = "logs"
+# Сколько журналов хранится: более старые удаляются при создании нового
+MAX_LOG_FILES = 20
+# Уровень сжатия журнала: вывод сжимается на лету, скорость важнее степени сжатия
+LOG_COMPRESS_LEVEL = 1
+
+# Обработчик строки: (поток "stdout" или "stderr", строка); вызывается из разных потоков
+LineHandler = Callable[[str, str], None]
+
+# Номера запусков в процессе: журналы одновременных запусков не совпадают по имени
+_RUN_NUMBERS = itertools.count(1)
+
+
+def get_log_dir(project_path: str = ".") -> str:
+    """
+    Возвращает директорию журналов вывода тестов (.testgen/logs).
+
+    Args:
+        project_path (str): Корневая директория проекта
+
+    Returns:
+        str: Путь к директории журналов
+    """
+    return os.path.join(get_testgen_dir(project_path), LOG_DIR_NAME)
+
+
+def _prune_logs(log_dir: str) -> None:
+    """Удаляет самые старые журналы сверх MAX_LOG_FILES"""
+    try:
+        names = [name for name in os.listdir(log_dir) if name.endswith(".log.gz")]
+    except OSError:
+        return
+    if len(names) < MAX_LOG_FILES:
+        return
+    paths = sorted((os.path.join(log_dir, name) for name in names), key=os.path.getmtime)
+    for path in paths[:len(paths) - MAX_LOG_FILES + 1]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class StreamLog:
+    """Вывод одного потока: хвост в памяти и вытесненные строки в сжатом журнале"""
+
+    def __init__(self, name: str, log_path: str, max_bytes: int = DEFAULT_TAIL_BYTES):
+        """
+        Args:
+            name (str): Имя потока ("stdout" или "stderr")
+            log_path (str): Путь к журналу (создаётся при первом переполнении хвоста)
+            max_bytes (int): Размер хвоста в памяти
+        """
+        self.name = name
+        self.max_bytes = max_bytes
+        self._path = log_path
+        self._lines: Deque[bytes] = deque()
+        self._size = 0
+        self._log = None
+        # Объём вывода: всего и вытесненного в журнал
+        self.total_bytes = 0
+        self.spilled_bytes = 0
+
+    @property
+    def log_path(self) -> Optional[str]:
+        """Путь к журналу вытесненных строк или None, если весь вывод поместился в память"""
+        return self._path if self.spilled_bytes else None
+
+    def append(self, line: bytes) -> None:
+        """
+        Добавляет строку, вытесняя старые строки хвоста в журнал.
+
+        Args:
+            line (bytes): Строка вывода (с переводом строки)
+        """
+        self._lines.append(line)
+        self._size += len(line)
+        self.total_bytes += len(line)
+        while self._size > self.max_bytes and len(self._lines) > 1:
+            evicted = self._lines.popleft()
+            self._size -= len(evicted)
+            if self._log is None:
+                log_dir = os.path.dirname(self._path)
+                os.makedirs(log_dir, exist_ok=True)
+                _prune_logs(log_dir)
+                self._log = gzip.open(self._path, "wb", compresslevel=LOG_COMPRESS_LEVEL)
+            self._log.write(evicted)
+            self.spilled_bytes += len(evicted)
+
+    def close(self) -> None:
+        """Дописывает и закрывает журнал"""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    @property
+    def tail(self) -> str:
+        """Хвост вывода, хранящийся в памяти"""
+        return b"".join(self._lines).decode("utf-8", errors="replace")
+
+    def iter_lines(self) -> Iterator[bytes]:
+        """
+        Перебирает весь вывод потока: строки журнала, затем хвост.
+
+        Yields:
+            bytes: Строки вывода
+        """
+        if self.spilled_bytes:
+            with gzip.open(self._path, "rb") as log:
+                yield from log
+        yield from list(self._lines)
+
+
+class OutputLog:
+    """Захваченный вывод процесса (stdout и stderr)"""
+
+    def __init__(self, project_path: str = ".", max_bytes: int = DEFAULT_TAIL_BYTES):
+        """
+        Args:
+            project_path (str): Корневая директория проекта (журналы в .testgen/logs)
+            max_bytes (int): Размер хвоста в памяти для каждого потока
+        """
+        run_id = f"run-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_RUN_NUMBERS)}"
+        log_dir = get_log_dir(project_path)
+        self.stdout = StreamLog("stdout", os.path.join(log_dir, f"{run_id}-stdout.log.gz"), max_bytes)
+        self.stderr = StreamLog("stderr", os.path.join(log_dir, f"{run_id}-stderr.log.gz"), max_bytes)
+
+    @property
+    def log_paths(self) -> List[str]:
+        """Пути к журналам, в которые был вытеснен вывод"""
+        return [stream.log_path for stream in (self.stdout, self.stderr) if stream.log_path]
+
+    @staticmethod
+    def _append(stream: StreamLog, line: bytes, on_line: Optional[LineHandler]) -> None:
+        stream.append(line)
+        if on_line is not None:
+            on_line(stream.name, line.decode("utf-8", errors="replace"))
+
+    def _read(self, pipe, stream: StreamLog, on_line: Optional[LineHandler]) -> None:
+        try:
+            for line in iter(lambda: pipe.readline(MAX_LINE_BYTES), b""):
+                self._append(stream, line, on_line)
+        finally:
+            stream.close()
+
+    async def _read_async(self, pipe: asyncio.StreamReader, stream: StreamLog,
+                          on_line: Optional[LineHandler]) -> None:
+        try:
+            while True:
+                try:
+                    line = await pipe.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    # Последняя строка без перевода строки
+                    line = e.partial
+                except asyncio.LimitOverrunError:
+                    # Строка длиннее буфера читается частями, как и в _read
+                    line = await pipe.read(MAX_LINE_BYTES)
+                if not line:
+                    break
+                self._append(stream, line, on_line)
+        finally:
+            stream.close()
+
+    def capture(self, process, on_line: Optional[LineHandler] = None) -> None:
+        """
+        Читает вывод процесса до закрытия обоих потоков.
+
+        Args:
+            process (subprocess.Popen): Процесс с stdout и stderr в двоичных каналах (subprocess.PIPE)
+            on_line (Optional[LineHandler]): Обработчик каждой строки по мере появления
+        """
+        # stderr читается в отдельном потоке: иначе заполненный канал остановит процесс
+        reader = threading.Thread(target=self._read, args=(process.stderr, self.stderr, on_line), daemon=True)
+        reader.start()
+        try:
+            self._read(process.stdout, self.stdout, on_line)
+        finally:
+            reader.join()
+
+    async def capture_async(self, process: asyncio.subprocess.Process,
+                            on_line: Optional[LineHandler] = None) -> None:
+        """
+        Читает вывод процесса asyncio до закрытия обоих потоков.
+
+        Args:
+            process (asyncio.subprocess.Process): Процесс с stdout и stderr в каналах
+                (создан с limit=MAX_LINE_BYTES)
+            on_line (Optional[LineHandler]): Обработчик каждой строки по мере появления
+        """
+        await asyncio.gather(
+            self._read_async(process.stdout, self.stdout, on_line),
+            self._read_async(process.stderr, self.stderr, on_line),
+        )
@@ -1,108 +1,187 @@
 import os
 import subprocess
-from typing import Dict, List, Optional, Tuple
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
 from rich.console import Console
 from rich.progress import Progress
 
+from langs.plugins import get_plugin
+from testengines.output_capture import DEFAULT_TAIL_BYTES, LineHandler, OutputLog
+from testengines.test_events import EVENT_FAIL, FINISHED_EVENTS, EventParser, TestEvent, TestSummary, create_parser
+
 console = Console()
 
 class TestResult:
     """Класс для хранения результатов тестирования"""
-    def __init__(self, success: bool, output: str, errors: str = "", duration: float = 0.0):
+    def __init__(self, success: bool, output: str, errors: str = "", duration: float = 0.0,
+                 log: Optional[OutputLog] = None):
         self.success = success
+        # Вывод и ошибки (для запуска внешнего тестраннера - хвосты ограниченного размера)
         self.output = output
         self.errors = errors
         self.duration = duration
+        # Полный вывод: хвосты в памяти и сжатые журналы вытесненных строк
+        self.log = log
+        # Итоги по отдельным тестам, если вывод фреймворка разбирается (см. testengines.test_events)
+        self.summary: Optional[TestSummary] = None
+
+class RunMonitor:
+    """Обработка вывода одного запуска: печать строк, разбор событий тестов и прогресс"""
+    
+    def __init__(self, progress: Progress, title: str, parser: Optional[EventParser], echo: bool = True,
+                 prefix: str = ""):
+        """
+        Args:
+            progress (Progress): Индикатор прогресса, в консоль которого печатается вывод
+            title (str): Заголовок задачи прогресса
+            parser (Optional[EventParser]): Разборщик вывода фреймворка
+            echo (bool): Печатать вывод тестов (иначе - только упавшие тесты)
+            prefix (str): Префикс печатаемых строк (имя набора при одновременных запусках)
+        """
+        self.progress = progress
+        self.title = title
+        self.parser = parser
+        self.echo = echo
+        self.prefix = prefix
+        self.summary = TestSummary()
+        # Пока количество тестов неизвестно, полоса прогресса неопределённая
+        self.task = progress.add_task(title, total=None if parser is not None else 1)
+        # Строки stdout и stderr приходят из разных потоков
+        self._lock = threading.Lock()
+    
+    @property
+    def handler(self) -> Optional[LineHandler]:
+        """Обработчик строк для OutputLog.capture или None, если строки не нужны"""
+        return self.on_line if self.echo or self.parser is not None else None
+    
+    def on_line(self, stream: str, line: str) -> None:
+        with self._lock:
+            text = line if self.parser is None else self.parser.display(stream, line)
+            # Строка печатается целиком одним вызовом: вывод одновременных запусков не перемешивается
+            if self.echo and text is not None:
+                self.progress.console.out(self.prefix + text.rstrip("\n"), highlight=False)
+            if self.parser is None:
+                return
+            for event in self.parser.feed(stream, line):
+                self.on_event(event)
+    
+    def on_event(self, event: TestEvent) -> None:
+        self.summary.add(event)
+        if event.kind not in FINISHED_EVENTS:
+            return
+        if event.kind == EVENT_FAIL and not self.echo:
+            self.progress.console.print(f"{self.prefix}[red]✗ {event.test_id}[/red]", highlight=False)
+        self.progress.update(
+            self.task, completed=self.summary.finished, total=self.parser.total,
+            description=f"{self.title}: [green]{self.summary.passed}[/green] ✓ [red]{self.summary.failed}[/red] ✗"
+        )
+    
+    def finish(self) -> Optional[TestSummary]:
+        """
+        Завершает разбор вывода после окончания процесса.
+        
+        Returns:
+            Optional[TestSummary]: Итоги по тестам или None, если вывод не разбирался
+        """
+        if self.parser is not None:
+            for event in self.parser.finish():
+                self.on_event(event)
+        finished = self.summary.finished or 1
+        self.progress.update(self.task, completed=finished, total=finished)
+        return self.summary if self.parser is not None else None
+
+def build_command(language: str, framework: str, test_path: str, verbose: bool = False,
+                  units: Optional[List[str]] = None,
+                  exclude: Sequence[str] = ()) -> Tuple[Optional[List[str]], Optional[EventParser], str]:
+    """
+    Формирует команду запуска тестов и разборщик её вывода.
+    
+    Args:
+        language (str): Язык программирования
+        framework (str): Тестовый фреймворк
+        test_path (str): Путь к директории с тестами
+        verbose (bool): Флаг подробного вывода
+        units (Optional[List[str]]): Запустить только эти файлы, тесты или пакеты (см. testengines.sharding)
+        exclude (Sequence[str]): Директории, тесты которых не запускаются (например, вложенные проекты)
+        
+    Returns:
+        Tuple[Optional[List[str]], Optional[EventParser], str]: Команда (None, если запуск невозможен),
+            разборщик вывода и сообщение об ошибке
+    """
+    plugin = get_plugin(language)
+    if plugin is None:
+        return None, None, f"Язык {language} не поддерживается"
+        
+    # Команда и флаги подробного вывода объявлены в плагине языка
+    if units is not None:
+        command = plugin.subset_command(framework, units, verbose)
+        if command is None:
+            return None, None, f"Фреймворк {framework} не поддерживает запуск части тестов"
+    else:
+        command = plugin.run_command(framework, test_path, verbose, exclude)
+        if command is None:
+            return None, None, f"Фреймворк {framework} не поддерживается для языка {language}"
+        
+    # Разборщик может требовать машинный формат вывода (например, go test -json)
+    parser = create_parser(framework)
+    if parser is not None:
+        command = parser.prepare_command(command)
+    return command, parser, ""
 
-def run_tests(language: str, framework: str, test_path: str, verbose: bool = False) -> TestResult:
+def run_tests(language: str, framework: str, test_path: str, verbose: bool = False,
+              cwd: Optional[str] = None, echo: bool = True,
+              max_output_bytes: int = DEFAULT_TAIL_BYTES, units: Optional[List[str]] = None) -> TestResult:
     """
     Запускает тесты для указанного языка и фреймворка.
     
+    Вывод читается по мере появления и сразу печатается (echo); в памяти
+    остаётся только его хвост, а вытесненные строки сжимаются в журнал
+    .testgen/logs (см. testengines.output_capture). Строки разбираются в
+    события отдельных тестов (см. testengines.test_events): по ним
+    показывается прогресс, а упавшие тесты сообщаются сразу. Несколько
+    наборов тестов одновременно запускает testengines.suite_executor.
+    
     Args:
         language (str): Язык программирования
         framework (str): Тестовый фреймворк
         test_path (str): Путь к директории с тестами
         verbose (bool): Флаг подробного вывода
+        cwd (Optional[str]): Рабочая директория команды (например, корень проекта в монорепозитории)
+        echo (bool): Печатать вывод тестов по мере появления (иначе - только упавшие тесты)
+        max_output_bytes (int): Размер хвоста stdout и stderr, хранимого в памяти
+        units (Optional[List[str]]): Запустить только эти файлы, тесты или пакеты (шард, см. testengines.sharding)
         
     Returns:
         TestResult: Результат выполнения тестов
     """
-    # Словарь команд для запуска тестов для разных языков и фреймворков
-    commands = {
-        "python": {
-            "pytest": ["pytest", test_path, "--color=yes"],
-            "unittest": ["python", "-m", "unittest", "discover", test_path]
-        },
-        "javascript": {
-            "jest": ["npx", "jest", test_path],
-            "mocha": ["npx", "mocha", test_path]
-        },
-        "go": {
-            "testing": ["go", "test", "./..." if test_path == "." else f"./{test_path}/..."]
-        },
-        "java": {
-            "junit": ["./gradlew", "test"],
-            "testng": ["./gradlew", "test"]
-        },
-        "ruby": {
-            "rspec": ["bundle", "exec", "rspec", test_path],
-            "minitest": ["ruby", "-Ilib:test", test_path]
-        },
-        "rust": {
-            "cargo-test": ["cargo", "test"]
-        },
-        "php": {
-            "phpunit": ["./vendor/bin/phpunit", test_path]
-        },
-        "csharp": {
-            "nunit": ["dotnet", "test", "--filter", "TestCategory=NUnit"],
-            "xunit": ["dotnet", "test", "--filter", "TestCategory=XUnit"],
-            "mstest": ["dotnet", "test", "--filter", "TestCategory=MSTest"]
-        }
-        # Добавить другие языки и фреймворки по необходимости
-    }
-    
     try:
-        if language.lower() not in commands:
-            return TestResult(False, "", f"Язык {language} не поддерживается")
-            
-        if framework.lower() not in commands[language.lower()]:
-            return TestResult(False, "", f"Фреймворк {framework} не поддерживается для языка {language}")
-            
-        command = commands[language.lower()][framework.lower()]
-        
-        # Добавляем флаги для подробного вывода, если требуется
-        if verbose:
-            if language.lower() == "python" and framework.lower() == "pytest":
-                command.append("-v")
-            elif language.lower() == "python" and framework.lower() == "unittest":
-                command.append("-v")
-            elif language.lower() == "javascript" and framework.lower() == "jest":
-                command.append("--verbose")
-            elif language.lower() == "javascript" and framework.lower() == "mocha":
-                command.append("--reporter=spec")
-            elif language.lower() == "go" and framework.lower() == "testing":
-                command.append("-v")
-            elif language.lower() == "ruby" and framework.lower() == "rspec":
-                command.append("--format=documentation")
-            # Добавить другие флаги для других языков и фреймворков
+        command, parser, error = build_command(language, framework, test_path, verbose, units)
+        if command is None:
+            return TestResult(False, "", error)
             
+        log = OutputLog(cwd or ".", max_output_bytes)
+        started = time.perf_counter()
         with Progress() as progress:
-            task = progress.add_task(f"Запуск тестов ({language}/{framework})", total=1)
+            monitor = RunMonitor(progress, f"Запуск тестов ({language}/{framework})", parser, echo)
             
+            # Каналы двоичные: строки декодируются по одной, вывод не копится целиком
             process = subprocess.Popen(
                 command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True
+                cwd=cwd
             )
-            
-            stdout, stderr = process.communicate()
+            try:
+                log.capture(process, monitor.handler)
+            finally:
+                process.wait()
             success = process.returncode == 0
+            summary = monitor.finish()
             
-            progress.update(task, completed=1)
-            
-        return TestResult(success, stdout, stderr)
+        result = TestResult(success, log.stdout.tail, log.stderr.tail, time.perf_counter() - started, log)
+        result.summary = summary
+        return result
         
     except Exception as e:
         return TestResult(False, "", str(e))
@@ -153,6 +232,8 @@ def generate_report(test_result: TestResult, format: str = "html", output_path:
         </html>
         """
     elif format == "markdown":
+        # Обратная косая черта недопустима внутри выражений f-строк до Python 3.12
+        errors_section = f"## Errors:\n\n```\n{test_result.errors}\n```" if test_result.errors else ""
         content = f"""
         # TestGen Report
         
@@ -164,9 +245,10 @@ def generate_report(test_result: TestResult, format: str = "html", output_path:
         {test_result.output}
         ```
         
-        {f'## Errors:\n\n```\n{test_result.errors}\n```' if test_result.errors else ''}
+        {errors_section}
         """
     else:  # text
+        errors_section = f"Errors:\n-------\n{test_result.errors}" if test_result.errors else ""
         content = f"""
         TestGen Report
         ==============
@@ -177,7 +259,7 @@ def generate_report(test_result: TestResult, format: str = "html", output_path:
         -------
         {test_result.output}
         
-        {f'Errors:\n-------\n{test_result.errors}' if test_result.errors else ''}
+        {errors_section}
         """
     
     # Записываем отчет в файл
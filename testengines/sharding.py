@@ -0,0 +1,235 @@
+"""
+Деление тестов на части с близким временем выполнения (`run --shard i/N`, `run --workers N`).
+
+Тесты делятся на единицы, которые фреймворк умеет запускать по отдельности
+(см. LanguagePlugin.shard_unit): файлы тестов или пакеты go. Вес единицы -
+сумма длительностей её тестов из истории (testengines.duration_history);
+единицам без истории назначается средний известный вес. Единицы
+раскладываются жадно (LPT): по убыванию веса, каждая - в наименее
+загруженную часть. Если фреймворк сообщает идентификаторы тестов
+(UNIT_TESTS), файл тяжелее средней части делится на отдельные тесты.
+
+Все шарды должны видеть одну и ту же историю и одно и то же дерево тестов:
+иначе разбиение у них получится разным.
+"""
+
+import heapq
+import os
+import re
+import subprocess
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from langs.file_scanner import iter_files
+from langs.plugins import UNIT_PACKAGES, UNIT_TESTS, LanguagePlugin
+
+# Разделитель единицы и теста в идентификаторах тестов (см. testengines.test_events)
+_ID_SEPARATORS = {"pytest": "::", "jest": " › ", "testing": "::", "rspec": "::"}
+# Тест без имени, известный только по номеру в файле (pytest без -v): "путь[3]"
+_POSITION_RE = re.compile(r"^(.*)\[\d+\]$")
+_GO_MODULE_RE = re.compile(r"^module\s+(\S+)", re.MULTILINE)
+# Сколько ждать вывода идентификаторов тестов тяжёлых файлов
+COLLECT_TIMEOUT = 120
+
+
+class Shard:
+    """Часть тестов: единицы запуска в порядке убывания веса"""
+
+    def __init__(self):
+        # Файлы, тесты или пакеты (аргументы команды запуска части тестов)
+        self.units: List[str] = []
+        # Вес единиц и суммарный вес (секунды, если история известна)
+        self.weights: Dict[str, float] = {}
+        self.weight = 0.0
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """
+    Разбирает параметр --shard.
+
+    Args:
+        text (str): Номер шарда и количество шардов ("2/4")
+
+    Returns:
+        Tuple[int, int]: Номер шарда (с 1) и количество шардов
+
+    Raises:
+        ValueError: Неверный формат или номер вне диапазона
+    """
+    index, _, count = text.strip().partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"Шард указывается как i/N: {text}") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Номер шарда должен быть от 1 до N: {text}")
+    return index, count
+
+
+def _rel(path: str, cwd: str) -> str:
+    return os.path.relpath(path, cwd).replace(os.sep, "/")
+
+
+def _go_module(cwd: str) -> Optional[str]:
+    try:
+        with open(os.path.join(cwd, "go.mod"), encoding="utf-8") as f:
+            match = _GO_MODULE_RE.search(f.read())
+    except OSError:
+        return None
+    return match.group(1) if match else None
+
+
+def discover_units(plugin: LanguagePlugin, framework: str, test_path: str,
+                   cwd: str = ".") -> Dict[str, str]:
+    """
+    Находит единицы запуска тестов.
+
+    Args:
+        plugin (LanguagePlugin): Плагин языка
+        framework (str): Тестовый фреймворк
+        test_path (str): Путь к тестам (относительно cwd)
+        cwd (str): Директория, из которой запускаются тесты
+
+    Returns:
+        Dict[str, str]: Аргумент команды (файл или пакет) -> ключ единицы в идентификаторах тестов
+    """
+    matcher = plugin.test_matcher()
+    if matcher is None:
+        return {}
+    root = os.path.join(cwd, test_path)
+    if os.path.isfile(root):
+        files = [root]
+    else:
+        files = [os.path.join(directory, name) for directory, name in iter_files(root) if matcher(name)]
+    files.sort()
+
+    if plugin.shard_unit(framework) != UNIT_PACKAGES:
+        return {_rel(path, cwd): _rel(path, cwd) for path in files}
+
+    # Пакет go - директория с тестами; в идентификаторах тестов он записан путём импорта
+    module = _go_module(cwd)
+    units = {}
+    for path in files:
+        directory = _rel(os.path.dirname(path), cwd)
+        arg = "." if directory == "." else f"./{directory}"
+        if module is None:
+            units[arg] = directory
+        else:
+            units[arg] = module if directory == "." else f"{module}/{directory}"
+    return units
+
+
+def unit_weights(units: Mapping[str, str], framework: str,
+                 durations: Mapping[str, float]) -> Dict[str, Optional[float]]:
+    """
+    Вычисляет вес единиц по длительностям их тестов.
+
+    Args:
+        units (Mapping[str, str]): Аргумент команды -> ключ единицы (см. discover_units)
+        framework (str): Тестовый фреймворк
+        durations (Mapping[str, float]): Идентификатор теста -> секунды
+
+    Returns:
+        Dict[str, Optional[float]]: Аргумент команды -> секунды (None, если история единицы неизвестна)
+    """
+    separator = _ID_SEPARATORS.get(framework.lower())
+    # Суммы по единицам: именованные тесты, тесты по номерам и итог единицы целиком
+    # (запуски с подробным выводом и без него не складываются друг с другом)
+    named: Dict[str, float] = {}
+    numbered: Dict[str, float] = {}
+    whole: Dict[str, float] = {}
+    for test_id, duration in durations.items():
+        if separator is not None and separator in test_id:
+            key = test_id.split(separator, 1)[0]
+            named[key] = named.get(key, 0.0) + duration
+            continue
+        match = _POSITION_RE.match(test_id)
+        if match:
+            numbered[match.group(1)] = numbered.get(match.group(1), 0.0) + duration
+        else:
+            # Итог единицы целиком (например, файл jest без --verbose)
+            whole[test_id] = duration
+    return {arg: named.get(key, numbered.get(key, whole.get(key))) for arg, key in units.items()}
+
+
+def _fill_unknown(weights: Mapping[str, Optional[float]]) -> Dict[str, float]:
+    known = [weight for weight in weights.values() if weight is not None]
+    default = sum(known) / len(known) if known else 1.0
+    return {unit: default if weight is None else weight for unit, weight in weights.items()}
+
+
+def partition(weights: Mapping[str, float], count: int) -> List[Shard]:
+    """
+    Раскладывает единицы на части жадным алгоритмом LPT.
+
+    Args:
+        weights (Mapping[str, float]): Единица -> вес
+        count (int): Количество частей
+
+    Returns:
+        List[Shard]: Части (возможно, пустые) в порядке номеров
+    """
+    shards = [Shard() for _ in range(count)]
+    loads = [(0.0, index) for index in range(count)]
+    # Порядок при равных весах задан именем: разбиение одинаково у всех шардов
+    for unit in sorted(weights, key=lambda name: (-weights[name], name)):
+        load, index = heapq.heappop(loads)
+        shard = shards[index]
+        shard.units.append(unit)
+        shard.weights[unit] = weights[unit]
+        shard.weight = load + weights[unit]
+        heapq.heappush(loads, (shard.weight, index))
+    return shards
+
+
+def _collect_tests(plugin: LanguagePlugin, framework: str, files: List[str], cwd: str) -> Dict[str, List[str]]:
+    """Запрашивает у фреймворка идентификаторы тестов файлов: файл -> тесты"""
+    command = plugin.collect_command(framework, files)
+    separator = _ID_SEPARATORS.get(framework.lower())
+    if not files or command is None or separator is None:
+        return {}
+    try:
+        output = subprocess.run(command, cwd=cwd, capture_output=True, text=True,
+                                timeout=COLLECT_TIMEOUT).stdout
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    tests: Dict[str, List[str]] = {}
+    for line in output.splitlines():
+        test_id = line.strip()
+        key = test_id.split(separator, 1)[0]
+        if separator in test_id and key in files:
+            tests.setdefault(key, []).append(test_id)
+    return tests
+
+
+def plan_shards(plugin: LanguagePlugin, framework: str, test_path: str, count: int,
+                durations: Mapping[str, float], cwd: str = ".") -> List[Shard]:
+    """
+    Делит тесты на части с близким временем выполнения.
+
+    Args:
+        plugin (LanguagePlugin): Плагин языка
+        framework (str): Тестовый фреймворк
+        test_path (str): Путь к тестам (относительно cwd)
+        count (int): Количество частей
+        durations (Mapping[str, float]): История длительностей тестов фреймворка
+        cwd (str): Директория, из которой запускаются тесты
+
+    Returns:
+        List[Shard]: Части в порядке номеров
+    """
+    units = discover_units(plugin, framework, test_path, cwd)
+    weights = unit_weights(units, framework, durations)
+    filled = _fill_unknown(weights)
+
+    if count > 1 and plugin.shard_unit(framework) == UNIT_TESTS and filled:
+        # Файл тяжелее средней части не даёт выровнять части: он делится на тесты
+        target = sum(filled.values()) / count
+        heavy = sorted(unit for unit, weight in filled.items() if weight > target)
+        for unit, tests in _collect_tests(plugin, framework, heavy, cwd).items():
+            known = {test_id: durations[test_id] for test_id in tests if test_id in durations}
+            default = sum(known.values()) / len(known) if known else filled[unit] / len(tests)
+            del filled[unit]
+            for test_id in tests:
+                filled[test_id] = known.get(test_id, default)
+
+    return partition(filled, count)
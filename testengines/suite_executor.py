@@ -0,0 +1,159 @@
+"""
+Одновременный запуск нескольких наборов тестов.
+
+Наборы (например, проекты полиглотного репозитория) запускаются как
+процессы asyncio не более чем по jobs одновременно, поэтому общее время
+равно времени самого долгого набора, а не их сумме. Наборы с большей
+оценкой длительности (по истории, см. testengines.duration_history)
+запускаются первыми, чтобы долгий набор не начинался последним. Вывод каждого набора
+читается построчно (см. testengines.output_capture); строка печатается
+целиком с префиксом набора, поэтому вывод разных наборов не перемешивается
+внутри строк. Итоги наборов объединяются в общие итоги.
+"""
+
+import asyncio
+import os
+import time
+from typing import List, Optional, Sequence
+
+from rich.progress import Progress
+
+from testengines.output_capture import DEFAULT_TAIL_BYTES, MAX_LINE_BYTES, OutputLog
+from testengines.runner import RunMonitor, TestResult, build_command
+from testengines.test_events import TestSummary
+
+
+class Suite:
+    """Набор тестов: язык, фреймворк и директория запуска"""
+
+    def __init__(self, name: str, language: str, framework: str, test_path: str = ".",
+                 cwd: Optional[str] = None, units: Optional[List[str]] = None,
+                 estimate: Optional[float] = None, exclude: Sequence[str] = ()):
+        """
+        Args:
+            name (str): Имя набора в выводе и итогах (например, корень проекта)
+            language (str): Язык программирования
+            framework (str): Тестовый фреймворк
+            test_path (str): Путь к тестам (относительно cwd)
+            cwd (Optional[str]): Рабочая директория команды
+            units (Optional[List[str]]): Только эти файлы, тесты или пакеты (часть тестов, см. testengines.sharding)
+            estimate (Optional[float]): Ожидаемая длительность в секундах (None - неизвестна)
+            exclude (Sequence[str]): Директории (относительно cwd), тесты которых относятся к другим наборам
+        """
+        self.name = name
+        self.language = language
+        self.framework = framework
+        self.test_path = test_path
+        self.cwd = cwd
+        self.units = units
+        self.estimate = estimate
+        self.exclude = list(exclude)
+
+
+def default_jobs(count: int) -> int:
+    """
+    Возвращает количество одновременных запусков по умолчанию.
+
+    Args:
+        count (int): Количество наборов
+
+    Returns:
+        int: Не больше числа наборов и числа процессоров
+    """
+    return max(1, min(count, os.cpu_count() or 1))
+
+
+async def _run_suite(suite: Suite, progress: Progress, limit: asyncio.Semaphore, verbose: bool,
+                     echo: bool, prefixed: bool, max_output_bytes: int) -> TestResult:
+    """Запускает один набор, дожидаясь свободного места в пределах limit"""
+    async with limit:
+        try:
+            command, parser, error = build_command(suite.language, suite.framework, suite.test_path, verbose,
+                                                   suite.units, suite.exclude)
+            if command is None:
+                return TestResult(False, "", error)
+
+            log = OutputLog(suite.cwd or ".", max_output_bytes)
+            started = time.perf_counter()
+            monitor = RunMonitor(progress, f"{suite.name} ({suite.language}/{suite.framework})", parser, echo,
+                                 prefix=f"[{suite.name}] " if prefixed else "")
+            # Строка длиннее MAX_LINE_BYTES читается частями
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=suite.cwd,
+                limit=MAX_LINE_BYTES,
+            )
+            try:
+                await log.capture_async(process, monitor.handler)
+            finally:
+                await process.wait()
+            summary = monitor.finish()
+
+            result = TestResult(process.returncode == 0, log.stdout.tail, log.stderr.tail,
+                                time.perf_counter() - started, log)
+            result.summary = summary
+            return result
+
+        except Exception as e:
+            return TestResult(False, "", str(e))
+
+
+async def _run_all(suites: Sequence[Suite], jobs: int, verbose: bool, echo: bool,
+                   max_output_bytes: int) -> List[TestResult]:
+    limit = asyncio.Semaphore(jobs)
+    # Семафор пропускает ожидающих по очереди: самые долгие наборы запускаются первыми,
+    # наборы без оценки - после них в исходном порядке
+    order = sorted(range(len(suites)), key=lambda index: -(suites[index].estimate or 0.0))
+    with Progress() as progress:
+        results = await asyncio.gather(*(
+            _run_suite(suites[index], progress, limit, verbose, echo, len(suites) > 1, max_output_bytes)
+            for index in order
+        ))
+    ordered: List[Optional[TestResult]] = [None] * len(suites)
+    for index, result in zip(order, results):
+        ordered[index] = result
+    return ordered
+
+
+def run_suites(suites: Sequence[Suite], jobs: Optional[int] = None, verbose: bool = False,
+               echo: bool = True, max_output_bytes: int = DEFAULT_TAIL_BYTES) -> List[TestResult]:
+    """
+    Запускает наборы тестов одновременно.
+
+    Args:
+        suites (Sequence[Suite]): Наборы тестов
+        jobs (Optional[int]): Наибольшее количество одновременных запусков (по умолчанию - default_jobs)
+        verbose (bool): Флаг подробного вывода
+        echo (bool): Печатать вывод тестов по мере появления (иначе - только упавшие тесты)
+        max_output_bytes (int): Размер хвоста stdout и stderr каждого набора, хранимого в памяти
+
+    Returns:
+        List[TestResult]: Результаты в порядке наборов
+    """
+    if not suites:
+        return []
+    jobs = jobs or default_jobs(len(suites))
+    return asyncio.run(_run_all(suites, jobs, verbose, echo, max_output_bytes))
+
+
+def merge_results(suites: Sequence[Suite], results: Sequence[TestResult]) -> Optional[TestSummary]:
+    """
+    Объединяет итоги наборов по отдельным тестам.
+
+    Args:
+        suites (Sequence[Suite]): Наборы тестов
+        results (Sequence[TestResult]): Их результаты (в том же порядке)
+
+    Returns:
+        Optional[TestSummary]: Общие итоги (тесты помечены именем набора) или None, если вывод ни одного набора не разбирался
+    """
+    merged = None
+    for suite, result in zip(suites, results):
+        if result.summary is None:
+            continue
+        if merged is None:
+            merged = TestSummary()
+        merged.merge(result.summary, prefix=f"{suite.name}: ")
+    return merged
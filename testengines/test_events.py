@@ -0,0 +1,548 @@
+"""
+Потоковый разбор вывода тестраннеров в события отдельных тестов.
+
+Разборщик фреймворка получает строки вывода по мере их появления и
+возвращает события "start", "pass", "fail" и "skip" для отдельных тестов.
+По ним runner показывает точный прогресс и сразу сообщает об упавших
+тестах, не дожидаясь конца набора. Где фреймворк умеет потоковый машинный
+формат (go test -json), разборщик добавляет нужные аргументы к команде;
+иначе разбирается построчный подробный вывод (pytest -v, unittest -v,
+jest --verbose, mocha spec). JSON-отчёт jest (--json) пишется только по
+окончании запуска, поэтому для потокового разбора не годится. У rspec в
+текстовом выводе нет ни файлов примеров, ни их длительности, поэтому
+события rspec берутся из JSON-отчёта (--format json) в конце запуска, а
+в консоль по-прежнему печатается обычный вывод.
+
+Разборщики регистрируются по имени фреймворка (register_parser), так что
+плагины языков могут добавлять свои.
+"""
+
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+EVENT_START = "start"
+EVENT_PASS = "pass"
+EVENT_FAIL = "fail"
+EVENT_SKIP = "skip"
+# События завершения теста
+FINISHED_EVENTS = (EVENT_PASS, EVENT_FAIL, EVENT_SKIP)
+
+# Управляющие последовательности цвета (pytest --color=yes, jest)
+_ANSI_RE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+
+
+def strip_ansi(line: str) -> str:
+    """Удаляет управляющие последовательности терминала из строки"""
+    return _ANSI_RE.sub("", line)
+
+
+class TestEvent:
+    """Событие отдельного теста"""
+
+    # Класс не является набором тестов pytest
+    __test__ = False
+
+    def __init__(self, kind: str, test_id: str, duration: Optional[float] = None, message: str = ""):
+        """
+        Args:
+            kind (str): Вид события: "start", "pass", "fail" или "skip"
+            test_id (str): Идентификатор теста (например, "tests/test_a.py::test_x")
+            duration (Optional[float]): Длительность теста в секундах, если фреймворк её сообщает
+            message (str): Пояснение (статус фреймворка, причина пропуска)
+        """
+        self.kind = kind
+        self.test_id = test_id
+        self.duration = duration
+        self.message = message
+
+    def __repr__(self) -> str:
+        return f"TestEvent({self.kind!r}, {self.test_id!r}, {self.duration!r})"
+
+
+class EventParser:
+    """Базовый разборщик: не распознаёт событий и печатает вывод как есть"""
+
+    # Аргументы, добавляемые к команде запуска ради разбираемого формата
+    extra_args: Sequence[str] = ()
+
+    def __init__(self):
+        # Ожидаемое количество тестов (None, пока фреймворк его не сообщил)
+        self.total: Optional[int] = None
+
+    def prepare_command(self, command: List[str]) -> List[str]:
+        """
+        Добавляет к команде запуска аргументы разбираемого формата.
+
+        Args:
+            command (List[str]): Команда запуска тестов
+
+        Returns:
+            List[str]: Команда с аргументами extra_args
+        """
+        return command + list(self.extra_args)
+
+    def feed(self, stream: str, line: str) -> List[TestEvent]:
+        """
+        Разбирает очередную строку вывода.
+
+        Args:
+            stream (str): Поток ("stdout" или "stderr")
+            line (str): Строка вывода
+
+        Returns:
+            List[TestEvent]: События, распознанные в строке
+        """
+        return []
+
+    def display(self, stream: str, line: str) -> Optional[str]:
+        """
+        Возвращает текст строки для вывода в консоль (None - строку не печатать).
+
+        Args:
+            stream (str): Поток ("stdout" или "stderr")
+            line (str): Строка вывода
+
+        Returns:
+            Optional[str]: Текст для консоли
+        """
+        return line
+
+    def finish(self) -> List[TestEvent]:
+        """
+        Завершает разбор после окончания вывода.
+
+        Returns:
+            List[TestEvent]: События, отложенные до конца вывода
+        """
+        return []
+
+
+class PytestParser(EventParser):
+    """pytest: строки "путь::тест PASSED" (-v) или строки прогресса "путь ..F.s" """
+
+    _COLLECTED_RE = re.compile(r"collected (\d+) items?(?: / (\d+) deselected)?(?: / (\d+) selected)?")
+    _VERBOSE_RE = re.compile(r"^(\S+::\S.*?) (PASSED|FAILED|ERROR|SKIPPED|XFAIL|XPASS)\b")
+    _PROGRESS_RE = re.compile(r"^(?:(\S+\.py) )?([.FEsxX]+)(?:\s+\[\s*\d+%\])?\s*$")
+    # Ошибка сбора модуля в кратких итогах: тесты модуля не запускались
+    _COLLECT_ERROR_RE = re.compile(r"^ERROR ([^\s:]+)(?: - .*)?$")
+    _KINDS = {"PASSED": EVENT_PASS, "XPASS": EVENT_PASS, "FAILED": EVENT_FAIL, "ERROR": EVENT_FAIL,
+              "SKIPPED": EVENT_SKIP, "XFAIL": EVENT_SKIP}
+    _MARKS = {".": EVENT_PASS, "X": EVENT_PASS, "F": EVENT_FAIL, "E": EVENT_FAIL, "s": EVENT_SKIP, "x": EVENT_SKIP}
+
+    def __init__(self):
+        super().__init__()
+        # Файл последней строки прогресса и число его тестов (без -v идентификаторы тестов неизвестны)
+        self._file = ""
+        self._index = 0
+
+    def feed(self, stream: str, line: str) -> List[TestEvent]:
+        if stream != "stdout":
+            return []
+        line = strip_ansi(line).rstrip()
+        match = self._VERBOSE_RE.match(line)
+        if match:
+            return [TestEvent(self._KINDS[match.group(2)], match.group(1), message=match.group(2))]
+        if self.total is None:
+            match = self._COLLECTED_RE.search(line)
+            if match:
+                collected, deselected, selected = match.groups()
+                self.total = int(selected) if selected else int(collected) - int(deselected or 0)
+                return []
+        match = self._COLLECT_ERROR_RE.match(line)
+        if match:
+            return [TestEvent(EVENT_FAIL, match.group(1), message="ERROR")]
+        match = self._PROGRESS_RE.match(line)
+        if match is None:
+            return []
+        if match.group(1):
+            self._file, self._index = match.group(1), 0
+        elif not self._file:
+            return []
+        events = []
+        for mark in match.group(2):
+            self._index += 1
+            events.append(TestEvent(self._MARKS[mark], f"{self._file}[{self._index}]"))
+        return events
+
+
+class UnittestParser(EventParser):
+    """unittest -v: строки "test_x (pkg.Class.test_x) ... ok" в stderr"""
+
+    _RESULT_RE = re.compile(r"^(?:(\w+) \(([\w.]+)\))?.*?\.\.\. (ok|FAIL|ERROR|skipped.*|expected failure|unexpected success)$")
+    _HEADER_RE = re.compile(r"^(\w+) \(([\w.]+)\)$")
+    _DOTS_RE = re.compile(r"^[.FEsxu]+$")
+    _MARKS = {".": EVENT_PASS, "u": EVENT_PASS, "F": EVENT_FAIL, "E": EVENT_FAIL, "s": EVENT_SKIP, "x": EVENT_SKIP}
+
+    def __init__(self):
+        super().__init__()
+        # Тест с docstring: имя на одной строке, результат - на следующей
+        self._pending: Optional[str] = None
+        self._count = 0
+
+    @staticmethod
+    def _test_id(name: str, owner: str) -> str:
+        # Python 3.11+ пишет полное имя теста, более ранние версии - только класс
+        return owner if owner.endswith("." + name) else f"{owner}.{name}"
+
+    def feed(self, stream: str, line: str) -> List[TestEvent]:
+        if stream != "stderr":
+            return []
+        line = line.rstrip()
+        match = self._RESULT_RE.match(line)
+        if match:
+            name, owner, status = match.groups()
+            test_id = self._test_id(name, owner) if name else self._pending
+            self._pending = None
+            if test_id is None:
+                return []
+            if status in ("ok", "unexpected success"):
+                kind = EVENT_PASS
+            elif status in ("FAIL", "ERROR"):
+                kind = EVENT_FAIL
+            else:
+                kind = EVENT_SKIP
+            return [TestEvent(kind, test_id, message=status)]
+        match = self._HEADER_RE.match(line)
+        if match:
+            self._pending = self._test_id(*match.groups())
+            return []
+        if self._DOTS_RE.match(line):
+            events = []
+            for mark in line:
+                self._count += 1
+                events.append(TestEvent(self._MARKS[mark], f"#{self._count}"))
+            return events
+        return []
+
+
+def _duration(value: Optional[str], unit: str = "ms") -> Optional[float]:
+    if value is None:
+        return None
+    return float(value) / 1000 if unit == "ms" else float(value)
+
+
+class _IndentedSuites:
+    """Стек вложенных блоков describe по отступам (jest --verbose, mocha spec)"""
+
+    def __init__(self):
+        self._stack: List[tuple] = []
+
+    def reset(self) -> None:
+        self._stack = []
+
+    def push(self, indent: int, title: str) -> None:
+        self.pop_to(indent)
+        self._stack.append((indent, title))
+
+    def pop_to(self, indent: int) -> None:
+        while self._stack and self._stack[-1][0] >= indent:
+            self._stack.pop()
+
+    def test_id(self, indent: int, title: str, separator: str) -> str:
+        self.pop_to(indent)
+        return separator.join([suite for _, suite in self._stack] + [title])
+
+
+class JestParser(EventParser):
+    """jest: строки "PASS путь" по файлам и "✓ тест (5 ms)" по тестам (--verbose)"""
+
+    _FILE_RE = re.compile(r"^\s*(PASS|FAIL)\s+(\S+)")
+    _TEST_RE = re.compile(r"^(\s*)(✓|√|✕|×|○|✎)\s+(?:(?:skipped|todo)\s+)?(.*?)(?:\s+\((\d+(?:\.\d+)?)\s*(ms|s)\))?\s*$")
+    _TOTAL_RE = re.compile(r"^Tests:.*?(\d+) total")
+    _KINDS = {"✓": EVENT_PASS, "√": EVENT_PASS, "✕": EVENT_FAIL, "×": EVENT_FAIL, "○": EVENT_SKIP, "✎": EVENT_SKIP}
+
+    def __init__(self):
+        super().__init__()
+        self._suites = _IndentedSuites()
+        # Текущий файл, его статус и были ли по нему строки отдельных тестов
+        self._file: Optional[str] = None
+        self._file_status = ""
+        self._file_tests = 0
+
+    def _flush_file(self) -> List[TestEvent]:
+        # Без --verbose о файле известен только итог: он считается одним тестом
+        events = []
+        if self._file is not None and not self._file_tests:
+            kind = EVENT_PASS if self._file_status == "PASS" else EVENT_FAIL
+            events.append(TestEvent(kind, self._file, message=self._file_status))
+        self._file = None
+        return events
+
+    def feed(self, stream: str, line: str) -> List[TestEvent]:
+        line = strip_ansi(line).rstrip()
+        match = self._FILE_RE.match(line)
+        if match:
+            events = self._flush_file()
+            self._file_status, self._file = match.groups()
+            self._file_tests = 0
+            self._suites.reset()
+            return events
+        if self._file is None:
+            match = self._TOTAL_RE.match(line)
+            if match:
+                self.total = int(match.group(1))
+            return []
+        match = self._TEST_RE.match(line)
+        if match:
+            indent, mark, title, value, unit = match.groups()
+            self._file_tests += 1
+            test_id = self._suites.test_id(len(indent), title, " › ")
+            return [TestEvent(self._KINDS[mark], f"{self._file} › {test_id}", _duration(value, unit or "ms"))]
+        if line.lstrip().startswith("●") or not line.strip():
+            # Подробности ошибок идут после всех тестов файла
+            return []
+        if line.startswith(" "):
+            self._suites.push(len(line) - len(line.lstrip()), line.strip())
+            return []
+        if line.startswith(("Test Suites:", "Tests:")):
+            match = self._TOTAL_RE.match(line)
+            if match:
+                self.total = int(match.group(1))
+            return self._flush_file()
+        return []
+
+    def finish(self) -> List[TestEvent]:
+        return self._flush_file()
+
+
+class MochaParser(EventParser):
+    """mocha (reporter spec): строки "✔ тест (12ms)", "1) тест" и "- тест" с блоками по отступам"""
+
+    _PASS_RE = re.compile(r"^(\s*)(?:✔|✓)\s+(.*?)(?:\s+\((\d+)ms\))?\s*$")
+    _FAIL_RE = re.compile(r"^(\s*)\d+\) (.*?)\s*$")
+    _PENDING_RE = re.compile(r"^(\s*)- (.*?)\s*$")
+    _SUMMARY_RE = re.compile(r"^\s*\d+ (passing|failing|pending)\b")
+
+    def __init__(self):
+        super().__init__()
+        self._suites = _IndentedSuites()
+        # После итогов идут подробности ошибок с теми же номерами "1) ..."
+        self._done = False
+
+    def feed(self, stream: str, line: str) -> List[TestEvent]:
+        if self._done or stream != "stdout":
+            return []
+        line = strip_ansi(line).rstrip()
+        if self._SUMMARY_RE.match(line):
+            self._done = True
+            return []
+        match = self._PASS_RE.match(line)
+        if match:
+            indent, title, value = match.groups()
+            return [TestEvent(EVENT_PASS, self._suites.test_id(len(indent), title, " "), _duration(value))]
+        match = self._FAIL_RE.match(line)
+        if match:
+            indent, title = match.groups()
+            return [TestEvent(EVENT_FAIL, self._suites.test_id(len(indent), title, " "))]
+        match = self._PENDING_RE.match(line)
+        if match:
+            indent, title = match.groups()
+            return [TestEvent(EVENT_SKIP, self._suites.test_id(len(indent), title, " "))]
+        if line.strip():
+            self._suites.push(len(line) - len(line.lstrip()), line.strip())
+        return []
+
+
+class GoTestParser(EventParser):
+    """go test -json: события test2json; строки "--- PASS: TestX (0.00s)" без -json"""
+
+    extra_args = ("-json",)
+
+    _TEXT_RE = re.compile(r"^\s*--- (PASS|FAIL|SKIP): (\S+) \(([\d.]+)s\)")
+    _ACTIONS = {"run": EVENT_START, "pass": EVENT_PASS, "fail": EVENT_FAIL, "skip": EVENT_SKIP}
+
+    def __init__(self):
+        super().__init__()
+        # Пакеты, в которых упал хотя бы один тест (иначе падение пакета - ошибка сборки)
+        self._failed_packages = set()
+
+    @staticmethod
+    def _event(line: str) -> Optional[dict]:
+        if not line.startswith("{"):
+            return None
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return None
+        return event if isinstance(event, dict) and "Action" in event else None
+
+    def feed(self, stream: str, line: str) -> List[TestEvent]:
+        event = self._event(line)
+        if event is None:
+            match = self._TEXT_RE.match(line)
+            if match is None:
+                return []
+            status, name, elapsed = match.groups()
+            return [TestEvent(status.lower(), name, float(elapsed))]
+        kind = self._ACTIONS.get(event["Action"])
+        if kind is None:
+            return []
+        package = event.get("Package", "")
+        test = event.get("Test")
+        if test is None:
+            # Итог пакета: сообщается, только если пакет упал без упавших тестов
+            if kind == EVENT_FAIL and package not in self._failed_packages:
+                return [TestEvent(EVENT_FAIL, package, event.get("Elapsed"), "package")]
+            return []
+        if kind == EVENT_FAIL:
+            self._failed_packages.add(package)
+        return [TestEvent(kind, f"{package}::{test}", event.get("Elapsed"))]
+
+    def display(self, stream: str, line: str) -> Optional[str]:
+        event = self._event(line)
+        if event is None:
+            return line
+        # В консоль выводится исходный текстовый вывод go test
+        return event.get("Output") if event["Action"] == "output" else None
+
+
+class RspecParser(EventParser):
+    """rspec: JSON-отчёт (--format json) с итогом и длительностью каждого примера"""
+
+    _STATUSES = {"passed": EVENT_PASS, "failed": EVENT_FAIL, "pending": EVENT_SKIP}
+
+    def __init__(self):
+        super().__init__()
+        # Файл JSON-отчёта; создаётся вместе с командой запуска
+        self._report: Optional[str] = None
+
+    def prepare_command(self, command: List[str]) -> List[str]:
+        fd, self._report = tempfile.mkstemp(prefix="testgen-rspec-", suffix=".json")
+        os.close(fd)
+        # С явным --format rspec не добавляет вывод по умолчанию (progress): он указывается сам
+        formatted = any(arg in ("--format", "-f") or arg.startswith("--format=") for arg in command)
+        human = [] if formatted else ["--format", "progress"]
+        return command + human + ["--format", "json", "--out", self._report]
+
+    def finish(self) -> List[TestEvent]:
+        if self._report is None:
+            return []
+        try:
+            with open(self._report, encoding="utf-8") as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            report = None
+        finally:
+            try:
+                os.remove(self._report)
+            except OSError:
+                pass
+            self._report = None
+        if not isinstance(report, dict):
+            return []
+
+        summary = report.get("summary") or {}
+        if isinstance(summary.get("example_count"), int):
+            self.total = summary["example_count"]
+        events = []
+        for example in report.get("examples") or []:
+            file_path = example.get("file_path", "")
+            if file_path.startswith("./"):
+                file_path = file_path[2:]
+            status = example.get("status", "")
+            # Идентификатор начинается с файла примера: по нему история делит тесты на шарды
+            test_id = f"{file_path}::{example.get('full_description') or example.get('id', '')}"
+            events.append(TestEvent(self._STATUSES.get(status, EVENT_FAIL), test_id,
+                                    example.get("run_time"), status))
+        if summary.get("errors_outside_of_examples_count"):
+            # Ошибка загрузки файлов спецификаций: примеры не запускались
+            events.append(TestEvent(EVENT_FAIL, "rspec", message="errors outside of examples"))
+        return events
+
+
+class TestSummary:
+    """Итоги запуска по событиям тестов"""
+
+    # Класс не является набором тестов pytest
+    __test__ = False
+
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        self.skipped = 0
+        # Упавшие тесты в порядке падения
+        self.failures: List[str] = []
+        # Длительность тестов: из вывода фреймворка, иначе время с предыдущего события
+        self.durations: Dict[str, float] = {}
+        self._last_event = time.perf_counter()
+
+    @property
+    def finished(self) -> int:
+        """Количество завершённых тестов"""
+        return self.passed + self.failed + self.skipped
+
+    def add(self, event: TestEvent) -> None:
+        """
+        Учитывает событие теста.
+
+        Args:
+            event (TestEvent): Событие
+        """
+        now = time.perf_counter()
+        if event.kind == EVENT_START:
+            return
+        if event.kind == EVENT_PASS:
+            self.passed += 1
+        elif event.kind == EVENT_FAIL:
+            self.failed += 1
+            self.failures.append(event.test_id)
+        else:
+            self.skipped += 1
+        duration = event.duration if event.duration is not None else now - self._last_event
+        self.durations[event.test_id] = duration
+        self._last_event = now
+
+    def merge(self, other: "TestSummary", prefix: str = "") -> None:
+        """
+        Добавляет итоги другого запуска (например, одного из одновременно запущенных наборов).
+
+        Args:
+            other (TestSummary): Итоги запуска
+            prefix (str): Префикс идентификаторов его тестов (чтобы тесты разных наборов не совпадали)
+        """
+        self.passed += other.passed
+        self.failed += other.failed
+        self.skipped += other.skipped
+        self.failures.extend(prefix + test_id for test_id in other.failures)
+        for test_id, duration in other.durations.items():
+            self.durations[prefix + test_id] = duration
+
+
+# Разборщики по имени фреймворка
+_PARSERS: Dict[str, Callable[[], EventParser]] = {
+    "pytest": PytestParser,
+    "unittest": UnittestParser,
+    "jest": JestParser,
+    "mocha": MochaParser,
+    "testing": GoTestParser,
+    "rspec": RspecParser,
+}
+
+
+def register_parser(framework: str, factory: Callable[[], EventParser]) -> None:
+    """
+    Регистрирует разборщик вывода фреймворка (заменяя прежний).
+
+    Args:
+        framework (str): Имя фреймворка (как в LanguagePlugin.frameworks)
+        factory (Callable[[], EventParser]): Функция или класс, создающий разборщик на один запуск
+    """
+    _PARSERS[framework.lower()] = factory
+
+
+def create_parser(framework: str) -> Optional[EventParser]:
+    """
+    Создаёт разборщик вывода для запуска тестов фреймворка.
+
+    Args:
+        framework (str): Имя фреймворка
+
+    Returns:
+        Optional[EventParser]: Разборщик или None, если вывод фреймворка не разбирается
+    """
+    factory = _PARSERS.get(framework.lower())
+    return factory() if factory is not None else None
@@ -5,7 +5,8 @@
 
 import os
 import tempfile
-from testengines.custom_runner import TestCase, TestRunner, run_tests
+from testengines.custom_runner import CUSTOM_FRAMEWORK, TestCase, TestRunner, run_tests
+from testengines.duration_history import DurationHistory
 
 # Пример тестового класса для тестирования собственного тестраннера
 class SampleTestCase(TestCase):
@@ -123,4 +124,52 @@ class FilteringTest(TestCase):
         
         # Проверяем результаты - должно быть только 2 теста (test_one и test_two)
         assert result.total == 2
-        assert result.success == 2 
\ No newline at end of file
+        assert result.success == 2
+
+
+def test_test_runner_runs_longest_first() -> None:
+    """Тестирует порядок запуска по истории длительности и запись замеров"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with open(os.path.join(tmp_dir, "test_order.py"), "w") as f:
+            f.write("""
+from testengines.custom_runner import TestCase
+
+class OrderTest(TestCase):
+    def test_a(self):
+        assert True
+
+    def test_b(self):
+        assert True
+
+    def test_c(self):
+        assert True
+            """)
+
+        history = DurationHistory(tmp_dir)
+        history.record(CUSTOM_FRAMEWORK, {"test_order.OrderTest.test_a": 0.1, "test_order.OrderTest.test_c": 2.0})
+        result = run_tests(tmp_dir, verbosity=0, history=history)
+
+        # Тест без истории получает среднее известных (1.05 с)
+        assert list(result.durations) == ["test_order.OrderTest.test_c", "test_order.OrderTest.test_b",
+                                          "test_order.OrderTest.test_a"]
+        assert history.stats(CUSTOM_FRAMEWORK, "test_order.OrderTest.test_c").runs == 2
+        assert os.path.exists(history.path)
+
+
+def test_test_runner_runs_same_named_modules() -> None:
+    """Тестирует, что одноимённые файлы тестов в разных директориях запускаются оба"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for package in ("a", "b"):
+            os.makedirs(os.path.join(tmp_dir, package))
+            with open(os.path.join(tmp_dir, package, "test_util.py"), "w") as f:
+                f.write("""
+from testengines.custom_runner import TestCase
+
+class UtilTest(TestCase):
+    def test_ok(self):
+        assert True
+            """)
+
+        result = run_tests(tmp_dir, verbosity=0)
+        assert result.total == 2
+        assert sorted(result.durations) == ["a.test_util.UtilTest.test_ok", "b.test_util.UtilTest.test_ok"]
\ No newline at end of file
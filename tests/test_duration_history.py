@@ -0,0 +1,31 @@
+import tempfile
+
+from testengines.duration_history import MAX_SAMPLES, STALE_RUNS, DurationHistory, percentile
+
+
+def test_rolling_stats_and_persistence():
+    """Тестирует скользящие замеры, процентили, порядок по длительности и сохранение истории"""
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([5.0], 90) == 5.0
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        history = DurationHistory(tmp_dir)
+        for index in range(MAX_SAMPLES + 5):
+            history.record("pytest", {"t::slow": float(index), "t::fast": 0.01})
+        stats = history.stats("pytest", "t::slow")
+        # Хранятся только последние MAX_SAMPLES замеров
+        assert stats.runs == MAX_SAMPLES and stats.last == MAX_SAMPLES + 4
+        assert stats.mean == sum(range(5, MAX_SAMPLES + 5)) / MAX_SAMPLES
+        assert stats.percentile(90) > stats.percentile(50)
+        assert history.longest_first("pytest", ["t::fast", "t::new", "t::slow"]) == ["t::slow", "t::new", "t::fast"]
+        history.save()
+
+        loaded = DurationHistory(tmp_dir)
+        assert loaded.load()
+        assert loaded.durations("pytest") == history.durations("pytest")
+
+        # Тест, не встречавшийся STALE_RUNS записей, забывается
+        for _ in range(STALE_RUNS + 1):
+            loaded.record("pytest", {"t::fast": 0.01})
+        assert loaded.stats("pytest", "t::slow") is None
+        assert loaded.stats("pytest", "t::fast").runs == MAX_SAMPLES
@@ -0,0 +1,120 @@
+import os
+import tempfile
+from langs.file_index import FileIndex, load_file_index
+from langs.lang_detector import detect_project_language, get_source_files
+from langs.file_scanner import LanguageClassifier
+from langs.plugins import get_language_patterns
+
+CLASSIFIER = LanguageClassifier(get_language_patterns())
+
+
+def _touch(path: str, content: str = "") -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def _age_tree(root: str, seconds: int = 60) -> None:
+    """Сдвигает mtime всех директорий в прошлое, чтобы они не считались «свежими»"""
+    for dir_path, dirs, files in os.walk(root):
+        for name in files:
+            path = os.path.join(dir_path, name)
+            st = os.stat(path)
+            os.utime(path, (st.st_atime - seconds, st.st_mtime - seconds))
+    for dir_path, dirs, files in os.walk(root, topdown=False):
+        st = os.stat(dir_path)
+        os.utime(dir_path, (st.st_atime - seconds, st.st_mtime - seconds))
+
+
+def _warm_index(root: str) -> None:
+    """Строит индекс и сдвигает mtime, чтобы следующий запуск мог им воспользоваться"""
+    load_file_index(root, CLASSIFIER)
+    _age_tree(root)
+    load_file_index(root, CLASSIFIER)
+
+
+def test_index_is_persisted_and_reused():
+    """Тестирует, что повторный запуск не перечитывает неизменённые директории"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _touch(os.path.join(tmp_dir, "main.py"))
+        _touch(os.path.join(tmp_dir, "pkg", "core.py"))
+        _touch(os.path.join(tmp_dir, "web", "index.js"))
+
+        index = load_file_index(tmp_dir, CLASSIFIER)
+        assert index.rescanned == 3
+        assert os.path.exists(index.path)
+
+        _age_tree(tmp_dir)
+        load_file_index(tmp_dir, CLASSIFIER)
+        warm = load_file_index(tmp_dir, CLASSIFIER)
+        assert warm.rescanned == 0
+        assert warm.language_counts()["python"] == 2
+        assert warm.language_counts()["javascript"] == 1
+
+
+def test_index_picks_up_changes():
+    """Тестирует обновление индекса после добавления файлов и изменения правил"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _touch(os.path.join(tmp_dir, "main.py"))
+        _touch(os.path.join(tmp_dir, "pkg", "core.py"))
+        _touch(os.path.join(tmp_dir, ".gitignore"), "# пусто\nnothing\n")
+        _warm_index(tmp_dir)
+
+        _touch(os.path.join(tmp_dir, "pkg", "extra.py"))
+        index = load_file_index(tmp_dir, CLASSIFIER)
+        assert index.rescanned == 1
+        assert sorted(name for _, name in index.iter_files("python")) == ["core.py", "extra.py", "main.py"]
+
+        # Изменение .gitignore не меняет mtime директории, но должно учитываться
+        _touch(os.path.join(tmp_dir, ".gitignore"), "pkg/\n")
+        index = load_file_index(tmp_dir, CLASSIFIER)
+        assert [name for _, name in index.iter_files("python")] == ["main.py"]
+
+
+def test_new_ignore_file_rescans_subtree():
+    """Тестирует, что новый .gitignore исключает файлы уже проиндексированных поддиректорий"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _touch(os.path.join(tmp_dir, "pkg", "core.py"))
+        _touch(os.path.join(tmp_dir, "pkg", "sub", "gen_x.py"))
+        _warm_index(tmp_dir)
+
+        _touch(os.path.join(tmp_dir, "pkg", ".gitignore"), "gen_*.py\n")
+        index = load_file_index(tmp_dir, CLASSIFIER)
+        assert [name for _, name in index.iter_files("python")] == ["core.py"]
+
+
+def test_file_matching_several_patterns_is_listed_once():
+    """Тестирует, что файл, подходящий под несколько шаблонов языка, возвращается один раз"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _touch(os.path.join(tmp_dir, "setup.py"))
+        _touch(os.path.join(tmp_dir, "app.py"))
+
+        index = load_file_index(tmp_dir, CLASSIFIER)
+        assert sorted(name for _, name in index.iter_files("python")) == ["app.py", "setup.py"]
+        # Подсчёт для определения языка совпадает с glob: setup.py подходит под два шаблона
+        assert index.language_counts()["python"] == 3
+        assert sorted(get_source_files(tmp_dir, "python")) == \
+            sorted(get_source_files(tmp_dir, "python", use_cache=False))
+
+
+def test_index_and_direct_scan_agree():
+    """Тестирует совпадение результатов с индексом и без него"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _touch(os.path.join(tmp_dir, "app.py"))
+        _touch(os.path.join(tmp_dir, "test_app.py"))
+        _touch(os.path.join(tmp_dir, "lib", "util.py"))
+
+        cached = sorted(get_source_files(tmp_dir, "python"))
+        direct = sorted(get_source_files(tmp_dir, "python", use_cache=False))
+        assert cached == direct
+        assert detect_project_language(tmp_dir) == detect_project_language(tmp_dir, use_cache=False) == "python"
+
+
+def test_corrupted_index_is_rebuilt():
+    """Тестирует, что повреждённый файл индекса не ломает обход"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _touch(os.path.join(tmp_dir, "main.py"))
+        index = FileIndex(tmp_dir, CLASSIFIER)
+        _touch(index.path, "мусор")
+        assert not index.load()
+        assert load_file_index(tmp_dir, CLASSIFIER).language_counts()["python"] == 1
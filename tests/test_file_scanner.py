@@ -0,0 +1,106 @@
+import os
+import glob
+import tempfile
+import time
+from langs import file_scanner
+from langs.file_scanner import LanguageClassifier, count_language_files, iter_files
+from langs.plugins import get_language_patterns
+
+LANGUAGE_PATTERNS = get_language_patterns()
+
+
+def _touch(path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "w").close()
+
+
+def test_classifier_lookup_tables():
+    """Тестирует отнесение файлов к языкам по расширению и имени"""
+    classifier = LanguageClassifier(LANGUAGE_PATTERNS)
+    assert classifier.classify("main.py") == ["python"]
+    assert classifier.classify("go.mod") == ["go"]
+    assert classifier.classify("App.tsx") == ["javascript"]
+    assert classifier.classify("README.md") == []
+
+
+def test_classifier_wildcard_patterns():
+    """Тестирует шаблоны, которые не сводятся к расширению"""
+    classifier = LanguageClassifier({"java": ["*Test.java"], "python": ["*.py"]})
+    assert classifier.classify("UserTest.java") == ["java"]
+    assert classifier.classify("User.java") == []
+
+
+def test_count_language_files_matches_glob():
+    """Тестирует, что однопроходный сканер даёт те же результаты, что и glob"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rel in ["main.py", "pkg/a.py", "pkg/sub/b.py", "web/index.js", "web/app.ts",
+                    "go.mod", "svc/main.go", "requirements.txt", ".hidden/x.py", "pkg/.secret.py"]:
+            _touch(os.path.join(tmp_dir, rel))
+
+        expected = {lang: 0 for lang in LANGUAGE_PATTERNS}
+        for lang, patterns in LANGUAGE_PATTERNS.items():
+            for pattern in patterns:
+                expected[lang] += len(glob.glob(os.path.join(tmp_dir, "**", pattern), recursive=True))
+
+        classifier = LanguageClassifier(LANGUAGE_PATTERNS)
+        assert count_language_files(tmp_dir, classifier) == expected
+
+
+def test_iter_files_skips_hidden():
+    """Тестирует пропуск скрытых файлов и директорий"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _touch(os.path.join(tmp_dir, "a.py"))
+        _touch(os.path.join(tmp_dir, ".git", "config.py"))
+        names = [name for _, name in iter_files(tmp_dir)]
+        assert names == ["a.py"]
+
+
+def test_parallel_walk_matches_serial_order():
+    """Тестирует, что параллельный обход выдаёт файлы в том же порядке, что и последовательный"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for d in range(6):
+            for sub in range(3):
+                for i in range(4):
+                    _touch(os.path.join(tmp_dir, f"d{d}", f"s{sub}", f"f{i}.py"))
+            _touch(os.path.join(tmp_dir, f"d{d}", "top.py"))
+        _touch(os.path.join(tmp_dir, "node_modules", "x.js"))
+
+        serial = list(iter_files(tmp_dir, workers=1))
+        parallel = list(iter_files(tmp_dir, workers=8))
+        assert parallel == serial
+        assert len(serial) == 6 * 3 * 4 + 6
+
+
+def test_parallel_walk_can_stop_early():
+    """Тестирует досрочное прекращение параллельного обхода"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for d in range(20):
+            _touch(os.path.join(tmp_dir, f"d{d}", "a.py"))
+        walker = iter_files(tmp_dir, workers=4)
+        first = next(walker)
+        walker.close()
+        assert first[1] == "a.py"
+
+
+def test_parallel_walk_reads_ahead_boundedly(monkeypatch):
+    """Тестирует, что параллельный обход читает заранее ограниченное число директорий"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for d in range(40):
+            _touch(os.path.join(tmp_dir, f"d{d:02d}", "a.py"))
+            _touch(os.path.join(tmp_dir, f"d{d:02d}", f"s{d}", "b.py"))
+        scanned = []
+        scan_directory = file_scanner.scan_directory
+
+        def counting_scan(*args):
+            scanned.append(args[0])
+            return scan_directory(*args)
+
+        monkeypatch.setattr(file_scanner, "scan_directory", counting_scan)
+        monkeypatch.setattr(file_scanner, "WALK_PREFETCH_PER_WORKER", 1)
+        walker = iter_files(tmp_dir, workers=2)
+        first = [next(walker) for _ in range(5)]
+        time.sleep(0.1)
+        # Корень, прочитанные директории и не больше двух прочитанных заранее
+        assert len(scanned) <= 1 + 5 + 2
+        rest = list(walker)
+        assert sorted(first + rest) == sorted(iter_files(tmp_dir, workers=1))
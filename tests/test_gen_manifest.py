@@ -0,0 +1,169 @@
+import os
+import tempfile
+import time
+from langs.gen_manifest import GenManifest
+from langs.gen_plan import plan_generation
+from langs.lang_detector import generate_tests_incremental
+
+
+def _write(path: str, content: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def test_manifest_skips_unchanged_sources():
+    """Тестирует пропуск неизменённых файлов и перегенерацию изменённых"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src = os.path.join(tmp_dir, "src")
+        output_dir = os.path.join(tmp_dir, "tests")
+        _write(os.path.join(src, "a.py"), "def a():\n    pass\n")
+        _write(os.path.join(src, "b.py"), "def b():\n    pass\n")
+
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False)
+        assert len(report.generated) == 2
+        assert os.path.exists(os.path.join(src, ".testgen", "gen-manifest"))
+
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False)
+        assert report.generated == []
+        assert len(report.up_to_date) == 2
+
+        # Изменение содержимого (размер меняется, поэтому проверка не зависит от разрешения mtime)
+        _write(os.path.join(src, "a.py"), "def a():\n    pass\n\n\ndef extra():\n    pass\n")
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False)
+        assert report.generated == [os.path.join(output_dir, "test_a.py")]
+
+        # Удалённый тест генерируется заново
+        os.remove(os.path.join(output_dir, "test_b.py"))
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False)
+        assert report.generated == [os.path.join(output_dir, "test_b.py")]
+
+        # Смена шаблона (фреймворка) перегенерирует всё, как и force
+        report = generate_tests_incremental(src, "python", "unittest", output_dir, use_cache=False)
+        assert len(report.generated) == 2
+        report = generate_tests_incremental(src, "python", "unittest", output_dir, use_cache=False, force=True)
+        assert len(report.generated) == 2
+
+
+def test_manifest_removes_orphans():
+    """Тестирует удаление тестов удалённых исходных файлов"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src = os.path.join(tmp_dir, "src")
+        output_dir = os.path.join(tmp_dir, "tests")
+        _write(os.path.join(src, "a.py"), "def a():\n    pass\n")
+        _write(os.path.join(src, "b.py"), "def b():\n    pass\n")
+        _write(os.path.join(src, "c.py"), "def c():\n    pass\n")
+        generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False)
+
+        # Изменённый вручную тест не удаляется, а только сообщается
+        with open(os.path.join(output_dir, "test_c.py"), "a") as f:
+            f.write("# edited\n")
+        os.remove(os.path.join(src, "b.py"))
+        os.remove(os.path.join(src, "c.py"))
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False)
+        assert report.removed == [os.path.join(output_dir, "test_b.py")]
+        assert not os.path.exists(os.path.join(output_dir, "test_b.py"))
+        assert report.orphans == [os.path.join(output_dir, "test_c.py")]
+        # Осиротевший тест сообщается один раз и удаляется из манифеста
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False)
+        assert report.orphans == [] and report.removed == []
+
+
+def test_unchanged_tests_are_not_rewritten():
+    """Тестирует, что перегенерация с тем же содержимым не перезаписывает файлы"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src = os.path.join(tmp_dir, "src")
+        output_dir = os.path.join(tmp_dir, "tests")
+        _write(os.path.join(src, "a.py"), "def a():\n    pass\n")
+        _write(os.path.join(src, "b.py"), "def b():\n    pass\n")
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False)
+        assert len(report.written) == 2
+
+        test_a = os.path.join(output_dir, "test_a.py")
+        os.utime(test_a, ns=(1_000_000_000, 1_000_000_000))
+        # Добавленный комментарий не меняет тест
+        _write(os.path.join(src, "a.py"), "# comment\ndef a():\n    pass\n")
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False)
+        assert report.generated == [test_a]
+        assert report.written == [] and report.unchanged == [test_a]
+        assert os.stat(test_a).st_mtime_ns == 1_000_000_000
+
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False, force=True)
+        assert report.written == [] and len(report.unchanged) == 2
+
+
+def test_test_path_collisions_are_reported():
+    """Тестирует, что тест с уже занятым путём не перезаписывает другой тест"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src = os.path.join(tmp_dir, "src")
+        output_dir = os.path.join(tmp_dir, "tests")
+        # Подчёркивания внутри пути дают разные имена
+        _write(os.path.join(src, "pkg", "a_b.py"), "def first():\n    pass\n")
+        _write(os.path.join(src, "pkg_a", "b.py"), "def second():\n    pass\n")
+        # Части на границе с подчёркиванием совпадают: "pkg_/a" и "pkg/_a"
+        _write(os.path.join(src, "pkg_", "a.py"), "def third():\n    pass\n")
+        _write(os.path.join(src, "pkg", "_a.py"), "def fourth():\n    pass\n")
+
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False)
+        assert sorted(os.listdir(output_dir)) == ["test_pkg___a.py", "test_pkg__a_b.py", "test_pkg_a__b.py"]
+        assert report.collisions == [(os.path.join(output_dir, "test_pkg___a.py"), os.path.join(src, "pkg_", "a.py"))]
+
+        # Пропущенный файл не попадает в манифест и сообщается снова
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False)
+        assert report.generated == [] and len(report.collisions) == 1
+
+
+def test_changed_sources_only():
+    """Тестирует обработку отдельных изменений без обхода директории (режим --watch)"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src = os.path.join(tmp_dir, "src")
+        output_dir = os.path.join(tmp_dir, "tests")
+        _write(os.path.join(src, "a.py"), "def a():\n    pass\n")
+        _write(os.path.join(src, "b.py"), "def b():\n    pass\n")
+        _write(os.path.join(src, "c.py"), "def c():\n    pass\n")
+        generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False)
+
+        _write(os.path.join(src, "a.py"), "def a():\n    pass\n\n\ndef extra():\n    pass\n")
+        os.remove(os.path.join(src, "b.py"))
+        os.remove(os.path.join(src, "c.py"))
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False,
+                                            changed=[os.path.join(src, "a.py")],
+                                            removed=[os.path.join(src, "b.py")])
+        assert report.sources == 1
+        assert report.written == [os.path.join(output_dir, "test_a.py")]
+        # Удаление c.py не передано: его тест остаётся до полного запуска
+        assert report.removed == [os.path.join(output_dir, "test_b.py")]
+        assert sorted(os.listdir(output_dir)) == ["test_a.py", "test_c.py"]
+
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False)
+        assert report.removed == [os.path.join(output_dir, "test_c.py")]
+
+
+def test_plan_generation_writes_nothing():
+    """Тестирует план генерации: подсчёт файлов и актуальных тестов без записи на диск"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src = os.path.join(tmp_dir, "src")
+        output_dir = os.path.join(tmp_dir, "tests")
+        _write(os.path.join(src, "a.py"), "def a():\n    pass\n")
+        _write(os.path.join(src, "b.py"), "def b():\n    pass\n")
+
+        plan = plan_generation(src, "python", "pytest", output_dir, use_cache=False)
+        assert (plan.files, plan.up_to_date, plan.pending) == (2, 0, 2)
+        assert plan.bytes == plan.pending_bytes > 0
+        assert not plan.measured
+        assert not os.path.exists(output_dir)
+        assert not os.path.exists(os.path.join(src, ".testgen", "gen-manifest"))
+
+        # Файлы, изменённые только что, в манифесте проверяются по хэшу: сдвигаем mtime в прошлое
+        for name in ("a.py", "b.py"):
+            os.utime(os.path.join(src, name), ns=(time.time_ns() - 10 ** 10,) * 2)
+        generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False)
+        manifest = GenManifest(src)
+        manifest.load()
+        manifest.record_throughput("python", 1 << 20, 2.0)
+        manifest.save()
+
+        plan = plan_generation(src, "python", "pytest", output_dir, use_cache=False)
+        assert (plan.files, plan.up_to_date, plan.pending) == (2, 2, 0)
+        assert plan.measured and plan.throughput == (1 << 20) / 2.0
+        assert plan_generation(src, "python", "pytest", output_dir, use_cache=False, force=True).pending == 2
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import pytest
+from langs.file_scanner import LanguageClassifier
+from langs.git_files import list_git_files, load_git_file_list
+from langs.lang_detector import get_source_files
+from langs.plugins import get_language_patterns
+
+git = pytest.importorskip("git")
+
+CLASSIFIER = LanguageClassifier(get_language_patterns())
+
+
+def _touch(path: str, content: str = "") -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def _init_repo(path: str):
+    repo = git.Repo.init(path)
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "test")
+        config.set_value("user", "email", "test@example.com")
+    return repo
+
+
+def test_list_git_files_outside_repo():
+    """Тестирует отказ от git вне рабочей копии"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        assert list_git_files(tmp_dir) is None
+
+
+def test_list_git_files_tracked_untracked_and_ignored():
+    """Тестирует список из индекса git: отслеживаемые и неисключённые неотслеживаемые файлы"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        repo = _init_repo(tmp_dir)
+        _touch(os.path.join(tmp_dir, "app.py"))
+        _touch(os.path.join(tmp_dir, "gone.py"))
+        _touch(os.path.join(tmp_dir, ".gitignore"), "build_out/\n")
+        repo.index.add(["app.py", "gone.py", ".gitignore"])
+        repo.index.commit("init")
+
+        os.remove(os.path.join(tmp_dir, "gone.py"))
+        _touch(os.path.join(tmp_dir, "pkg", "new.py"))
+        _touch(os.path.join(tmp_dir, "build_out", "gen.py"))
+
+        assert sorted(list_git_files(tmp_dir)) == [".gitignore", "app.py", "pkg/new.py"]
+
+
+def test_git_file_list_applies_builtin_and_testgen_rules():
+    """Тестирует встроенный список исключений и .testgenignore поверх списка git"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _init_repo(tmp_dir)
+        _touch(os.path.join(tmp_dir, "app.py"))
+        _touch(os.path.join(tmp_dir, "app_test.py"))
+        _touch(os.path.join(tmp_dir, "vendor", "dep.py"))
+        _touch(os.path.join(tmp_dir, "scripts", "tool.py"))
+        _touch(os.path.join(tmp_dir, ".testgenignore"), "scripts/\n")
+
+        files = load_git_file_list(tmp_dir, CLASSIFIER)
+        assert sorted(name for _, name in files.iter_files("python")) == ["app.py", "app_test.py"]
+        assert files.language_counts()["python"] == 2
+
+        assert get_source_files(tmp_dir, "python") == [os.path.join(tmp_dir, "app.py")]
+
+
+def test_git_file_list_lists_each_file_once():
+    """Тестирует, что файл, подходящий под несколько шаблонов языка, возвращается один раз"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _init_repo(tmp_dir)
+        _touch(os.path.join(tmp_dir, "setup.py"))
+
+        files = load_git_file_list(tmp_dir, CLASSIFIER)
+        assert [name for _, name in files.iter_files("python")] == ["setup.py"]
+        assert files.language_counts()["python"] == 2
+        assert get_source_files(tmp_dir, "python") == [os.path.join(tmp_dir, "setup.py")]
@@ -0,0 +1,41 @@
+from langs.glob_matcher import compile_name_matcher
+from langs.plugins import get_plugin
+
+
+def _matcher(lang: str):
+    plugin = get_plugin(lang)
+    return compile_name_matcher(plugin.source_patterns, plugin.test_patterns)
+
+
+def test_python_test_files_excluded():
+    """Тестирует исключение файлов тестов по обоим шаблонам Python"""
+    matches = _matcher("python")
+    assert matches("module.py")
+    assert not matches("test_module.py")
+    assert not matches("module_test.py")
+    assert not matches("module.pyc")
+    # Шаблон исключения сопоставляется с именем целиком, а не по префиксу
+    assert matches("testing.py")
+
+
+def test_exclusion_is_case_insensitive():
+    """Тестирует исключение тестов независимо от регистра имени"""
+    matches = _matcher("java")
+    assert matches("Service.java")
+    assert not matches("ServiceTest.java")
+    assert not matches("ServiceTEST.java")
+
+
+def test_multiple_include_patterns():
+    """Тестирует объединение нескольких шаблонов включения"""
+    matches = _matcher("javascript")
+    assert matches("app.js")
+    assert matches("App.tsx")
+    assert not matches("app.test.js")
+    assert not matches("app.json")
+
+
+def test_empty_include_matches_nothing():
+    """Тестирует, что без шаблонов включения ни одно имя не подходит"""
+    matches = compile_name_matcher([], ["*.py"])
+    assert not matches("module.py")
@@ -0,0 +1,80 @@
+import os
+import tempfile
+from langs import go_generator
+from langs.go_generator import generate_tests, output_file_name, scan_file
+
+
+SOURCE = b'''// Package util helps.
+package util
+
+const raw = `
+func Fake() {
+}`
+
+// Reverse reverses.
+func Reverse(s string) string {
+	r := '}'
+	_ = "{"
+	return s + string(r)
+}
+
+func helper() {}
+
+type Buffer struct {
+	data []byte
+}
+
+func (b *Buffer) Write(p []byte) (n int, err error) {
+	return len(p), nil
+}
+
+func (b Buffer) Len() int { return len(b.data) }
+
+func Map[T any, U any](s []T, f func(T) U) []U {
+	return nil
+}
+'''
+
+
+def _write(path: str, content: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def test_scan_file():
+    """Тестирует поиск экспортируемых функций, методов и типов в обход строк и комментариев"""
+    package, symbols = scan_file(SOURCE)
+    assert package == "util"
+    assert symbols == (
+        ("function", "Reverse", "", "Reverse(s string)", 9, 13, False),
+        ("type", "Buffer", "", "Buffer", 17, 19, False),
+        ("method", "Write", "*Buffer", "Write(p []byte)", 21, 23, False),
+        ("method", "Len", "Buffer", "Len()", 25, 25, False),
+        ("function", "Map", "", "Map[T any, U any](s []T, f func(T) U)", 27, 29, True),
+    )
+    assert scan_file(b"") == ("", ())
+
+
+def test_generate_tests_uses_module_path():
+    """Тестирует импорт пакета по пути модуля из go.mod"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write(os.path.join(tmpdir, "go.mod"), b"module example.com/demo\n\ngo 1.21\n")
+        _write(os.path.join(tmpdir, "pkg", "util", "strings.go"), SOURCE)
+        _write(os.path.join(tmpdir, "cmd", "main.go"), b"package main\n\nfunc Run() {}\n")
+        go_generator._MODULES.clear()
+        output_dir = os.path.join(tmpdir, "tests")
+
+        test_path = generate_tests(os.path.join(tmpdir, "pkg", "util", "strings.go"), "testing", output_dir, tmpdir)
+        assert test_path == os.path.join(output_dir, "pkg_util_strings_test.go")
+        assert output_file_name("src/a_b") != output_file_name("src_a/b")
+        with open(test_path) as f:
+            code = f.read()
+        assert "package testgen_test" in code
+        assert 'util "example.com/demo/pkg/util"' in code
+        assert "func TestPkgUtilStringsBufferWrite(t *testing.T) {" in code
+        assert "_ = (*util.Buffer).Write" in code
+        assert "_ = util.Buffer.Len" in code
+        assert "t.Skip(" in code
+
+        assert generate_tests(os.path.join(tmpdir, "cmd", "main.go"), "testing", output_dir, tmpdir) is None
@@ -0,0 +1,70 @@
+import os
+import tempfile
+from langs.ignore_rules import IgnoreRules, is_ignored
+from langs.file_scanner import iter_files
+from langs.lang_detector import detect_project_language, get_source_files
+
+
+def _touch(path: str, content: str = "") -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def test_ignore_rules_basic_patterns():
+    """Тестирует базовый синтаксис .gitignore"""
+    rules = IgnoreRules(["# комментарий", "*.log", "/build_out", "docs/", "gen/**/*.py", ""])
+    assert rules.match("app.log", False)
+    assert rules.match("sub/app.log", False)
+    assert rules.match("build_out", True)
+    assert rules.match("sub/build_out", True) is None
+    assert rules.match("docs", True)
+    assert rules.match("docs", False) is None
+    assert rules.match("gen/a/b/x.py", False)
+    assert rules.match("gen/x.py", False)
+    assert rules.match("src/x.py", False) is None
+
+
+def test_ignore_rules_negation():
+    """Тестирует отрицание: решает последнее совпавшее правило"""
+    rules = IgnoreRules(["*.py", "!keep.py"])
+    assert rules.match("drop.py", False)
+    assert rules.match("keep.py", False) is False
+
+
+def test_nested_rules_take_precedence():
+    """Тестирует приоритет правил из вложенных директорий"""
+    chain = (("", IgnoreRules(["*.py"])), ("pkg", IgnoreRules(["!api.py"])))
+    assert is_ignored(chain, "main.py", False)
+    assert not is_ignored(chain, "pkg/api.py", False)
+    assert is_ignored(chain, "pkg/other.py", False)
+
+
+def test_walker_prunes_vendored_and_ignored_dirs():
+    """Тестирует отсечение встроенных и исключённых директорий при обходе"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _touch(os.path.join(tmp_dir, "main.py"))
+        _touch(os.path.join(tmp_dir, "node_modules", "lib", "index.js"))
+        _touch(os.path.join(tmp_dir, "venv", "lib", "site.py"))
+        _touch(os.path.join(tmp_dir, "generated", "out.py"))
+        _touch(os.path.join(tmp_dir, "pkg", "tmp.py"))
+        _touch(os.path.join(tmp_dir, "pkg", "core.py"))
+        _touch(os.path.join(tmp_dir, ".gitignore"), "generated/\n")
+        _touch(os.path.join(tmp_dir, "pkg", ".testgenignore"), "tmp.py\n")
+
+        found = sorted(os.path.relpath(os.path.join(d, n), tmp_dir) for d, n in iter_files(tmp_dir))
+        assert found == ["main.py", os.path.join("pkg", "core.py")]
+
+        unfiltered = [n for _, n in iter_files(tmp_dir, use_ignore=False)]
+        assert "out.py" in unfiltered
+
+
+def test_node_modules_does_not_skew_detection():
+    """Тестирует, что node_modules не влияет на определение языка"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _touch(os.path.join(tmp_dir, "main.py"))
+        for i in range(5):
+            _touch(os.path.join(tmp_dir, "node_modules", f"dep{i}", "index.js"))
+
+        assert detect_project_language(tmp_dir) == "python"
+        assert get_source_files(tmp_dir, "javascript") == []
@@ -0,0 +1,103 @@
+import os
+import tempfile
+from langs.javascript_generator import generate_tests, output_file_name, scan_module
+from langs.mapped_source import LineCounter, open_mapped
+
+
+ESM_SOURCE = b'''// export function commented() {}
+/* export class Hidden {} */
+const text = "export function inString() {";
+const tmpl = `${ `nested ${ {a: 1}.a }` } export function inTemplate() {}`;
+const pattern = /export function inRegex\\{"/g;
+const half = total / 2 / count;
+
+export function add(a, b = 2) {
+  if (a > b) { return `}`; }
+  return a + b;
+}
+
+export default class Calculator {
+  method() { return "{"; }
+}
+
+export const multiply = (a, b) => a * b;
+function local(x) {
+  return x;
+}
+class Helper {}
+export { local, Helper as PublicHelper };
+export { other } from "./other";
+'''
+
+CJS_SOURCE = b'''function add(a, b) { return a + b; }
+const sub = (a, b) => a - b;
+module.exports = { add, sub, nested: { skip: true }, mul: function (a) {} };
+exports.div = function (a, b) {
+  return a / b;
+};
+'''
+
+
+def _write(path: str, content: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def test_scan_es_module():
+    """Тестирует поиск экспортов ES-модуля в обход комментариев, строк и регулярных выражений"""
+    esm, exports = scan_module(ESM_SOURCE)
+    assert esm
+    assert exports == (
+        ("function", "add", "add", "add(a, b = 2)", 8, 11),
+        ("class", "Calculator", "default", "Calculator", 13, 15),
+        ("function", "multiply", "multiply", "multiply(a, b)", 17, 17),
+        ("function", "local", "local", "local(x)", 18, 20),
+        ("class", "Helper", "PublicHelper", "Helper", 21, 21),
+    )
+
+
+def test_scan_commonjs_module():
+    """Тестирует поиск экспортов CommonJS"""
+    esm, exports = scan_module(CJS_SOURCE)
+    assert not esm
+    assert [(kind, exported, start, end) for kind, _, exported, _, start, end in exports] == [
+        ("function", "add", 1, 1),
+        ("function", "sub", 2, 2),
+        ("function", "mul", 3, 3),
+        ("function", "div", 4, 6),
+    ]
+    assert scan_module(b"") == (False, ())
+
+
+def test_line_counter_and_empty_file():
+    """Тестирует подсчёт строк блоками и отображение пустого файла"""
+    buf = b"a\nb\n" * 10
+    counter = LineCounter(buf)
+    assert [counter.line_at(position) for position in (0, 3, 4, 39)] == [1, 2, 3, 20]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "empty.js")
+        _write(path, b"")
+        with open_mapped(path) as mapped:
+            assert mapped == b""
+
+
+def test_generate_tests_imports_relative_path():
+    """Тестирует импорт модуля из директории тестов и имя файла теста для TypeScript"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write(os.path.join(tmpdir, "src", "math.ts"), ESM_SOURCE)
+        _write(os.path.join(tmpdir, "src", "cjs.js"), CJS_SOURCE)
+        output_dir = os.path.join(tmpdir, "tests")
+
+        test_path = generate_tests(os.path.join(tmpdir, "src", "math.ts"), "jest", output_dir, tmpdir)
+        assert test_path == os.path.join(output_dir, "src_math.test.ts")
+        assert output_file_name("src/a_b", ".js") != output_file_name("src_a/b", ".js")
+        with open(test_path) as f:
+            code = f.read()
+        assert 'import Calculator, { add, multiply, local, PublicHelper } from "../src/math";' in code
+        assert 'expect(typeof PublicHelper).toBe("function");' in code
+
+        code = generate_tests(os.path.join(tmpdir, "src", "cjs.js"), "mocha", None, tmpdir)
+        assert 'const { add, sub, mul, div } = require("./src/cjs.js");' in code
+        assert 'assert.strictEqual(typeof div, "function");' in code
@@ -1,7 +1,8 @@
 import os
 import tempfile
 import pytest
-from langs.lang_detector import detect_project_language, get_available_test_frameworks
+import types
+from langs.lang_detector import detect_project_language, get_available_test_frameworks, get_source_files, iter_source_files
 
 def test_get_available_test_frameworks():
     """Тестирует получение списка доступных тестовых фреймворков"""
@@ -67,4 +68,19 @@ def test_detect_project_language_mixed():
             f.write('{"name": "test", "version": "1.0.0"}')
             
         detected_lang = detect_project_language(tmp_dir)
-        assert detected_lang == "javascript" 
\ No newline at end of file
+        assert detected_lang == "javascript"
+
+def test_iter_source_files_streams_sources():
+    """Тестирует ленивое перечисление исходных файлов без тестов"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.makedirs(os.path.join(tmp_dir, "pkg"))
+        for name in ("main.py", "test_main.py", os.path.join("pkg", "util.py"), "notes.txt"):
+            open(os.path.join(tmp_dir, name), "w").close()
+
+        files = iter_source_files(tmp_dir, "python", use_cache=False)
+        assert isinstance(files, types.GeneratorType)
+        first = next(files)
+        rest = list(files)
+        assert sorted([first] + rest) == sorted(get_source_files(tmp_dir, "python", use_cache=False))
+        assert sorted(os.path.relpath(p, tmp_dir) for p in [first] + rest) == \
+            sorted(["main.py", os.path.join("pkg", "util.py")])
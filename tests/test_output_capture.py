@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+from testengines.output_capture import OutputLog, StreamLog
+
+
+def test_stream_log_spills_evicted_lines():
+    """Тестирует ограничение хвоста в памяти и вытеснение строк в сжатый журнал"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stream = StreamLog("stdout", os.path.join(tmp_dir, "logs", "out.log.gz"), max_bytes=32)
+        stream.append(b"short\n")
+        assert stream.log_path is None and stream.tail == "short\n"
+
+        lines = [f"line {index}\n".encode() for index in range(100)]
+        for line in lines:
+            stream.append(line)
+        stream.close()
+        assert len(stream.tail.encode()) <= 32
+        assert stream.log_path is not None and os.path.exists(stream.log_path)
+        # Журнал и хвост вместе дают весь вывод по порядку
+        assert list(stream.iter_lines()) == [b"short\n"] + lines
+        assert stream.total_bytes == stream.spilled_bytes + len(stream.tail.encode())
+
+
+def test_output_log_captures_process_streams():
+    """Тестирует построчное чтение stdout и stderr процесса с обработчиком строк"""
+    script = "import sys\nfor i in range(1000):\n    print(i)\nprint('failed', file=sys.stderr)\n"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log = OutputLog(tmp_dir, max_bytes=256)
+        seen = []
+        process = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        log.capture(process, lambda stream, line: seen.append((stream, line)))
+        assert process.wait() == 0
+
+        assert len(seen) == 1001 and ("stderr", "failed\n") in seen
+        assert log.stderr.tail == "failed\n"
+        assert log.stdout.tail.endswith("999\n") and len(log.stdout.tail) <= 256
+        assert log.log_paths == [log.stdout.log_path]
+        assert sum(1 for _ in log.stdout.iter_lines()) == 1000
@@ -0,0 +1,64 @@
+import os
+import tempfile
+
+import pytest
+
+from langs.lang_detector import generate_tests_incremental
+from langs.output_layout import OutputLayout, parse_layout
+
+
+def _write(path: str, content: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def test_parse_layout_and_shards():
+    """Тестирует разбор --layout и набор файлов в файлы тестов примерно по N тестов"""
+    assert parse_layout(None).kind == "file"
+    assert parse_layout("package").bundled
+    assert parse_layout("shards:3").spec == "shards:3"
+    for text in ("modules", "package:3", "shards:x", "shards:0"):
+        with pytest.raises(ValueError):
+            parse_layout(text)
+
+    sizes = {"a": 2, "b": 0, "c": 2, "d": 5, "e": 1}
+    groups = OutputLayout("shards", 3).group(list("edcba"), ".", sizes.get)
+    assert groups == [("shard0001", ["a", "b", "c"]), ("shard0002", ["d"]), ("shard0003", ["e"])]
+
+
+def test_package_layout_bundles_modules():
+    """Тестирует объединение тестов пакета в один файл и смену раскладки"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src = os.path.join(tmp_dir, "src")
+        output_dir = os.path.join(tmp_dir, "tests")
+        # Одинаковые имена в разных модулях не должны конфликтовать
+        for name in ("a", "b"):
+            _write(os.path.join(src, "pkg", f"{name}.py"),
+                   "def run():\n    pass\n\n\nclass Calc:\n    def add(self, x):\n        return x\n")
+        _write(os.path.join(src, "main.py"), "def main():\n    pass\n")
+        layout = parse_layout("package")
+
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False, layout=layout)
+        bundle = os.path.join(output_dir, "test_pkg.py")
+        assert sorted(report.generated) == [bundle, os.path.join(output_dir, "test_root.py")]
+        with open(bundle) as f:
+            code = f.read()
+        compile(code, bundle, "exec")
+        assert "class TestPkgACalc:" in code and "class TestPkgBCalc:" in code
+        assert "callable(pkg_b.run)" in code
+
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False, layout=layout)
+        assert report.generated == [] and len(report.up_to_date) == 2
+
+        # Удаление модуля меняет состав группы: файл пакета формируется заново
+        os.remove(os.path.join(src, "pkg", "b.py"))
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False, layout=layout)
+        assert report.generated == [bundle]
+        with open(bundle) as f:
+            assert "pkg_b" not in f.read()
+
+        # При возврате к файлу на модуль объединённые тесты удаляются
+        report = generate_tests_incremental(src, "python", "pytest", output_dir, use_cache=False)
+        assert sorted(os.listdir(output_dir)) == ["test_main.py", "test_pkg_a.py"]
+        assert sorted(report.removed) == [bundle, os.path.join(output_dir, "test_root.py")]
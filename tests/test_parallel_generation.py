@@ -0,0 +1,36 @@
+import os
+import tempfile
+from langs.lang_detector import generate_tests_for_language
+
+
+def _write(path: str, content: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def _read_tree(directory: str) -> dict:
+    result = {}
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            result[name] = f.read()
+    return result
+
+
+def test_parallel_generation_matches_sequential():
+    """Тестирует, что результат генерации не зависит от количества процессов"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src = os.path.join(tmp_dir, "src")
+        for index in range(40):
+            _write(os.path.join(src, f"pkg{index % 3}", f"mod{index}.py"), f"def func{index}(x):\n    return x\n")
+        _write(os.path.join(src, "pkg", "a_b.py"), "def first():\n    pass\n")
+        _write(os.path.join(src, "pkg_a", "b.py"), "def second():\n    pass\n")
+
+        sequential_dir = os.path.join(tmp_dir, "out1")
+        parallel_dir = os.path.join(tmp_dir, "out2")
+        sequential = generate_tests_for_language(src, "python", "pytest", sequential_dir, use_cache=False)
+        parallel = generate_tests_for_language(src, "python", "pytest", parallel_dir, use_cache=False, jobs=2)
+
+        assert [os.path.basename(p) for p in parallel] == [os.path.basename(p) for p in sequential]
+        assert _read_tree(parallel_dir) == _read_tree(sequential_dir)
+        assert len(sequential) == 42
@@ -0,0 +1,62 @@
+import sys
+import pytest
+from langs import plugins
+from langs.lang_detector import get_available_test_frameworks, get_source_matcher
+from langs.plugins import LanguagePlugin, get_classifier, get_plugin, register_plugin
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Изолированная копия реестра плагинов"""
+    plugins._load_builtins()
+    monkeypatch.setattr(plugins, "_PLUGINS", dict(plugins._PLUGINS))
+    monkeypatch.setattr(plugins, "_CLASSIFIER", None)
+    monkeypatch.setattr(plugins, "_ENTRY_POINTS_LOADED", False)
+    yield
+    plugins._CLASSIFIER = None
+
+
+def test_builtin_run_commands():
+    """Тестирует команды запуска тестов встроенных плагинов"""
+    assert get_plugin("Python").run_command("pytest", "tests", verbose=True) == ["pytest", "tests", "--color=yes", "-v"]
+    assert get_plugin("go").run_command("testing", ".") == ["go", "test", "./..."]
+    assert get_plugin("go").run_command("testing", "pkg") == ["go", "test", "./pkg/..."]
+    assert get_plugin("python").run_command("nose", "tests") is None
+    assert get_plugin("python").run_command("pytest", ".", exclude=["sub"]) == ["pytest", ".", "--color=yes", "--ignore=sub"]
+    assert get_plugin("go").run_command("testing", ".", exclude=["sub"]) == ["go", "test", "./..."]
+
+
+def test_registered_plugin_is_lazy(registry):
+    """Тестирует, что модуль генератора импортируется только при использовании языка"""
+    module_name = "tests._lazy_generator_module"
+    plugin = LanguagePlugin("kotlin", ["*.kt"], ["*.kt"], ["*Test.kt"], ["kotest"], generator=module_name)
+    register_plugin(plugin)
+
+    assert get_available_test_frameworks("kotlin") == ["kotest"]
+    assert get_source_matcher("kotlin")("Main.kt") and not get_source_matcher("kotlin")("MainTest.kt")
+    assert get_classifier().classify("Main.kt") == ["kotlin"]
+    assert module_name not in sys.modules
+    with pytest.raises(ImportError):
+        plugin.generator_module()
+
+
+def test_entry_point_plugins(registry, monkeypatch):
+    """Тестирует загрузку сторонних плагинов через точки входа"""
+    class EntryPoint:
+        def __init__(self, name, value):
+            self.name = name
+            self.value = value
+
+        def load(self):
+            if isinstance(self.value, Exception):
+                raise self.value
+            return self.value
+
+    points = [
+        EntryPoint("elixir", lambda: [LanguagePlugin("elixir", ["*.ex", "mix.exs"], ["*.ex"], frameworks=["exunit"])]),
+        EntryPoint("broken", ImportError("нет модуля")),
+    ]
+    monkeypatch.setattr(plugins, "_iter_entry_points", lambda: points)
+    with pytest.warns(UserWarning, match="broken"):
+        assert get_plugin("elixir").frameworks == ["exunit"]
+    assert get_classifier().classify("mix.exs") == ["elixir"]
@@ -0,0 +1,79 @@
+import os
+import tempfile
+from langs.lang_detector import detect_project_map, get_source_files
+from langs.project_map import find_project_root
+
+
+def _touch(path: str, content: str = "") -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def _create_monorepo(root: str) -> None:
+    # Инструментальный package.json в корне без исходного кода JavaScript
+    _touch(os.path.join(root, "package.json"), '{"devDependencies": {"prettier": "1.0"}}')
+    _touch(os.path.join(root, "tools", "release.py"))
+    _touch(os.path.join(root, "services", "api", "go.mod"), "module api")
+    _touch(os.path.join(root, "services", "api", "main.go"))
+    _touch(os.path.join(root, "services", "api", "handlers", "user.go"))
+    _touch(os.path.join(root, "sdk", "python", "pyproject.toml"), "[tool.pytest.ini_options]")
+    _touch(os.path.join(root, "sdk", "python", "client", "api.py"))
+    _touch(os.path.join(root, "web", "package.json"), '{"devDependencies": {"mocha": "10"}}')
+    _touch(os.path.join(root, "web", "src", "app.ts"))
+    _touch(os.path.join(root, "web", "src", "index.ts"))
+
+
+def test_detect_project_map_polyglot():
+    """Тестирует определение проектов, языков и фреймворков в монорепозитории"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _create_monorepo(tmp_dir)
+
+        projects = detect_project_map(tmp_dir)
+        by_root = {os.path.relpath(path, tmp_dir): info for path, info in projects.items()}
+
+        assert set(by_root) == {".", os.path.join("services", "api"), os.path.join("sdk", "python"), "web"}
+        assert by_root[os.path.join("services", "api")].language == "go"
+        assert by_root[os.path.join("services", "api")].file_count == 2
+        assert by_root[os.path.join("sdk", "python")].language == "python"
+        assert by_root[os.path.join("sdk", "python")].framework == "pytest"
+        assert by_root["web"].language == "javascript"
+        assert by_root["web"].framework == "mocha"
+        # Корень без JS-кода получает язык по своим собственным файлам
+        assert by_root["."].language == "python"
+        assert len(by_root["."].nested) == 3
+
+
+def test_detect_project_map_single_project():
+    """Тестирует обычный проект с одним корнем"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _touch(os.path.join(tmp_dir, "go.mod"))
+        _touch(os.path.join(tmp_dir, "main.go"))
+        _touch(os.path.join(tmp_dir, "pkg", "util.go"))
+
+        projects = detect_project_map(tmp_dir)
+        assert list(projects) == [tmp_dir]
+        assert projects[tmp_dir].language == "go"
+        assert projects[tmp_dir].framework == "testing"
+
+
+def test_get_source_files_skips_nested_projects():
+    """Тестирует исключение вложенных проектов из обхода внешнего"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _create_monorepo(tmp_dir)
+        nested = [os.path.join(tmp_dir, "sdk", "python")]
+        files = get_source_files(tmp_dir, "python", exclude_dirs=nested)
+        assert files == [os.path.join(tmp_dir, "tools", "release.py")]
+
+
+def test_find_project_root_for_test_path(monkeypatch):
+    """Тестирует поиск корня проекта (директории запуска тестов и истории) по пути к тестам"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _create_monorepo(tmp_dir)
+        _touch(os.path.join(tmp_dir, "sdk", "python", "tests", "test_api.py"))
+        monkeypatch.chdir(tmp_dir)
+        assert find_project_root(os.path.join("sdk", "python", "tests"), "python") == os.path.join("sdk", "python")
+        assert find_project_root(os.path.join("services", "api", "handlers"), "go") == os.path.join("services", "api")
+        # Без манифеста языка поиск не поднимается выше текущей директории
+        assert find_project_root("tools", "python") == "."
+
@@ -0,0 +1,147 @@
+import os
+import tempfile
+from langs import parse_cache, python_generator
+from langs.python_generator import generate_tests, module_name, parse_module
+
+
+SOURCE = '''
+def add(a, b=1, *args, c, **kwargs):
+    return a + b
+
+
+async def fetch(url):
+    return url
+
+
+def _helper():
+    pass
+
+
+class Calculator:
+    def __init__(self):
+        self.value = 0
+
+    def multiply(self, x):
+        return self.value * x
+'''
+
+
+def _write(path: str, content: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def test_parse_module_extracts_public_api():
+    """Тестирует извлечение публичных функций, классов и методов"""
+    functions, classes = parse_module(SOURCE.encode())
+    assert [f[0] for f in functions] == ["add", "fetch"]
+    assert functions[0][1] == ("a", "b", "*args", "c", "**kwargs")
+    assert functions[1][2] is True
+    assert [c[0] for c in classes] == ["Calculator"]
+    assert [m[0] for m in classes[0][1]] == ["multiply"]
+    assert parse_module(b"def broken(:\n") is None
+
+
+def test_module_name():
+    """Тестирует имя модуля для импорта"""
+    root = os.path.join("project")
+    assert module_name(os.path.join(root, "pkg", "utils.py"), root) == "pkg.utils"
+    assert module_name(os.path.join(root, "pkg", "__init__.py"), root) == "pkg"
+
+
+def test_generate_tests_writes_compilable_file():
+    """Тестирует генерацию файлов тестов для pytest и unittest"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, "pkg", "calc.py")
+        _write(source, SOURCE)
+        for framework in ("pytest", "unittest"):
+            output_dir = os.path.join(tmp_dir, framework)
+            test_path = generate_tests(source, framework, output_dir, tmp_dir, use_cache=False)
+            assert test_path == os.path.join(output_dir, "test_pkg_calc.py")
+            with open(test_path, encoding="utf-8") as f:
+                code = f.read()
+            compile(code, test_path, "exec")
+            assert "from pkg.calc import add, fetch, Calculator" in code
+            assert "test_multiply" in code
+            assert "_helper" not in code
+
+        # Без output_dir возвращается код теста
+        assert "def test_add():" in generate_tests(source, "pytest", None, tmp_dir, use_cache=False)
+
+
+def test_parse_cache_skips_unchanged_files(monkeypatch):
+    """Тестирует, что неизменённый файл не разбирается повторно, в том числе в новом процессе"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, "calc.py")
+        _write(source, SOURCE)
+        calls = []
+        original = python_generator.parse_module
+        monkeypatch.setattr(python_generator, "parse_module", lambda data: calls.append(1) or original(data))
+
+        generate_tests(source, "pytest", None, tmp_dir)
+        generate_tests(source, "pytest", None, tmp_dir)
+        assert len(calls) == 1
+
+        # Новый процесс: кэш читается с диска
+        parse_cache._CACHES.clear()
+        generate_tests(source, "pytest", None, tmp_dir)
+        assert len(calls) == 1
+
+        # Изменённое содержимое разбирается заново
+        _write(source, SOURCE + "\ndef extra():\n    pass\n")
+        assert "test_extra" in generate_tests(source, "pytest", None, tmp_dir)
+        assert len(calls) == 2
+        parse_cache._CACHES.clear()
+
+
+def test_parse_cache_compaction():
+    """Тестирует слияние дописанных записей в снимок без удалённых файлов"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for index in range(parse_cache.COMPACT_MIN_RECORDS + 10):
+            path = os.path.join(tmp_dir, f"m{index}.py")
+            _write(path, f"x = {index}\n")
+            paths.append(path)
+
+        cache = parse_cache.ParseCache(tmp_dir, "test.bin", "1")
+        for path in paths:
+            with open(path, "rb") as f:
+                cache.put(path, parse_cache.content_digest(f.read()), path)
+        os.remove(paths[0])
+
+        reloaded = parse_cache.ParseCache(tmp_dir, "test.bin", "1")
+        reloaded.load()
+        assert reloaded.appended == 0
+        assert len(reloaded.by_path) == len(paths) - 1
+
+        # Другая версия формата сбрасывает кэш
+        other = parse_cache.ParseCache(tmp_dir, "test.bin", "2")
+        other.load()
+        assert other.by_path == {}
+
+
+def test_parse_cache_drops_corrupted_record():
+    """Тестирует, что повреждённая запись не скрывает записи, дописанные после неё"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for index in range(3):
+            path = os.path.join(tmp_dir, f"m{index}.py")
+            _write(path, f"x = {index}\n")
+            paths.append(path)
+
+        cache = parse_cache.ParseCache(tmp_dir, "test.bin", "1")
+        cache.put(paths[0], b"a", 0)
+        # Оборванная запись, например, после аварийного завершения процесса
+        with open(cache.path, "ab") as f:
+            f.write(b"\xff\x00")
+
+        reloaded = parse_cache.ParseCache(tmp_dir, "test.bin", "1")
+        reloaded.load()
+        assert reloaded.by_path == {"m0.py": b"a"} and reloaded.appended == 0
+        reloaded.put(paths[1], b"b", 1)
+        reloaded.put(paths[2], b"c", 2)
+
+        again = parse_cache.ParseCache(tmp_dir, "test.bin", "1")
+        again.load()
+        assert again.by_path == {"m0.py": b"a", "m1.py": b"b", "m2.py": b"c"}
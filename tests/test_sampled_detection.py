@@ -0,0 +1,93 @@
+import os
+import tempfile
+import pytest
+from langs.lang_detector import detect_project_language_sampled
+from langs.sampled_detection import leader_confidence, parse_detect_budget
+
+
+def _touch(path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "w").close()
+
+
+def test_leader_confidence():
+    """Тестирует оценку уверенности в лидере"""
+    assert leader_confidence({"python": 0, "go": 0}) == (None, 0.0)
+    lang, confidence = leader_confidence({"python": 10, "go": 10})
+    assert confidence == pytest.approx(0.5)
+    lang, confidence = leader_confidence({"python": 200, "go": 5})
+    assert lang == "python"
+    assert confidence > 0.999
+
+
+def test_leader_confidence_ignores_manifest_weight():
+    """Тестирует, что вес манифеста выбирает лидера, но не увеличивает объём выборки"""
+    lang, confidence = leader_confidence({"go": 27, "python": 5}, {"go": 2, "python": 5})
+    assert lang == "go"
+    assert confidence < 0.5
+    assert leader_confidence({"go": 25, "python": 0}, {"go": 0, "python": 0}) == ("go", 0.5)
+
+
+def test_sampled_detection_stops_early():
+    """Тестирует раннюю остановку на дереве с явным лидером"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for d in range(20):
+            for i in range(20):
+                _touch(os.path.join(tmp_dir, f"pkg{d}", f"m{i}.py"))
+
+        result = detect_project_language_sampled(tmp_dir)
+        assert result.language == "python"
+        assert result.confidence >= 0.99
+        assert result.files_scanned < 400
+        assert not result.complete
+
+
+def test_sampled_detection_weights_manifests():
+    """Тестирует, что манифест в корне перевешивает несколько файлов другого языка"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _touch(os.path.join(tmp_dir, "go.mod"))
+        _touch(os.path.join(tmp_dir, "main.go"))
+        for i in range(5):
+            _touch(os.path.join(tmp_dir, "scripts", f"tool{i}.py"))
+
+        result = detect_project_language_sampled(tmp_dir)
+        assert result.language == "go"
+        assert result.complete
+        assert result.confidence == 1.0
+
+
+def test_sampled_detection_respects_file_budget():
+    """Тестирует остановку по бюджету файлов с неполной уверенностью"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i in range(10):
+            _touch(os.path.join(tmp_dir, f"a{i}.py"))
+            _touch(os.path.join(tmp_dir, f"b{i}.rb"))
+        for i in range(10):
+            _touch(os.path.join(tmp_dir, "sub", f"c{i}.py"))
+
+        result = detect_project_language_sampled(tmp_dir, max_files=20)
+        assert result.files_scanned == 20
+        assert not result.complete
+        assert result.confidence < 0.99
+
+
+def test_sampled_detection_checks_budget_per_file():
+    """Тестирует, что бюджет файлов соблюдается внутри одной большой директории"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i in range(50):
+            _touch(os.path.join(tmp_dir, f"m{i}.py"))
+
+        result = detect_project_language_sampled(tmp_dir, max_files=10)
+        assert result.files_scanned == 10
+        assert not result.complete
+        assert result.language == "python"
+
+
+def test_parse_detect_budget():
+    """Тестирует разбор бюджета из командной строки"""
+    assert parse_detect_budget("5000") == (5000, None)
+    assert parse_detect_budget("1.5s") == (None, 1.5)
+    assert parse_detect_budget("5000,2s") == (5000, 2.0)
+    for value in ("", "abc", "-1", "0s"):
+        with pytest.raises(ValueError):
+            parse_detect_budget(value)
@@ -0,0 +1,55 @@
+import os
+import tempfile
+
+import pytest
+
+from langs.plugins import get_plugin
+from testengines.sharding import discover_units, parse_shard, partition, plan_shards, unit_weights
+
+
+def _write(path: str, content: str = "") -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def test_parse_shard_and_lpt_partition():
+    """Тестирует разбор --shard и жадное выравнивание частей по весу"""
+    assert parse_shard("2/4") == (2, 4)
+    for text in ("0/2", "3/2", "x/2", "2"):
+        with pytest.raises(ValueError):
+            parse_shard(text)
+
+    weights = {"a": 7, "b": 5, "c": 4, "d": 3, "e": 3, "f": 2}
+    shards = partition(weights, 2)
+    assert [shard.units for shard in shards] == [["a", "d", "f"], ["b", "c", "e"]]
+    assert [shard.weight for shard in shards] == [12, 12]
+    assert partition({"a": 1}, 3)[2].units == []
+
+
+def test_units_and_weights_from_history():
+    """Тестирует поиск единиц запуска (файлы, пакеты go) и их вес по истории длительности"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _write(os.path.join(tmp_dir, "go.mod"), "module example.com/app\n")
+        _write(os.path.join(tmp_dir, "a_test.go"))
+        _write(os.path.join(tmp_dir, "pkg", "x", "x_test.go"))
+        _write(os.path.join(tmp_dir, "pkg", "x", "y_test.go"))
+        units = discover_units(get_plugin("go"), "testing", ".", tmp_dir)
+        assert units == {".": "example.com/app", "./pkg/x": "example.com/app/pkg/x"}
+        weights = unit_weights(units, "testing", {"example.com/app/pkg/x::TestA": 2.0,
+                                                  "example.com/app/pkg/x::TestB": 1.0})
+        assert weights == {".": None, "./pkg/x": 3.0}
+        assert get_plugin("go").subset_command("testing", ["./pkg/x"]) == ["go", "test", "./pkg/x"]
+
+        units = {"spec/calc_spec.rb": "spec/calc_spec.rb", "spec/util_spec.rb": "spec/util_spec.rb"}
+        weights = unit_weights(units, "rspec", {"spec/calc_spec.rb::Calc adds": 0.25,
+                                                "spec/calc_spec.rb::Calc divides": 0.5})
+        assert weights == {"spec/calc_spec.rb": 0.75, "spec/util_spec.rb": None}
+
+        for name in ("test_a.py", "test_b.py", "test_c.py"):
+            _write(os.path.join(tmp_dir, "tests", name))
+        durations = {"tests/test_a.py::test_x": 4.0, "tests/test_a.py[1]": 9.0, "tests/test_b.py[1]": 1.0}
+        # Файл без истории получает средний известный вес; пустой тяжёлый файл на тесты не делится
+        shards = plan_shards(get_plugin("python"), "pytest", "tests", 2, durations, tmp_dir)
+        assert [shard.units for shard in shards] == [["tests/test_a.py"], ["tests/test_c.py", "tests/test_b.py"]]
+        assert shards[1].weight == 3.5
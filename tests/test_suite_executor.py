@@ -0,0 +1,41 @@
+import os
+import tempfile
+
+from testengines.suite_executor import Suite, merge_results, run_suites
+
+
+def test_run_suites_concurrently_and_merge():
+    """Тестирует одновременный запуск наборов тестов и объединение их итогов"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        suites = []
+        for name, body in (("a", "assert 1"), ("b", "assert 0")):
+            root = os.path.join(tmp_dir, name)
+            os.makedirs(root)
+            with open(os.path.join(root, f"test_{name}.py"), "w") as f:
+                f.write(f"def test_{name}():\n    {body}\n\n\ndef test_ok():\n    pass\n")
+            suites.append(Suite(name, "python", "pytest", ".", cwd=root))
+        suites.append(Suite("x", "cobol", "none"))
+
+        results = run_suites(suites, jobs=2, verbose=True, echo=False)
+        assert [result.success for result in results] == [True, False, False]
+        assert "cobol" in results[2].errors and results[2].summary is None
+
+        merged = merge_results(suites, results)
+        assert (merged.passed, merged.failed) == (3, 1)
+        assert merged.failures == ["b: test_b.py::test_b"]
+
+
+def test_nested_projects_are_excluded_from_outer_suite():
+    """Тестирует, что тесты вложенного проекта не запускаются повторно набором внешнего"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        nested = os.path.join(tmp_dir, "sub")
+        os.makedirs(nested)
+        for root, name in ((tmp_dir, "outer"), (nested, "inner")):
+            with open(os.path.join(root, f"test_{name}.py"), "w") as f:
+                f.write(f"def test_{name}():\n    pass\n")
+        suites = [Suite(".", "python", "pytest", ".", cwd=tmp_dir, exclude=["sub"]),
+                  Suite("sub", "python", "pytest", ".", cwd=nested)]
+
+        results = run_suites(suites, jobs=2, verbose=True, echo=False)
+        merged = merge_results(suites, results)
+        assert merged.passed == 2
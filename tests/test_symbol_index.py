@@ -0,0 +1,71 @@
+import os
+import tempfile
+from langs.symbol_index import update_symbol_index
+
+
+def _write(path: str, content: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def test_symbol_index_lookup_and_untested_functions():
+    """Тестирует символы файлов и поиск публичных функций без тестов"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _write(os.path.join(tmp_dir, "pkg", "x", "calc.py"),
+               "def add(a, b):\n    return a + b\n\n\ndef sub(a, b):\n    return a - b\n\n\n"
+               "class Calc:\n    def mul(self, x):\n        return x\n")
+        _write(os.path.join(tmp_dir, "pkg", "xy", "other.py"), "def other():\n    pass\n")
+        _write(os.path.join(tmp_dir, "tests", "test_calc.py"), "def test_add():\n    pass\n")
+
+        with update_symbol_index(tmp_dir, ["python"], use_cache=False) as index:
+            symbols = index.file_symbols(os.path.join(tmp_dir, "pkg", "x", "calc.py"))
+            assert [(s[1], s[2], s[3]) for s in symbols] == [
+                ("function", "add", "add(a, b)"),
+                ("function", "sub", "sub(a, b)"),
+                ("class", "Calc", "Calc"),
+                ("method", "Calc.mul", "mul(self, x)"),
+            ]
+            assert symbols[0][4:] == (1, 2)
+
+            # Префикс pkg/x не захватывает соседнюю директорию pkg/xy
+            untested = index.functions_without_tests("pkg/x")
+            assert [(row[0], row[2]) for row in untested] == [("pkg/x/calc.py", "sub")]
+            assert len(index.functions_without_tests()) == 2
+
+
+def test_untested_functions_follow_language_rules():
+    """Тестирует правила покрытия Go (Test<Имя>, Test<Тип><Имя>) и JavaScript (импорт модуля)"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _write(os.path.join(tmp_dir, "calc.go"),
+               "package calc\n\nfunc Add(a, b int) int {\n\treturn a + b\n}\n\n"
+               "func Sub(a, b int) int {\n\treturn a - b\n}\n\n"
+               "type Calc struct{}\n\nfunc (c *Calc) Mul(x int) int {\n\treturn x\n}\n")
+        _write(os.path.join(tmp_dir, "calc_test.go"),
+               "package calc\n\nimport \"testing\"\n\nfunc TestAdd(t *testing.T) {}\n\n"
+               "func TestCalcMul_Zero(t *testing.T) {}\n")
+        _write(os.path.join(tmp_dir, "src", "m.js"), "export function mul(a, b) { return a * b; }\n")
+        _write(os.path.join(tmp_dir, "src", "d.js"), "export function div(a, b) { return a / b; }\n")
+        _write(os.path.join(tmp_dir, "tests", "m.test.js"),
+               "import { mul } from \"../src/m\";\n\ntest(\"mul\", () => expect(mul(2, 3)).toBe(6));\n")
+
+        with update_symbol_index(tmp_dir, ["go", "javascript"], use_cache=False) as index:
+            assert [row[2] for row in index.functions_without_tests()] == ["Sub", "div"]
+            assert [row[2] for row in index.functions_without_tests(language="go")] == ["Sub"]
+
+
+def test_symbol_index_incremental_update():
+    """Тестирует, что повторное обновление извлекает символы только изменённых файлов"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _write(os.path.join(tmp_dir, "a.py"), "def a():\n    pass\n")
+        _write(os.path.join(tmp_dir, "b.py"), "def b():\n    pass\n")
+        with update_symbol_index(tmp_dir, ["python"], use_cache=False) as index:
+            assert index.updated == 2
+
+        # Содержимое a.py меняется, b.py удаляется
+        _write(os.path.join(tmp_dir, "a.py"), "def a():\n    pass\n\n\ndef a2():\n    pass\n")
+        os.remove(os.path.join(tmp_dir, "b.py"))
+        with update_symbol_index(tmp_dir, ["python"], use_cache=False) as index:
+            assert index.updated == 1
+            assert index.removed == 1
+            assert [row[2] for row in index.functions_without_tests()] == ["a", "a2"]
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import pytest
+from langs import template_engine
+from langs.template_engine import TemplateError, compile_template, load_template
+from langs.python_generator import generate_tests, generator_signature
+
+
+def _write(path: str, content: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def test_compile_template_syntax():
+    """Тестирует подстановки, циклы, условия и удаление строк с блоками"""
+    template = compile_template(
+        "{# комментарий #}\n"
+        "items: {{ ', '.join(str(x) for x in items) }}\n"
+        "{% for index, item in enumerate(items) %}\n"
+        "{% if item > 2 %}\n"
+        "  big {{ item }}\n"
+        "{% elif index == 0 %}\n"
+        "  first {{ item }}{% if item %}!{% endif %}\n"
+        "{% else %}\n"
+        "  small {{ item }}\n"
+        "{% endif %}\n"
+        "{% endfor %}\n"
+        "end"
+    )
+    assert template.render({"items": [1, 2, 3]}) == "items: 1, 2, 3\n  first 1!\n  small 2\n  big 3\nend"
+
+    for text in ("{% for x in y %}", "{% endif %}", "{% if x %}{% else %}{% elif y %}{% endif %}",
+                 "{% while x %}", "{{ x + }}"):
+        with pytest.raises(TemplateError):
+            compile_template(text)
+
+
+def test_compiled_template_disk_cache(monkeypatch):
+    """Тестирует, что скомпилированный шаблон берётся из кэша на диске"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        text = "cached {{ value }}\n"
+        compile_template(text, cache_dir=tmp_dir)
+        assert len(os.listdir(tmp_dir)) == 1
+
+        # Новый процесс: шаблон не компилируется заново
+        template_engine._COMPILED.clear()
+        monkeypatch.setattr(template_engine, "compile_source", lambda *args: pytest.fail("шаблон скомпилирован"))
+        assert compile_template(text, cache_dir=tmp_dir).render({"value": 1}) == "cached 1\n"
+
+
+def test_project_template_override():
+    """Тестирует переопределение встроенного шаблона в .testgen/templates"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, "calc.py")
+        _write(source, "def add(a, b):\n    return a + b\n")
+        builtin_signature = generator_signature("pytest", tmp_dir)
+
+        _write(os.path.join(tmp_dir, ".testgen", "templates", "python", "pytest.tmpl"),
+               "# {{ module }}\n{% for name in imported %}\n# {{ name }}\n{% endfor %}\n")
+        template_engine._RESOLVED.clear()
+        assert load_template("python", "pytest", tmp_dir).name.startswith(tmp_dir)
+        assert generate_tests(source, "pytest", None, tmp_dir, use_cache=False) == "# calc\n# add\n"
+        assert generator_signature("pytest", tmp_dir) != builtin_signature
+        template_engine._RESOLVED.clear()
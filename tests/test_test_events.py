@@ -0,0 +1,104 @@
+import json
+import os
+
+from testengines.test_events import (
+    EVENT_FAIL, EVENT_PASS, EVENT_SKIP, TestSummary, create_parser
+)
+
+
+def _feed(parser, lines, stream="stdout"):
+    events = []
+    for line in lines:
+        events.extend(parser.feed(stream, line + "\n"))
+    events.extend(parser.finish())
+    return [(event.kind, event.test_id) for event in events]
+
+
+def test_pytest_and_unittest_events():
+    """Тестирует разбор строк pytest (-v и прогресс) и unittest -v (включая тест с docstring)"""
+    parser = create_parser("pytest")
+    events = _feed(parser, [
+        "collected 4 items",
+        "tests/test_a.py::test_ok PASSED                [ 25%]",
+        "tests/test_a.py::TestX::test_bad FAILED        [ 50%]",
+        "tests/test_b.py .s                             [100%]",
+    ])
+    assert parser.total == 4
+    assert events == [(EVENT_PASS, "tests/test_a.py::test_ok"), (EVENT_FAIL, "tests/test_a.py::TestX::test_bad"),
+                      (EVENT_PASS, "tests/test_b.py[1]"), (EVENT_SKIP, "tests/test_b.py[2]")]
+
+    events = _feed(create_parser("unittest"), [
+        "test_add (test_calc.TestCalc.test_add) ... ok",
+        "test_div (test_calc.TestCalc) ... FAIL",
+        "test_doc (test_calc.TestCalc.test_doc)",
+        "Проверка с docstring ... skipped 'нет данных'",
+    ], stream="stderr")
+    assert events == [(EVENT_PASS, "test_calc.TestCalc.test_add"), (EVENT_FAIL, "test_calc.TestCalc.test_div"),
+                      (EVENT_SKIP, "test_calc.TestCalc.test_doc")]
+
+
+def test_jest_mocha_and_go_events():
+    """Тестирует разбор jest --verbose, mocha spec и go test -json и подсчёт итогов"""
+    events = _feed(create_parser("jest"), [
+        "FAIL src/calc.test.js",
+        "  calc",
+        "    ✓ adds (3 ms)",
+        "    ✕ divides (1 ms)",
+        "PASS src/util.test.js",
+        "Tests:       1 failed, 2 passed, 3 total",
+    ])
+    assert events == [(EVENT_PASS, "src/calc.test.js › calc › adds"), (EVENT_FAIL, "src/calc.test.js › calc › divides"),
+                      (EVENT_PASS, "src/util.test.js")]
+
+    events = _feed(create_parser("mocha"), [
+        "  calc",
+        "    ✔ adds (2ms)",
+        "    1) divides",
+        "    - later",
+        "  1 passing (5ms)",
+        "  1) calc",
+    ])
+    assert events == [(EVENT_PASS, "calc adds"), (EVENT_FAIL, "calc divides"), (EVENT_SKIP, "calc later")]
+
+    parser = create_parser("testing")
+    assert parser.extra_args == ("-json",)
+    lines = [json.dumps(event) for event in (
+        {"Action": "run", "Package": "calc", "Test": "TestAdd"},
+        {"Action": "output", "Package": "calc", "Test": "TestAdd", "Output": "=== RUN   TestAdd\n"},
+        {"Action": "pass", "Package": "calc", "Test": "TestAdd", "Elapsed": 0.5},
+        {"Action": "fail", "Package": "calc", "Test": "TestDiv", "Elapsed": 0.1},
+        {"Action": "fail", "Package": "calc", "Elapsed": 0.7},
+        {"Action": "fail", "Package": "broken", "Elapsed": 0},
+    )]
+    assert parser.display("stdout", lines[1]) == "=== RUN   TestAdd\n"
+    assert parser.display("stdout", lines[0]) is None
+    summary = TestSummary()
+    for line in lines:
+        for event in parser.feed("stdout", line):
+            summary.add(event)
+    assert (summary.passed, summary.failed, summary.skipped) == (1, 2, 0)
+    assert summary.failures == ["calc::TestDiv", "broken"]
+    assert summary.durations["calc::TestAdd"] == 0.5
+
+
+def test_rspec_events_from_json_report():
+    """Тестирует разбор JSON-отчёта rspec и сохранение обычного вывода в консоли"""
+    parser = create_parser("rspec")
+    command = parser.prepare_command(["bundle", "exec", "rspec", "spec"])
+    assert command[4:6] == ["--format", "progress"]
+    report = command[command.index("--out") + 1]
+    with open(report, "w", encoding="utf-8") as f:
+        json.dump({"examples": [
+            {"file_path": "./spec/calc_spec.rb", "full_description": "Calc adds", "status": "passed", "run_time": 0.25},
+            {"file_path": "./spec/calc_spec.rb", "full_description": "Calc divides", "status": "failed", "run_time": 0.5},
+            {"file_path": "./spec/util_spec.rb", "full_description": "Util later", "status": "pending", "run_time": 0},
+        ], "summary": {"example_count": 3, "errors_outside_of_examples_count": 0}}, f)
+    assert parser.display("stdout", "..F\n") == "..F\n"
+    events = parser.finish()
+    assert [(event.kind, event.test_id, event.duration) for event in events] == [
+        (EVENT_PASS, "spec/calc_spec.rb::Calc adds", 0.25), (EVENT_FAIL, "spec/calc_spec.rb::Calc divides", 0.5),
+        (EVENT_SKIP, "spec/util_spec.rb::Util later", 0)]
+    assert parser.total == 3 and not os.path.exists(report)
+
+    verbose = create_parser("rspec").prepare_command(["rspec", "spec", "--format=documentation"])
+    assert "progress" not in verbose
@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+import pytest
+from langs.watcher import SourceWatcher
+
+
+def _write(path: str, content: str = "") -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_reports_changed_and_removed_sources(use_inotify):
+    """Тестирует пакеты изменений: новые, изменённые и удалённые исходные файлы"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _write(os.path.join(tmp_dir, "main.py"), "x = 1")
+        with SourceWatcher(tmp_dir, "python", use_inotify=use_inotify,
+                           poll_interval=0.05, debounce=0.05) as watcher:
+            assert watcher.files() == [os.path.join(tmp_dir, "main.py")]
+            assert watcher.next_batch(timeout=0.2) is None
+
+            _write(os.path.join(tmp_dir, "main.py"), "x = 22")
+            _write(os.path.join(tmp_dir, "pkg", "util.py"))
+            _write(os.path.join(tmp_dir, "pkg", "test_util.py"))
+            batch = watcher.next_batch(timeout=5)
+            assert batch.changed == [os.path.join(tmp_dir, "main.py"), os.path.join(tmp_dir, "pkg", "util.py")]
+            assert batch.removed == []
+
+            shutil.rmtree(os.path.join(tmp_dir, "pkg"))
+            batch = watcher.next_batch(timeout=5)
+            assert batch.changed == []
+            assert batch.removed == [os.path.join(tmp_dir, "pkg", "util.py")]
+
+
+def test_watcher_applies_ignore_rules():
+    """Тестирует, что изменения в исключённых директориях не попадают в пакеты"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _write(os.path.join(tmp_dir, ".gitignore"), "generated/\n")
+        _write(os.path.join(tmp_dir, "main.py"))
+        with SourceWatcher(tmp_dir, "python", use_inotify=False, poll_interval=0.05, debounce=0.05) as watcher:
+            _write(os.path.join(tmp_dir, "generated", "models.py"))
+            _write(os.path.join(tmp_dir, "node_modules", "lib.py"))
+            assert watcher.next_batch(timeout=0.3) is None
+
+            # Снятие правила делает директорию видимой
+            os.remove(os.path.join(tmp_dir, ".gitignore"))
+            batch = watcher.next_batch(timeout=5)
+            assert batch.changed == [os.path.join(tmp_dir, "generated", "models.py")]